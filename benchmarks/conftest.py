@@ -0,0 +1,101 @@
+"""
+Benchmark fixtures.
+
+The suite only runs when BENCHMARK_POSTGRES_DATABASE names a dedicated,
+migrated PostgreSQL database (it truncates tables) and pytest-benchmark is
+installed; otherwise the benchmark modules are not collected, so a plain
+`pytest` run is unaffected.
+
+Environment:
+    BENCHMARK_POSTGRES_DATABASE  Database to load and query (required)
+    BENCHMARK_ROWS               gl_transactions rows (default 1,000,000)
+    BENCHMARK_SEED               Generator seed (default DEFAULT_SEED)
+    BENCHMARK_YEAR               Data year (default 2025)
+"""
+
+import asyncio
+import os
+
+import pytest
+
+BENCH_DB = os.getenv("BENCHMARK_POSTGRES_DATABASE")
+
+try:
+    import pytest_benchmark  # noqa: F401
+    HAVE_PYTEST_BENCHMARK = True
+except ImportError:
+    HAVE_PYTEST_BENCHMARK = False
+
+if not (BENCH_DB and HAVE_PYTEST_BENCHMARK):
+    collect_ignore_glob = ["test_*.py"]
+else:
+    # Config reads the environment on import, so point it at the
+    # benchmark database before anything under src is imported.
+    os.environ["POSTGRES_DATABASE"] = BENCH_DB
+
+
+def _profile():
+    from benchmarks.synthetic_data import DEFAULT_SEED, SyntheticProfile
+
+    return SyntheticProfile(
+        rows=int(os.getenv("BENCHMARK_ROWS", "1000000")),
+        seed=int(os.getenv("BENCHMARK_SEED", str(DEFAULT_SEED))),
+        year=int(os.getenv("BENCHMARK_YEAR", "2025")),
+    )
+
+
+if HAVE_PYTEST_BENCHMARK:
+    # Only define the hook when the plugin that declares it is installed
+    def pytest_benchmark_update_json(config, benchmarks, output_json):
+        """Record the data profile so result files are only diffed like for like."""
+        if BENCH_DB:
+            output_json["synthetic_profile"] = vars(_profile())
+
+
+@pytest.fixture(scope="session")
+def bench_profile():
+    return _profile()
+
+
+@pytest.fixture(scope="session")
+def synthetic_data(bench_profile):
+    """
+    Load the synthetic data set once per session.
+
+    A database that already holds the expected number of rows for the
+    profile's year is reused; set BENCHMARK_RELOAD=1 to force a reload.
+    """
+    from sqlalchemy import text
+    from src.db.postgres import get_engine
+    from benchmarks.synthetic_data import load_synthetic_data
+
+    existing = 0
+    try:
+        with get_engine().connect() as conn:
+            existing = conn.execute(
+                text("SELECT COUNT(*) FROM gl_transactions WHERE txyear = :year"),
+                {"year": bench_profile.year},
+            ).scalar()
+    except Exception:
+        pass
+
+    if existing != bench_profile.rows or os.getenv("BENCHMARK_RELOAD") == "1":
+        load_synthetic_data(bench_profile)
+    return bench_profile
+
+
+@pytest.fixture
+def db_session(synthetic_data):
+    from src.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def run_async():
+    """Run an async route handler to completion."""
+    return asyncio.run
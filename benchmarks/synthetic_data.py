@@ -0,0 +1,430 @@
+"""
+Deterministic synthetic data for the benchmark suite.
+
+Generates GL transactions plus the tables the hot paths read (gl_accounts,
+mapping tables, budget_lines, department_forecasts, capital_assets,
+driver_values) and bulk loads them into a local PostgreSQL with COPY.
+
+Distributions follow the production data closely enough for the query
+plans to match:
+    - gxpjno is drawn from data/master/project_mappings.csv weighted by
+      txn_count; roughly 45% of rows carry no project
+    - gl_accounts.ctuf01 is drawn from account_dept_mappings.csv weighted
+      by account_count, so the CTUF01 department fallback is exercised
+    - gxshut is set on ~15% of rows: K/C + unit (2) + year (2) + P/M/F
+      (6th char), e.g. 'K0125P' -> PLANNED-01
+    - gxacct uses the segment format without the company prefix
+      ('1-20-401-20-320-510-110-4'); the first digit is the plant
+    - amounts are lognormal with ~8% credits
+
+The same seed and row count always produce the same data.
+
+Usage:
+    python -m benchmarks.synthetic_data --rows 2000000
+    python -m benchmarks.synthetic_data --rows 500000 --seed 7 --year 2025
+"""
+
+import argparse
+import io
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+
+MASTER_DATA_DIR = Path(__file__).parent.parent / "data" / "master"
+
+DEFAULT_SEED = 20250101
+CHUNK_ROWS = 250_000
+
+PLANTS = [
+    # (plant digit, plant code, location, budget entity, alias prefix, units)
+    ("1", "KC", "20", "Kyger", "K", 5),
+    ("2", "CC", "21", "Clifty", "C", 6),
+]
+
+# (account type, cost type, FERC, detail) combinations seen in 401 accounts
+ACCOUNT_STEMS = [
+    ("401", "10", "350", "501"),
+    ("401", "10", "350", "504"),
+    ("401", "10", "350", "506"),
+    ("401", "20", "320", "500"),
+    ("401", "20", "320", "510"),
+    ("401", "20", "320", "512"),
+    ("401", "20", "320", "513"),
+    ("401", "20", "320", "514"),
+    ("401", "20", "320", "516"),
+    ("426", "20", "330", "520"),
+]
+
+MONTH_COLUMNS = ["jan", "feb", "mar", "apr", "may", "jun",
+                 "jul", "aug", "sep", "oct", "nov", "dec"]
+
+TRANSACTION_COLUMNS = [
+    "gxjrnl", "gxacct", "gxco", "txyear", "txmnth", "thedat", "gxfamt",
+    "gxdrcr", "ctdesc", "gxdesc", "thsrc", "gxpjno", "gxshut",
+]
+
+SOURCES = np.array(["AP", "PO", "JE", "PR", "IC"])
+DESCRIPTIONS = np.array([
+    "VENDOR INVOICE", "MATERIAL ISSUE", "PAYROLL ACCRUAL", "CONTRACT SERVICES",
+    "FREIGHT", "STOREROOM ISSUE", "JOURNAL ENTRY", "OVERTIME",
+])
+
+
+@dataclass
+class SyntheticProfile:
+    """Size and shape of a synthetic data set."""
+    rows: int = 1_000_000
+    seed: int = DEFAULT_SEED
+    year: int = 2025
+    accounts_per_plant: int = 600
+    budget_lines_per_dept: int = 40
+    capital_assets: int = 2_000
+    project_share: float = 0.55
+    outage_share: float = 0.15
+    credit_share: float = 0.08
+
+
+def _read_master(name: str) -> pd.DataFrame:
+    return pd.read_csv(MASTER_DATA_DIR / name, comment="#").dropna(how="all")
+
+
+def _weights(counts: pd.Series) -> np.ndarray:
+    values = counts.fillna(1).clip(lower=1).to_numpy(dtype=float)
+    return values / values.sum()
+
+
+def build_accounts(profile: SyntheticProfile) -> pd.DataFrame:
+    """Chart of accounts (gl_accounts rows) for both plants."""
+    rng = np.random.default_rng([profile.seed, 1])
+    dept_map = _read_master("account_dept_mappings.csv")
+    ctuf01_pool = dept_map["ctuf01"].astype(str).str.strip().to_numpy()
+    ctuf01_p = _weights(dept_map["account_count"])
+
+    rows = []
+    for digit, _, location, _, _, _ in PLANTS:
+        stems = rng.integers(0, len(ACCOUNT_STEMS), profile.accounts_per_plant)
+        subs = rng.integers(100, 999, profile.accounts_per_plant)
+        labor = rng.choice(["4", "5"], profile.accounts_per_plant, p=[0.3, 0.7])
+        ctuf01 = rng.choice(ctuf01_pool, profile.accounts_per_plant, p=ctuf01_p)
+        for i in range(profile.accounts_per_plant):
+            acct_type, cost_type, ferc, detail = ACCOUNT_STEMS[stems[i]]
+            rows.append({
+                "ctacct": f"{digit}-{location}-{acct_type}-{cost_type}-{ferc}-{detail}-{subs[i]}-{labor[i]}",
+                "ctdesc": f"{'FUEL' if cost_type == '10' else 'O&M'} {ferc}-{detail} {subs[i]}",
+                "ctco": "003",
+                "ctactv": "Y",
+                "ctmors": "S",
+                "ctuf01": ctuf01[i],
+            })
+    return pd.DataFrame(rows).drop_duplicates("ctacct").reset_index(drop=True)
+
+
+def iter_transaction_chunks(
+    profile: SyntheticProfile,
+    accounts: pd.DataFrame,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield gl_transactions rows in chunks.
+
+    Each chunk draws from its own child seed, so a given seed, row count
+    and chunk size always produce the same rows without holding them all
+    in memory.
+    """
+    projects = _read_master("project_mappings.csv")
+    project_pool = projects["project_number"].astype(str).str.strip().to_numpy()
+    project_p = _weights(projects["txn_count"])
+
+    ctacct = accounts["ctacct"].to_numpy()
+    ctdesc = accounts["ctdesc"].to_numpy()
+    # Heavy-tailed account usage: a few accounts carry most of the volume
+    account_p = 1.0 / np.arange(1, len(ctacct) + 1) ** 0.8
+    account_p /= account_p.sum()
+
+    children = np.random.SeedSequence([profile.seed, 2]).spawn(
+        max(1, -(-profile.rows // chunk_rows))
+    )
+    start = 0
+    for child in children:
+        n = min(chunk_rows, profile.rows - start)
+        if n <= 0:
+            break
+        rng = np.random.default_rng(child)
+
+        acct_idx = rng.choice(len(ctacct), n, p=account_p)
+        month = rng.integers(1, 13, n)
+        day = rng.integers(1, 29, n)
+
+        amount = np.round(rng.lognormal(mean=6.5, sigma=1.6, size=n), 2)
+        credit = rng.random(n) < profile.credit_share
+        amount[credit] *= -1
+
+        gxpjno = np.where(
+            rng.random(n) < profile.project_share,
+            rng.choice(project_pool, n, p=project_p),
+            "",
+        )
+
+        gxshut = np.full(n, "", dtype=object)
+        outage = np.flatnonzero(rng.random(n) < profile.outage_share)
+        if len(outage):
+            acct_plant = np.array([a[0] for a in ctacct[acct_idx[outage]]])
+            yy = f"{profile.year % 100:02d}"
+            kinds = rng.choice(["P", "M", "F"], len(outage), p=[0.7, 0.2, 0.1])
+            units = rng.integers(1, 6, len(outage))
+            for j, row in enumerate(outage):
+                prefix = "K" if acct_plant[j] == "1" else "C"
+                gxshut[row] = f"{prefix}{units[j]:02d}{yy}{kinds[j]}"
+
+        yield pd.DataFrame({
+            "gxjrnl": start + np.arange(n) + 1,
+            "gxacct": ctacct[acct_idx],
+            "gxco": "003",
+            "txyear": profile.year,
+            "txmnth": month,
+            "thedat": pd.to_datetime({"year": profile.year, "month": month, "day": day}).dt.date,
+            "gxfamt": amount,
+            "gxdrcr": np.where(credit, "C", "D"),
+            "ctdesc": ctdesc[acct_idx],
+            "gxdesc": rng.choice(DESCRIPTIONS, n),
+            "thsrc": rng.choice(SOURCES, n),
+            "gxpjno": gxpjno,
+            "gxshut": gxshut,
+        }, columns=TRANSACTION_COLUMNS)
+        start += n
+
+
+def transactions_frame(profile: SyntheticProfile, accounts: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """All transactions for a profile as one DataFrame (small profiles only)."""
+    accounts = accounts if accounts is not None else build_accounts(profile)
+    return pd.concat(list(iter_transaction_chunks(profile, accounts)), ignore_index=True)
+
+
+def build_budget_lines(profile: SyntheticProfile, accounts: pd.DataFrame, dept_codes: List[str]) -> pd.DataFrame:
+    """budget_lines for every plant and department."""
+    rng = np.random.default_rng([profile.seed, 3])
+    rows = []
+    for digit, _, _, entity, _, _ in PLANTS:
+        plant_accounts = accounts.loc[accounts["ctacct"].str.startswith(digit), "ctacct"].to_numpy()
+        for dept in dept_codes:
+            picks = rng.choice(plant_accounts, profile.budget_lines_per_dept)
+            monthly = np.round(rng.lognormal(9.0, 1.2, (profile.budget_lines_per_dept, 12)), 2)
+            for i, account in enumerate(picks):
+                row = {
+                    "full_account": f"003-{account}",
+                    "account_code": account,
+                    "line_description": f"{dept} line {i + 1}",
+                    "budget_entity": entity,
+                    "department": dept,
+                    "labor_nonlabor": "L" if account.endswith("4") else "N",
+                    "budget_year": profile.year,
+                    "total": float(monthly[i].sum()),
+                }
+                row.update(zip(MONTH_COLUMNS, monthly[i].tolist()))
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def build_department_forecasts(profile: SyntheticProfile, dept_codes: List[str]) -> pd.DataFrame:
+    """department_forecasts for every plant and department."""
+    rng = np.random.default_rng([profile.seed, 4])
+    rows = []
+    for _, plant_code, _, _, _, _ in PLANTS:
+        for dept in dept_codes:
+            monthly = np.round(rng.lognormal(11.0, 0.8, 12), 2)
+            row = {
+                "plant_code": plant_code,
+                "dept_code": dept,
+                "budget_year": profile.year,
+                "total": float(monthly.sum()),
+                "updated_by": "benchmark",
+            }
+            row.update(zip(MONTH_COLUMNS, monthly.tolist()))
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def build_capital_assets(profile: SyntheticProfile, plant_ids: List[int]) -> pd.DataFrame:
+    """capital_assets spread across plants and in-service years."""
+    rng = np.random.default_rng([profile.seed, 5])
+    n = profile.capital_assets
+    years = rng.integers(profile.year - 30, profile.year + 2, n)
+    return pd.DataFrame({
+        "asset_number": [f"BENCH-{i:06d}" for i in range(1, n + 1)],
+        "name": [f"Synthetic asset {i}" for i in range(1, n + 1)],
+        "plant_id": rng.choice(plant_ids, n),
+        "original_cost": np.round(rng.lognormal(13.0, 1.3, n), 2),
+        "salvage_value": 0,
+        "useful_life_years": rng.choice([10, 15, 20, 30, 40], n),
+        "in_service_date": [date(int(y), int(m), 1) for y, m in zip(years, rng.integers(1, 13, n))],
+        "depreciation_method": "straight_line",
+        "accumulated_depreciation": 0,
+        "status": "active",
+    })
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def copy_frame(raw_conn, table: str, df: pd.DataFrame):
+    """COPY a DataFrame into a table through a psycopg2 connection."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep="\\N")
+    buffer.seek(0)
+    with raw_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+def _prepare_schema():
+    """Create the tables/view that live outside the Alembic migrations."""
+    from src.db import postgres
+    from src.db.views import create_budget_groups_view
+    from src.models import gl_account  # noqa: F401 - registers gl_accounts
+    from src.models.mapping_tables import Base as MappingBase
+
+    postgres.init_db()
+    MappingBase.metadata.create_all(postgres.get_engine())
+    create_budget_groups_view()
+
+
+def _seed_reference_data():
+    """Plants, periods, cost categories and default scenarios."""
+    from src.database import SessionLocal
+    from src.etl.seed_data import (
+        seed_plants, seed_periods, seed_cost_categories, seed_default_scenarios,
+    )
+
+    db = SessionLocal()
+    try:
+        seed_plants(db)
+        seed_periods(db)
+        seed_cost_categories(db)
+        seed_default_scenarios(db)
+    finally:
+        db.close()
+
+
+def _driver_values(conn, profile: SyntheticProfile) -> int:
+    """Monthly driver values for every scenario, driver and plant."""
+    conn.execute(text("""
+        INSERT INTO driver_definitions (name, unit, is_plant_specific)
+        VALUES ('bench_coal_price', '$/ton', true),
+               ('bench_heat_rate', 'BTU/kWh', true),
+               ('bench_capacity_factor', '%', true)
+        ON CONFLICT (name) DO NOTHING
+    """))
+    # Deterministic, value derived from the row keys and the seed
+    result = conn.execute(text("""
+        INSERT INTO driver_values (scenario_id, driver_id, plant_id, period_yyyymm, value, updated_by)
+        SELECT s.id, d.id, p.id, y::text || LPAD(m::text, 2, '0'),
+               ROUND((50 + ((s.id * 31 + d.id * 17 + p.id * 7 + y * 12 + m + :seed) % 1000) / 10.0)::numeric, 6),
+               'benchmark'
+        FROM scenarios s
+        CROSS JOIN driver_definitions d
+        CROSS JOIN plants p
+        CROSS JOIN generate_series(:year, :year + 4) AS y
+        CROSS JOIN generate_series(1, 12) AS m
+        ON CONFLICT ON CONSTRAINT uq_driver_value DO NOTHING
+    """), {"seed": profile.seed % 997, "year": profile.year})
+    return result.rowcount
+
+
+def load_synthetic_data(profile: SyntheticProfile, verbose: bool = True) -> dict:
+    """
+    Replace the synthetic tables' contents with a generated data set.
+
+    Assumes migrations have been applied (alembic upgrade head). Truncates
+    gl_transactions (with gl_facts and its dimensions), gl_accounts, the mapping tables, budget_lines,
+    department_forecasts and capital_assets, so only point this at a
+    dedicated benchmark database.
+
+    Returns:
+        Row counts per table
+    """
+    from src.db.partitions import ensure_year_partitions
+    from src.db.postgres import get_engine
+    from src.etl.gl_facts import insert_facts
+
+    def log(msg):
+        if verbose:
+            print(f"[BENCH] {msg}")
+
+    _prepare_schema()
+    _seed_reference_data()
+    engine = get_engine()
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            TRUNCATE gl_transactions, gl_facts, dim_account, dim_project, dim_outage,
+                     gl_accounts, project_mappings, account_dept_mappings,
+                     budget_lines, department_forecasts, ytd_aggregates
+            RESTART IDENTITY
+        """))
+        conn.execute(text("DELETE FROM capital_assets WHERE asset_number LIKE 'BENCH-%'"))
+        ensure_year_partitions(conn, profile.year)
+        plant_ids = [row[0] for row in conn.execute(text("SELECT id FROM plants ORDER BY id"))]
+
+    accounts = build_accounts(profile)
+    projects = _read_master("project_mappings.csv")
+    dept_map = _read_master("account_dept_mappings.csv")
+    dept_codes = sorted(
+        set(projects["dept_code"].str.strip()) | set(dept_map["dept_code"].str.strip())
+    )
+    counts = {}
+
+    raw = engine.raw_connection()
+    try:
+        copy_frame(raw, "gl_accounts", accounts)
+        copy_frame(raw, "project_mappings", projects[["project_number", "txn_count", "dept_code"]].astype({"project_number": str}))
+        copy_frame(raw, "account_dept_mappings", dept_map[["ctuf01", "account_count", "dept_code"]])
+        counts["gl_accounts"] = len(accounts)
+
+        loaded = 0
+        for chunk in iter_transaction_chunks(profile, accounts):
+            copy_frame(raw, "gl_transactions", chunk)
+            loaded += len(chunk)
+            log(f"gl_transactions {loaded:,}/{profile.rows:,}")
+        counts["gl_transactions"] = loaded
+
+        for table, df in (
+            ("budget_lines", build_budget_lines(profile, accounts, dept_codes)),
+            ("department_forecasts", build_department_forecasts(profile, dept_codes)),
+            ("capital_assets", build_capital_assets(profile, plant_ids)),
+        ):
+            copy_frame(raw, table, df)
+            counts[table] = len(df)
+        raw.commit()
+    finally:
+        raw.close()
+
+    with engine.begin() as conn:
+        counts["gl_facts"] = insert_facts(conn, "gl_transactions", "gl_facts")
+        counts["driver_values"] = _driver_values(conn, profile)
+        conn.execute(text("ANALYZE"))
+
+    log(", ".join(f"{k}={v:,}" for k, v in counts.items()))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load synthetic benchmark data into PostgreSQL")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="gl_transactions rows")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--year", type=int, default=2025)
+    args = parser.parse_args()
+
+    load_synthetic_data(SyntheticProfile(rows=args.rows, seed=args.seed, year=args.year))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+API hot path benchmarks: corporate summary, transaction paging and the
+variance export. Handlers are called directly (no HTTP), so the numbers
+cover SQL plus response building.
+"""
+
+import pytest
+
+
+async def _drain(response):
+    """Consume a StreamingResponse body."""
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+def test_corporate_summary(benchmark, synthetic_data, run_async):
+    from src.api.routes.summary import get_corporate_summary
+
+    benchmark(lambda: run_async(get_corporate_summary(year=synthetic_data.year, current_month=11, method="forecast")))
+
+
+@pytest.mark.parametrize("page", [1, 50, 2000])
+def test_transactions_paging(benchmark, synthetic_data, run_async, page):
+    from src.api.routes.transactions import get_transactions
+
+    def fetch():
+        return run_async(get_transactions(
+            year=synthetic_data.year, month=None, plant_code="KC", dept_code=None,
+            outage_group=None, account=None, page=page, page_size=100,
+        ))
+
+    benchmark.extra_info["page"] = page
+    benchmark(fetch)
+
+
+def test_transactions_filtered(benchmark, synthetic_data, run_async):
+    from src.api.routes.transactions import get_transactions
+
+    def fetch():
+        return run_async(get_transactions(
+            year=synthetic_data.year, month=6, plant_code=None, dept_code="MAINT",
+            outage_group=None, account="320-510", page=1, page_size=1000,
+        ))
+
+    benchmark(fetch)
+
+
+@pytest.mark.parametrize("plant_code", ["KC", "CC"])
+def test_variance_export(benchmark, synthetic_data, run_async, plant_code):
+    from src.api.routes.exports import export_variance
+
+    async def export():
+        return await _drain(await export_variance(plant_code, synthetic_data.year, 11))
+
+    benchmark(lambda: run_async(export()))
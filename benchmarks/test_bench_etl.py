@@ -0,0 +1,40 @@
+"""
+ETL load benchmark.
+
+Runs load_gl_actuals end to end with the DB2 extract replaced by a
+synthetic frame, so the transform, delete and insert stages are timed
+against PostgreSQL. Rows are written to a year well clear of the data set
+and its partitions dropped afterwards.
+"""
+
+import pytest
+
+from benchmarks.synthetic_data import SyntheticProfile, transactions_frame
+from src.db.partitions import drop_year
+
+
+ETL_ROWS = 50_000
+
+
+@pytest.fixture
+def etl_year(synthetic_data, monkeypatch):
+    from src.db.postgres import get_engine
+    from src.etl import gl_actuals
+
+    profile = SyntheticProfile(rows=ETL_ROWS, seed=synthetic_data.seed, year=synthetic_data.year + 50)
+    frame = transactions_frame(profile)
+    # DB2 returns upper-case column names
+    frame.columns = frame.columns.str.upper()
+
+    monkeypatch.setattr(gl_actuals, "extract_gl_actuals", lambda year, month=None, refresh=False: frame.copy())
+    yield profile.year
+
+    with get_engine().begin() as conn:
+        drop_year(conn, profile.year)
+
+
+def test_etl_load_gl_actuals(benchmark, etl_year):
+    from src.etl.gl_actuals import load_gl_actuals
+
+    benchmark.extra_info["rows"] = ETL_ROWS
+    benchmark.pedantic(load_gl_actuals, args=(etl_year,), rounds=3, iterations=1)
@@ -0,0 +1,35 @@
+"""
+Report and engine benchmarks: depreciation import into a forecast and
+sponsor report generation.
+"""
+
+from src.models import Scenario
+
+
+def test_depreciation_import(benchmark, db_session, synthetic_data):
+    from src.engine.depreciation import import_depreciation_to_forecast
+
+    scenario = db_session.query(Scenario).order_by(Scenario.id).first()
+    year = synthetic_data.year
+
+    benchmark.extra_info["scenario_id"] = scenario.id
+    benchmark.pedantic(
+        import_depreciation_to_forecast,
+        args=(scenario.id, year, year + 4),
+        kwargs={"db": db_session},
+        rounds=3,
+        iterations=1,
+    )
+
+
+def test_sponsor_report(benchmark, db_session, synthetic_data, tmp_path):
+    from src.reports.sponsor_report import generate_sponsor_report
+
+    output = tmp_path / "sponsor_report.xlsx"
+    benchmark.pedantic(
+        generate_sponsor_report,
+        args=(db_session, synthetic_data.year, output, "KC"),
+        rounds=5,
+        iterations=1,
+    )
+    assert output.exists()
@@ -0,0 +1,45 @@
+"""
+ETL transform benchmark.
+
+Strips a synthetic GL extract (text columns space-padded the way DB2
+returns CHAR columns) with object strings, as the transforms used to,
+and with Arrow strings and categoricals, as they do now. The resulting
+frame size is recorded in extra_info["bytes"] next to the timings.
+"""
+
+import pytest
+
+from benchmarks.synthetic_data import SyntheticProfile, transactions_frame
+from src.etl.gl_actuals import GL_ACTUALS_CATEGORIES
+from src.etl.run_tracking import frame_bytes
+from src.etl.transforms import STRING_DTYPE, normalize_strings
+
+
+TRANSFORM_ROWS = 500_000
+
+TRANSFORMS = {
+    "object": {"categories": (), "string_dtype": object},
+    "arrow": {"categories": GL_ACTUALS_CATEGORIES, "string_dtype": STRING_DTYPE},
+}
+
+
+@pytest.fixture(scope="module")
+def padded_extract(bench_profile):
+    profile = SyntheticProfile(rows=TRANSFORM_ROWS, seed=bench_profile.seed, year=bench_profile.year)
+    frame = transactions_frame(profile)
+    for col in frame.select_dtypes(include=["object"]).columns:
+        if col != "thedat":
+            frame[col] = frame[col] + "   "
+    return frame
+
+
+@pytest.mark.parametrize("mode", list(TRANSFORMS))
+def test_transform_strings(benchmark, padded_extract, mode):
+    def setup():
+        return (padded_extract.copy(),), TRANSFORMS[mode]
+
+    result = benchmark.pedantic(normalize_strings, setup=setup, rounds=5, iterations=1)
+
+    benchmark.extra_info["rows"] = TRANSFORM_ROWS
+    benchmark.extra_info["bytes"] = frame_bytes(result)
+    assert result["gxdrcr"].isin(["C", "D"]).all()
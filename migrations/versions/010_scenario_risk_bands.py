@@ -0,0 +1,46 @@
+"""Add scenario risk bands table for Monte Carlo results
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-01-12
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # P10/P50/P90 cost bands per plant/year, stored against a derived scenario
+    op.create_table(
+        'scenario_risk_bands',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('scenario_id', sa.Integer(), nullable=False),
+        sa.Column('plant_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('trials', sa.Integer(), nullable=False),
+        sa.Column('cost_mean', sa.Numeric(18, 2), nullable=True),
+        sa.Column('cost_p10', sa.Numeric(18, 2), nullable=True),
+        sa.Column('cost_p50', sa.Numeric(18, 2), nullable=True),
+        sa.Column('cost_p90', sa.Numeric(18, 2), nullable=True),
+        sa.Column('cost_per_mwh_p10', sa.Numeric(18, 4), nullable=True),
+        sa.Column('cost_per_mwh_p50', sa.Numeric(18, 4), nullable=True),
+        sa.Column('cost_per_mwh_p90', sa.Numeric(18, 4), nullable=True),
+        sa.Column('generation_mwh_p50', sa.Numeric(18, 4), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['scenario_id'], ['scenarios.id']),
+        sa.ForeignKeyConstraint(['plant_id'], ['plants.id']),
+        sa.UniqueConstraint('scenario_id', 'plant_id', 'year', name='uq_scenario_risk_band'),
+    )
+    op.create_index('ix_scenario_risk_bands_scenario_id', 'scenario_risk_bands', ['scenario_id'])
+
+
+def downgrade():
+    op.drop_index('ix_scenario_risk_bands_scenario_id', table_name='scenario_risk_bands')
+    op.drop_table('scenario_risk_bands')
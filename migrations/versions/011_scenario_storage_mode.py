@@ -0,0 +1,27 @@
+"""Add copy-on-write storage mode to scenarios
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-01-14
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 'full' stores every cell; 'overlay' stores only cells overriding the parent
+    op.add_column(
+        'scenarios',
+        sa.Column('storage_mode', sa.String(20), nullable=False, server_default='full'),
+    )
+
+
+def downgrade():
+    op.drop_column('scenarios', 'storage_mode')
@@ -0,0 +1,41 @@
+"""Add etl_runs table for ETL run telemetry
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-01-20
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'etl_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_name', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_seconds', sa.Numeric(12, 3), nullable=True),
+        sa.Column('rows_processed', sa.BigInteger(), nullable=True),
+        sa.Column('bytes_processed', sa.BigInteger(), nullable=True),
+        sa.Column('rows_per_second', sa.Numeric(14, 2), nullable=True),
+        sa.Column('process_peak_rss_mb', sa.Numeric(10, 1), nullable=True),
+        sa.Column('phases', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_etl_runs_job_started', 'etl_runs', ['job_name', 'started_at'])
+
+
+def downgrade():
+    op.drop_index('ix_etl_runs_job_started', table_name='etl_runs')
+    op.drop_table('etl_runs')
@@ -0,0 +1,58 @@
+"""Add fiscal close calendar and precomputed YTD aggregates
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-01-27
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'fiscal_periods',
+        sa.Column('fiscal_year', sa.Integer(), nullable=False),
+        sa.Column('period', sa.Integer(), nullable=False),
+        sa.Column('period_name', sa.String(20), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('fiscal_year', 'period'),
+    )
+
+    op.create_table(
+        'period_closes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('plant_code', sa.String(10), nullable=False),
+        sa.Column('fiscal_year', sa.Integer(), nullable=False),
+        sa.Column('period', sa.Integer(), nullable=False),
+        sa.Column('closed_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('closed_by', sa.String(100), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('plant_code', 'fiscal_year', 'period', name='uq_period_closes_plant_period'),
+    )
+
+    op.create_table(
+        'ytd_aggregates',
+        sa.Column('plant_code', sa.String(10), nullable=False),
+        sa.Column('fiscal_year', sa.Integer(), nullable=False),
+        sa.Column('through_period', sa.Integer(), nullable=False),
+        sa.Column('dept_code', sa.String(30), nullable=False),
+        sa.Column('ytd_actual', sa.Numeric(18, 2), nullable=False, server_default='0'),
+        sa.Column('ytd_budget', sa.Numeric(18, 2), nullable=False, server_default='0'),
+        sa.Column('annual_budget', sa.Numeric(18, 2), nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('plant_code', 'fiscal_year', 'through_period', 'dept_code'),
+    )
+
+
+def downgrade():
+    op.drop_table('ytd_aggregates')
+    op.drop_table('period_closes')
+    op.drop_table('fiscal_periods')
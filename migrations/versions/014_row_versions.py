@@ -0,0 +1,33 @@
+"""Add row versions to department forecasts and budget entries
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-02-03
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Optimistic concurrency: edits carry the version they were made
+    # against and are rejected (409) if the row has moved on
+    op.add_column(
+        'department_forecasts',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+    op.add_column(
+        'budget_entries',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+
+
+def downgrade():
+    op.drop_column('budget_entries', 'version')
+    op.drop_column('department_forecasts', 'version')
@@ -0,0 +1,139 @@
+"""Partition gl_transactions by fiscal year and month
+
+gl_transactions is created by init_db (not by an earlier migration); on
+databases where it already exists as a plain table, this rebuilds it as
+LIST (txyear) partitions sub-partitioned by LIST (txmnth) and copies the
+rows over, year by year. New databases get the partitioned table from
+init_db directly. See src/db/partitions.py for the layout.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-02-10
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+MONTHS = list(range(1, 13))
+
+INDEXES = {
+    'ix_gl_transactions_gxacct': ['gxacct'],
+    'ix_gl_transactions_gxshut': ['gxshut'],
+    'ix_gl_year_month_acct': ['txyear', 'txmnth', 'gxacct'],
+}
+
+
+def _relkind(bind, table):
+    return bind.execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"
+    ), {"table": table}).scalar()
+
+
+def _dependent_views(bind, table):
+    """(name, kind, definition) of views reading `table`, to rebuild on the new table."""
+    return bind.execute(sa.text("""
+        SELECT DISTINCT v.relname, v.relkind, pg_get_viewdef(v.oid)
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        WHERE d.refobjid = to_regclass(:table) AND v.relkind IN ('v', 'm') AND v.relname <> :table
+    """), {"table": table}).fetchall()
+
+
+def _drop_views(views):
+    for name, kind, _ in views:
+        op.execute(f"DROP {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {name}")
+
+
+def _create_views(views):
+    for name, kind, definition in views:
+        op.execute(f"CREATE {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {name} AS {definition}")
+
+
+def _create_year(year):
+    op.execute(f"""
+        CREATE TABLE gl_transactions_y{year}
+        PARTITION OF gl_transactions FOR VALUES IN ({year})
+        PARTITION BY LIST (txmnth)
+    """)
+    for month in MONTHS:
+        op.execute(f"""
+            CREATE TABLE gl_transactions_y{year}m{month:02d}
+            PARTITION OF gl_transactions_y{year} FOR VALUES IN ({month})
+        """)
+    op.execute(f"CREATE TABLE gl_transactions_y{year}_other PARTITION OF gl_transactions_y{year} DEFAULT")
+
+
+def upgrade():
+    bind = op.get_bind()
+    if _relkind(bind, 'gl_transactions') != 'r':
+        return  # missing (init_db creates it partitioned) or already partitioned
+
+    # Views (transaction_budget_groups) would follow the rename; rebuild them after
+    views = _dependent_views(bind, 'gl_transactions')
+    _drop_views(views)
+
+    # Move the heap aside, freeing its index names
+    op.execute("ALTER TABLE gl_transactions RENAME TO gl_transactions_heap")
+    op.execute("ALTER TABLE gl_transactions_heap RENAME CONSTRAINT gl_transactions_pkey TO gl_transactions_heap_pkey")
+    for name in ['ix_gl_transactions_txyear', 'ix_gl_transactions_txmnth', *INDEXES]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # Same columns and id sequence; partition keys join the primary key
+    op.execute("""
+        CREATE TABLE gl_transactions (LIKE gl_transactions_heap INCLUDING DEFAULTS)
+        PARTITION BY LIST (txyear)
+    """)
+    op.execute("ALTER SEQUENCE gl_transactions_id_seq OWNED BY gl_transactions.id")
+    op.execute("ALTER TABLE gl_transactions ALTER COLUMN txyear SET NOT NULL")
+    op.execute("ALTER TABLE gl_transactions ALTER COLUMN txmnth SET NOT NULL")
+    op.execute("ALTER TABLE gl_transactions ADD CONSTRAINT gl_transactions_pkey PRIMARY KEY (id, txyear, txmnth)")
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON gl_transactions ({', '.join(columns)})")
+
+    # Rows without a month go to their year's DEFAULT partition as month 0;
+    # rows without a year have no partition and are not carried over
+    op.execute("UPDATE gl_transactions_heap SET txmnth = 0 WHERE txmnth IS NULL")
+    years = [row[0] for row in bind.execute(sa.text(
+        "SELECT DISTINCT txyear FROM gl_transactions_heap WHERE txyear IS NOT NULL ORDER BY txyear"
+    ))]
+    for year in years:
+        _create_year(year)
+        op.execute(f"INSERT INTO gl_transactions SELECT * FROM gl_transactions_heap WHERE txyear = {year}")
+
+    op.execute("DROP TABLE gl_transactions_heap")
+    _create_views(views)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if _relkind(bind, 'gl_transactions') != 'p':
+        return
+
+    views = _dependent_views(bind, 'gl_transactions')
+    _drop_views(views)
+
+    op.execute("ALTER TABLE gl_transactions RENAME TO gl_transactions_partitioned")
+    op.execute("ALTER TABLE gl_transactions_partitioned RENAME CONSTRAINT gl_transactions_pkey TO gl_transactions_partitioned_pkey")
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute("CREATE TABLE gl_transactions (LIKE gl_transactions_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER SEQUENCE gl_transactions_id_seq OWNED BY gl_transactions.id")
+    op.execute("ALTER TABLE gl_transactions ADD CONSTRAINT gl_transactions_pkey PRIMARY KEY (id)")
+    for name, columns in {
+        **INDEXES,
+        'ix_gl_transactions_txyear': ['txyear'],
+        'ix_gl_transactions_txmnth': ['txmnth'],
+    }.items():
+        op.execute(f"CREATE INDEX {name} ON gl_transactions ({', '.join(columns)})")
+
+    op.execute("INSERT INTO gl_transactions SELECT * FROM gl_transactions_partitioned")
+    op.execute("DROP TABLE gl_transactions_partitioned")
+    _create_views(views)
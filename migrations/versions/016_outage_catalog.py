@@ -0,0 +1,48 @@
+"""Outage catalog columns on dim_outage and an outage_key index on gl_facts
+
+Both tables are created by init_db (not by migrations); this only
+upgrades tables created before the catalog. Populate the new columns
+with python -m src.etl.outage_catalog.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-02-24
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+COLUMNS = {
+    'unit_number': 'SMALLINT',
+    'outage_year': 'SMALLINT',
+    'window_start': 'DATE',
+    'window_end': 'DATE',
+}
+
+
+def _exists(bind, table):
+    return bind.execute(sa.text("SELECT to_regclass(:table)"), {"table": table}).scalar() is not None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if _exists(bind, 'dim_outage'):
+        for name, type_ in COLUMNS.items():
+            op.execute(f"ALTER TABLE dim_outage ADD COLUMN IF NOT EXISTS {name} {type_}")
+    if _exists(bind, 'gl_facts'):
+        # Created on every partition
+        op.execute("CREATE INDEX IF NOT EXISTS ix_gl_facts_outage_key ON gl_facts (outage_key)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_gl_facts_outage_key")
+    bind = op.get_bind()
+    if _exists(bind, 'dim_outage'):
+        for name in COLUMNS:
+            op.execute(f"ALTER TABLE dim_outage DROP COLUMN IF EXISTS {name}")
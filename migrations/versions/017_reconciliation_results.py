@@ -0,0 +1,45 @@
+"""Add reconciliation_results table for GL actuals control totals
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-03-03
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'reconciliation_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=True),
+        sa.Column('checked_at', sa.DateTime(), nullable=False),
+        sa.Column('txyear', sa.Integer(), nullable=False),
+        sa.Column('txmnth', sa.Integer(), nullable=False),
+        sa.Column('gxacct', sa.String(36), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('source_rows', sa.BigInteger(), nullable=True),
+        sa.Column('target_rows', sa.BigInteger(), nullable=True),
+        sa.Column('source_amount', sa.Numeric(18, 2), nullable=True),
+        sa.Column('target_amount', sa.Numeric(18, 2), nullable=True),
+        sa.Column('source_hash', sa.BigInteger(), nullable=True),
+        sa.Column('target_hash', sa.BigInteger(), nullable=True),
+        sa.Column('action', sa.String(20), nullable=False, server_default='none'),
+        sa.Column('resolved', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_reconciliation_results_year_checked', 'reconciliation_results', ['txyear', 'checked_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reconciliation_results_year_checked', table_name='reconciliation_results')
+    op.drop_table('reconciliation_results')
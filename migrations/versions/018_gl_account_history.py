@@ -0,0 +1,33 @@
+"""Row hash on gl_accounts for the account master sync
+
+gl_accounts and gl_account_history are created by init_db (not by
+migrations); this only upgrades a gl_accounts table created before the
+sync. The first sync hashes every account and opens its history.
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-03-10
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def _exists(bind, table):
+    return bind.execute(sa.text("SELECT to_regclass(:table)"), {"table": table}).scalar() is not None
+
+
+def upgrade():
+    if _exists(op.get_bind(), 'gl_accounts'):
+        op.execute("ALTER TABLE gl_accounts ADD COLUMN IF NOT EXISTS row_hash VARCHAR(32)")
+
+
+def downgrade():
+    if _exists(op.get_bind(), 'gl_accounts'):
+        op.execute("ALTER TABLE gl_accounts DROP COLUMN IF EXISTS row_hash")
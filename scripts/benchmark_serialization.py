@@ -0,0 +1,187 @@
+"""
+Benchmark API response serialization: before vs after the orjson path.
+
+Builds synthetic transaction rows and a corporate summary in memory (no
+database needed) and times:
+
+    before  - Pydantic model per row + FastAPI jsonable_encoder + json.dumps
+              (what a response_model endpoint does)
+    legacy  - serialize_for_json + json.dumps
+    after   - rows_to_dicts + orjson (ORJSONResponse.render)
+
+Usage:
+    python scripts/benchmark_serialization.py                # 1000-row pages
+    python scripts/benchmark_serialization.py 50000          # bigger payload
+    python scripts/benchmark_serialization.py 50000 20       # 20 repeats
+"""
+
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.encoders import jsonable_encoder
+
+from src.api.schemas import (
+    Transaction, TransactionList,
+    CorporateSummary, PlantSummary, DepartmentSummary, MonthlyAmount,
+)
+from src.utils.json_encoder import ORJSONResponse, rows_to_dicts, serialize_for_json
+
+
+TRANSACTION_KEYS = (
+    "id", "gxacct", "account_desc", "txyear", "txmnth", "gxfamt", "gxdrcr",
+    "gxpjno", "gxshut", "gxdesc", "dept_code", "outage_group", "plant_code",
+)
+
+DEPARTMENTS = ["MAINT", "OPER", "ENGR", "SAFETY", "PLANNED-01", "PLANNED-03", "UNPLANNED"]
+
+
+def make_transaction_rows(count: int):
+    """Rows shaped like the transaction_budget_groups SELECT."""
+    rng = random.Random(42)
+    rows = []
+    for i in range(count):
+        dept = rng.choice(DEPARTMENTS)
+        rows.append((
+            i + 1,
+            f"{rng.choice('KC')}{rng.randint(10000000, 99999999)}",
+            "MAINTENANCE MATERIALS",
+            2025,
+            rng.randint(1, 12),
+            Decimal(f"{rng.uniform(-50000, 250000):.2f}"),
+            rng.choice("DC"),
+            f"P{rng.randint(1000, 9999)}",
+            None,
+            "VENDOR INVOICE",
+            dept,
+            dept if dept.startswith("PLANNED") or dept == "UNPLANNED" else None,
+            rng.choice(["KC", "CC"]),
+        ))
+    return rows
+
+
+def make_summary_dict():
+    """Corporate summary payload with Decimal amounts (2 plants)."""
+    rng = random.Random(7)
+    plants = []
+    for plant_code in ("KC", "CC"):
+        departments = []
+        for dept in DEPARTMENTS:
+            months = [
+                {
+                    "month": m,
+                    "actual": Decimal(f"{rng.uniform(0, 900000):.2f}"),
+                    "budget": Decimal("0"),
+                    "forecast": Decimal("0"),
+                    "variance": Decimal("0"),
+                }
+                for m in range(1, 13)
+            ]
+            ytd = sum((m["actual"] for m in months[:11]), Decimal("0"))
+            departments.append({
+                "dept_code": dept, "dept_name": dept, "plant_code": plant_code,
+                "is_outage": dept.startswith("PLANNED") or dept == "UNPLANNED",
+                "months": months, "ytd_actual": ytd, "ytd_budget": Decimal("0"),
+                "ytd_variance": Decimal("0"), "year_end_projection": ytd,
+            })
+        plants.append({
+            "plant_code": plant_code, "plant_name": plant_code, "departments": departments,
+            "total_actual": sum((d["ytd_actual"] for d in departments), Decimal("0")),
+            "total_budget": Decimal("0"), "total_variance": Decimal("0"),
+        })
+    return {
+        "year": 2025, "current_month": 11, "plants": plants,
+        "grand_total_actual": sum((p["total_actual"] for p in plants), Decimal("0")),
+        "grand_total_budget": Decimal("0"), "grand_total_variance": Decimal("0"),
+    }
+
+
+def timed(fn, repeats: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def transactions_before(rows):
+    models = [Transaction(**dict(zip(TRANSACTION_KEYS, row))) for row in rows]
+    payload = TransactionList(transactions=models, total=len(rows), page=1, page_size=len(rows))
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def transactions_legacy(rows):
+    payload = {"transactions": [dict(zip(TRANSACTION_KEYS, row)) for row in rows], "total": len(rows)}
+    return json.dumps(serialize_for_json(payload)).encode()
+
+
+def transactions_after(rows):
+    payload = {"transactions": rows_to_dicts(TRANSACTION_KEYS, rows), "total": len(rows)}
+    return ORJSONResponse(payload).body
+
+
+def summary_before(data):
+    plants = [
+        PlantSummary(
+            **{k: v for k, v in p.items() if k != "departments"},
+            departments=[
+                DepartmentSummary(
+                    **{k: v for k, v in d.items() if k != "months"},
+                    months=[MonthlyAmount(**m) for m in d["months"]],
+                )
+                for d in p["departments"]
+            ],
+        )
+        for p in data["plants"]
+    ]
+    payload = CorporateSummary(**{k: v for k, v in data.items() if k != "plants"}, plants=plants)
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def summary_legacy(data):
+    return json.dumps(serialize_for_json(data)).encode()
+
+
+def summary_after(data):
+    return ORJSONResponse(data).body
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    rows = make_transaction_rows(count)
+    summary = make_summary_dict()
+
+    cases = [
+        (f"transactions ({count:,} rows)", rows, transactions_before, transactions_legacy, transactions_after),
+        ("corporate summary", summary, summary_before, summary_legacy, summary_after),
+    ]
+
+    print("=" * 78)
+    print(f"Serialization benchmark (best of {repeats})")
+    print("=" * 78)
+    print(f"{'Payload':<28} {'before ms':>11} {'legacy ms':>11} {'after ms':>11} {'speedup':>9} {'KB':>6}")
+    print("-" * 78)
+    for label, data, before, legacy, after in cases:
+        t_before = timed(lambda: before(data), repeats)
+        t_legacy = timed(lambda: legacy(data), repeats)
+        t_after = timed(lambda: after(data), repeats)
+        size_kb = len(after(data)) / 1024
+        print(
+            f"{label:<28} {t_before:>11.2f} {t_legacy:>11.2f} {t_after:>11.2f} "
+            f"{t_before / t_after:>8.1f}x {size_kb:>6.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
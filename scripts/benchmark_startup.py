@@ -0,0 +1,98 @@
+"""
+Benchmark API cold start.
+
+Each run imports the app in a fresh interpreter (what a new or recycled
+uvicorn worker does) and reports the import wall time, the heavy optional
+dependencies that got loaded, and the slowest top-level imports from
+`python -X importtime`. No database is needed: engines are created on
+first use.
+
+Usage:
+    python scripts/benchmark_startup.py                  # src.api.main, 5 runs
+    python scripts/benchmark_startup.py 10               # 10 runs
+    python scripts/benchmark_startup.py 5 src.etl        # another module
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+
+# Optional dependencies the API should not load until a request needs them
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "pyodbc")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print("loaded:" + ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def cold_import(module: str):
+    """Import `module` in a new interpreter; returns (seconds, heavy modules loaded)."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, loaded = result.stdout.strip().splitlines()[-2:]
+    return float(elapsed), [m for m in loaded[len("loaded:"):].split(",") if m]
+
+
+def slowest_imports(module: str, top: int = 10):
+    """Top-level packages by cumulative import time (microseconds)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.rstrip()
+        # Only direct imports of the module (one level of indent) to avoid
+        # double counting nested ones
+        if name.startswith("   ") and not name.startswith("    "):
+            try:
+                totals[name.strip()] = int(cumulative)
+            except ValueError:
+                continue
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    module = sys.argv[2] if len(sys.argv) > 2 else "src.api.main"
+
+    timings = []
+    loaded = []
+    for _ in range(repeats):
+        elapsed, loaded = cold_import(module)
+        timings.append(elapsed * 1000)
+
+    print("=" * 60)
+    print(f"Cold import of {module} ({repeats} runs)")
+    print("=" * 60)
+    print(f"  best   {min(timings):>9.1f} ms")
+    print(f"  median {statistics.median(timings):>9.1f} ms")
+    print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+    print("-" * 60)
+    print(f"{'Slowest imports':<44} {'ms':>9}")
+    for name, micros in slowest_imports(module):
+        print(f"  {name:<42} {micros / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 """
-Run the GL Actuals ETL.
+Run the nightly ETL (see src/etl/orchestrator.py).
+
+Steps run in dependency order, independent ones in parallel, and a
+rerun with --resume after a failure picks up where it stopped.
 
 Usage:
-    python scripts/run_etl.py                  # Load 2025 full year
-    python scripts/run_etl.py 2025             # Load 2025 full year
-    python scripts/run_etl.py 2025 11          # Load 2025 November only
+    python scripts/run_etl.py                   # 2025: accounts, mappings, all GL months, budget, views
+    python scripts/run_etl.py 2025              # Same for 2025
+    python scripts/run_etl.py 2025 11           # Only November's GL actuals (plus its dependencies)
+    python scripts/run_etl.py 2025 --from-cache # Read closed months from the extract cache, not DB2
+    python scripts/run_etl.py 2025 --resume     # Resume a failed run at the failed step
+    python scripts/run_etl.py 2025 --workers 6  # Run up to 6 steps at once
 """
 
 import sys
@@ -14,16 +20,18 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.etl.gl_actuals import load_gl_actuals
+from src.etl.orchestrator import main as run_orchestrator
 
 
 def main():
-    year = int(sys.argv[1]) if len(sys.argv) > 1 else 2025
-    month = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    args = sys.argv[1:]
+    positional = [a for a in args if not a.startswith("-")]
+    # Keep the old "year month" form working
+    if len(positional) > 1 and args.index(positional[1]) == 1:
+        args = [positional[0], "--months", positional[1], *args[2:]]
     
-    load_gl_actuals(year, month)
+    sys.exit(run_orchestrator(args))
 
 
 if __name__ == "__main__":
     main()
-
@@ -3,11 +3,17 @@ FastAPI application for OVEC Budget System.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
+from src.config import Config
+from src.utils.json_encoder import ORJSONResponse
+from src.utils.instrumentation import render_metrics
+from src.api.middleware import InstrumentationMiddleware, ProfilingMiddleware
+
 from src.api.routes import (
     summary,
     transactions,
@@ -18,13 +24,19 @@ from src.api.routes import (
     exports,
     budget_entry_api,
     scenarios,
+    reports,
+    etl,
+    close_calendar,
+    events,
+    outages,
 )
 
 # Create FastAPI app
 app = FastAPI(
     title="OVEC Budget System",
     description="Financial planning and reporting for OVEC power plants",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for development
@@ -36,6 +48,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# On-demand profiling (?_profile=1 / X-Profile: 1); not installed unless enabled
+if Config.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, token=Config.PROFILING_TOKEN)
+
+# Per-route latency / SQL / serialization metrics (see /metrics)
+app.add_middleware(InstrumentationMiddleware, server_timing=Config.SERVER_TIMING)
+
 # Mount static files (mockups/styles.css)
 static_path = Path(__file__).parent.parent.parent / "mockups"
 if static_path.exists():
@@ -56,6 +75,15 @@ app.include_router(funding_api.router, tags=["Funding"])
 app.include_router(exports.router, tags=["Exports"])
 app.include_router(budget_entry_api.router, tags=["Budget Entry"])
 app.include_router(scenarios.router, tags=["Scenarios"])
+app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+app.include_router(etl.router, tags=["ETL"])
+app.include_router(close_calendar.router, tags=["Close Calendar"])
+app.include_router(events.router, tags=["Events"])
+app.include_router(outages.router, tags=["Outages"])
+
+if Config.PROFILING_ENABLED:
+    from src.api.routes import profiles
+    app.include_router(profiles.router, tags=["Profiling"])
 
 
 @app.get("/")
@@ -73,3 +101,9 @@ async def health():
         "status": "healthy" if db_ok else "unhealthy",
         "database": db_msg
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this worker process."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
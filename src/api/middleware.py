@@ -0,0 +1,157 @@
+"""
+ASGI middleware for request instrumentation and on-demand profiling.
+"""
+
+import hmac
+import time
+from urllib.parse import parse_qs
+
+from src.utils.instrumentation import (
+    current_stats,
+    end_request,
+    observe_request,
+    server_timing_header,
+    start_request,
+)
+from src.utils.profiling import StackSampler, save_profile
+
+
+class InstrumentationMiddleware:
+    """
+    Record latency, SQL statements, DB time, rows and render time per request.
+
+    Metrics are tagged with the matched route template (e.g.
+    /forecast/{plant_code}) rather than the raw path, so cardinality stays
+    bounded; unmatched paths share one label. Latency is measured to the
+    end of the response body, but the Server-Timing header (when enabled)
+    is sent with the headers and so only covers work done before the
+    response started. Work done while a StreamingResponse is being
+    iterated is still counted in the metrics. Long-lived event streams
+    (exclude_prefixes) are not recorded, so they do not skew latency.
+    """
+
+    def __init__(
+        self,
+        app,
+        server_timing: bool = False,
+        exclude_paths=("/metrics",),
+        exclude_prefixes=("/api/events/",),
+    ):
+        self.app = app
+        self.server_timing = server_timing
+        self.exclude_paths = set(exclude_paths)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"] in self.exclude_paths
+            or scope["path"].startswith(self.exclude_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats, token = start_request()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((
+                        b"server-timing",
+                        server_timing_header(time.perf_counter() - start, stats).encode("latin-1"),
+                    ))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            observe_request(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status,
+                time.perf_counter() - start,
+                stats,
+            )
+            end_request(token)
+
+
+class ProfilingMiddleware:
+    """
+    Profile individual requests on demand.
+
+    Only installed when PROFILING_ENABLED is set, so it costs nothing when
+    off. A request is profiled when it carries `_profile=1` in the query
+    string or an `X-Profile: 1` header (plus a matching `X-Profile-Token`
+    when PROFILING_TOKEN is configured). The profile - sampled stacks and
+    every SQL statement with its timing - is stored and its id returned in
+    the `X-Profile-Id` response header; fetch it from /api/profiles/{id}.
+    """
+
+    def __init__(self, app, token: str = None):
+        self.app = app
+        self.token = token
+
+    def _requested(self, scope) -> bool:
+        headers = dict(scope.get("headers", []))
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        wanted = headers.get(b"x-profile") == b"1" or query.get("_profile") == ["1"]
+        if not wanted:
+            return False
+        if self.token:
+            supplied = headers.get(b"x-profile-token", b"").decode("latin-1")
+            return hmac.compare_digest(supplied, self.token)
+        return True
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_stats()
+        token = None
+        if stats is None:
+            stats, token = start_request()
+        stats.statements = []
+
+        start = time.perf_counter()
+        sampler = StackSampler()
+        sampler.start()
+        # The response is held back until the handler returns so the
+        # profile id can go in a header (streaming bodies are buffered).
+        messages = []
+
+        async def send_wrapper(message):
+            messages.append(message)
+
+        status = 500
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            if messages and messages[0]["type"] == "http.response.start":
+                status = messages[0]["status"]
+            route = scope.get("route")
+            profile_id = save_profile(
+                scope["method"],
+                scope["path"],
+                getattr(route, "path", None),
+                status,
+                time.perf_counter() - start,
+                sampler,
+                stats.statements,
+            )
+            if token is not None:
+                end_request(token)
+
+        response_start, body = messages[0], messages[1:]
+        headers = list(response_start.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+        await send({**response_start, "headers": headers})
+        for message in body:
+            await send(message)
@@ -7,7 +7,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from src.db.events import notify
 from src.db.postgres import get_engine, get_session
+from src.engine.close_calendar import MONTH_COLUMNS
 from src.models.funding import BudgetSubmission, BudgetEntry, DepartmentForecast
 
 router = APIRouter(prefix="/api/budget-entry", tags=["budget-entry"])
@@ -15,6 +17,9 @@ router = APIRouter(prefix="/api/budget-entry", tags=["budget-entry"])
 
 class BudgetLineData(BaseModel):
     """Request model for a single budget line."""
+    # Existing line: its id and the version it was read at; omitted for new lines
+    id: Optional[int] = None
+    version: Optional[int] = None
     account_code: Optional[str] = None
     account_name: Optional[str] = None
     line_description: Optional[str] = None
@@ -22,12 +27,19 @@ class BudgetLineData(BaseModel):
     notes: Optional[str] = None
 
 
+class DeletedLine(BaseModel):
+    """A line to delete, with the version it was read at."""
+    id: int
+    version: int
+
+
 class BudgetEntrySaveRequest(BaseModel):
-    """Request model for saving budget entries."""
+    """Request model for saving budget entries (changed and new lines only)."""
     plant_code: str
     dept_code: str
     year: int
     entries: List[BudgetLineData]
+    deleted: List[DeletedLine] = []
     updated_by: Optional[str] = None
 
 
@@ -42,6 +54,14 @@ class ApprovalRequest(BaseModel):
     rejection_reason: Optional[str] = None
 
 
+def _notify_status(session, submission: BudgetSubmission):
+    """Change event for a submission's new status (sent on commit)."""
+    notify(
+        session, "budget_status", submission.plant_code, submission.budget_year,
+        submission_id=submission.id, dept_code=submission.dept_code, status=submission.status,
+    )
+
+
 @router.get("/{plant_code}/{year}")
 async def get_budget_entries(plant_code: str, year: int, dept_code: Optional[str] = None) -> Dict:
     """Get budget entries for a plant/year, optionally filtered by department."""
@@ -72,7 +92,8 @@ async def get_budget_entries(plant_code: str, year: int, dept_code: Optional[str
         for sub in submissions:
             entry_query = text("""
                 SELECT id, account_code, account_name, line_description,
-                       jan, feb, mar, apr, may, jun, jul, aug, sep, oct, nov, dec, total, notes
+                       jan, feb, mar, apr, may, jun, jul, aug, sep, oct, nov, dec, total, notes,
+                       version
                 FROM budget_entries
                 WHERE submission_id = :submission_id
                 ORDER BY account_code
@@ -90,7 +111,8 @@ async def get_budget_entries(plant_code: str, year: int, dept_code: Optional[str
                     "line_description": entry[3],
                     "months": months,
                     "total": float(entry[16]) if entry[16] else 0,
-                    "notes": entry[17]
+                    "notes": entry[17],
+                    "version": entry[18]
                 })
             
             result_data.append({
@@ -117,13 +139,54 @@ async def get_budget_entries(plant_code: str, year: int, dept_code: Optional[str
     }
 
 
+def _line_values(entry_data: BudgetLineData) -> Dict:
+    """Column values for a posted line (descriptive fields only if sent)."""
+    values = {m: Decimal(str(entry_data.months[i])) for i, m in enumerate(MONTH_COLUMNS)}
+    values["total"] = Decimal(str(sum(entry_data.months)))
+    for field in ("account_code", "account_name", "line_description", "notes"):
+        if field in entry_data.model_fields_set:
+            values[field] = getattr(entry_data, field)
+    return values
+
+
+def _entry_conflict(session, submission_id: int, entry_ids: List[int]) -> HTTPException:
+    """409 listing the current version of each conflicting line (None if deleted)."""
+    current = dict(
+        session.query(BudgetEntry.id, BudgetEntry.version).filter(
+            BudgetEntry.submission_id == submission_id,
+            BudgetEntry.id.in_(entry_ids)
+        ).all()
+    )
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": "Budget lines were changed by someone else; reload and reapply your edits",
+            "conflicts": [{"id": entry_id, "version": current.get(entry_id)} for entry_id in entry_ids],
+        },
+    )
+
+
 @router.post("/{plant_code}/{year}")
 async def save_budget_entries(plant_code: str, year: int, request: BudgetEntrySaveRequest) -> Dict:
-    """Save budget entries (creates or updates draft)."""
+    """
+    Save budget entries (creates or updates draft).
+
+    Only changed lines are sent. Lines with an id are updated, and
+    `deleted` lines removed, only if they are still at the version the
+    client read; otherwise nothing is saved and 409 is returned with the
+    current versions. Lines without an id are added. Returns the id and
+    new version of each posted line, in request order.
+    """
     
     if request.plant_code != plant_code or request.year != year:
         raise HTTPException(status_code=400, detail="Plant code or year mismatch")
     
+    for entry_data in request.entries:
+        if len(entry_data.months) != 12:
+            raise HTTPException(status_code=400, detail="Expected 12 months per entry")
+        if entry_data.id is not None and entry_data.version is None:
+            raise HTTPException(status_code=400, detail=f"Version required to update entry {entry_data.id}")
+    
     session = get_session()
     
     try:
@@ -132,7 +195,7 @@ async def save_budget_entries(plant_code: str, year: int, request: BudgetEntrySa
             BudgetSubmission.plant_code == plant_code,
             BudgetSubmission.dept_code == request.dept_code,
             BudgetSubmission.budget_year == year
-        ).first()
+        ).with_for_update().first()
         
         if submission:
             # Check if editable
@@ -154,48 +217,58 @@ async def save_budget_entries(plant_code: str, year: int, request: BudgetEntrySa
             session.add(submission)
             session.flush()  # Get the ID
         
-        # Delete existing entries and recreate
-        session.query(BudgetEntry).filter(
-            BudgetEntry.submission_id == submission.id
-        ).delete()
+        conflicts = []
+        
+        for line in request.deleted:
+            deleted = session.query(BudgetEntry).filter(
+                BudgetEntry.id == line.id,
+                BudgetEntry.submission_id == submission.id,
+                BudgetEntry.version == line.version
+            ).delete(synchronize_session=False)
+            if not deleted:
+                conflicts.append(line.id)
         
-        # Add new entries
+        saved = []
         for entry_data in request.entries:
-            if len(entry_data.months) != 12:
-                raise HTTPException(status_code=400, detail="Expected 12 months per entry")
-            
-            entry = BudgetEntry(
-                submission_id=submission.id,
-                plant_code=plant_code,
-                dept_code=request.dept_code,
-                budget_year=year,
-                account_code=entry_data.account_code,
-                account_name=entry_data.account_name,
-                line_description=entry_data.line_description,
-                jan=Decimal(str(entry_data.months[0])),
-                feb=Decimal(str(entry_data.months[1])),
-                mar=Decimal(str(entry_data.months[2])),
-                apr=Decimal(str(entry_data.months[3])),
-                may=Decimal(str(entry_data.months[4])),
-                jun=Decimal(str(entry_data.months[5])),
-                jul=Decimal(str(entry_data.months[6])),
-                aug=Decimal(str(entry_data.months[7])),
-                sep=Decimal(str(entry_data.months[8])),
-                oct=Decimal(str(entry_data.months[9])),
-                nov=Decimal(str(entry_data.months[10])),
-                dec=Decimal(str(entry_data.months[11])),
-                total=Decimal(str(sum(entry_data.months))),
-                notes=entry_data.notes
-            )
-            session.add(entry)
+            if entry_data.id is not None:
+                # Conditional update: only if nobody has saved the line since it was read
+                values = _line_values(entry_data)
+                values["version"] = BudgetEntry.version + 1
+                updated = session.query(BudgetEntry).filter(
+                    BudgetEntry.id == entry_data.id,
+                    BudgetEntry.submission_id == submission.id,
+                    BudgetEntry.version == entry_data.version
+                ).update(values, synchronize_session=False)
+                if not updated:
+                    conflicts.append(entry_data.id)
+                saved.append({"id": entry_data.id, "version": entry_data.version + 1})
+            else:
+                entry = BudgetEntry(
+                    submission_id=submission.id,
+                    plant_code=plant_code,
+                    dept_code=request.dept_code,
+                    budget_year=year,
+                    version=1,
+                    **_line_values(entry_data)
+                )
+                session.add(entry)
+                saved.append(entry)
+        
+        if conflicts:
+            submission_id = submission.id
+            session.rollback()
+            raise _entry_conflict(session, submission_id, conflicts)
         
+        session.flush()  # Assign ids to new lines
+        saved = [{"id": s.id, "version": s.version} if isinstance(s, BudgetEntry) else s for s in saved]
         session.commit()
         
         return {
             "success": True,
             "submission_id": submission.id,
             "status": submission.status,
-            "message": f"Saved {len(request.entries)} budget entries"
+            "message": f"Saved {len(request.entries)} budget entries, deleted {len(request.deleted)}",
+            "entries": saved
         }
     
     except HTTPException:
@@ -230,6 +303,7 @@ async def submit_budget(plant_code: str, year: int, dept_code: str, request: Sub
         submission.submitted_at = datetime.now()
         submission.submitted_by = request.submitted_by
         submission.rejection_reason = None
+        _notify_status(session, submission)
         
         session.commit()
         
@@ -331,13 +405,22 @@ async def approve_budget(submission_id: int, request: ApprovalRequest) -> Dict:
         submission.approved_at = datetime.now()
         submission.approved_by = request.approved_by
         
-        # Copy budget entries to department forecast
-        # First, delete any existing forecast for this dept/year
-        session.query(DepartmentForecast).filter(
+        # Copy budget entries to department forecast, replacing any existing
+        # row in place so its version moves on (open forecast edits get a 409)
+        forecast = session.query(DepartmentForecast).filter(
             DepartmentForecast.plant_code == submission.plant_code,
             DepartmentForecast.dept_code == submission.dept_code,
             DepartmentForecast.budget_year == submission.budget_year
-        ).delete()
+        ).with_for_update().first()
+        if forecast is None:
+            forecast = DepartmentForecast(
+                plant_code=submission.plant_code,
+                dept_code=submission.dept_code,
+                budget_year=submission.budget_year,
+                version=1
+            )
+        else:
+            forecast.version = DepartmentForecast.version + 1
         
         # Get total of all entries for this submission
         entries = session.query(BudgetEntry).filter(
@@ -345,32 +428,23 @@ async def approve_budget(submission_id: int, request: ApprovalRequest) -> Dict:
         ).all()
         
         # Aggregate entries into single forecast row
-        forecast = DepartmentForecast(
-            plant_code=submission.plant_code,
-            dept_code=submission.dept_code,
-            budget_year=submission.budget_year,
-            jan=sum(Decimal(str(e.jan or 0)) for e in entries),
-            feb=sum(Decimal(str(e.feb or 0)) for e in entries),
-            mar=sum(Decimal(str(e.mar or 0)) for e in entries),
-            apr=sum(Decimal(str(e.apr or 0)) for e in entries),
-            may=sum(Decimal(str(e.may or 0)) for e in entries),
-            jun=sum(Decimal(str(e.jun or 0)) for e in entries),
-            jul=sum(Decimal(str(e.jul or 0)) for e in entries),
-            aug=sum(Decimal(str(e.aug or 0)) for e in entries),
-            sep=sum(Decimal(str(e.sep or 0)) for e in entries),
-            oct=sum(Decimal(str(e.oct or 0)) for e in entries),
-            nov=sum(Decimal(str(e.nov or 0)) for e in entries),
-            dec=sum(Decimal(str(e.dec or 0)) for e in entries),
-            updated_by=request.approved_by
-        )
-        forecast.total = sum([
-            forecast.jan or 0, forecast.feb or 0, forecast.mar or 0, forecast.apr or 0,
-            forecast.may or 0, forecast.jun or 0, forecast.jul or 0, forecast.aug or 0,
-            forecast.sep or 0, forecast.oct or 0, forecast.nov or 0, forecast.dec or 0,
-        ])
+        for month in MONTH_COLUMNS:
+            setattr(forecast, month, sum(Decimal(str(getattr(e, month) or 0)) for e in entries))
+        forecast.updated_by = request.approved_by
+        forecast.total = sum(getattr(forecast, month) or 0 for month in MONTH_COLUMNS)
         
         session.add(forecast)
+        session.flush()
+        _notify_status(session, submission)
+        notify(session, "forecast_saved", submission.plant_code, submission.budget_year, rows=[{
+            "dept_code": forecast.dept_code,
+            "version": forecast.version,
+            "months": [float(getattr(forecast, month)) for month in MONTH_COLUMNS],
+        }])
         session.commit()
+
+        from src.engine.projections import invalidate_projections
+        invalidate_projections(submission.budget_year)
         
         return {
             "success": True,
@@ -409,6 +483,7 @@ async def reject_budget(submission_id: int, request: ApprovalRequest) -> Dict:
         submission.status = 'rejected'
         submission.approved_by = request.approved_by  # Person who rejected
         submission.rejection_reason = request.rejection_reason
+        _notify_status(session, submission)
         
         session.commit()
         
@@ -0,0 +1,57 @@
+"""
+Fiscal close calendar API endpoints.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from src.engine.close_calendar import PLANT_CODES, close_period, current_month, get_close_state
+
+router = APIRouter(prefix="/api/close")
+
+
+class CloseRequest(BaseModel):
+    """Request model for closing a period."""
+    closed_by: Optional[str] = None
+
+
+@router.get("/{year}")
+async def get_close_calendar(year: int):
+    """Current (last closed) month of each plant for a fiscal year."""
+    states = get_close_state()
+    return {
+        "year": year,
+        "current_month": current_month(year),
+        "plants": [
+            {
+                "plant_code": plant_code,
+                "current_month": current_month(year, plant_code),
+                "last_closed": (
+                    {
+                        "fiscal_year": states[plant_code].fiscal_year,
+                        "period": states[plant_code].period,
+                        "closed_at": states[plant_code].closed_at,
+                        "closed_by": states[plant_code].closed_by,
+                    }
+                    if plant_code in states else None
+                ),
+            }
+            for plant_code in PLANT_CODES
+        ],
+    }
+
+
+@router.post("/{plant_code}/{year}/{period}")
+def close_fiscal_period(plant_code: str, year: int, period: int, request: CloseRequest):
+    """
+    Close a period for a plant.
+
+    Periods close in order. Closing precomputes the month's YTD actual and
+    budget per department used by the variance page and export.
+    """
+    try:
+        return close_period(plant_code, year, period, request.closed_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,60 @@
+"""
+ETL run history API endpoints.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from src.db.postgres import get_engine
+from src.etl.reconciliation import get_reconciliation
+from src.etl.run_tracking import get_etl_runs, throughput_trends
+
+router = APIRouter(prefix="/api/etl")
+
+
+@router.get("/runs")
+async def list_etl_runs(
+    job_name: Optional[str] = Query(default=None, description="Filter to one job, e.g. gl_actuals"),
+    limit: int = Query(default=50, ge=1, le=500),
+    window: int = Query(default=10, ge=1, le=100, description="Runs in the throughput baseline"),
+):
+    """
+    Recent ETL runs with per-phase timings, plus throughput trends.
+
+    Each trend compares a job's latest successful run (rows/second) with
+    the median of its previous `window` successful runs; `degrading` is
+    set when it drops below 70% of that baseline.
+    """
+    engine = get_engine()
+    with engine.connect() as conn:
+        runs = get_etl_runs(conn, job_name, limit)
+        trends = throughput_trends(conn, window)
+
+    if job_name:
+        trends = [t for t in trends if t["job_name"] == job_name]
+
+    return {"runs": runs, "trends": trends}
+
+
+@router.get("/reconciliation/{year}")
+async def latest_reconciliation(year: int):
+    """
+    Latest control-total check of a year's GL actuals against Infinium.
+
+    One row per month compared (gxacct null) and one per account whose
+    row count, amount or row hash differed, with the reload done for it
+    and whether the totals matched afterwards.
+    """
+    engine = get_engine()
+    with engine.connect() as conn:
+        rows = get_reconciliation(conn, year)
+
+    months = [r for r in rows if r["gxacct"] is None]
+    return {
+        "year": year,
+        "checked_at": rows[0]["checked_at"] if rows else None,
+        "months_checked": len(months),
+        "months_mismatched": sum(r["status"] != "match" for r in months),
+        "results": rows,
+    }
@@ -0,0 +1,56 @@
+"""Server-sent change events per plant and year."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from src.db.events import hub
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+# Comment line sent when idle, so proxies keep the stream open and
+# disconnected clients are noticed
+HEARTBEAT_SECONDS = 15
+
+# Client reconnect delay (EventSource retry)
+RETRY_MILLISECONDS = 5000
+
+
+def format_sse(event: dict) -> str:
+    """One server-sent event, named by the event type."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+@router.get("/{plant_code}/{year}")
+async def stream_events(request: Request, plant_code: str, year: int):
+    """
+    Stream change events for a plant and year (text/event-stream).
+
+    Event types: forecast_saved, forecast_deleted, budget_status,
+    funding_status, etl_finished, and resync (events may have been
+    missed; reload).
+    """
+
+    async def events():
+        queue = hub.subscribe(plant_code, year)
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            hub.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -8,6 +8,7 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy import text
 
 from src.db.postgres import get_engine
+from src.engine import close_calendar
 
 router = APIRouter(prefix="/api/export", tags=["exports"])
 
@@ -145,47 +146,12 @@ async def export_variance(plant_code: str, year: int, month: Optional[int] = Non
     """Export variance report to CSV."""
     
     engine = get_engine()
-    plant_entity = "Kyger" if plant_code == "KC" else "Clifty"
-    current_month = month or 11
+    current_month = month or close_calendar.current_month(year, plant_code)
+    
+    # YTD actual / budget precomputed when the period closed
+    ytd_rows = close_calendar.get_ytd_aggregates(plant_code, year, current_month)
     
     with engine.connect() as conn:
-        # Get YTD actuals by department
-        actuals_query = text("""
-            SELECT 
-                dept_code,
-                SUM(gxfamt) as total_amt
-            FROM transaction_budget_groups
-            WHERE txyear = :year 
-              AND plant_code = :plant_code 
-              AND txmnth <= :month
-            GROUP BY dept_code
-        """)
-        actuals_result = conn.execute(actuals_query, {
-            "year": year, 
-            "plant_code": plant_code,
-            "month": current_month
-        })
-        actuals_rows = actuals_result.fetchall()
-        
-        # Get YTD budget by department
-        budget_months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-        budget_sum_cols = ' + '.join([f'COALESCE({m}, 0)' for m in budget_months[:current_month]])
-        
-        try:
-            budget_query = text(f"""
-                SELECT 
-                    department,
-                    SUM({budget_sum_cols}) as ytd_budget,
-                    SUM(total) as annual_budget
-                FROM budget_lines
-                WHERE budget_year = :year AND budget_entity = :entity
-                GROUP BY department
-            """)
-            budget_result = conn.execute(budget_query, {"year": year, "entity": plant_entity})
-            budget_rows = budget_result.fetchall()
-        except Exception:
-            budget_rows = []
-        
         # Get explanations
         expl_query = text("""
             SELECT dept_code, explanation
@@ -195,20 +161,15 @@ async def export_variance(plant_code: str, year: int, month: Optional[int] = Non
         expl_result = conn.execute(expl_query, {"plant_code": plant_code, "year": year})
         expl_rows = expl_result.fetchall()
     
-    # Build data
-    actuals_by_dept = {row[0]: float(row[1]) if row[1] else 0 for row in actuals_rows}
-    budgets_by_dept = {row[0]: {"ytd": float(row[1]) if row[1] else 0, "annual": float(row[2]) if row[2] else 0} for row in budget_rows}
     expl_by_dept = {row[0]: row[1] for row in expl_rows}
     
-    all_depts = set(actuals_by_dept.keys()) | set(budgets_by_dept.keys())
-    
     headers = ["Department", "YTD Actual", "YTD Budget", "Variance $", "Variance %", "Annual Budget", "Explanation"]
     
     data_rows = []
-    for dept in sorted(all_depts):
-        actual = actuals_by_dept.get(dept, 0)
-        budget_info = budgets_by_dept.get(dept, {"ytd": 0, "annual": 0})
-        ytd_budget = budget_info["ytd"]
+    for row in ytd_rows:
+        dept = row["dept_code"]
+        actual = row["ytd_actual"]
+        ytd_budget = row["ytd_budget"]
         variance = ytd_budget - actual
         variance_pct = (variance / ytd_budget * 100) if ytd_budget != 0 else 0
         
@@ -218,7 +179,7 @@ async def export_variance(plant_code: str, year: int, month: Optional[int] = Non
             ytd_budget,
             variance,
             f"{variance_pct:.1f}%",
-            budget_info["annual"],
+            row["annual_budget"],
             expl_by_dept.get(dept, "")
         ])
     
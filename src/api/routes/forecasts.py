@@ -2,8 +2,8 @@
 
 from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text
 from pydantic import BaseModel
 from typing import Optional
 
@@ -11,6 +11,7 @@ from src.database import get_db
 from src.models import Forecast, Scenario, Plant, CostCategory, Period
 from src.models.cost_category import CostSection
 from src.models.period import Granularity
+from src.engine.scenario_layers import forecast_for_write, forecast_source, resolved_forecasts_sql
 
 router = APIRouter()
 
@@ -21,6 +22,9 @@ class ForecastUpdate(BaseModel):
     cost_dollars: Optional[float] = None
     notes: Optional[str] = None
     updated_by: Optional[str] = None
+    # Scenario being edited (default: the row's own). For a copy-on-write
+    # scenario inheriting the row, the edit is saved as an override in it.
+    scenario_id: Optional[int] = None
 
 
 class ForecastResponse(BaseModel):
@@ -61,27 +65,39 @@ def get_scenario_forecasts(
     year: Optional[int] = None,
     db: Session = Depends(get_db),
 ):
-    """Get all forecasts for a scenario with optional filters."""
+    """
+    Get all forecasts for a scenario with optional filters.
+
+    Copy-on-write scenarios return their effective grid: own overrides
+    plus cells inherited from the parent chain (with the id of the row
+    the cell lives in).
+    """
+    scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+    F = forecast_source(scenario)
+    
+    # Columns rather than entities: resolved rows share ids with the
+    # ancestor rows they come from
     query = (
-        db.query(Forecast)
-        .options(
-            joinedload(Forecast.plant),
-            joinedload(Forecast.category),
-            joinedload(Forecast.period),
+        db.query(
+            F.id, F.scenario_id, F.plant_id, F.category_id, F.period_id,
+            F.generation_mwh, F.cost_dollars, F.notes,
+            Plant.name.label("plant_name"), CostCategory.name.label("category_name"),
+            CostCategory.section, Period,
         )
-        .filter(Forecast.scenario_id == scenario_id)
+        .outerjoin(Plant, F.plant_id == Plant.id)
+        .join(CostCategory, F.category_id == CostCategory.id)
+        .join(Period, F.period_id == Period.id)
+        .filter(F.scenario_id == scenario_id)
     )
     
     if plant_id:
-        query = query.filter(Forecast.plant_id == plant_id)
+        query = query.filter(F.plant_id == plant_id)
     
     if section:
-        query = query.join(CostCategory).filter(CostCategory.section == section)
+        query = query.filter(CostCategory.section == section)
     
     if year:
-        query = query.join(Period).filter(Period.year == year)
-    
-    forecasts = query.all()
+        query = query.filter(Period.year == year)
     
     return [
         ForecastResponse(
@@ -92,14 +108,17 @@ def get_scenario_forecasts(
             period_id=f.period_id,
             generation_mwh=float(f.generation_mwh) if f.generation_mwh else None,
             cost_dollars=float(f.cost_dollars) if f.cost_dollars else None,
-            cost_per_mwh=float(f.cost_per_mwh) if f.cost_per_mwh else None,
+            cost_per_mwh=(
+                float(f.cost_dollars) / float(f.generation_mwh)
+                if f.generation_mwh and f.generation_mwh > 0 and f.cost_dollars else None
+            ),
             notes=f.notes,
-            plant_name=f.plant.name if f.plant else "Combined",
-            category_name=f.category.name,
-            category_section=f.category.section.value,
-            period_display=f.period.display_name,
+            plant_name=f.plant_name or "Combined",
+            category_name=f.category_name,
+            category_section=f.section.value,
+            period_display=f.Period.display_name,
         )
-        for f in forecasts
+        for f in query.all()
     ]
 
 
@@ -110,19 +129,22 @@ def get_scenario_summary(
     db: Session = Depends(get_db),
 ):
     """Get summary totals by cost section for a scenario."""
+    scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+    F = forecast_source(scenario)
+    
     query = (
         db.query(
             CostCategory.section,
-            func.sum(Forecast.cost_dollars).label("total_cost"),
-            func.sum(Forecast.generation_mwh).label("total_generation"),
+            func.sum(F.cost_dollars).label("total_cost"),
+            func.sum(F.generation_mwh).label("total_generation"),
         )
-        .join(CostCategory, Forecast.category_id == CostCategory.id)
-        .filter(Forecast.scenario_id == scenario_id)
+        .join(CostCategory, F.category_id == CostCategory.id)
+        .filter(F.scenario_id == scenario_id)
         .group_by(CostCategory.section)
     )
     
     if year:
-        query = query.join(Period).filter(Period.year == year)
+        query = query.join(Period, F.period_id == Period.id).filter(Period.year == year)
     
     results = query.all()
     
@@ -148,25 +170,42 @@ def update_forecast(
     update: ForecastUpdate,
     db: Session = Depends(get_db),
 ):
-    """Update a forecast value."""
-    forecast = (
-        db.query(Forecast)
-        .options(
-            joinedload(Forecast.plant),
-            joinedload(Forecast.category),
-            joinedload(Forecast.period),
-        )
-        .filter(Forecast.id == forecast_id)
-        .first()
-    )
+    """
+    Update a forecast value.
+
+    With scenario_id naming a copy-on-write scenario that inherits this
+    row, the ancestor row is left alone and the edit is written to an
+    override row in that scenario (created on the first edit).
+    """
+    forecast = db.query(Forecast).filter(Forecast.id == forecast_id).first()
     
     if not forecast:
         raise HTTPException(status_code=404, detail="Forecast not found")
     
+    scenario = forecast.scenario
+    if update.scenario_id is not None and update.scenario_id != forecast.scenario_id:
+        scenario = db.query(Scenario).filter(Scenario.id == update.scenario_id).first()
+        if not scenario:
+            raise HTTPException(status_code=404, detail="Scenario not found")
+        inherited = scenario.is_overlay and db.execute(
+            text(f"SELECT 1 FROM ({resolved_forecasts_sql()}) r WHERE r.id = :forecast_id"),
+            {"scenario_ids": [scenario.id], "forecast_id": forecast_id},
+        ).first()
+        if not inherited:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Forecast {forecast_id} is not part of scenario {scenario.id}",
+            )
+    
     # Check if scenario is locked
-    if forecast.scenario.is_locked:
+    if scenario.is_locked:
         raise HTTPException(status_code=400, detail="Scenario is locked")
     
+    if scenario.id != forecast.scenario_id:
+        forecast, _ = forecast_for_write(
+            db, scenario.id, forecast.plant_id, forecast.category_id, forecast.period_id
+        )
+    
     # Update fields
     if update.generation_mwh is not None:
         forecast.generation_mwh = Decimal(str(update.generation_mwh))
@@ -1,21 +1,32 @@
 """API endpoints for saving and retrieving department forecasts."""
 
+import hashlib
 from typing import List, Dict, Optional
 from decimal import Decimal
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from src.db.events import notify
 from src.db.postgres import get_engine, get_session
 from src.models.funding import DepartmentForecast
 
 router = APIRouter(prefix="/api/forecasts", tags=["forecasts"])
 
 
+def _invalidate_projections(year: int):
+    # Imported here so the projection engine (numpy) loads on first use
+    from src.engine.projections import invalidate_projections
+    invalidate_projections(year)
+
+
 class ForecastData(BaseModel):
     """Request model for forecast data."""
     dept_code: str
     months: List[float]  # 12 monthly values
+    # Version the edit was made against: 0 for a department with no saved
+    # forecast, None to overwrite unconditionally
+    version: Optional[int] = None
 
 
 class ForecastSaveRequest(BaseModel):
@@ -33,9 +44,26 @@ class ForecastResponse(BaseModel):
     total: float
 
 
+def grid_etag(versions: List[tuple]) -> str:
+    """Weak ETag of a plant/year grid from its (dept_code, version) pairs."""
+    digest = hashlib.sha1(";".join(f"{dept}:{version}" for dept, version in versions).encode())
+    return f'W/"{digest.hexdigest()[:16]}"'
+
+
 @router.get("/{plant_code}/{year}")
-async def get_forecasts(plant_code: str, year: int) -> Dict:
-    """Get all saved forecasts for a plant and year."""
+async def get_forecasts(
+    plant_code: str,
+    year: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """
+    Get all saved forecasts for a plant and year.
+
+    Each forecast carries its row version, to be sent back with edits.
+    The grid's ETag changes whenever any row does; a matching
+    If-None-Match gets 304 Not Modified.
+    """
     
     engine = get_engine()
     
@@ -47,7 +75,8 @@ async def get_forecasts(plant_code: str, year: int) -> Dict:
                 jul, aug, sep, oct, nov, dec,
                 total,
                 updated_at,
-                updated_by
+                updated_by,
+                version
             FROM department_forecasts
             WHERE plant_code = :plant_code AND budget_year = :year
             ORDER BY dept_code
@@ -55,6 +84,11 @@ async def get_forecasts(plant_code: str, year: int) -> Dict:
         result = conn.execute(query, {"plant_code": plant_code, "year": year})
         rows = result.fetchall()
     
+    etag = grid_etag([(row[0], row[16]) for row in rows])
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     forecasts = []
     for row in rows:
         months = [float(row[i]) if row[i] else 0 for i in range(1, 13)]
@@ -63,7 +97,8 @@ async def get_forecasts(plant_code: str, year: int) -> Dict:
             "months": months,
             "total": float(row[13]) if row[13] else 0,
             "updated_at": row[14].isoformat() if row[14] else None,
-            "updated_by": row[15]
+            "updated_by": row[15],
+            "version": row[16]
         })
     
     return {
@@ -74,111 +109,230 @@ async def get_forecasts(plant_code: str, year: int) -> Dict:
     }
 
 
+MONTH_COLUMNS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+_CENT = Decimal("0.01")
+
+# One statement: diff the posted grid against the stored rows and upsert
+# only the rows that differ, returning their old values and new versions.
+# A row whose posted version is not the stored one (0: expected no row)
+# makes the statement write nothing; a row changed by a concurrent save
+# after the snapshot fails the DO UPDATE condition and is not returned.
+# Either way the caller sees changed rows without a new_version: 409.
+_SAVE_GRID_SQL = f"""
+    WITH incoming AS (
+        SELECT *
+        FROM unnest(
+            CAST(:dept_codes AS varchar[]),
+            CAST(:versions AS integer[]),
+            {", ".join(f"CAST(:{m} AS numeric[])" for m in MONTH_COLUMNS)}
+        ) AS t(dept_code, version, {", ".join(MONTH_COLUMNS)})
+    ),
+    changed AS (
+        SELECT i.*, f.id AS stored_id, f.version AS stored_version,
+               {", ".join(f"f.{m} AS old_{m}" for m in MONTH_COLUMNS)}
+        FROM incoming i
+        LEFT JOIN department_forecasts f
+          ON f.plant_code = :plant_code AND f.budget_year = :year AND f.dept_code = i.dept_code
+        WHERE f.id IS NULL
+           OR ({", ".join(f"f.{m}" for m in MONTH_COLUMNS)})
+              IS DISTINCT FROM ({", ".join(f"i.{m}" for m in MONTH_COLUMNS)})
+    ),
+    upserted AS (
+        INSERT INTO department_forecasts (
+            plant_code, dept_code, budget_year, {", ".join(MONTH_COLUMNS)}, total,
+            updated_at, updated_by, version
+        )
+        SELECT :plant_code, dept_code, :year, {", ".join(MONTH_COLUMNS)},
+               {" + ".join(MONTH_COLUMNS)}, NOW(), :updated_by, COALESCE(stored_version, 0) + 1
+        FROM changed
+        WHERE NOT EXISTS (
+            SELECT 1 FROM changed
+            WHERE version IS NOT NULL AND version <> COALESCE(stored_version, 0)
+        )
+        ON CONFLICT ON CONSTRAINT uq_dept_forecast DO UPDATE SET
+            {", ".join(f"{m} = EXCLUDED.{m}" for m in MONTH_COLUMNS)},
+            total = EXCLUDED.total,
+            updated_at = EXCLUDED.updated_at,
+            updated_by = EXCLUDED.updated_by,
+            version = department_forecasts.version + 1
+        WHERE department_forecasts.version = EXCLUDED.version - 1
+        RETURNING dept_code, version
+    )
+    SELECT c.dept_code, c.stored_id IS NULL AS inserted,
+           c.stored_version, u.version AS new_version,
+           {", ".join(f"c.old_{m}" for m in MONTH_COLUMNS)},
+           {", ".join(f"c.{m}" for m in MONTH_COLUMNS)}
+    FROM changed c
+    LEFT JOIN upserted u ON u.dept_code = c.dept_code
+    ORDER BY c.dept_code
+"""
+
+
+def _to_cents(value: float) -> Decimal:
+    """Round a posted amount the way Numeric(18, 2) stores it."""
+    return Decimal(str(value)).quantize(_CENT)
+
+
+def changed_cells(dept_code: str, old: List[Optional[Decimal]], new: List[Decimal]) -> List[Dict]:
+    """Cells that differ between a stored row (None values for a new row) and the posted one."""
+    return [
+        {
+            "dept_code": dept_code,
+            "month": month,
+            "old": float(old_value) if old_value is not None else None,
+            "new": float(new_value),
+        }
+        for month, (old_value, new_value) in enumerate(zip(old, new), start=1)
+        if old_value is None or old_value != new_value
+    ]
+
+
+def version_conflict(conflicts: List[Dict]) -> HTTPException:
+    """409 listing the rows whose stored version differs from the posted one."""
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": "Forecast was changed by someone else; reload and reapply your edits",
+            "conflicts": conflicts,
+        },
+    )
+
+
 @router.post("/{plant_code}/{year}")
 async def save_forecasts(plant_code: str, year: int, request: ForecastSaveRequest) -> Dict:
-    """Save forecast data for multiple departments."""
+    """
+    Save forecast rows for a plant and year.
+
+    Clients send the rows they edited, each with the version it was read
+    at. The rows are compared with the stored ones and only departments
+    with a changed month are written, in a single
+    INSERT ... ON CONFLICT DO UPDATE round trip. If any changed row's
+    version is stale nothing is written and 409 is returned with the
+    stored versions. Returns the changed cells (old is null for
+    departments that had no saved forecast) and the new versions.
+    """
     
     if request.plant_code != plant_code or request.year != year:
         raise HTTPException(status_code=400, detail="Plant code or year mismatch")
     
-    session = get_session()
-    saved_count = 0
+    seen = set()
+    for forecast_data in request.forecasts:
+        if len(forecast_data.months) != 12:
+            raise HTTPException(status_code=400, detail=f"Expected 12 months for {forecast_data.dept_code}")
+        if forecast_data.dept_code in seen:
+            raise HTTPException(status_code=400, detail=f"Duplicate department {forecast_data.dept_code}")
+        seen.add(forecast_data.dept_code)
     
-    try:
-        for forecast_data in request.forecasts:
-            if len(forecast_data.months) != 12:
-                raise HTTPException(status_code=400, detail=f"Expected 12 months for {forecast_data.dept_code}")
-            
-            # Check if forecast exists
-            existing = session.query(DepartmentForecast).filter(
-                DepartmentForecast.plant_code == plant_code,
-                DepartmentForecast.dept_code == forecast_data.dept_code,
-                DepartmentForecast.budget_year == year
-            ).first()
-            
-            if existing:
-                # Update existing
-                existing.jan = Decimal(str(forecast_data.months[0]))
-                existing.feb = Decimal(str(forecast_data.months[1]))
-                existing.mar = Decimal(str(forecast_data.months[2]))
-                existing.apr = Decimal(str(forecast_data.months[3]))
-                existing.may = Decimal(str(forecast_data.months[4]))
-                existing.jun = Decimal(str(forecast_data.months[5]))
-                existing.jul = Decimal(str(forecast_data.months[6]))
-                existing.aug = Decimal(str(forecast_data.months[7]))
-                existing.sep = Decimal(str(forecast_data.months[8]))
-                existing.oct = Decimal(str(forecast_data.months[9]))
-                existing.nov = Decimal(str(forecast_data.months[10]))
-                existing.dec = Decimal(str(forecast_data.months[11]))
-                existing.total = Decimal(str(sum(forecast_data.months)))
-                existing.updated_by = request.updated_by
-            else:
-                # Create new
-                new_forecast = DepartmentForecast(
-                    plant_code=plant_code,
-                    dept_code=forecast_data.dept_code,
-                    budget_year=year,
-                    jan=Decimal(str(forecast_data.months[0])),
-                    feb=Decimal(str(forecast_data.months[1])),
-                    mar=Decimal(str(forecast_data.months[2])),
-                    apr=Decimal(str(forecast_data.months[3])),
-                    may=Decimal(str(forecast_data.months[4])),
-                    jun=Decimal(str(forecast_data.months[5])),
-                    jul=Decimal(str(forecast_data.months[6])),
-                    aug=Decimal(str(forecast_data.months[7])),
-                    sep=Decimal(str(forecast_data.months[8])),
-                    oct=Decimal(str(forecast_data.months[9])),
-                    nov=Decimal(str(forecast_data.months[10])),
-                    dec=Decimal(str(forecast_data.months[11])),
-                    total=Decimal(str(sum(forecast_data.months))),
-                    updated_by=request.updated_by
-                )
-                session.add(new_forecast)
-            
-            saved_count += 1
+    params = {
+        "plant_code": plant_code,
+        "year": year,
+        "updated_by": request.updated_by,
+        "dept_codes": [f.dept_code for f in request.forecasts],
+        "versions": [f.version for f in request.forecasts],
+    }
+    for i, month in enumerate(MONTH_COLUMNS):
+        params[month] = [_to_cents(f.months[i]) for f in request.forecasts]
+    
+    cells = []
+    versions = {}
+    inserted = 0
+    updated = 0
+    
+    if request.forecasts:
+        try:
+            with get_engine().begin() as conn:
+                rows = conn.execute(text(_SAVE_GRID_SQL), params).fetchall()
+                conflicts = [
+                    {
+                        "dept_code": row.dept_code,
+                        "version": row.stored_version or 0,
+                        "months": [float(row._mapping[f"old_{m}"] or 0) for m in MONTH_COLUMNS],
+                    }
+                    for row in rows
+                    if row.new_version is None
+                ]
+                if conflicts:
+                    # Raised inside the transaction so any rows written roll back
+                    raise version_conflict(conflicts)
+                if rows:
+                    # Delivered to other sessions' grids on commit
+                    notify(conn, "forecast_saved", plant_code, year, rows=[
+                        {
+                            "dept_code": row.dept_code,
+                            "version": row.new_version,
+                            "months": [float(row._mapping[m]) for m in MONTH_COLUMNS],
+                        }
+                        for row in rows
+                    ])
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
         
-        session.commit()
+        for row in rows:
+            mapping = row._mapping
+            old = [mapping[f"old_{m}"] for m in MONTH_COLUMNS]
+            new = [mapping[m] for m in MONTH_COLUMNS]
+            cells.extend(changed_cells(row.dept_code, old, new))
+            versions[row.dept_code] = row.new_version
+            if row.inserted:
+                inserted += 1
+            else:
+                updated += 1
         
-        return {
-            "success": True,
-            "message": f"Saved {saved_count} forecasts",
-            "plant_code": plant_code,
-            "year": year,
-            "count": saved_count
-        }
-    
-    except Exception as e:
-        session.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+        if rows:
+            _invalidate_projections(year)
     
-    finally:
-        session.close()
+    return {
+        "success": True,
+        "message": f"Saved {inserted + updated} of {len(request.forecasts)} forecasts",
+        "plant_code": plant_code,
+        "year": year,
+        "count": inserted + updated,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(request.forecasts) - inserted - updated,
+        "changed_cells": cells,
+        "versions": versions,
+    }
 
 
 @router.delete("/{plant_code}/{year}/{dept_code}")
-async def delete_forecast(plant_code: str, year: int, dept_code: str) -> Dict:
-    """Delete a specific forecast."""
+async def delete_forecast(plant_code: str, year: int, dept_code: str, version: Optional[int] = None) -> Dict:
+    """Delete a specific forecast (only at `version`, if given; 409 otherwise)."""
     
     session = get_session()
     
     try:
-        deleted = session.query(DepartmentForecast).filter(
+        query = session.query(DepartmentForecast).filter(
             DepartmentForecast.plant_code == plant_code,
             DepartmentForecast.dept_code == dept_code,
             DepartmentForecast.budget_year == year
-        ).delete()
+        )
+        if version is not None:
+            current = query.with_entities(DepartmentForecast.version).with_for_update().scalar()
+            if current is not None and current != version:
+                raise version_conflict([{"dept_code": dept_code, "version": current}])
+        deleted = query.delete()
+        if deleted:
+            notify(session, "forecast_deleted", plant_code, year, dept_code=dept_code)
         
         session.commit()
+        _invalidate_projections(year)
         
         return {
             "success": True,
             "deleted": deleted > 0
         }
     
+    except HTTPException:
+        session.rollback()
+        raise
+    
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     
     finally:
         session.close()
-
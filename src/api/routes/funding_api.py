@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from src.db.events import notify
 from src.db.postgres import get_engine, get_session
 from src.models.funding import FundingChange
 
@@ -219,6 +220,10 @@ async def update_status(change_id: int, request: StatusUpdate) -> Dict:
         if request.status == "approved":
             change.approved_at = datetime.now()
         
+        notify(
+            session, "funding_status", change.plant_code, change.budget_year,
+            change_id=change_id, change_type=change.change_type, status=request.status,
+        )
         session.commit()
         
         return {
@@ -0,0 +1,87 @@
+"""
+Outage cost API endpoints.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from sqlalchemy import text
+
+from src.db.postgres import get_engine
+from src.engine import close_calendar
+from src.etl.outage_catalog import OUTAGE_TYPES
+from src.utils.json_encoder import ORJSONResponse
+
+router = APIRouter(prefix="/api/outages")
+
+# Costs per outage event booked in a fiscal year, read through
+# transaction_budget_groups (gl_facts' outage_key index, or the preliminary
+# aggregate of a month in close); the catalog supplies plant, unit, type
+# and window
+OUTAGE_COSTS_SQL = """
+    SELECT o.alias, o.plant_code, o.unit_number, o.outage_year, o.outage_type,
+           o.outage_group, o.window_start, o.window_end,
+           SUM(f.gxfamt) AS total_amt,
+           SUM(f.txn_count) AS txn_count
+    FROM dim_outage o
+    JOIN transaction_budget_groups f ON f.outage_key = o.outage_key AND f.txyear = :year
+    WHERE o.is_outage {plant_filter}
+    GROUP BY o.outage_key
+    ORDER BY o.plant_code, o.unit_number, o.alias
+"""
+
+
+def rollup_outages(rows) -> list:
+    """Group outage event rows (OUTAGE_COSTS_SQL order) by plant and unit."""
+    units = {}
+    for alias, plant_code, unit, outage_year, outage_type, group, start, end, amount, count in rows:
+        entry = units.setdefault((plant_code, unit), {
+            "plant_code": plant_code,
+            "unit": unit,
+            "total": 0.0,
+            "by_type": {name: 0.0 for name in OUTAGE_TYPES.values()},
+            "outages": [],
+        })
+        amount = float(amount or 0)
+        type_name = OUTAGE_TYPES[outage_type]
+        entry["total"] += amount
+        entry["by_type"][type_name] += amount
+        entry["outages"].append({
+            "alias": alias,
+            "outage_year": outage_year,
+            "type": type_name,
+            "outage_group": group,
+            "window_start": start,
+            "window_end": end,
+            "amount": amount,
+            "txn_count": count,
+        })
+    return list(units.values())
+
+
+@router.get("/{year}")
+async def get_outage_costs(year: int, plant_code: Optional[str] = Query(default=None)):
+    """
+    Outage costs of a fiscal year per plant and unit, with each outage event.
+
+    Events are the shutdown aliases in the outage catalog; costs are the
+    transactions charged to them in the year, whatever year the outage is.
+    Months in close count their preliminary aggregates, like the summary.
+    """
+    params = {"year": year}
+    plant_filter = ""
+    if plant_code:
+        plant_filter = "AND o.plant_code = :plant_code"
+        params["plant_code"] = plant_code
+
+    with get_engine().connect() as conn:
+        rows = conn.execute(text(OUTAGE_COSTS_SQL.format(plant_filter=plant_filter)), params).fetchall()
+
+    units = rollup_outages(rows)
+    return ORJSONResponse({
+        "year": year,
+        "plant_code": plant_code,
+        "preliminary_months": close_calendar.preliminary_months(year),
+        "total": sum(unit["total"] for unit in units),
+        "units": units,
+    })
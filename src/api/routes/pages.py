@@ -2,7 +2,7 @@
 HTML page routes using Jinja2 templates.
 """
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from pathlib import Path
@@ -14,6 +14,8 @@ from sqlalchemy import text
 from decimal import Decimal
 
 from src.db.postgres import get_session
+from src.engine import close_calendar
+from src.etl.outage_catalog import is_outage_group
 
 router = APIRouter()
 
@@ -32,71 +34,42 @@ PLANT_NAMES = {
     "CC": "Clifty Creek"
 }
 
+# Year-end projection methods (see src.engine.projections)
+PROJECTION_METHOD = Query(default="forecast", pattern="^(forecast|run_rate|seasonal)$")
+
 
 @router.get("/summary/{year}", response_class=HTMLResponse)
-async def summary_page(request: Request, year: int, plant_code: str = "KC"):
+async def summary_page(request: Request, year: int, plant_code: str = "KC", method: str = PROJECTION_METHOD):
     """Render the monthly summary page."""
+    from src.engine.projections import ProjectionMethod, get_projections
 
-    # Current month (use November for demo, or actual current month)
-    current_month = 11  # datetime.now().month
-
-    engine = get_engine()
+    current_month = close_calendar.current_month(year, plant_code)
 
-    with engine.connect() as conn:
-        # Get monthly actuals by department
-        query = text("""
-            SELECT
-                dept_code,
-                txmnth,
-                SUM(gxfamt) as total_amt,
-                CASE
-                    WHEN dept_code LIKE 'PLANNED-%' OR dept_code IN ('UNPLANNED', 'OUTAGE') THEN 'OUTAGE'
-                    ELSE 'NON-OUTAGE'
-                END as group_name
-            FROM transaction_budget_groups
-            WHERE txyear = :year AND plant_code = :plant_code
-            GROUP BY dept_code, txmnth
-            ORDER BY group_name DESC, dept_code, txmnth
-        """)
-
-        result = conn.execute(query, {"year": year, "plant_code": plant_code})
-        rows = result.fetchall()
+    projections = get_projections(year, current_month, ProjectionMethod(method))
 
     # Build department data structure
     departments = {}
 
-    for row in rows:
-        dept_code = row[0]
-        month = row[1]
-        amount = float(row[2]) if row[2] else 0
-        group_name = row[3]
-
-        if dept_code not in departments:
-            departments[dept_code] = {
-                "dept_code": dept_code,
-                "dept_name": dept_code,
-                "group_name": group_name,
-                "months": [{} for _ in range(12)],
-                "ytd_actual": 0,
-                "ytd_budget": 0,
-                "year_end_projection": 0
-            }
-
-        # Store monthly data (0-indexed)
-        if 1 <= month <= 12:
-            departments[dept_code]["months"][month - 1] = {
-                "month": month,
-                "actual": amount,
-                "forecast": 0,  # TODO: from forecast table
-                "budget": 0     # TODO: from budget table
-            }
-
-            if month <= current_month:
-                departments[dept_code]["ytd_actual"] += amount
-
-    # Calculate year-end projection (simplified: YTD actual for now)
-    for dept in departments.values():
-        dept["year_end_projection"] = dept["ytd_actual"]
+    for projection in projections.for_plant(plant_code):
+        dept_code = projection.dept_code
+        is_outage = is_outage_group(dept_code)
+        departments[dept_code] = {
+            "dept_code": dept_code,
+            "dept_name": dept_code,
+            "group_name": "OUTAGE" if is_outage else "NON-OUTAGE",
+            "months": [
+                {
+                    "month": m + 1,
+                    "actual": projection.actuals[m],
+                    "forecast": projection.estimate[m],
+                    "budget": projection.budget[m],
+                }
+                for m in range(12)
+            ],
+            "ytd_actual": projection.ytd_actual,
+            "ytd_budget": projection.ytd_budget,
+            "year_end_projection": projection.year_end_projection,
+        }
 
     # Group departments
     grouped = OrderedDict()
@@ -116,7 +89,7 @@ async def summary_page(request: Request, year: int, plant_code: str = "KC"):
     # Calculate plant totals
     plant_total = {
         "ytd_actual": sum(d["ytd_actual"] for d in departments.values()),
-        "budget": 0,
+        "budget": sum(d["ytd_budget"] for d in departments.values()),
         "year_end_projection": sum(d["year_end_projection"] for d in departments.values())
     }
 
@@ -131,6 +104,7 @@ async def summary_page(request: Request, year: int, plant_code: str = "KC"):
         "plant_total": plant_total,
         "department_count": len(departments),
         "group_count": len([g for g in grouped.values() if g]),
+        "preliminary_months": close_calendar.preliminary_months(year),
         "last_updated": datetime.now().strftime("%b %d, %Y %I:%M %p"),
         "active_page": "summary"
     })
@@ -144,162 +118,37 @@ async def home_page(request: Request):
 
 
 @router.get("/forecast/{plant_code}", response_class=HTMLResponse)
-async def forecast_page(request: Request, plant_code: str, year: int = 2025):
+async def forecast_page(request: Request, plant_code: str, year: int = 2025, method: str = PROJECTION_METHOD):
     """Render the forecast input page."""
-
-    current_month = 11  # datetime.now().month
-    engine = get_engine()
-    actuals_rows = []
-    budget_rows = []
-    forecast_rows = []
-
-    with engine.connect() as conn:
-        # Get YTD actuals by department from transaction_budget_groups
-        try:
-            actuals_query = text("""
-                SELECT
-                    dept_code,
-                    txmnth,
-                    SUM(gxfamt) as total_amt
-                FROM transaction_budget_groups
-                WHERE txyear = :year AND plant_code = :plant_code
-                GROUP BY dept_code, txmnth
-                ORDER BY dept_code, txmnth
-            """)
-            actuals_result = conn.execute(actuals_query, {"year": year, "plant_code": plant_code})
-            actuals_rows = actuals_result.fetchall()
-        except Exception:
-            actuals_rows = []
-
-        # Get budget by department from budget_lines
-        plant_entity = "Kyger" if plant_code == "KC" else "Clifty"
-        try:
-            budget_query = text("""
-                SELECT
-                    department,
-                    SUM(jan) as jan, SUM(feb) as feb, SUM(mar) as mar,
-                    SUM(apr) as apr, SUM(may) as may, SUM(jun) as jun,
-                    SUM(jul) as jul, SUM(aug) as aug, SUM(sep) as sep,
-                    SUM(oct) as oct, SUM(nov) as nov, SUM(dec) as dec,
-                    SUM(total) as total
-                FROM budget_lines
-                WHERE budget_year = :year AND budget_entity = :entity
-                GROUP BY department
-                ORDER BY department
-            """)
-            budget_result = conn.execute(budget_query, {"year": year, "entity": plant_entity})
-            budget_rows = budget_result.fetchall()
-        except Exception:
-            budget_rows = []
-
-        # Get saved forecasts from department_forecasts (from approved budgets)
-        try:
-            forecast_query = text("""
-                SELECT
-                    dept_code,
-                    jan, feb, mar, apr, may, jun,
-                    jul, aug, sep, oct, nov, dec,
-                    total
-                FROM department_forecasts
-                WHERE budget_year = :year AND plant_code = :plant_code
-                ORDER BY dept_code
-            """)
-            forecast_result = conn.execute(forecast_query, {"year": year, "plant_code": plant_code})
-            forecast_rows = forecast_result.fetchall()
-        except Exception:
-            forecast_rows = []
-
-    # Build department data structure
-    departments = {}
-
-    # Process actuals
-    for row in actuals_rows:
-        dept_code = row[0]
-        month = row[1]
-        amount = float(row[2]) if row[2] else 0
-
-        if dept_code not in departments:
-            departments[dept_code] = {
-                "dept_code": dept_code,
-                "actuals": [0] * 12,
-                "budget": [0] * 12,
-                "forecast": [0] * 12,
-                "has_saved_forecast": False,
-                "ytd_actual": 0,
-                "ytd_budget": 0,
-                "total_budget": 0
-            }
-
-        if 1 <= month <= 12:
-            departments[dept_code]["actuals"][month - 1] = amount
-            if month <= current_month:
-                departments[dept_code]["ytd_actual"] += amount
-
-    # Process budget
-    month_cols = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-    for row in budget_rows:
-        dept = row[0] or "UNKNOWN"
-        if dept not in departments:
-            departments[dept] = {
-                "dept_code": dept,
-                "actuals": [0] * 12,
-                "budget": [0] * 12,
-                "forecast": [0] * 12,
-                "has_saved_forecast": False,
-                "ytd_actual": 0,
-                "ytd_budget": 0,
-                "total_budget": 0
-            }
-
-        for i, col in enumerate(month_cols):
-            val = float(row[i + 1]) if row[i + 1] else 0
-            departments[dept]["budget"][i] = val
-            if i < current_month:
-                departments[dept]["ytd_budget"] += val
-
-        departments[dept]["total_budget"] = float(row[13]) if row[13] else 0
-
-        # Initialize forecast: YTD actuals + remaining budget (as default)
-        for i in range(12):
-            if i < current_month:
-                departments[dept]["forecast"][i] = departments[dept]["actuals"][i]
-            else:
-                departments[dept]["forecast"][i] = departments[dept]["budget"][i]
-
-    # Override with saved forecasts from department_forecasts table
-    for row in forecast_rows:
-        dept = row[0]
-        if dept not in departments:
-            departments[dept] = {
-                "dept_code": dept,
-                "actuals": [0] * 12,
-                "budget": [0] * 12,
-                "forecast": [0] * 12,
-                "has_saved_forecast": True,
-                "ytd_actual": 0,
-                "ytd_budget": 0,
-                "total_budget": 0
-            }
-
-        # Use saved forecast values
-        departments[dept]["has_saved_forecast"] = True
-        for i in range(12):
-            val = float(row[i + 1]) if row[i + 1] else 0
-            # For past months, use actuals; for future months, use saved forecast
-            if i < current_month:
-                departments[dept]["forecast"][i] = departments[dept]["actuals"][i]
-            else:
-                departments[dept]["forecast"][i] = val
-
-    # Sort departments
-    sorted_depts = sorted(departments.values(), key=lambda d: d["dept_code"])
+    from src.engine.projections import ProjectionMethod, get_projections
+
+    current_month = close_calendar.current_month(year, plant_code)
+
+    # Actuals through the close month, then saved forecast / budget / run-rate
+    projections = get_projections(year, current_month, ProjectionMethod(method))
+
+    sorted_depts = [
+        {
+            "dept_code": p.dept_code,
+            "actuals": p.actuals,
+            "budget": p.budget,
+            "forecast": p.forecast,
+            "has_saved_forecast": p.has_saved_forecast,
+            "version": p.version,
+            "ytd_actual": p.ytd_actual,
+            "ytd_budget": p.ytd_budget,
+            "total_budget": p.total_budget,
+            "year_end_projection": p.year_end_projection,
+        }
+        for p in projections.for_plant(plant_code)
+    ]
 
     # Calculate totals
     totals = {
-        "ytd_actual": sum(d["ytd_actual"] for d in departments.values()),
-        "ytd_budget": sum(d["ytd_budget"] for d in departments.values()),
-        "total_budget": sum(d["total_budget"] for d in departments.values()),
-        "forecast": [sum(d["forecast"][i] for d in departments.values()) for i in range(12)]
+        "ytd_actual": sum(d["ytd_actual"] for d in sorted_depts),
+        "ytd_budget": sum(d["ytd_budget"] for d in sorted_depts),
+        "total_budget": sum(d["total_budget"] for d in sorted_depts),
+        "forecast": [sum(d["forecast"][i] for d in sorted_depts) for i in range(12)]
     }
 
     return templates.TemplateResponse("forecast.html", {
@@ -311,7 +160,7 @@ async def forecast_page(request: Request, plant_code: str, year: int = 2025):
         "month_names": MONTH_NAMES,
         "departments": sorted_depts,
         "totals": totals,
-        "department_count": len(departments),
+        "department_count": len(sorted_depts),
         "last_updated": datetime.now().strftime("%b %d, %Y %I:%M %p"),
         "active_page": "forecast"
     })
@@ -435,77 +284,29 @@ async def budget_page(request: Request, plant_code: str, year: int = 2025):
 async def variance_page(request: Request, plant_code: str, year: int = 2025, month: int = None):
     """Render the variance analysis page."""
 
-    current_month = month or 11  # datetime.now().month
-    engine = get_engine()
-    plant_entity = "Kyger" if plant_code == "KC" else "Clifty"
-    actuals_rows = []
-    budget_rows = []
-
-    with engine.connect() as conn:
-        # Get YTD actuals by department
-        try:
-            actuals_query = text("""
-                SELECT
-                    dept_code,
-                    SUM(gxfamt) as total_amt
-                FROM transaction_budget_groups
-                WHERE txyear = :year
-                  AND plant_code = :plant_code
-                  AND txmnth <= :month
-                GROUP BY dept_code
-                ORDER BY dept_code
-            """)
-            actuals_result = conn.execute(actuals_query, {
-                "year": year,
-                "plant_code": plant_code,
-                "month": current_month
-            })
-            actuals_rows = actuals_result.fetchall()
-        except Exception:
-            actuals_rows = []
-
-        # Get YTD budget by department
-        try:
-            budget_months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-            budget_sum_cols = ' + '.join([f'COALESCE({m}, 0)' for m in budget_months[:current_month]])
+    current_month = month or close_calendar.current_month(year, plant_code)
 
-            budget_query = text(f"""
-                SELECT
-                    department,
-                    SUM({budget_sum_cols}) as ytd_budget,
-                    SUM(total) as annual_budget
-                FROM budget_lines
-                WHERE budget_year = :year AND budget_entity = :entity
-                GROUP BY department
-                ORDER BY department
-            """)
-            budget_result = conn.execute(budget_query, {"year": year, "entity": plant_entity})
-            budget_rows = budget_result.fetchall()
-        except Exception:
-            budget_rows = []
-
-    # Build variance data
-    actuals_by_dept = {row[0]: float(row[1]) if row[1] else 0 for row in actuals_rows}
-    budgets_by_dept = {row[0]: {"ytd": float(row[1]) if row[1] else 0, "annual": float(row[2]) if row[2] else 0} for row in budget_rows}
-
-    all_depts = set(actuals_by_dept.keys()) | set(budgets_by_dept.keys())
+    # Precomputed when the period closed (see src.engine.close_calendar)
+    ytd_by_dept = {
+        row["dept_code"]: row
+        for row in close_calendar.get_ytd_aggregates(plant_code, year, current_month)
+    }
 
     variance_lines = []
     total_actual = 0
     total_budget = 0
     total_variance = 0
 
-    for dept in sorted(all_depts):
-        actual = actuals_by_dept.get(dept, 0)
-        budget_info = budgets_by_dept.get(dept, {"ytd": 0, "annual": 0})
-        ytd_budget = budget_info["ytd"]
+    for dept, row in ytd_by_dept.items():
+        actual = row["ytd_actual"]
+        ytd_budget = row["ytd_budget"]
         variance = ytd_budget - actual  # Positive = favorable (under budget)
 
         variance_lines.append({
             "dept_code": dept,
             "ytd_actual": actual,
             "ytd_budget": ytd_budget,
-            "annual_budget": budget_info["annual"],
+            "annual_budget": row["annual_budget"],
             "variance": variance,
             "variance_pct": (variance / ytd_budget * 100) if ytd_budget != 0 else 0,
             "is_favorable": variance >= 0
@@ -529,6 +330,7 @@ async def variance_page(request: Request, plant_code: str, year: int = 2025, mon
         "total_variance_pct": (total_variance / total_budget * 100) if total_budget != 0 else 0,
         "is_total_favorable": total_variance >= 0,
         "department_count": len(variance_lines),
+        "preliminary_months": [m for m in close_calendar.preliminary_months(year) if m <= current_month],
         "last_updated": datetime.now().strftime("%b %d, %Y %I:%M %p"),
         "active_page": "variance"
     })
@@ -690,7 +492,8 @@ async def budget_entry_page(request: Request, plant_code: str, year: int = 2025,
                 # Get entries for this submission
                 entry_query = text("""
                     SELECT id, account_code, account_name, line_description,
-                           jan, feb, mar, apr, may, jun, jul, aug, sep, oct, nov, dec, total, notes
+                           jan, feb, mar, apr, may, jun, jul, aug, sep, oct, nov, dec, total, notes,
+                           version
                     FROM budget_entries
                     WHERE submission_id = :submission_id
                     ORDER BY account_code
@@ -707,7 +510,8 @@ async def budget_entry_page(request: Request, plant_code: str, year: int = 2025,
                         "line_description": row[3],
                         "months": months,
                         "total": float(row[16]) if row[16] else sum(months),
-                        "notes": row[17]
+                        "notes": row[17],
+                        "version": row[18]
                     })
         except Exception:
             pass
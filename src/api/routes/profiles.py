@@ -0,0 +1,50 @@
+"""
+Stored request profiles (only mounted when profiling is enabled).
+
+Profiles hold request paths, SQL and code locations, so when
+PROFILING_TOKEN is configured reading them needs the same
+X-Profile-Token header as creating them.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from src.config import Config
+from src.utils.profiling import collapsed_stacks, list_profiles, load_profile
+
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(default=None)):
+    """Reject the request unless it carries PROFILING_TOKEN (when one is set)."""
+    token = Config.PROFILING_TOKEN
+    if token and not hmac.compare_digest(x_profile_token or "", token):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Profile-Token")
+
+
+router = APIRouter(prefix="/api/profiles", dependencies=[Depends(require_profiling_token)])
+
+
+@router.get("")
+async def get_profiles(limit: int = Query(default=50, ge=1, le=500)):
+    """List recent profiles, newest first."""
+    return {"profiles": list_profiles(limit)}
+
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str):
+    """Full profile: sampled stacks and captured SQL with timings."""
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.get("/{profile_id}/flamegraph.txt", response_class=PlainTextResponse)
+async def get_profile_flamegraph(profile_id: str):
+    """Collapsed stacks for flamegraph.pl or https://www.speedscope.app."""
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(collapsed_stacks(profile["stacks"]))
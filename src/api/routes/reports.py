@@ -9,7 +9,9 @@ from typing import Optional
 
 from src.database import get_db
 from src.models import Scenario
-from src.reports.excel_generator import generate_sponsor_report
+
+# Report builders (openpyxl, numpy) are imported inside the handlers so they
+# load on the first report request rather than at API startup.
 
 router = APIRouter()
 
@@ -27,6 +29,8 @@ def generate_sponsor_excel_report(
     - years: Number of years to include (1-16, default 2)
     - include_monthly: Include monthly breakdown for first 2 years
     """
+    from src.reports.excel_generator import generate_sponsor_report
+
     scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
     if not scenario:
         raise HTTPException(status_code=404, detail="Scenario not found")
@@ -53,18 +57,65 @@ def generate_sponsor_excel_report(
 
 @router.get("/comparison")
 def generate_comparison_report(
-    scenario_ids: str = Query(..., description="Comma-separated scenario IDs"),
+    scenario_ids: str = Query(..., description="Comma-separated scenario IDs (first is the baseline)"),
     year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    plant_ids: Optional[str] = Query(default=None, description="Comma-separated plant IDs"),
+    top_n: int = Query(default=20, ge=1, le=200),
+    min_delta: float = Query(default=0.0, ge=0, description="Top movers must move by more than this ($)"),
+    format: str = Query(default="json", pattern="^(json|xlsx)$"),
     db: Session = Depends(get_db),
 ):
-    """Generate comparison report between multiple scenarios."""
-    ids = [int(x.strip()) for x in scenario_ids.split(",")]
+    """
+    Compare two or more scenarios cell by cell.
     
-    # Validate scenarios exist
-    scenarios = db.query(Scenario).filter(Scenario.id.in_(ids)).all()
-    if len(scenarios) != len(ids):
-        raise HTTPException(status_code=404, detail="One or more scenarios not found")
+    Forecasts are pivoted in one query into a (plant, category, period) x
+    scenario matrix with deltas against the first scenario, $/MWhr deltas
+    by plant and year, and top movers; each cell is marked added, removed,
+    changed or unchanged against the baseline.
     
-    # TODO: Implement comparison report
-    return {"message": "Comparison report generation not yet implemented", "scenarios": ids}
+    - year: Shortcut for year_from = year_to = year
+    - format: json or xlsx
+    """
+    from src.reports.scenario_comparison import (
+        compare_scenarios,
+        comparison_to_excel,
+        iter_comparison_json,
+    )
 
+    try:
+        ids = [int(x.strip()) for x in scenario_ids.split(",") if x.strip()]
+        plants = [int(x.strip()) for x in plant_ids.split(",") if x.strip()] if plant_ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="IDs must be comma-separated integers")
+    
+    if year is not None:
+        year_from = year_to = year
+    
+    try:
+        result = compare_scenarios(
+            db,
+            ids,
+            year_from=year_from,
+            year_to=year_to,
+            plant_ids=plants,
+            top_n=top_n,
+            min_delta=min_delta,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    if format == "xlsx":
+        filename = f"OVEC_Scenario_Comparison_{timestamp}.xlsx"
+        return StreamingResponse(
+            comparison_to_excel(result),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+    
+    return StreamingResponse(iter_comparison_json(result), media_type="application/json")
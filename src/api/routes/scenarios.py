@@ -3,9 +3,13 @@
 Provides operations for saving, loading, and comparing forecast scenarios:
 - List all scenarios
 - Create/update scenarios
+- Clone scenarios (server-side copy of forecasts and driver values)
+- Copy-on-write (overlay) scenarios and materialize on lock
 - Delete scenarios
+- Run Monte Carlo cost risk simulations
 """
 
+import os
 from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
@@ -14,6 +18,8 @@ from datetime import datetime
 
 from src.db.postgres import get_session
 from src.models.scenario import Scenario, ScenarioType, ScenarioStatus
+from src.engine.scenario_clone import DriverOverride, clone_scenario, copy_scenario_data
+from src.engine.scenario_layers import materialize_scenario, resolve_scenario_forecasts
 
 
 # =============================================================================
@@ -90,6 +96,7 @@ class ScenarioResponse(BaseModel):
     status: str
     version: int
     parent_scenario_id: Optional[int]
+    storage_mode: str = "full"
     created_at: Optional[datetime]
     created_by: Optional[str]
     is_active: bool
@@ -109,6 +116,42 @@ class CreateScenarioRequest(BaseModel):
     created_by: Optional[str] = None
 
 
+class DriverOverrideRequest(BaseModel):
+    """Driver value to replace in a cloned scenario."""
+    driver_name: str
+    value: float
+    plant_id: Optional[int] = None
+    period_yyyymm: Optional[str] = Field(default=None, min_length=4, max_length=6)
+
+
+class CloneScenarioRequest(BaseModel):
+    """Request to clone a scenario with its forecasts and driver values."""
+    name: Optional[str] = Field(default=None, max_length=200)
+    description: Optional[str] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    plant_ids: Optional[List[int]] = None
+    category_ids: Optional[List[int]] = None
+    driver_overrides: List[DriverOverrideRequest] = []
+    copy_on_write: bool = False  # Store only overridden cells; inherit the rest
+    created_by: Optional[str] = None
+
+
+class SimulateScenarioRequest(BaseModel):
+    """Request to run a Monte Carlo cost risk simulation."""
+    year_from: int
+    year_to: int
+    trials: int = Field(default=20000, ge=1000, le=200000)
+    seed: Optional[int] = None
+    coal_price_volatility: float = Field(default=0.15, ge=0, le=1)
+    heat_rate_volatility: float = Field(default=0.02, ge=0, le=1)
+    generation_volatility: float = Field(default=0.08, ge=0, le=1)
+    include_asset_health: bool = True
+    workers: Optional[int] = Field(default=None, ge=1, le=16)
+    persist: bool = True
+    created_by: Optional[str] = None
+
+
 class SetActiveScenarioRequest(BaseModel):
     """Request to set active scenario."""
     scenario_id: Optional[int] = None  # None to clear
@@ -145,6 +188,7 @@ async def list_scenarios(
                 status=s.status.value if s.status else "draft",
                 version=s.version,
                 parent_scenario_id=s.parent_scenario_id,
+                storage_mode=s.storage_mode or "full",
                 created_at=s.created_at,
                 created_by=s.created_by,
                 is_active=s.is_active,
@@ -221,6 +265,7 @@ async def get_scenario(scenario_id: int):
             status=scenario.status.value if scenario.status else "draft",
             version=scenario.version,
             parent_scenario_id=scenario.parent_scenario_id,
+            storage_mode=scenario.storage_mode or "full",
             created_at=scenario.created_at,
             created_by=scenario.created_by,
             is_active=scenario.is_active,
@@ -232,6 +277,11 @@ async def get_scenario(scenario_id: int):
 async def create_scenario(request: CreateScenarioRequest):
     """Create a new scenario."""
     with get_session() as db:
+        if request.parent_scenario_id:
+            parent = db.query(Scenario).filter(Scenario.id == request.parent_scenario_id).first()
+            if not parent:
+                raise HTTPException(status_code=404, detail="Parent scenario not found")
+
         # Create scenario
         scenario_type = ScenarioType.BUDGET
         if request.scenario_type == "internal_forecast":
@@ -249,7 +299,20 @@ async def create_scenario(request: CreateScenarioRequest):
             created_by=request.created_by,
         )
         db.add(scenario)
-        db.commit()
+
+        try:
+            if request.parent_scenario_id:
+                # Start from the parent's data (set-based copy, same transaction)
+                db.flush()
+                copy_scenario_data(
+                    db, request.parent_scenario_id, scenario.id,
+                    updated_by=request.created_by,
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to create scenario: {e}")
+
         db.refresh(scenario)
 
         return ScenarioResponse(
@@ -260,6 +323,7 @@ async def create_scenario(request: CreateScenarioRequest):
             status=scenario.status.value,
             version=scenario.version,
             parent_scenario_id=scenario.parent_scenario_id,
+            storage_mode=scenario.storage_mode or "full",
             created_at=scenario.created_at,
             created_by=scenario.created_by,
             is_active=scenario.is_active,
@@ -283,16 +347,223 @@ async def delete_scenario(scenario_id: int):
         return {"status": "deleted", "scenario_id": scenario_id}
 
 
+@router.post("/{scenario_id}/clone")
+async def clone_scenario_endpoint(scenario_id: int, request: CloneScenarioRequest):
+    """Clone a scenario including its forecasts and driver values.
+
+    Rows are copied server-side with INSERT ... SELECT in one transaction.
+    Optionally restricts the copy to a year/plant/category subset and
+    applies driver overrides to the clone. With copy_on_write the clone
+    stores no forecast rows and inherits the source's grid.
+    """
+    if (
+        request.year_from is not None
+        and request.year_to is not None
+        and request.year_to < request.year_from
+    ):
+        raise HTTPException(status_code=400, detail="year_to must be >= year_from")
+
+    overrides = [
+        DriverOverride(
+            driver_name=o.driver_name,
+            value=o.value,
+            plant_id=o.plant_id,
+            period_yyyymm=o.period_yyyymm,
+        )
+        for o in request.driver_overrides
+    ]
+
+    with get_session() as db:
+        try:
+            result = clone_scenario(
+                db,
+                scenario_id,
+                name=request.name,
+                description=request.description,
+                year_from=request.year_from,
+                year_to=request.year_to,
+                plant_ids=request.plant_ids,
+                category_ids=request.category_ids,
+                driver_overrides=overrides,
+                created_by=request.created_by,
+                copy_on_write=request.copy_on_write,
+            )
+        except ValueError as e:
+            status = 404 if "not found" in str(e) else 400
+            raise HTTPException(status_code=status, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Clone failed: {e}")
+
+        clone = result.pop("scenario")
+        return {
+            "status": "cloned",
+            "source_scenario_id": scenario_id,
+            "scenario": ScenarioResponse(
+                id=clone.id,
+                name=clone.name,
+                description=clone.description,
+                scenario_type=clone.scenario_type.value,
+                status=clone.status.value,
+                version=clone.version,
+                parent_scenario_id=clone.parent_scenario_id,
+                storage_mode=clone.storage_mode,
+                created_at=clone.created_at,
+                created_by=clone.created_by,
+                is_active=clone.is_active,
+                is_locked=clone.is_locked,
+            ),
+            **result,
+        }
+
+
 @router.post("/{scenario_id}/lock")
 async def lock_scenario(scenario_id: int):
-    """Lock a scenario to prevent further modifications."""
+    """Lock a scenario to prevent further modifications.
+
+    Overlay scenarios are materialized first so published numbers no
+    longer change when an ancestor is edited.
+    """
     with get_session() as db:
         scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
         if not scenario:
             raise HTTPException(status_code=404, detail="Scenario not found")
 
-        scenario.is_locked = True
-        scenario.status = ScenarioStatus.PUBLISHED
-        db.commit()
+        try:
+            result = materialize_scenario(db, scenario_id)
+            scenario.is_locked = True
+            scenario.status = ScenarioStatus.PUBLISHED
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to lock scenario: {e}")
+
+        return {
+            "status": "locked",
+            "scenario_id": scenario_id,
+            "cells_materialized": result["cells_materialized"],
+        }
+
+
+@router.post("/{scenario_id}/materialize")
+async def materialize_scenario_endpoint(scenario_id: int):
+    """Copy inherited cells into an overlay scenario and switch it to full storage."""
+    with get_session() as db:
+        try:
+            result = materialize_scenario(db, scenario_id)
+            db.commit()
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Materialize failed: {e}")
+
+        return {"status": "materialized", **result}
+
+
+@router.get("/{scenario_id}/forecasts")
+def get_scenario_forecasts(scenario_id: int):
+    """Get a scenario's effective forecast grid.
+
+    Overlay scenarios are resolved through their parent chain; each cell
+    reports the scenario it is inherited from.
+    """
+    with get_session() as db:
+        scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+        if not scenario:
+            raise HTTPException(status_code=404, detail="Scenario not found")
+
+        cells = resolve_scenario_forecasts(db, scenario_id)
 
-        return {"status": "locked", "scenario_id": scenario_id}
+        return {
+            "scenario_id": scenario_id,
+            "storage_mode": scenario.storage_mode,
+            "cell_count": len(cells),
+            "overridden_count": sum(1 for c in cells if c.source_scenario_id == scenario_id),
+            "cells": [
+                {
+                    "plant_id": c.plant_id,
+                    "category_id": c.category_id,
+                    "period_id": c.period_id,
+                    "generation_mwh": c.generation_mwh,
+                    "cost_dollars": c.cost_dollars,
+                    "source_scenario_id": c.source_scenario_id,
+                }
+                for c in cells
+            ],
+        }
+
+
+@router.post("/{scenario_id}/simulate")
+def simulate_scenario(scenario_id: int, request: SimulateScenarioRequest):
+    """Run a Monte Carlo cost risk simulation around a scenario.
+
+    Samples coal price, heat rate, generation and Asset Health repairs to
+    produce P10/P50/P90 cost and $/MWhr bands per plant and year. When
+    persist is set, the bands are saved as a derived scenario so the
+    sponsor report can show them.
+
+    Declared sync so the CPU-bound draws run in the threadpool.
+    """
+    from src.engine.risk_simulation import RiskAssumptions, simulate_scenario_risk
+    from src.etl.asset_health import AssetHealthConnector
+
+    if request.year_to < request.year_from:
+        raise HTTPException(status_code=400, detail="year_to must be >= year_from")
+
+    # Without an Asset Health connection the scenario's Asset Health
+    # forecast is carried as a fixed cost
+    asset_health_items = None
+    ah_conn_string = os.getenv("ASSET_HEALTH_DB_URL")
+    if request.include_asset_health and ah_conn_string:
+        connector = AssetHealthConnector(ah_conn_string)
+        try:
+            asset_health_items = connector.fetch_items(
+                year_from=request.year_from, year_to=request.year_to
+            )
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Asset Health fetch failed: {e}")
+
+    assumptions = RiskAssumptions(
+        coal_price_volatility=request.coal_price_volatility,
+        heat_rate_volatility=request.heat_rate_volatility,
+        generation_volatility=request.generation_volatility,
+    )
+
+    with get_session() as db:
+        try:
+            result = simulate_scenario_risk(
+                scenario_id=scenario_id,
+                year_from=request.year_from,
+                year_to=request.year_to,
+                trials=request.trials,
+                assumptions=assumptions,
+                asset_health_items=asset_health_items,
+                seed=request.seed,
+                workers=request.workers,
+                persist=request.persist,
+                created_by=request.created_by,
+                db=db,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    return {
+        "base_scenario_id": result["base_scenario_id"],
+        "scenario_id": result["scenario_id"],
+        "trials": result["trials"],
+        "asset_health_items": len(asset_health_items) if asset_health_items is not None else None,
+        "bands": [
+            {
+                "plant_id": b.plant_id,
+                "year": b.year,
+                "cost": {"p10": b.cost_p10, "p50": b.cost_p50, "p90": b.cost_p90, "mean": b.cost_mean},
+                "cost_per_mwh": {
+                    "p10": b.cost_per_mwh_p10,
+                    "p50": b.cost_per_mwh_p50,
+                    "p90": b.cost_per_mwh_p90,
+                },
+                "generation_mwh_p50": b.generation_p50,
+            }
+            for b in result["bands"]
+        ],
+    }
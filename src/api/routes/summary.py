@@ -8,22 +8,38 @@ from decimal import Decimal
 from typing import List, Optional
 
 from src.db.postgres import get_engine
-from src.api.schemas import (
-    CorporateSummary, PlantSummary, DepartmentSummary, MonthlyAmount
-)
+from src.engine import close_calendar
+from src.etl.outage_catalog import is_outage_group
+from src.api.schemas import CorporateSummary
+from src.utils.json_encoder import ORJSONResponse
 
 router = APIRouter()
 
 
+def _money(value: float) -> Decimal:
+    return Decimal(f"{value:.2f}")
+
+
 @router.get("/summary/{year}", response_model=CorporateSummary)
 async def get_corporate_summary(
     year: int,
-    current_month: int = Query(default=11, description="Current month for YTD calculations")
+    current_month: Optional[int] = Query(
+        default=None, ge=0, le=12,
+        description="Month for YTD calculations (default: last month closed at every plant)",
+    ),
+    method: str = Query(default="forecast", pattern="^(forecast|run_rate|seasonal)$",
+                        description="Year-end projection method"),
 ):
     """
     Get corporate-level summary with plant and department breakdowns.
     """
+    from src.engine.projections import ProjectionMethod, get_projections
+
+    if current_month is None:
+        current_month = close_calendar.current_month(year)
+
     engine = get_engine()
+    projections = get_projections(year, current_month, ProjectionMethod(method))
     
     with engine.connect() as conn:
         # Get monthly actuals by plant and department
@@ -33,7 +49,7 @@ async def get_corporate_summary(
                 dept_code,
                 txmnth,
                 SUM(gxfamt) as total_amt,
-                COUNT(*) as txn_count
+                SUM(txn_count) as txn_count
             FROM transaction_budget_groups
             WHERE txyear = :year
             GROUP BY plant_code, dept_code, txmnth
@@ -66,73 +82,77 @@ async def get_corporate_summary(
                 "dept_code": dept_code,
                 "dept_name": dept_code,  # TODO: lookup from departments table
                 "plant_code": plant_code,
-                "is_outage": dept_code.startswith("PLANNED") or dept_code == "UNPLANNED" or dept_code == "OUTAGE",
+                "is_outage": is_outage_group(dept_code),
                 "months": {m: {"month": m, "actual": Decimal("0")} for m in range(1, 13)}
             }
         
         # Add amount to month
         plants_data[plant_code]["departments"][dept_code]["months"][month]["actual"] = amount
     
-    # Convert to response models
+    # Build the response as plain dicts; returned through ORJSONResponse so
+    # FastAPI does not re-validate every nested CorporateSummary field
     plants = []
     grand_total_actual = Decimal("0")
+    zero = Decimal("0")
     
     for plant_code, plant_data in plants_data.items():
         departments = []
         plant_total = Decimal("0")
         
         for dept_code, dept_data in plant_data["departments"].items():
+            projection = projections.get(plant_code, dept_code)
             months = [
-                MonthlyAmount(
-                    month=m,
-                    actual=dept_data["months"][m]["actual"],
-                    budget=Decimal("0"),  # TODO: from budget table
-                    forecast=Decimal("0"),  # TODO: from forecast table
-                    variance=Decimal("0")
-                )
+                {
+                    "month": m,
+                    "actual": dept_data["months"][m]["actual"],
+                    "budget": zero,  # TODO: from budget table
+                    "forecast": _money(projection.estimate[m - 1]) if projection else zero,
+                    "variance": zero,
+                }
                 for m in range(1, 13)
             ]
             
             ytd_actual = sum(
-                dept_data["months"][m]["actual"] 
-                for m in range(1, current_month + 1)
+                (dept_data["months"][m]["actual"] for m in range(1, current_month + 1)),
+                Decimal("0"),
             )
             plant_total += ytd_actual
             
-            departments.append(DepartmentSummary(
-                dept_code=dept_code,
-                dept_name=dept_data["dept_name"],
-                plant_code=plant_code,
-                is_outage=dept_data["is_outage"],
-                months=months,
-                ytd_actual=ytd_actual,
-                ytd_budget=Decimal("0"),
-                ytd_variance=Decimal("0"),
-                year_end_projection=ytd_actual  # Simplified for now
-            ))
+            departments.append({
+                "dept_code": dept_code,
+                "dept_name": dept_data["dept_name"],
+                "plant_code": plant_code,
+                "is_outage": dept_data["is_outage"],
+                "months": months,
+                "ytd_actual": ytd_actual,
+                "ytd_budget": zero,
+                "ytd_variance": zero,
+                "year_end_projection": _money(projection.year_end_projection) if projection else ytd_actual,
+            })
         
         # Sort departments: non-outage first, then outage
-        departments.sort(key=lambda d: (d.is_outage, d.dept_code))
+        departments.sort(key=lambda d: (d["is_outage"], d["dept_code"]))
         
         grand_total_actual += plant_total
         
-        plants.append(PlantSummary(
-            plant_code=plant_code,
-            plant_name=plant_data["plant_name"],
-            departments=departments,
-            total_actual=plant_total,
-            total_budget=Decimal("0"),
-            total_variance=Decimal("0")
-        ))
+        plants.append({
+            "plant_code": plant_code,
+            "plant_name": plant_data["plant_name"],
+            "departments": departments,
+            "total_actual": plant_total,
+            "total_budget": zero,
+            "total_variance": zero,
+        })
     
-    return CorporateSummary(
-        year=year,
-        current_month=current_month,
-        plants=plants,
-        grand_total_actual=grand_total_actual,
-        grand_total_budget=Decimal("0"),
-        grand_total_variance=Decimal("0")
-    )
+    return ORJSONResponse({
+        "year": year,
+        "current_month": current_month,
+        "preliminary_months": close_calendar.preliminary_months(year),
+        "plants": plants,
+        "grand_total_actual": grand_total_actual,
+        "grand_total_budget": zero,
+        "grand_total_variance": zero,
+    })
 
 
 @router.get("/departments/{plant_code}/{year}/{month}")
@@ -152,7 +172,7 @@ async def get_department_summary(
                 dept_code,
                 outage_group,
                 SUM(gxfamt) as total_amt,
-                COUNT(*) as txn_count
+                SUM(txn_count) as txn_count
             FROM transaction_budget_groups
             WHERE plant_code = :plant_code 
               AND txyear = :year 
@@ -181,6 +201,7 @@ async def get_department_summary(
         "plant_code": plant_code,
         "year": year,
         "month": month,
+        "preliminary": month in close_calendar.preliminary_months(year),
         "departments": departments
     }
 
@@ -5,10 +5,10 @@ Transaction API endpoints.
 from fastapi import APIRouter, Query
 from sqlalchemy import text
 from typing import Optional, List
-from decimal import Decimal
 
 from src.db.postgres import get_engine
-from src.api.schemas import Transaction, TransactionList
+from src.api.schemas import TransactionList
+from src.utils.json_encoder import ORJSONResponse, rows_to_dicts
 
 router = APIRouter()
 
@@ -26,6 +26,12 @@ async def get_transactions(
 ):
     """
     Get filtered list of transactions with pagination.
+    
+    Rows are returned as plain dicts through ORJSONResponse, bypassing
+    per-row TransactionList validation (the schema still documents the
+    shape). Defaults are applied in SQL. The count reads
+    transaction_details like the page, so months with preliminary close
+    numbers (aggregates, no detail) still list their loaded transactions.
     """
     engine = get_engine()
     
@@ -62,7 +68,7 @@ async def get_transactions(
     with engine.connect() as conn:
         # Get total count
         count_query = text(f"""
-            SELECT COUNT(*) FROM transaction_budget_groups
+            SELECT COUNT(*) FROM transaction_details
             WHERE {where_clause}
         """)
         total = conn.execute(count_query, params).scalar()
@@ -70,42 +76,28 @@ async def get_transactions(
         # Get transactions
         query = text(f"""
             SELECT 
-                id, gxacct, ctdesc, txyear, txmnth, gxfamt, gxdrcr,
-                gxpjno, gxshut, gxdesc, dept_code, outage_group, plant_code
-            FROM transaction_budget_groups
+                id, gxacct, ctdesc AS account_desc, txyear, txmnth,
+                COALESCE(gxfamt, 0) AS gxfamt,
+                COALESCE(gxdrcr, '') AS gxdrcr,
+                gxpjno, gxshut, gxdesc,
+                COALESCE(dept_code, 'MAINT') AS dept_code,
+                outage_group,
+                COALESCE(plant_code, 'KC') AS plant_code
+            FROM transaction_details
             WHERE {where_clause}
             ORDER BY id
             LIMIT :limit OFFSET :offset
         """)
         
         result = conn.execute(query, params)
-        rows = result.fetchall()
-    
-    transactions = [
-        Transaction(
-            id=row[0],
-            gxacct=row[1],
-            account_desc=row[2],
-            txyear=row[3],
-            txmnth=row[4],
-            gxfamt=Decimal(str(row[5])) if row[5] else Decimal("0"),
-            gxdrcr=row[6] or "",
-            gxpjno=row[7],
-            gxshut=row[8],
-            gxdesc=row[9],
-            dept_code=row[10] or "MAINT",
-            outage_group=row[11],
-            plant_code=row[12] or "KC"
-        )
-        for row in rows
-    ]
+        transactions = rows_to_dicts(result.keys(), result.fetchall())
     
-    return TransactionList(
-        transactions=transactions,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    return ORJSONResponse({
+        "transactions": transactions,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+    })
 
 
 @router.get("/transactions/summary")
@@ -122,7 +114,7 @@ async def get_transaction_summary(
         if month:
             query = text("""
                 SELECT 
-                    COUNT(*) as total_txns,
+                    COALESCE(SUM(txn_count), 0) as total_txns,
                     SUM(CASE WHEN gxfamt > 0 THEN gxfamt ELSE 0 END) as total_debits,
                     SUM(CASE WHEN gxfamt < 0 THEN gxfamt ELSE 0 END) as total_credits,
                     SUM(gxfamt) as net_amount,
@@ -135,7 +127,7 @@ async def get_transaction_summary(
         else:
             query = text("""
                 SELECT 
-                    COUNT(*) as total_txns,
+                    COALESCE(SUM(txn_count), 0) as total_txns,
                     SUM(CASE WHEN gxfamt > 0 THEN gxfamt ELSE 0 END) as total_debits,
                     SUM(CASE WHEN gxfamt < 0 THEN gxfamt ELSE 0 END) as total_credits,
                     SUM(gxfamt) as net_amount,
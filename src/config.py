@@ -3,6 +3,7 @@ Configuration loader for environment variables.
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load .env from project root
@@ -24,6 +25,24 @@ class Config:
     INFINIUM_USER = os.getenv('INFINIUM_USER')
     INFINIUM_PW = os.getenv('INFINIUM_PW')
     
+    # Local Parquet cache of Infinium extracts (src/etl/extract_cache.py)
+    EXTRACT_CACHE_DIR = os.getenv(
+        'EXTRACT_CACHE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'extract_cache'),
+    )
+    EXTRACT_CACHE_RETENTION_DAYS = int(os.getenv('EXTRACT_CACHE_RETENTION_DAYS', '35'))
+    
+    # Instrumentation
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '500'))
+    
+    # On-demand request profiling (off unless explicitly enabled)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')
+    PROFILE_DIR = os.getenv(
+        'PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'budgetapp-profiles')
+    )
+    
     @classmethod
     def get_postgres_url(cls):
         """Get SQLAlchemy PostgreSQL connection URL."""
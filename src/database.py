@@ -5,21 +5,47 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 
 from src.config import Config
 
-# Create database engine
-engine = create_engine(
-    Config.get_postgres_url(),
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+# Engine singleton, created on first use so importing models or routes
+# does not build a connection pool
+_engine = None
+
+
+def get_engine():
+    """Get or create the SQLAlchemy engine."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            Config.get_postgres_url(),
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+        )
+    return _engine
+
+
+class _LazySessionFactory(sessionmaker):
+    """sessionmaker that binds to get_engine() when the first session is made."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.kw["bind"] = get_engine()
+        return super().__call__(**local_kw)
+
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionFactory(autocommit=False, autoflush=False)
 
 # Base class for models
 Base = declarative_base()
 
 
+def __getattr__(name):
+    # `from src.database import engine` keeps working
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -32,5 +58,4 @@ def get_db():
 def init_db():
     """Initialize database tables."""
     from src.models import plant, period, cost_category, scenario, forecast
-    Base.metadata.create_all(bind=engine)
-
+    Base.metadata.create_all(bind=get_engine())
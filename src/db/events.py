@@ -0,0 +1,185 @@
+"""
+Change events over Postgres LISTEN/NOTIFY.
+
+Writers call notify() on the connection (or session) of the transaction
+that makes the change; Postgres delivers the event on commit, to every
+process listening, so all uvicorn workers see changes made by any of
+them (and by ETL jobs run elsewhere).
+
+Each process runs one listener thread (started by the first subscriber
+and kept for the life of the process) that fans events out to asyncio
+queues subscribed per (plant_code, year). Events with no plant_code (or
+year) go to every plant (or year).
+
+Event payloads are small JSON objects:
+
+    {"type": "forecast_saved", "plant_code": "KC", "year": 2025,
+     "rows": [{"dept_code": "MAINT", "version": 4, "months": [...]}]}
+
+Payloads over NOTIFY's size limit are sent without their detail and
+marked "truncated"; subscribers that may have missed events (listener
+reconnect, full queue) get a "resync" event. Clients reload on either.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from src.db.postgres import get_engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "budget_changes"
+
+# NOTIFY payloads must be under 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+# Listener select() timeout and wait before reconnecting
+POLL_SECONDS = 30.0
+RECONNECT_SECONDS = 5.0
+
+# Events buffered per subscriber before it is told to resync
+QUEUE_SIZE = 100
+
+
+def encode_event(event_type: str, plant_code: Optional[str], year: Optional[int], data: dict) -> str:
+    """JSON payload for an event, without its detail if too large for NOTIFY."""
+    event = {"type": event_type, "plant_code": plant_code, "year": year, **data}
+    payload = json.dumps(event, default=float, separators=(",", ":"))
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        payload = json.dumps(
+            {"type": event_type, "plant_code": plant_code, "year": year, "truncated": True},
+            separators=(",", ":"),
+        )
+    return payload
+
+
+def notify(
+    db,
+    event_type: str,
+    plant_code: Optional[str] = None,
+    year: Optional[int] = None,
+    **data,
+):
+    """
+    Queue a change event; it is delivered when the transaction commits.
+
+    Args:
+        db: SQLAlchemy Connection or Session doing the change
+        event_type: e.g. "forecast_saved"
+        plant_code: Plant the change belongs to (None: all plants)
+        year: Budget year (None: all years)
+        **data: Event detail (JSON-serializable)
+    """
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANNEL, "payload": encode_event(event_type, plant_code, year, data)},
+    )
+
+
+def _matches(event: dict, plant_code: str, year: int) -> bool:
+    return (
+        event.get("plant_code") in (None, plant_code)
+        and event.get("year") in (None, year)
+    )
+
+
+class EventHub:
+    """Per-process LISTEN connection fanned out to asyncio subscribers."""
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._subscribers: Dict[asyncio.Queue, Tuple[str, int, asyncio.AbstractEventLoop]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, plant_code: str, year: int) -> asyncio.Queue:
+        """Queue receiving the events for a plant and year (call from the event loop)."""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = (plant_code, year, asyncio.get_running_loop())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name="change-events", daemon=True)
+                self._thread.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def dispatch(self, event: dict):
+        """Hand an event to every matching subscriber (thread-safe)."""
+        with self._lock:
+            targets = [
+                (queue, loop)
+                for queue, (plant_code, year, loop) in self._subscribers.items()
+                if _matches(event, plant_code, year)
+            ]
+        _deliver(targets, event)
+
+    def _resync_all(self):
+        with self._lock:
+            targets = [(queue, loop) for queue, (_, _, loop) in self._subscribers.items()]
+        _deliver(targets, {"type": "resync"})
+
+    def _listen(self):
+        connected_before = False
+        while True:
+            conn = None
+            try:
+                raw = get_engine().raw_connection()
+                raw.detach()  # held for the life of the listener, not a pool slot
+                conn = raw.driver_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {self.channel}")
+                if connected_before:
+                    # Events sent while disconnected are lost
+                    self._resync_all()
+                connected_before = True
+
+                while True:
+                    if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        try:
+                            self.dispatch(json.loads(notification.payload))
+                        except ValueError:
+                            logger.warning("Ignoring malformed change event %r", notification.payload)
+            except Exception:
+                logger.exception("Change event listener failed; reconnecting")
+                time.sleep(RECONNECT_SECONDS)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+def _deliver(targets, event: dict):
+    for queue, loop in targets:
+        try:
+            loop.call_soon_threadsafe(_offer, queue, event)
+        except RuntimeError:
+            pass  # loop closed; its subscriber is going away
+
+
+def _offer(queue: asyncio.Queue, event: dict):
+    """Put without blocking; a subscriber that falls behind is told to resync."""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"type": "resync"})
+
+
+hub = EventHub()
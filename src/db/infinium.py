@@ -2,7 +2,6 @@
 Infinium DB2 database connection.
 """
 
-import pyodbc
 from src.config import Config
 
 
@@ -16,6 +15,10 @@ def get_infinium_connection():
     Raises:
         Exception: If connection fails
     """
+    # Imported here so the API (which never talks to DB2) starts without
+    # the ODBC driver manager loaded
+    import pyodbc
+
     conn_string = Config.get_db2_connection_string()
     return pyodbc.connect(conn_string)
 
@@ -0,0 +1,166 @@
+"""
+Partition layout of the ledger tables.
+
+gl_transactions (full Infinium detail) and gl_facts (the narrow rows
+summaries read, 1:1 by id) are laid out the same way: partitioned by
+LIST (txyear), each year partition by LIST (txmnth):
+
+    gl_transactions
+      gl_transactions_y2025            FOR VALUES IN (2025)
+        gl_transactions_y2025m01       FOR VALUES IN (1)
+        ...
+        gl_transactions_y2025m12       FOR VALUES IN (12)
+        gl_transactions_y2025_other    DEFAULT (adjustment periods)
+
+Queries filtering on txyear (and txmnth) are pruned to those partitions.
+
+A reload never deletes rows in place. Each month is loaded into a
+staging table shaped like the partition (same columns, a CHECK on its
+bounds, the parent's indexes built up front), then swapped in: the old
+month partition is detached and dropped, the staging table renamed and
+attached. The CHECK lets ATTACH skip its validation scan and the
+prebuilt indexes are adopted, so the swap is metadata-only. Months that a
+full-year reload no longer has rows for are truncated.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import text
+
+TABLE = "gl_transactions"
+FACT_TABLE = "gl_facts"
+PARTITIONED_TABLES = (TABLE, FACT_TABLE)
+
+MONTHS = tuple(range(1, 13))
+
+# Month slots of a year partition; None is the DEFAULT partition
+MONTH_SLOTS = (*MONTHS, None)
+
+# Month the ETL commands take for the DEFAULT partition (all adjustment periods)
+ADJUSTMENT_MONTH = 13
+
+PRIMARY_KEY = ("id", "txyear", "txmnth")
+
+
+def year_partition(year: int, table: str = TABLE) -> str:
+    return f"{table}_y{int(year)}"
+
+
+def month_partition(year: int, month: Optional[int], table: str = TABLE) -> str:
+    if month is None:
+        return f"{year_partition(year, table)}_other"
+    return f"{year_partition(year, table)}m{int(month):02d}"
+
+
+def month_slot(month) -> Optional[int]:
+    """Partition slot of a txmnth value (None: the DEFAULT partition)."""
+    return int(month) if month in MONTHS else None
+
+
+def _bound(month: Optional[int]) -> str:
+    return "DEFAULT" if month is None else f"FOR VALUES IN ({int(month)})"
+
+
+def _check(year: int, month: Optional[int]) -> str:
+    if month is None:
+        months = ", ".join(str(m) for m in MONTHS)
+        return f"txyear = {int(year)} AND txmnth NOT IN ({months})"
+    return f"txyear = {int(year)} AND txmnth = {int(month)}"
+
+
+def _parent_indexes(table: str = TABLE) -> List[tuple]:
+    """(name, columns) of the indexes every partition of `table` carries."""
+    from src.models.gl_transaction import GLFact, GLTransaction
+    model = {TABLE: GLTransaction, FACT_TABLE: GLFact}[table]
+    return [
+        (index.name, [column.name for column in index.columns])
+        for index in sorted(model.__table__.indexes, key=lambda i: i.name)
+    ]
+
+
+def ensure_year_partitions(db_conn, year: int, tables=PARTITIONED_TABLES):
+    """Create the partition of a year and its month partitions if missing."""
+    for table in tables:
+        db_conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {year_partition(year, table)}
+            PARTITION OF {table} FOR VALUES IN ({int(year)})
+            PARTITION BY LIST (txmnth)
+        """))
+        for month in MONTH_SLOTS:
+            db_conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {month_partition(year, month, table)}
+                PARTITION OF {year_partition(year, table)} {_bound(month)}
+            """))
+
+
+def partition_years(db_conn, table: str = TABLE) -> List[int]:
+    """Years that have a partition."""
+    rows = db_conn.execute(text(f"""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+    """), {"table": table})
+    prefix = f"{table}_y"
+    return sorted(int(row[0][len(prefix):]) for row in rows if row[0].startswith(prefix))
+
+
+def create_staging(db_conn, year: int, month: Optional[int], table: str = TABLE) -> str:
+    """
+    Empty table to load one month into, shaped like its partition.
+
+    Returns:
+        Staging table name
+    """
+    staging = f"{month_partition(year, month, table)}_load"
+    db_conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    db_conn.execute(text(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)"))
+    db_conn.execute(text(
+        f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_bounds CHECK ({_check(year, month)})"
+    ))
+    return staging
+
+
+def index_staging(db_conn, staging: str, table: str = TABLE):
+    """Build the parent's primary key and indexes on a loaded staging table."""
+    db_conn.execute(text(
+        f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY ({', '.join(PRIMARY_KEY)})"
+    ))
+    for name, columns in _parent_indexes(table):
+        db_conn.execute(text(f"CREATE INDEX {staging}_{name} ON {staging} ({', '.join(columns)})"))
+    db_conn.execute(text(f"ANALYZE {staging}"))
+
+
+def swap_in(db_conn, year: int, month: Optional[int], staging: str, table: str = TABLE):
+    """
+    Replace a month partition with an indexed staging table.
+
+    Run in a transaction: readers see the old month until it commits.
+    """
+    target = month_partition(year, month, table)
+    parent = year_partition(year, table)
+
+    attached = db_conn.execute(text("""
+        SELECT 1 FROM pg_inherits
+        WHERE inhrelid = to_regclass(:target) AND inhparent = to_regclass(:parent)
+    """), {"target": target, "parent": parent}).first()
+    if attached:
+        db_conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {target}"))
+    db_conn.execute(text(f"DROP TABLE IF EXISTS {target}"))
+
+    db_conn.execute(text(f"ALTER TABLE {staging} RENAME TO {target}"))
+    db_conn.execute(text(f"ALTER INDEX {staging}_pkey RENAME TO {target}_pkey"))
+    for name, _ in _parent_indexes(table):
+        db_conn.execute(text(f"ALTER INDEX {staging}_{name} RENAME TO {target}_{name}"))
+    db_conn.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {target} {_bound(month)}"))
+    db_conn.execute(text(f"ALTER TABLE {target} DROP CONSTRAINT {staging}_bounds"))
+
+
+def truncate_partition(db_conn, year: int, month: Optional[int], table: str = TABLE):
+    db_conn.execute(text(f"TRUNCATE {month_partition(year, month, table)}"))
+
+
+def drop_year(db_conn, year: int):
+    """Remove a year's rows (detail and facts) by dropping its partitions."""
+    for table in PARTITIONED_TABLES:
+        db_conn.execute(text(f"DROP TABLE IF EXISTS {year_partition(year, table)}"))
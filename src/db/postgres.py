@@ -44,7 +44,7 @@ def get_session():
 
 def init_db():
     """Initialize database tables."""
-    from src.models import gl_transaction  # Import models to register them
+    from src.models import gl_transaction, dimensions, etl_run, reconciliation, close_calendar  # Import models to register them
     engine = get_engine()
     Base.metadata.create_all(engine)
 
@@ -1,5 +1,18 @@
 """
 Database views for budget reporting.
+
+transaction_budget_groups reads gl_facts (the narrow table with the
+plant and department already derived; see src/etl/gl_facts.py) and backs
+every summary, projection and variance query. The account, project and
+outage columns are decoded from the integer dimension keys; the joins are
+LEFT joins on unique keys, so Postgres drops the ones a query does not
+reference. Months loaded in preliminary mode (src/etl/preliminary.py)
+read their DB2 aggregate rows instead of their facts until the detailed
+load replaces them; each row carries the number of Infinium rows it
+stands for (txn_count), so counts are SUM(txn_count).
+
+transaction_details adds the Infinium detail columns from gl_transactions
+and the account description for the transaction list and drill-downs.
 """
 
 from sqlalchemy import text
@@ -11,135 +24,103 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 # SQL to create the transaction_budget_groups view
 CREATE_BUDGET_GROUPS_VIEW = """
-DROP VIEW IF EXISTS transaction_budget_groups;
-
 CREATE VIEW transaction_budget_groups AS
-SELECT 
-    t.id,
+SELECT
+    r.id,
+    r.txyear,
+    r.txmnth,
+    r.gxfamt,
+    r.gxdrcr,
+    r.plant_code,
+    r.dept_code,
+    r.account_key,
+    r.project_key,
+    r.outage_key,
+    r.txn_count,
+    r.is_preliminary,
+    da.gxacct,
+    dp.project_number AS gxpjno,
+    o.alias AS gxshut,
+    o.outage_group,
+    COALESCE(o.is_outage, FALSE) AS is_outage
+FROM (
+    SELECT f.id, f.txyear, f.txmnth, f.gxfamt, f.gxdrcr, f.plant_code, f.dept_code,
+           f.account_key, f.project_key, f.outage_key,
+           1 AS txn_count, FALSE AS is_preliminary
+    FROM gl_facts f
+    WHERE NOT EXISTS (
+        SELECT 1 FROM preliminary_periods pp
+        WHERE pp.txyear = f.txyear AND pp.txmnth = f.txmnth
+    )
+    UNION ALL
+    SELECT NULL, p.txyear, p.txmnth, p.gxfamt, p.gxdrcr, p.plant_code, p.dept_code,
+           p.account_key, p.project_key, p.outage_key,
+           p.txn_count, TRUE
+    FROM gl_preliminary_actuals p
+) r
+LEFT JOIN dim_account da ON da.account_key = r.account_key
+LEFT JOIN dim_project dp ON dp.project_key = r.project_key
+LEFT JOIN dim_outage o ON o.outage_key = r.outage_key
+"""
+
+# SQL to create the transaction_details view (facts + 1:1 detail row)
+CREATE_TRANSACTION_DETAILS_VIEW = """
+CREATE VIEW transaction_details AS
+SELECT
+    f.id,
+    f.txyear,
+    f.txmnth,
+    f.gxfamt,
+    f.gxdrcr,
+    f.plant_code,
+    f.dept_code,
     t.gxacct,
-    t.txyear,
-    t.txmnth,
-    t.gxfamt,
-    t.gxdrcr,
     t.gxpjno,
     t.gxshut,
-    t.gxdesc,
-    t.thsrc,
+    o.outage_group,
+    COALESCE(o.is_outage, FALSE) AS is_outage,
     a.ctdesc,
     a.ctuf01,
-    
-    -- Derive plant_code from account or shutdown alias
-    CASE 
-        WHEN LEFT(t.gxshut, 1) = 'K' THEN 'KC'
-        WHEN LEFT(t.gxshut, 1) = 'C' THEN 'CC'
-        WHEN LEFT(t.gxacct, 1) = '1' THEN 'KC'  -- Kyger accounts start with 1
-        WHEN LEFT(t.gxacct, 1) = '2' THEN 'CC'  -- Clifty accounts start with 2
-        ELSE 'KC'  -- Default
-    END AS plant_code,
-    
-    -- Department code: project mapping takes priority, then CTUF01 fallback
-    COALESCE(pm.dept_code, adm.dept_code, 'MAINT') AS dept_code,
-    
-    -- Outage group: derived from shutdown alias pattern
-    CASE 
-        WHEN LENGTH(TRIM(COALESCE(t.gxshut, ''))) >= 6 
-             AND SUBSTRING(t.gxshut, 6, 1) = 'P' 
-        THEN 'PLANNED-' || SUBSTRING(t.gxshut, 2, 2)
-        
-        WHEN LENGTH(TRIM(COALESCE(t.gxshut, ''))) >= 6 
-             AND SUBSTRING(t.gxshut, 6, 1) IN ('M', 'F') 
-        THEN 'UNPLANNED'
-        
-        ELSE NULL
-    END AS outage_group,
-    
-    -- Flag if this is an outage transaction
-    CASE 
-        WHEN LENGTH(TRIM(COALESCE(t.gxshut, ''))) >= 6 
-             AND SUBSTRING(t.gxshut, 6, 1) IN ('P', 'M', 'F') 
-        THEN TRUE
-        ELSE FALSE
-    END AS is_outage
-    
-FROM gl_transactions t
+    t.gxjrnl,
+    t.thedat,
+    t.gxdesc,
+    t.gxdsc2,
+    t.thsrc,
+    t.thref,
+    t.gxvndnum,
+    t.gxvndn,
+    t.phdesc,
+    t.gxpwbs,
+    t.wbdesc,
+    t.gxequn,
+    t.gxeqnm,
+    t.gxrfnum
+FROM gl_facts f
+JOIN gl_transactions t
+    ON t.id = f.id AND t.txyear = f.txyear AND t.txmnth = f.txmnth
+LEFT JOIN dim_outage o ON o.outage_key = f.outage_key
 LEFT JOIN gl_accounts a ON t.gxacct = a.ctacct
-LEFT JOIN project_mappings pm ON TRIM(t.gxpjno) = pm.project_number
-LEFT JOIN account_dept_mappings adm ON TRIM(a.ctuf01) = adm.ctuf01;
 """
 
+VIEWS = {
+    'transaction_budget_groups': CREATE_BUDGET_GROUPS_VIEW,
+    'transaction_details': CREATE_TRANSACTION_DETAILS_VIEW,
+}
+
 
 def create_budget_groups_view():
-    """Create the transaction_budget_groups view."""
-    logging.info("Creating transaction_budget_groups view...")
-    
+    """Create the transaction_budget_groups and transaction_details views."""
     engine = get_engine()
-    
+
     with engine.connect() as conn:
-        # Execute each statement separately
-        conn.execute(text("DROP VIEW IF EXISTS transaction_budget_groups"))
+        for name, create_sql in VIEWS.items():
+            logging.info(f"Creating {name} view...")
+            conn.execute(text(f"DROP VIEW IF EXISTS {name}"))
+            conn.execute(text(create_sql))
         conn.commit()
-        
-        # Create the view
-        create_sql = """
-        CREATE VIEW transaction_budget_groups AS
-        SELECT 
-            t.id,
-            t.gxacct,
-            t.txyear,
-            t.txmnth,
-            t.gxfamt,
-            t.gxdrcr,
-            t.gxpjno,
-            t.gxshut,
-            t.gxdesc,
-            t.thsrc,
-            a.ctdesc,
-            a.ctuf01,
-            
-            -- Derive plant_code from account or shutdown alias
-            CASE 
-                WHEN LEFT(t.gxshut, 1) = 'K' THEN 'KC'
-                WHEN LEFT(t.gxshut, 1) = 'C' THEN 'CC'
-                WHEN LEFT(t.gxacct, 1) = '1' THEN 'KC'
-                WHEN LEFT(t.gxacct, 1) = '2' THEN 'CC'
-                ELSE 'KC'
-            END AS plant_code,
-            
-            -- Department code: project mapping takes priority, then CTUF01 fallback
-            COALESCE(pm.dept_code, adm.dept_code, 'MAINT') AS dept_code,
-            
-            -- Outage group: derived from shutdown alias pattern
-            CASE 
-                WHEN LENGTH(TRIM(COALESCE(t.gxshut, ''))) >= 6 
-                     AND SUBSTRING(t.gxshut, 6, 1) = 'P' 
-                THEN 'PLANNED-' || SUBSTRING(t.gxshut, 2, 2)
-                
-                WHEN LENGTH(TRIM(COALESCE(t.gxshut, ''))) >= 6 
-                     AND SUBSTRING(t.gxshut, 6, 1) IN ('M', 'F') 
-                THEN 'UNPLANNED'
-                
-                ELSE NULL
-            END AS outage_group,
-            
-            -- Flag if this is an outage transaction
-            CASE 
-                WHEN LENGTH(TRIM(COALESCE(t.gxshut, ''))) >= 6 
-                     AND SUBSTRING(t.gxshut, 6, 1) IN ('P', 'M', 'F') 
-                THEN TRUE
-                ELSE FALSE
-            END AS is_outage
-            
-        FROM gl_transactions t
-        LEFT JOIN gl_accounts a ON t.gxacct = a.ctacct
-        LEFT JOIN project_mappings pm ON TRIM(t.gxpjno) = pm.project_number
-        LEFT JOIN account_dept_mappings adm ON TRIM(a.ctuf01) = adm.ctuf01
-        """
-        conn.execute(text(create_sql))
-        conn.commit()
-        
-    logging.info("View created successfully")
+
+    logging.info("Views created successfully")
 
 
 if __name__ == "__main__":
     create_budget_groups_view()
-
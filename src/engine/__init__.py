@@ -1,13 +1,43 @@
 # Forecast calculation engine
 
-from src.engine.depreciation import (
-    DepreciationScheduleRow,
-    generate_depreciation_schedule,
-    calculate_total_depreciation_by_period,
-    import_depreciation_to_forecast,
-    project_future_depreciation,
-    generate_cash_flow_comparison,
-)
+import importlib
+
+# Exports are resolved on first access so importing one engine module
+# (e.g. scenario_layers from an API route) does not load numpy for the
+# risk simulation.
+_EXPORTS = {
+    "DepreciationScheduleRow": "src.engine.depreciation",
+    "generate_depreciation_schedule": "src.engine.depreciation",
+    "calculate_total_depreciation_by_period": "src.engine.depreciation",
+    "import_depreciation_to_forecast": "src.engine.depreciation",
+    "project_future_depreciation": "src.engine.depreciation",
+    "generate_cash_flow_comparison": "src.engine.depreciation",
+    "RiskAssumptions": "src.engine.risk_simulation",
+    "PlantYearInputs": "src.engine.risk_simulation",
+    "RiskBandResult": "src.engine.risk_simulation",
+    "simulate_plant_year": "src.engine.risk_simulation",
+    "run_simulation": "src.engine.risk_simulation",
+    "build_simulation_inputs": "src.engine.risk_simulation",
+    "save_risk_scenario": "src.engine.risk_simulation",
+    "simulate_scenario_risk": "src.engine.risk_simulation",
+    "DriverOverride": "src.engine.scenario_clone",
+    "copy_scenario_data": "src.engine.scenario_clone",
+    "apply_driver_overrides": "src.engine.scenario_clone",
+    "clone_scenario": "src.engine.scenario_clone",
+    "ResolvedCell": "src.engine.scenario_layers",
+    "resolved_forecasts_sql": "src.engine.scenario_layers",
+    "resolved_forecasts": "src.engine.scenario_layers",
+    "forecast_source": "src.engine.scenario_layers",
+    "forecast_for_write": "src.engine.scenario_layers",
+    "resolve_scenario_forecasts": "src.engine.scenario_layers",
+    "clear_resolution_cache": "src.engine.scenario_layers",
+    "materialize_scenario": "src.engine.scenario_layers",
+    "ProjectionMethod": "src.engine.projections",
+    "DepartmentProjection": "src.engine.projections",
+    "ProjectionSet": "src.engine.projections",
+    "get_projections": "src.engine.projections",
+    "invalidate_projections": "src.engine.projections",
+}
 
 __all__ = [
     # Depreciation
@@ -17,4 +47,42 @@ __all__ = [
     "import_depreciation_to_forecast",
     "project_future_depreciation",
     "generate_cash_flow_comparison",
+    # Risk simulation
+    "RiskAssumptions",
+    "PlantYearInputs",
+    "RiskBandResult",
+    "simulate_plant_year",
+    "run_simulation",
+    "build_simulation_inputs",
+    "save_risk_scenario",
+    "simulate_scenario_risk",
+    # Scenario cloning
+    "DriverOverride",
+    "copy_scenario_data",
+    "apply_driver_overrides",
+    "clone_scenario",
+    # Copy-on-write scenario layers
+    "ResolvedCell",
+    "resolved_forecasts_sql",
+    "resolved_forecasts",
+    "forecast_source",
+    "forecast_for_write",
+    "resolve_scenario_forecasts",
+    "clear_resolution_cache",
+    "materialize_scenario",
+    # Year-end projections
+    "ProjectionMethod",
+    "DepartmentProjection",
+    "ProjectionSet",
+    "get_projections",
+    "invalidate_projections",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,361 @@
+"""
+Fiscal close calendar.
+
+The "current month" of a plant is its last closed period (period_closes).
+Pages and exports ask current_month() instead of assuming one; a plant
+with no closes yet falls back to the last period of fiscal_periods
+(seeded from data/master/fiscal_calendar.csv by load_all_mappings) that
+has ended.
+
+Close state and the calendar are cached in-process and reloaded every
+CLOSE_STATE_TTL_SECONDS, or at once after close_period() in this process.
+
+Closing a period precomputes that month's YTD actual and budget per
+department into ytd_aggregates, which the variance page and export read.
+Aggregates computed before the latest successful ETL run are rebuilt on
+the next read, so a reload of actuals is picked up; computed_at is UTC,
+like etl_runs.finished_at, and rebuilds of one plant, year and month are
+serialized with a transaction advisory lock. preliminary_months()
+lists months whose actuals are still preliminary close numbers.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from src.db.postgres import get_engine
+
+
+# How long close state is reused before it is re-read
+CLOSE_STATE_TTL_SECONDS = 60
+
+PLANT_CODES = ("KC", "CC")
+
+# plant_code -> budget_lines.budget_entity
+PLANT_BUDGET_ENTITIES = {"KC": "Kyger", "CC": "Clifty"}
+
+MONTH_COLUMNS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+
+@dataclass
+class CloseState:
+    """Last closed period of a plant."""
+    plant_code: str
+    fiscal_year: int
+    period: int
+    closed_at: Optional[datetime] = None
+    closed_by: Optional[str] = None
+
+
+@dataclass
+class _Snapshot:
+    loaded_at: float
+    closes: Dict[str, CloseState]
+    periods: Dict[Tuple[int, int], Tuple[date, date]]  # (year, period) -> (start, end)
+
+
+_snapshot: Optional[_Snapshot] = None
+_lock = threading.Lock()
+
+
+def _load_snapshot() -> _Snapshot:
+    closes = {}
+    periods = {}
+    with get_engine().connect() as conn:
+        try:
+            rows = conn.execute(text("""
+                SELECT DISTINCT ON (plant_code) plant_code, fiscal_year, period, closed_at, closed_by
+                FROM period_closes
+                ORDER BY plant_code, fiscal_year DESC, period DESC
+            """))
+            for row in rows:
+                closes[row.plant_code] = CloseState(
+                    row.plant_code, row.fiscal_year, row.period, row.closed_at, row.closed_by
+                )
+            rows = conn.execute(text("""
+                SELECT fiscal_year, period, start_date, end_date FROM fiscal_periods
+            """))
+            periods = {(r.fiscal_year, r.period): (r.start_date, r.end_date) for r in rows}
+        except Exception:
+            # Tables not created yet: no closes, calendar fallback only
+            pass
+    return _Snapshot(time.monotonic(), closes, periods)
+
+
+def _get_snapshot() -> _Snapshot:
+    global _snapshot
+    with _lock:
+        snapshot = _snapshot
+    if snapshot is None or time.monotonic() - snapshot.loaded_at > CLOSE_STATE_TTL_SECONDS:
+        snapshot = _load_snapshot()
+        with _lock:
+            _snapshot = snapshot
+    return snapshot
+
+
+def invalidate_close_state():
+    """Force the next read to reload close state and the calendar."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def get_close_state() -> Dict[str, CloseState]:
+    """Last closed period per plant (plants never closed are omitted)."""
+    return dict(_get_snapshot().closes)
+
+
+def _calendar_month(snapshot: _Snapshot, year: int, today: date) -> int:
+    """Last period of `year` that has ended by `today` (0-12)."""
+    ended = [period for (y, period), (_, end) in snapshot.periods.items() if y == year and end < today]
+    if ended:
+        return max(ended)
+    if any(y == year for y, _ in snapshot.periods):
+        return 0
+    # Year not in the calendar: assume calendar months
+    if year < today.year:
+        return 12
+    if year > today.year:
+        return 0
+    return today.month - 1
+
+
+def current_month(year: int, plant_code: Optional[str] = None, today: Optional[date] = None) -> int:
+    """
+    Last closed month of `year` (0-12).
+
+    Args:
+        year: Fiscal year
+        plant_code: Plant; None for the corporate view (the earliest
+            close across plants, so every plant's month is final)
+        today: Reference date for the calendar fallback (default today)
+
+    Returns:
+        Month number; 12 for fully closed years, 0 if nothing is closed
+    """
+    if plant_code is None:
+        return min(current_month(year, code, today) for code in PLANT_CODES)
+
+    snapshot = _get_snapshot()
+    state = snapshot.closes.get(plant_code)
+    if state is None:
+        return _calendar_month(snapshot, year, today or date.today())
+    if year < state.fiscal_year:
+        return 12
+    if year > state.fiscal_year:
+        return 0
+    return state.period
+
+
+def preliminary_months(year: int) -> List[int]:
+    """
+    Months of `year` whose actuals are preliminary (DB2 aggregates loaded
+    during close; see src/etl/preliminary.py) until the detailed load.
+    """
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("""
+            SELECT txmnth FROM preliminary_periods
+            WHERE txyear = :year
+            ORDER BY txmnth
+        """), {"year": year})
+        return [row[0] for row in rows]
+
+
+# =============================================================================
+# Closing
+# =============================================================================
+
+def close_period(
+    plant_code: str,
+    fiscal_year: int,
+    period: int,
+    closed_by: Optional[str] = None,
+) -> dict:
+    """
+    Close a period for a plant and precompute its YTD aggregates.
+
+    Periods close in order: the period must follow the plant's last
+    close (any period if the plant has never closed). The close and the
+    aggregates are committed together.
+
+    Raises:
+        ValueError: Unknown plant or period, or out of order
+    """
+    if plant_code not in PLANT_CODES:
+        raise ValueError(f"Unknown plant {plant_code}")
+
+    with get_engine().begin() as conn:
+        exists = conn.execute(text("""
+            SELECT 1 FROM fiscal_periods WHERE fiscal_year = :year AND period = :period
+        """), {"year": fiscal_year, "period": period}).first()
+        if not exists:
+            raise ValueError(f"Period {fiscal_year}-{period:02d} is not in the fiscal calendar")
+
+        last = conn.execute(text("""
+            SELECT fiscal_year, period FROM period_closes
+            WHERE plant_code = :plant_code
+            ORDER BY fiscal_year DESC, period DESC
+            LIMIT 1
+            FOR UPDATE
+        """), {"plant_code": plant_code}).first()
+        if last is not None:
+            expected = (last.fiscal_year + 1, 1) if last.period == 12 else (last.fiscal_year, last.period + 1)
+            if (fiscal_year, period) != expected:
+                raise ValueError(
+                    f"{plant_code} last closed {last.fiscal_year}-{last.period:02d}; "
+                    f"next period to close is {expected[0]}-{expected[1]:02d}"
+                )
+
+        conn.execute(text("""
+            INSERT INTO period_closes (plant_code, fiscal_year, period, closed_at, closed_by)
+            VALUES (:plant_code, :year, :period, NOW(), :closed_by)
+        """), {"plant_code": plant_code, "year": fiscal_year, "period": period, "closed_by": closed_by})
+
+        departments = precompute_ytd(conn, plant_code, fiscal_year, period)
+
+    invalidate_close_state()
+    from src.engine.projections import invalidate_projections
+    invalidate_projections(fiscal_year)
+
+    return {
+        "plant_code": plant_code,
+        "fiscal_year": fiscal_year,
+        "period": period,
+        "departments": departments,
+    }
+
+
+# =============================================================================
+# YTD aggregates
+# =============================================================================
+
+def _lock_ytd(db_conn, plant_code: str, fiscal_year: int, through_period: int):
+    """Hold the rebuild lock of a plant, year and month until the transaction ends."""
+    db_conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"), {
+        "lock_key": f"ytd_aggregates:{plant_code}:{fiscal_year}:{through_period}",
+    })
+
+
+def _ytd_fresh(db_conn, params: dict) -> bool:
+    """True if the month's aggregates exist and postdate the latest successful ETL run."""
+    return bool(db_conn.execute(text("""
+        SELECT MIN(computed_at) >= COALESCE(
+            (SELECT MAX(finished_at) FROM etl_runs WHERE status = 'success'), MIN(computed_at)
+        )
+        FROM ytd_aggregates
+        WHERE plant_code = :plant_code AND fiscal_year = :year AND through_period = :period
+    """), params).scalar())
+
+
+def precompute_ytd(db_conn, plant_code: str, fiscal_year: int, through_period: int) -> int:
+    """
+    (Re)build ytd_aggregates for a plant, year and month.
+
+    Takes the month's advisory lock, so concurrent rebuilds run one after
+    the other instead of interleaving their DELETE and INSERT.
+
+    Returns:
+        Number of departments written
+    """
+    _lock_ytd(db_conn, plant_code, fiscal_year, through_period)
+    budget_ytd = " + ".join(f"COALESCE({m}, 0)" for m in MONTH_COLUMNS[:through_period]) or "0"
+    params = {
+        "plant_code": plant_code,
+        "year": fiscal_year,
+        "period": through_period,
+        "entity": PLANT_BUDGET_ENTITIES.get(plant_code),
+        "computed_at": datetime.utcnow(),
+    }
+
+    db_conn.execute(text("""
+        DELETE FROM ytd_aggregates
+        WHERE plant_code = :plant_code AND fiscal_year = :year AND through_period = :period
+    """), params)
+
+    result = db_conn.execute(text(f"""
+        INSERT INTO ytd_aggregates (
+            plant_code, fiscal_year, through_period, dept_code,
+            ytd_actual, ytd_budget, annual_budget, computed_at
+        )
+        SELECT
+            :plant_code, :year, :period, COALESCE(a.dept_code, b.department),
+            COALESCE(a.ytd_actual, 0), COALESCE(b.ytd_budget, 0), COALESCE(b.annual_budget, 0),
+            :computed_at
+        FROM (
+            SELECT dept_code, SUM(gxfamt) AS ytd_actual
+            FROM transaction_budget_groups
+            WHERE txyear = :year AND plant_code = :plant_code AND txmnth <= :period
+            GROUP BY dept_code
+        ) a
+        FULL OUTER JOIN (
+            SELECT COALESCE(department, 'UNKNOWN') AS department,
+                   SUM({budget_ytd}) AS ytd_budget,
+                   SUM(total) AS annual_budget
+            FROM budget_lines
+            WHERE budget_year = :year AND budget_entity = :entity
+            GROUP BY COALESCE(department, 'UNKNOWN')
+        ) b ON a.dept_code = b.department
+        WHERE COALESCE(a.dept_code, b.department) IS NOT NULL
+    """), params)
+    return result.rowcount
+
+
+def refresh_ytd_aggregates(fiscal_year: int) -> int:
+    """
+    Rebuild the YTD aggregates of every period closed in a year.
+
+    Run after actuals or budgets are reloaded, so closed months reflect
+    the reload.
+
+    Returns:
+        Number of department rows written
+    """
+    with get_engine().begin() as conn:
+        closes = conn.execute(text("""
+            SELECT plant_code, period FROM period_closes
+            WHERE fiscal_year = :year
+            ORDER BY plant_code, period
+        """), {"year": fiscal_year}).fetchall()
+        written = sum(precompute_ytd(conn, plant_code, fiscal_year, period) for plant_code, period in closes)
+
+    from src.engine.projections import invalidate_projections
+    invalidate_projections(fiscal_year)
+    return written
+
+
+def get_ytd_aggregates(plant_code: str, fiscal_year: int, through_period: int) -> List[dict]:
+    """
+    YTD actual, YTD budget and annual budget per department.
+
+    Read from ytd_aggregates; built (and stored) on first request for a
+    month that was not closed through close_period(), and rebuilt when
+    older than the latest successful ETL run. Concurrent readers of a
+    stale month wait for the first one's rebuild rather than repeating it.
+    """
+    params = {"plant_code": plant_code, "year": fiscal_year, "period": through_period}
+    with get_engine().begin() as conn:
+        if not _ytd_fresh(conn, params):
+            _lock_ytd(conn, plant_code, fiscal_year, through_period)
+            # Another request may have rebuilt it while we waited
+            if not _ytd_fresh(conn, params):
+                precompute_ytd(conn, plant_code, fiscal_year, through_period)
+
+        rows = conn.execute(text("""
+            SELECT dept_code, ytd_actual, ytd_budget, annual_budget
+            FROM ytd_aggregates
+            WHERE plant_code = :plant_code AND fiscal_year = :year AND through_period = :period
+            ORDER BY dept_code
+        """), params)
+        return [
+            {
+                "dept_code": row.dept_code,
+                "ytd_actual": float(row.ytd_actual),
+                "ytd_budget": float(row.ytd_budget),
+                "annual_budget": float(row.annual_budget),
+            }
+            for row in rows
+        ]
@@ -18,6 +18,7 @@ from src.models import Plant, Period, CostCategory, Scenario, Forecast
 from src.models.capital_asset import CapitalAsset, CapitalProject, AssetStatus
 from src.models.period import Granularity
 from src.models.cost_category import CostSection
+from src.engine.scenario_layers import forecast_for_write
 
 
 @dataclass
@@ -268,33 +269,11 @@ def _upsert_forecast(
     amount: Decimal,
     stats: dict,
 ) -> None:
-    """Helper to create or update a forecast record."""
-    existing = (
-        db.query(Forecast)
-        .filter(
-            Forecast.scenario_id == scenario_id,
-            Forecast.plant_id == plant_id,
-            Forecast.category_id == category_id,
-            Forecast.period_id == period_id,
-        )
-        .first()
-    )
-    
-    if existing:
-        existing.cost_dollars = amount
-        existing.notes = "Auto-calculated depreciation"
-        stats["forecasts_updated"] += 1
-    else:
-        forecast = Forecast(
-            scenario_id=scenario_id,
-            plant_id=plant_id,
-            category_id=category_id,
-            period_id=period_id,
-            cost_dollars=amount,
-            notes="Auto-calculated depreciation",
-        )
-        db.add(forecast)
-        stats["forecasts_created"] += 1
+    """Helper to create or update a forecast record (an override on copy-on-write scenarios)."""
+    forecast, created = forecast_for_write(db, scenario_id, plant_id, category_id, period_id)
+    forecast.cost_dollars = amount
+    forecast.notes = "Auto-calculated depreciation"
+    stats["forecasts_created" if created else "forecasts_updated"] += 1
 
 
 def project_future_depreciation(
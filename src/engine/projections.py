@@ -0,0 +1,348 @@
+"""
+Year-end projections for department forecasts.
+
+A projection is YTD actuals through the close month plus an estimate of
+the remaining months, for every plant x department at once:
+
+    forecast  - saved department forecast, else the budget, else run-rate
+    run_rate  - average closed month carried forward
+    seasonal  - prior-year monthly shape scaled to this year's YTD
+                (run-rate where there is no usable prior-year YTD)
+
+Inputs are loaded with one query per source into (department x month)
+arrays and projected in a single vectorized pass. Results are cached per
+(year, close month, method) and revalidated with a cheap token query
+(saved forecast count / latest update and the latest successful ETL run),
+so saves and loads from other processes invalidate them too;
+invalidate_projections() drops them immediately in this process.
+"""
+
+import enum
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from src.db.postgres import get_engine
+from src.engine.close_calendar import MONTH_COLUMNS, PLANT_BUDGET_ENTITIES
+
+
+# budget_lines.budget_entity -> plant_code
+BUDGET_ENTITY_PLANTS = {entity: plant for plant, entity in PLANT_BUDGET_ENTITIES.items()}
+
+# SQLSTATE for a relation that does not exist
+UNDEFINED_TABLE = "42P01"
+
+
+class ProjectionMethod(str, enum.Enum):
+    """How the months after the close month are estimated."""
+    FORECAST = "forecast"
+    RUN_RATE = "run_rate"
+    SEASONAL = "seasonal"
+
+
+@dataclass
+class ProjectionInputs:
+    """Monthly inputs for one year, one row per (plant_code, dept_code)."""
+    year: int
+    keys: List[Tuple[str, str]]
+    actuals: np.ndarray        # (n, 12)
+    prior_actuals: np.ndarray  # (n, 12) same months of the previous year
+    budget: np.ndarray         # (n, 12)
+    saved: np.ndarray          # (n, 12) department_forecasts
+    has_budget: np.ndarray     # (n,) bool
+    has_saved: np.ndarray      # (n,) bool
+    saved_version: Optional[np.ndarray] = None  # (n,) department_forecasts.version, 0 if none
+
+
+@dataclass
+class DepartmentProjection:
+    """Projection for one plant/department."""
+    plant_code: str
+    dept_code: str
+    actuals: List[float]
+    budget: List[float]
+    estimate: List[float]      # method estimate for every month
+    forecast: List[float]      # actuals through the close month, estimate after
+    ytd_actual: float
+    ytd_budget: float
+    total_budget: float
+    year_end_projection: float
+    has_saved_forecast: bool
+    source: str                # what the remaining months came from
+    version: int = 0           # saved forecast row version (0: no saved row)
+
+
+@dataclass
+class ProjectionSet:
+    """All projections for a year as of a close month."""
+    year: int
+    close_month: int
+    method: ProjectionMethod
+    computed_at: datetime
+    departments: Dict[Tuple[str, str], DepartmentProjection]
+
+    def for_plant(self, plant_code: str) -> List[DepartmentProjection]:
+        """Departments of one plant, sorted by dept_code."""
+        return sorted(
+            (p for (plant, _), p in self.departments.items() if plant == plant_code),
+            key=lambda p: p.dept_code,
+        )
+
+    def get(self, plant_code: str, dept_code: str) -> Optional[DepartmentProjection]:
+        return self.departments.get((plant_code, dept_code))
+
+
+# =============================================================================
+# Calculation
+# =============================================================================
+
+def project(
+    inputs: ProjectionInputs,
+    close_month: int,
+    method: ProjectionMethod = ProjectionMethod.FORECAST,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Project every row of `inputs` to year end.
+
+    Args:
+        inputs: Monthly inputs
+        close_month: Last closed month (0-12); later months are projected
+        method: Estimate for the remaining months
+
+    Returns:
+        (grid, estimate, source): (n, 12) actuals through the close month
+        then estimates, (n, 12) estimates for every month, and the source
+        of each row's estimate
+    """
+    method = ProjectionMethod(method)
+    n = len(inputs.keys)
+    closed = np.arange(1, 13) <= close_month
+
+    ytd = inputs.actuals[:, closed].sum(axis=1)
+    run_rate = ytd / close_month if close_month else np.zeros(n)
+    run_rate_grid = np.repeat(run_rate[:, None], 12, axis=1)
+    source = np.full(n, ProjectionMethod.RUN_RATE.value, dtype=object)
+
+    if method == ProjectionMethod.RUN_RATE:
+        estimate = run_rate_grid
+    elif method == ProjectionMethod.SEASONAL:
+        prior_ytd = inputs.prior_actuals[:, closed].sum(axis=1)
+        seasonal = prior_ytd > 0
+        scale = np.divide(ytd, prior_ytd, out=np.zeros(n), where=seasonal)
+        estimate = np.where(seasonal[:, None], inputs.prior_actuals * scale[:, None], run_rate_grid)
+        source[seasonal] = ProjectionMethod.SEASONAL.value
+    else:
+        estimate = np.where(
+            inputs.has_saved[:, None], inputs.saved,
+            np.where(inputs.has_budget[:, None], inputs.budget, run_rate_grid),
+        )
+        source[inputs.has_budget] = "budget"
+        source[inputs.has_saved] = "saved"
+
+    grid = np.where(closed[None, :], inputs.actuals, estimate)
+    return grid, estimate, source
+
+
+def build_projection_set(
+    inputs: ProjectionInputs,
+    close_month: int,
+    method: ProjectionMethod = ProjectionMethod.FORECAST,
+) -> ProjectionSet:
+    """Run project() and package the rows."""
+    method = ProjectionMethod(method)
+    grid, estimate, source = project(inputs, close_month, method)
+    closed = np.arange(1, 13) <= close_month
+    ytd_actual = inputs.actuals[:, closed].sum(axis=1)
+    ytd_budget = inputs.budget[:, closed].sum(axis=1)
+    total_budget = inputs.budget.sum(axis=1)
+    year_end = grid.sum(axis=1)
+
+    departments = {}
+    for i, (plant_code, dept_code) in enumerate(inputs.keys):
+        departments[(plant_code, dept_code)] = DepartmentProjection(
+            plant_code=plant_code,
+            dept_code=dept_code,
+            actuals=inputs.actuals[i].tolist(),
+            budget=inputs.budget[i].tolist(),
+            estimate=estimate[i].tolist(),
+            forecast=grid[i].tolist(),
+            ytd_actual=float(ytd_actual[i]),
+            ytd_budget=float(ytd_budget[i]),
+            total_budget=float(total_budget[i]),
+            year_end_projection=float(year_end[i]),
+            has_saved_forecast=bool(inputs.has_saved[i]),
+            source=source[i],
+            version=int(inputs.saved_version[i]) if inputs.saved_version is not None else 0,
+        )
+
+    return ProjectionSet(
+        year=inputs.year,
+        close_month=close_month,
+        method=method,
+        computed_at=datetime.utcnow(),
+        departments=departments,
+    )
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def _fetch(conn, sql: str, params: dict) -> list:
+    """
+    Rows of a query, or [] if its table is missing (as on a fresh database).
+
+    Only undefined_table (SQLSTATE 42P01) is absorbed; any other error is a
+    real failure and propagates rather than projecting from missing inputs.
+    """
+    try:
+        with conn.begin_nested():
+            return conn.execute(text(sql), params).fetchall()
+    except ProgrammingError as e:
+        if getattr(e.orig, "pgcode", None) == UNDEFINED_TABLE:
+            return []
+        raise
+
+
+def _monthly(rows: Sequence[tuple], index: Dict[Tuple[str, str], int], n: int) -> np.ndarray:
+    """(n, 12) array from (plant_code, dept_code, m1..m12) rows."""
+    grid = np.zeros((n, 12))
+    for row in rows:
+        grid[index[(row[0], row[1])]] = [float(v) if v is not None else 0.0 for v in row[2:14]]
+    return grid
+
+
+def load_projection_inputs(conn, year: int) -> ProjectionInputs:
+    """
+    Load actuals (this and last year), budget and saved forecasts for all
+    plants and departments.
+    """
+    actual_rows = _fetch(conn, """
+        SELECT plant_code, dept_code, txyear, txmnth, SUM(gxfamt)
+        FROM transaction_budget_groups
+        WHERE txyear IN (:year, :prior_year) AND txmnth BETWEEN 1 AND 12
+        GROUP BY plant_code, dept_code, txyear, txmnth
+    """, {"year": year, "prior_year": year - 1})
+
+    month_sums = ", ".join(f"SUM({m})" for m in MONTH_COLUMNS)
+    budget_rows = [
+        (BUDGET_ENTITY_PLANTS[row[0]], row[1] or "UNKNOWN", *row[2:])
+        for row in _fetch(conn, f"""
+            SELECT budget_entity, department, {month_sums}
+            FROM budget_lines
+            WHERE budget_year = :year AND budget_entity = ANY(:entities)
+            GROUP BY budget_entity, department
+        """, {"year": year, "entities": list(BUDGET_ENTITY_PLANTS)})
+    ]
+
+    saved_rows = _fetch(conn, f"""
+        SELECT plant_code, dept_code, {", ".join(MONTH_COLUMNS)}, version
+        FROM department_forecasts
+        WHERE budget_year = :year
+    """, {"year": year})
+
+    keys = sorted(
+        {(row[0], row[1]) for row in actual_rows if row[2] == year}
+        | {(row[0], row[1]) for row in budget_rows}
+        | {(row[0], row[1]) for row in saved_rows}
+    )
+    index = {key: i for i, key in enumerate(keys)}
+    n = len(keys)
+
+    actuals = np.zeros((n, 12))
+    prior_actuals = np.zeros((n, 12))
+    for plant_code, dept_code, txyear, month, amount in actual_rows:
+        i = index.get((plant_code, dept_code))
+        if i is None:
+            continue  # prior-year-only department
+        target = actuals if txyear == year else prior_actuals
+        target[i, month - 1] += float(amount or 0)
+
+    has_budget = np.zeros(n, dtype=bool)
+    has_budget[[index[(row[0], row[1])] for row in budget_rows]] = True
+    has_saved = np.zeros(n, dtype=bool)
+    has_saved[[index[(row[0], row[1])] for row in saved_rows]] = True
+    saved_version = np.zeros(n, dtype=int)
+    for row in saved_rows:
+        saved_version[index[(row[0], row[1])]] = row[14]
+
+    return ProjectionInputs(
+        year=year,
+        keys=keys,
+        actuals=actuals,
+        prior_actuals=prior_actuals,
+        budget=_monthly(budget_rows, index, n),
+        saved=_monthly(saved_rows, index, n),
+        has_budget=has_budget,
+        has_saved=has_saved,
+        saved_version=saved_version,
+    )
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+_cache: Dict[Tuple[int, int, str], Tuple[tuple, ProjectionSet]] = {}
+_cache_lock = threading.Lock()
+
+
+def _source_token(conn, year: int) -> Optional[tuple]:
+    """Changes whenever saved forecasts change or an ETL job finishes."""
+    row = _fetch(conn, """
+        SELECT
+            (SELECT COUNT(*) FROM department_forecasts WHERE budget_year = :year),
+            (SELECT MAX(updated_at) FROM department_forecasts WHERE budget_year = :year),
+            (SELECT MAX(finished_at) FROM etl_runs WHERE status = 'success')
+    """, {"year": year})
+    return tuple(row[0]) if row else None
+
+
+def get_projections(
+    year: int,
+    close_month: int,
+    method: ProjectionMethod = ProjectionMethod.FORECAST,
+) -> ProjectionSet:
+    """
+    Projections for every plant and department, cached per
+    (year, close_month, method).
+
+    Args:
+        year: Fiscal year
+        close_month: Last closed month (0-12)
+        method: Estimate for the remaining months
+
+    Returns:
+        ProjectionSet
+    """
+    method = ProjectionMethod(method)
+    key = (year, close_month, method.value)
+
+    with get_engine().connect() as conn:
+        token = _source_token(conn, year)
+        with _cache_lock:
+            cached = _cache.get(key)
+        if token is not None and cached and cached[0] == token:
+            return cached[1]
+
+        projections = build_projection_set(load_projection_inputs(conn, year), close_month, method)
+
+    if token is not None:
+        with _cache_lock:
+            _cache[key] = (token, projections)
+    return projections
+
+
+def invalidate_projections(year: Optional[int] = None):
+    """Drop cached projections (all, or one year)."""
+    with _cache_lock:
+        if year is None:
+            _cache.clear()
+        else:
+            for key in [k for k in _cache if k[0] == year]:
+                del _cache[key]
@@ -0,0 +1,395 @@
+"""
+Monte Carlo cost risk simulation.
+
+Scenarios hold point estimates. This module samples the main cost drivers
+around a base scenario to produce P10/P50/P90 bands per plant and year:
+
+- Delivered coal price (lognormal multiplier, mean 1.0)
+- Heat rate (normal multiplier on fuel burned per MWh)
+- Generation (normal multiplier, floored at a minimum output)
+- Asset Health repairs (each item occurs with its risk_factor probability)
+
+Draws are vectorized with NumPy across trials. Plant/years are independent,
+so they can optionally be spread across a process pool; each plant/year gets
+its own child seed so results are identical regardless of worker count.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models import Plant, Period, CostCategory, Scenario
+from src.models.cost_category import CostSection
+from src.models.scenario import ScenarioStatus, ScenarioRiskBand
+from src.engine.scenario_layers import forecast_source
+from src.etl.asset_health import AssetHealthItem
+
+
+PERCENTILES = (10, 50, 90)
+
+# Cap on trials x repair items held in memory at once when sampling repairs
+REPAIR_DRAW_BLOCK = 5_000_000
+
+
+@dataclass
+class RiskAssumptions:
+    """Volatility assumptions for the simulation (one standard deviation)."""
+    coal_price_volatility: float = 0.15   # Lognormal sigma on delivered coal price
+    heat_rate_volatility: float = 0.02    # Fraction of base heat rate
+    generation_volatility: float = 0.08   # Fraction of base generation
+    min_generation_factor: float = 0.20   # Floor on sampled generation
+
+
+@dataclass
+class PlantYearInputs:
+    """Point-estimate inputs for one plant and year of the base scenario."""
+    plant_id: int
+    year: int
+    generation_mwh: float
+    fuel_cost: float
+    other_cost: float
+    repair_costs: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    repair_probabilities: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+
+@dataclass
+class RiskBandResult:
+    """Simulated distribution summary for one plant and year."""
+    plant_id: int
+    year: int
+    trials: int
+    cost_mean: float
+    cost_p10: float
+    cost_p50: float
+    cost_p90: float
+    cost_per_mwh_p10: float
+    cost_per_mwh_p50: float
+    cost_per_mwh_p90: float
+    generation_p50: float
+
+
+def simulate_plant_year(
+    inputs: PlantYearInputs,
+    assumptions: RiskAssumptions,
+    trials: int,
+    seed: np.random.SeedSequence,
+) -> RiskBandResult:
+    """
+    Run all trials for a single plant/year.
+
+    Args:
+        inputs: Base scenario values for the plant/year
+        assumptions: Volatility assumptions
+        trials: Number of Monte Carlo trials
+        seed: Seed sequence for this plant/year's random stream
+
+    Returns:
+        RiskBandResult with percentile bands
+    """
+    rng = np.random.default_rng(seed)
+
+    # Lognormal with mu = -sigma^2/2 keeps the expected price multiplier at 1.0
+    sigma = assumptions.coal_price_volatility
+    price_factor = rng.lognormal(mean=-0.5 * sigma ** 2, sigma=sigma, size=trials)
+    heat_rate_factor = np.maximum(
+        rng.normal(1.0, assumptions.heat_rate_volatility, size=trials), 0.5
+    )
+    generation_factor = np.maximum(
+        rng.normal(1.0, assumptions.generation_volatility, size=trials),
+        assumptions.min_generation_factor,
+    )
+
+    generation = inputs.generation_mwh * generation_factor
+    # Fuel burn scales with output and heat rate; cost scales with price
+    fuel = inputs.fuel_cost * price_factor * heat_rate_factor * generation_factor
+    total = fuel + inputs.other_cost
+
+    item_count = len(inputs.repair_costs)
+    if item_count:
+        block = max(1, REPAIR_DRAW_BLOCK // item_count)
+        for start in range(0, trials, block):
+            stop = min(start + block, trials)
+            occurs = rng.random((stop - start, item_count)) < inputs.repair_probabilities
+            total[start:stop] += occurs @ inputs.repair_costs
+
+    cost_per_mwh = np.divide(
+        total, generation,
+        out=np.full(trials, np.nan),
+        where=generation > 0,
+    )
+
+    cost_bands = np.percentile(total, PERCENTILES)
+    if np.isnan(cost_per_mwh).all():
+        cpm_bands = np.zeros(len(PERCENTILES))
+    else:
+        cpm_bands = np.nanpercentile(cost_per_mwh, PERCENTILES)
+
+    return RiskBandResult(
+        plant_id=inputs.plant_id,
+        year=inputs.year,
+        trials=trials,
+        cost_mean=float(total.mean()),
+        cost_p10=float(cost_bands[0]),
+        cost_p50=float(cost_bands[1]),
+        cost_p90=float(cost_bands[2]),
+        cost_per_mwh_p10=float(cpm_bands[0]),
+        cost_per_mwh_p50=float(cpm_bands[1]),
+        cost_per_mwh_p90=float(cpm_bands[2]),
+        generation_p50=float(np.median(generation)),
+    )
+
+
+def _simulate_task(args) -> RiskBandResult:
+    """Process pool entry point (must be a module-level function)."""
+    return simulate_plant_year(*args)
+
+
+def run_simulation(
+    inputs: Sequence[PlantYearInputs],
+    assumptions: Optional[RiskAssumptions] = None,
+    trials: int = 20_000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> List[RiskBandResult]:
+    """
+    Simulate every plant/year in the inputs.
+
+    Args:
+        inputs: Plant/year base values (see build_simulation_inputs)
+        assumptions: Volatility assumptions (defaults if None)
+        trials: Number of trials per plant/year
+        seed: Root seed for reproducible results
+        workers: Process pool size; None or 1 runs in-process
+
+    Returns:
+        List of RiskBandResult in the same order as inputs
+    """
+    assumptions = assumptions or RiskAssumptions()
+    child_seeds = np.random.SeedSequence(seed).spawn(len(inputs))
+    tasks = [
+        (item, assumptions, trials, child_seed)
+        for item, child_seed in zip(inputs, child_seeds)
+    ]
+
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_simulate_task, tasks))
+
+    return [_simulate_task(task) for task in tasks]
+
+
+def build_simulation_inputs(
+    db: Session,
+    scenario_id: int,
+    year_from: int,
+    year_to: int,
+    asset_health_items: Optional[List[AssetHealthItem]] = None,
+) -> List[PlantYearInputs]:
+    """
+    Collect base scenario values per plant/year.
+
+    Fuel section costs are treated as price/heat-rate/generation sensitive;
+    all other sections pass through unchanged. When Asset Health items are
+    supplied, the deterministic Asset Health forecast is replaced by the
+    sampled repairs so it is not counted twice.
+    """
+    asset_health_category = (
+        db.query(CostCategory)
+        .filter(CostCategory.short_name == "Asset Health")
+        .first()
+    )
+
+    scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+    F = forecast_source(scenario)
+
+    rows = (
+        db.query(
+            F.plant_id,
+            Period.year,
+            CostCategory.section,
+            F.category_id,
+            func.sum(F.cost_dollars),
+            func.sum(F.generation_mwh),
+        )
+        .join(Period, F.period_id == Period.id)
+        .join(CostCategory, F.category_id == CostCategory.id)
+        .filter(
+            F.scenario_id == scenario_id,
+            F.plant_id.isnot(None),
+            Period.year >= year_from,
+            Period.year <= year_to,
+        )
+        .group_by(F.plant_id, Period.year, CostCategory.section, F.category_id)
+        .all()
+    )
+
+    totals: Dict[tuple, Dict[str, float]] = {}
+    for plant_id, year, section, category_id, cost, generation in rows:
+        entry = totals.setdefault(
+            (plant_id, year), {"generation": 0.0, "fuel": 0.0, "other": 0.0}
+        )
+        entry["generation"] += float(generation or 0)
+
+        if (
+            asset_health_items is not None
+            and asset_health_category
+            and category_id == asset_health_category.id
+        ):
+            continue
+
+        if section == CostSection.FUEL:
+            entry["fuel"] += float(cost or 0)
+        else:
+            entry["other"] += float(cost or 0)
+
+    # Group repair items by plant/year (items reference plants by name)
+    repairs: Dict[tuple, List[AssetHealthItem]] = {}
+    if asset_health_items:
+        plants = {}
+        for p in db.query(Plant).all():
+            plants[p.name] = p.id
+            plants[p.short_name] = p.id
+        for item in asset_health_items:
+            plant_id = plants.get(item.plant_name)
+            if plant_id is None or not (year_from <= item.year <= year_to):
+                continue
+            repairs.setdefault((plant_id, item.year), []).append(item)
+            totals.setdefault(
+                (plant_id, item.year), {"generation": 0.0, "fuel": 0.0, "other": 0.0}
+            )
+
+    inputs = []
+    for (plant_id, year), entry in sorted(totals.items()):
+        items = repairs.get((plant_id, year), [])
+        inputs.append(PlantYearInputs(
+            plant_id=plant_id,
+            year=year,
+            generation_mwh=entry["generation"],
+            fuel_cost=entry["fuel"],
+            other_cost=entry["other"],
+            repair_costs=np.array([float(i.estimated_cost) for i in items]),
+            repair_probabilities=np.array([i.risk_factor for i in items]),
+        ))
+
+    return inputs
+
+
+def save_risk_scenario(
+    db: Session,
+    base_scenario: Scenario,
+    results: List[RiskBandResult],
+    trials: int,
+    created_by: Optional[str] = None,
+) -> Scenario:
+    """
+    Persist simulation results as a derived scenario.
+
+    The new scenario points at the base through parent_scenario_id and
+    holds one ScenarioRiskBand row per plant/year.
+    """
+    derived = Scenario(
+        name=f"{base_scenario.name} - Risk Bands",
+        description=(
+            f"Monte Carlo simulation of scenario {base_scenario.id} "
+            f"({trials:,} trials per plant/year)"
+        ),
+        scenario_type=base_scenario.scenario_type,
+        status=ScenarioStatus.DRAFT,
+        version=base_scenario.version,
+        parent_scenario_id=base_scenario.id,
+        created_by=created_by,
+        is_active=True,
+    )
+    db.add(derived)
+    db.flush()
+
+    db.add_all([
+        ScenarioRiskBand(
+            scenario_id=derived.id,
+            plant_id=r.plant_id,
+            year=r.year,
+            trials=r.trials,
+            cost_mean=Decimal(str(round(r.cost_mean, 2))),
+            cost_p10=Decimal(str(round(r.cost_p10, 2))),
+            cost_p50=Decimal(str(round(r.cost_p50, 2))),
+            cost_p90=Decimal(str(round(r.cost_p90, 2))),
+            cost_per_mwh_p10=Decimal(str(round(r.cost_per_mwh_p10, 4))),
+            cost_per_mwh_p50=Decimal(str(round(r.cost_per_mwh_p50, 4))),
+            cost_per_mwh_p90=Decimal(str(round(r.cost_per_mwh_p90, 4))),
+            generation_mwh_p50=Decimal(str(round(r.generation_p50, 4))),
+        )
+        for r in results
+    ])
+    db.commit()
+    db.refresh(derived)
+    return derived
+
+
+def simulate_scenario_risk(
+    scenario_id: int,
+    year_from: int,
+    year_to: int,
+    trials: int = 20_000,
+    assumptions: Optional[RiskAssumptions] = None,
+    asset_health_items: Optional[List[AssetHealthItem]] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    persist: bool = True,
+    created_by: Optional[str] = None,
+    db: Session = None,
+) -> dict:
+    """
+    Simulate cost risk for a scenario and optionally save the bands.
+
+    Args:
+        scenario_id: Base scenario to simulate around
+        year_from: First year
+        year_to: Last year
+        trials: Trials per plant/year
+        assumptions: Volatility assumptions
+        asset_health_items: Repair items to sample; None keeps the
+            scenario's Asset Health forecast as a fixed cost
+        seed: Root seed for reproducible results
+        workers: Process pool size
+        persist: If True, save as a derived scenario
+        created_by: User recorded on the derived scenario
+        db: Database session
+
+    Returns:
+        Dict with the derived scenario id (if persisted) and the bands
+    """
+    close_db = False
+    if db is None:
+        db = SessionLocal()
+        close_db = True
+
+    try:
+        base = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+        if not base:
+            raise ValueError(f"Scenario {scenario_id} not found")
+
+        inputs = build_simulation_inputs(
+            db, scenario_id, year_from, year_to, asset_health_items
+        )
+        results = run_simulation(inputs, assumptions, trials, seed, workers)
+
+        derived_id = None
+        if persist and results:
+            derived_id = save_risk_scenario(db, base, results, trials, created_by).id
+
+        return {
+            "base_scenario_id": scenario_id,
+            "scenario_id": derived_id,
+            "trials": trials,
+            "bands": results,
+        }
+
+    finally:
+        if close_db:
+            db.close()
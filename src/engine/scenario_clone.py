@@ -0,0 +1,307 @@
+"""
+Scenario cloning.
+
+Copies a scenario's forecasts and driver values with set-based
+INSERT ... SELECT statements so a 15-year monthly scenario is duplicated
+in a handful of statements instead of one ORM object per row. Everything
+runs in the caller's transaction.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.scenario import Scenario, ScenarioStatus, StorageMode
+from src.engine.scenario_layers import resolved_forecasts_sql
+
+
+@dataclass
+class DriverOverride:
+    """
+    Replacement value for a driver in the cloned scenario.
+
+    period_yyyymm of None applies the value to every period of the driver
+    already present in the clone. plant_id matches exactly (None is the
+    plant-agnostic row).
+    """
+    driver_name: str
+    value: float
+    plant_id: Optional[int] = None
+    period_yyyymm: Optional[str] = None
+
+
+def _subset_filters(
+    alias: str,
+    year_from: Optional[int],
+    year_to: Optional[int],
+    plant_ids: Optional[Sequence[int]],
+    category_ids: Optional[Sequence[int]],
+    params: dict,
+    year_expr: str,
+    keep_null_plant: bool,
+) -> str:
+    """Build the optional WHERE clauses shared by the copy statements."""
+    clauses = []
+    if year_from is not None:
+        clauses.append(f"{year_expr} >= :year_from")
+        params["year_from"] = year_from
+    if year_to is not None:
+        clauses.append(f"{year_expr} <= :year_to")
+        params["year_to"] = year_to
+    if plant_ids:
+        if keep_null_plant:
+            clauses.append(f"({alias}.plant_id = ANY(:plant_ids) OR {alias}.plant_id IS NULL)")
+        else:
+            clauses.append(f"{alias}.plant_id = ANY(:plant_ids)")
+        params["plant_ids"] = list(plant_ids)
+    if category_ids is not None:
+        clauses.append(f"{alias}.category_id = ANY(:category_ids)")
+        params["category_ids"] = list(category_ids)
+    return "".join(f" AND {c}" for c in clauses)
+
+
+def copy_scenario_data(
+    db: Session,
+    source_scenario_id: int,
+    target_scenario_id: int,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    plant_ids: Optional[Sequence[int]] = None,
+    category_ids: Optional[Sequence[int]] = None,
+    updated_by: Optional[str] = None,
+    include_forecasts: bool = True,
+) -> dict:
+    """
+    Copy forecasts and driver values from one scenario to another.
+
+    Forecasts are read through the source's parent chain, so copying an
+    overlay scenario produces a full grid.
+
+    Args:
+        db: Database session (not committed here)
+        source_scenario_id: Scenario to copy from
+        target_scenario_id: Scenario to copy into
+        year_from: Optional first year to copy
+        year_to: Optional last year to copy
+        plant_ids: Optional plant subset. Combined (NULL plant) forecasts
+            are skipped; plant-agnostic driver values are kept.
+        category_ids: Optional cost category subset (forecasts only)
+        updated_by: User recorded on the copied rows
+        include_forecasts: False to copy driver values only
+
+    Returns:
+        Dict with row counts
+    """
+    params = {
+        "source_id": source_scenario_id,
+        "target_id": target_scenario_id,
+        "scenario_ids": [source_scenario_id],
+        "updated_by": updated_by,
+    }
+    forecasts_copied = 0
+    if include_forecasts:
+        forecasts_copied = _copy_forecasts(
+            db, params, year_from, year_to, plant_ids, category_ids
+        )
+
+    driver_params = dict(params)
+    driver_filters = _subset_filters(
+        "dv", year_from, year_to, plant_ids, None, driver_params,
+        "CAST(SUBSTRING(dv.period_yyyymm, 1, 4) AS INTEGER)", True,
+    )
+
+    drivers = db.execute(text(f"""
+        INSERT INTO driver_values (
+            scenario_id, driver_id, plant_id, period_yyyymm,
+            value, notes, updated_at, updated_by
+        )
+        SELECT
+            :target_id, dv.driver_id, dv.plant_id, dv.period_yyyymm,
+            dv.value, dv.notes, NOW(), :updated_by
+        FROM driver_values dv
+        WHERE dv.scenario_id = :source_id{driver_filters}
+    """), driver_params)
+
+    return {
+        "forecasts_copied": forecasts_copied,
+        "driver_values_copied": drivers.rowcount,
+    }
+
+
+def _copy_forecasts(
+    db: Session,
+    params: dict,
+    year_from: Optional[int],
+    year_to: Optional[int],
+    plant_ids: Optional[Sequence[int]],
+    category_ids: Optional[Sequence[int]],
+) -> int:
+    """INSERT ... SELECT the source's resolved forecast grid."""
+    forecast_params = dict(params)
+    forecast_filters = _subset_filters(
+        "f", year_from, year_to, plant_ids, category_ids, forecast_params, "p.year", False
+    )
+
+    result = db.execute(text(f"""
+        INSERT INTO forecasts (
+            scenario_id, plant_id, category_id, period_id,
+            generation_mwh, cost_dollars, notes, updated_at, updated_by
+        )
+        SELECT
+            :target_id, f.plant_id, f.category_id, f.period_id,
+            f.generation_mwh, f.cost_dollars, f.notes, NOW(), :updated_by
+        FROM ({resolved_forecasts_sql()}) f
+        JOIN periods p ON p.id = f.period_id
+        WHERE f.scenario_id = :source_id{forecast_filters}
+    """), forecast_params)
+    return result.rowcount
+
+
+def apply_driver_overrides(
+    db: Session,
+    scenario_id: int,
+    overrides: List[DriverOverride],
+    updated_by: Optional[str] = None,
+) -> dict:
+    """
+    Apply driver overrides to a scenario in two statements.
+
+    Existing rows are updated from a VALUES list joined to driver
+    definitions by name; overrides for a specific period that have no row
+    yet are inserted.
+
+    Returns:
+        Dict with updated/inserted counts
+    """
+    if not overrides:
+        return {"driver_values_updated": 0, "driver_values_inserted": 0}
+
+    params = {"scenario_id": scenario_id, "updated_by": updated_by}
+    rows = []
+    for i, o in enumerate(overrides):
+        rows.append(
+            f"(CAST(:name_{i} AS VARCHAR(100)), CAST(:plant_{i} AS INTEGER), "
+            f"CAST(:period_{i} AS VARCHAR(6)), CAST(:value_{i} AS NUMERIC(18, 6)))"
+        )
+        params[f"name_{i}"] = o.driver_name
+        params[f"plant_{i}"] = o.plant_id
+        params[f"period_{i}"] = o.period_yyyymm
+        params[f"value_{i}"] = o.value
+    values_sql = ",\n            ".join(rows)
+
+    updated = db.execute(text(f"""
+        UPDATE driver_values dv
+        SET value = o.value,
+            notes = 'Clone override',
+            updated_at = NOW(),
+            updated_by = :updated_by
+        FROM (VALUES
+            {values_sql}
+        ) AS o(driver_name, plant_id, period_yyyymm, value)
+        JOIN driver_definitions dd ON dd.name = o.driver_name
+        WHERE dv.scenario_id = :scenario_id
+          AND dv.driver_id = dd.id
+          AND dv.plant_id IS NOT DISTINCT FROM o.plant_id
+          AND (o.period_yyyymm IS NULL OR dv.period_yyyymm = o.period_yyyymm)
+    """), params)
+
+    inserted = db.execute(text(f"""
+        INSERT INTO driver_values (
+            scenario_id, driver_id, plant_id, period_yyyymm,
+            value, notes, updated_at, updated_by
+        )
+        SELECT :scenario_id, dd.id, o.plant_id, o.period_yyyymm,
+               o.value, 'Clone override', NOW(), :updated_by
+        FROM (VALUES
+            {values_sql}
+        ) AS o(driver_name, plant_id, period_yyyymm, value)
+        JOIN driver_definitions dd ON dd.name = o.driver_name
+        WHERE o.period_yyyymm IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM driver_values dv
+              WHERE dv.scenario_id = :scenario_id
+                AND dv.driver_id = dd.id
+                AND dv.plant_id IS NOT DISTINCT FROM o.plant_id
+                AND dv.period_yyyymm = o.period_yyyymm
+          )
+    """), params)
+
+    return {
+        "driver_values_updated": updated.rowcount,
+        "driver_values_inserted": inserted.rowcount,
+    }
+
+
+def clone_scenario(
+    db: Session,
+    source_scenario_id: int,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    plant_ids: Optional[Sequence[int]] = None,
+    category_ids: Optional[Sequence[int]] = None,
+    driver_overrides: Optional[List[DriverOverride]] = None,
+    created_by: Optional[str] = None,
+    copy_on_write: bool = False,
+) -> dict:
+    """
+    Clone a scenario and its child rows in a single transaction.
+
+    The clone is a new draft version whose parent is the source. With
+    copy_on_write the clone is created in overlay storage mode and no
+    forecast rows are copied; it inherits the source's grid until cells
+    are overridden; year/plant subsets then only limit the driver values
+    copied. Driver values are always copied. On any error the
+    transaction is rolled back and nothing is created.
+
+    Returns:
+        Dict with the new scenario and row counts
+
+    Raises:
+        ValueError: If the source scenario does not exist, or a category
+            subset is combined with copy_on_write
+    """
+    if copy_on_write and category_ids is not None:
+        raise ValueError("A category subset cannot be used with copy-on-write clones")
+    source = db.query(Scenario).filter(Scenario.id == source_scenario_id).first()
+    if not source:
+        raise ValueError(f"Scenario {source_scenario_id} not found")
+
+    try:
+        clone = Scenario(
+            name=name or f"{source.name} (copy)",
+            description=description if description is not None else source.description,
+            scenario_type=source.scenario_type,
+            status=ScenarioStatus.DRAFT,
+            version=(source.version or 1) + 1,
+            parent_scenario_id=source.id,
+            storage_mode=(StorageMode.OVERLAY if copy_on_write else StorageMode.FULL).value,
+            created_by=created_by,
+            is_active=True,
+            is_locked=False,
+        )
+        db.add(clone)
+        db.flush()
+
+        stats = copy_scenario_data(
+            db, source.id, clone.id,
+            year_from=year_from,
+            year_to=year_to,
+            plant_ids=plant_ids,
+            category_ids=category_ids,
+            updated_by=created_by,
+            include_forecasts=not copy_on_write,
+        )
+        stats.update(apply_driver_overrides(db, clone.id, driver_overrides or [], created_by))
+
+        db.commit()
+        db.refresh(clone)
+
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"scenario": clone, **stats}
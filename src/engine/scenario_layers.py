@@ -0,0 +1,293 @@
+"""
+Copy-on-write scenario storage.
+
+A scenario in overlay storage mode keeps only the forecast cells it
+overrides; every other cell is inherited from its parent chain
+(parent_scenario_id), nearest ancestor first. The chain stops at the first
+scenario stored in full mode.
+
+Reads go through resolved_forecasts_sql(), a recursive CTE that flattens
+the chain with DISTINCT ON. resolve_scenario_forecasts() caches the
+flattened grid in-process and revalidates it with a cheap token query, so
+repeat reads of an unchanged chain skip the flattening. Writes go
+through forecast_for_write(), which turns an edit of an inherited cell
+into an override row in the scenario itself.
+
+materialize_scenario() turns an overlay scenario into a full copy; it is
+run when a scenario is locked/published so published numbers no longer
+move when an ancestor is edited.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, aliased
+
+from src.models import Forecast, Scenario
+from src.models.scenario import StorageMode
+
+
+# Guard against accidental cycles in parent_scenario_id
+MAX_CHAIN_DEPTH = 32
+
+
+_CHAIN_CTE = f"""
+    chain AS (
+        SELECT s.id AS root_id, s.id, s.parent_scenario_id, s.storage_mode, 0 AS depth
+        FROM scenarios s
+        WHERE s.id = ANY(:scenario_ids)
+        UNION ALL
+        SELECT c.root_id, s.id, s.parent_scenario_id, s.storage_mode, c.depth + 1
+        FROM scenarios s
+        JOIN chain c ON s.id = c.parent_scenario_id
+        WHERE c.storage_mode = '{StorageMode.OVERLAY.value}'
+          AND c.depth < {MAX_CHAIN_DEPTH}
+    )
+"""
+
+
+def resolved_forecasts_sql() -> str:
+    """
+    SQL returning the effective forecast grid for :scenario_ids.
+
+    Output columns match the forecasts table, with scenario_id set to the
+    requested scenario, plus source_scenario_id (the scenario the cell
+    actually lives in). Bind :scenario_ids as a list.
+    """
+    return f"""
+        WITH RECURSIVE {_CHAIN_CTE}
+        SELECT DISTINCT ON (c.root_id, f.plant_id, f.category_id, f.period_id)
+            f.id,
+            c.root_id AS scenario_id,
+            f.plant_id,
+            f.category_id,
+            f.period_id,
+            f.generation_mwh,
+            f.cost_dollars,
+            f.notes,
+            f.updated_at,
+            f.updated_by,
+            f.scenario_id AS source_scenario_id
+        FROM forecasts f
+        JOIN chain c ON f.scenario_id = c.id
+        ORDER BY c.root_id, f.plant_id, f.category_id, f.period_id, c.depth
+    """
+
+
+def resolved_forecasts(scenario_ids: Sequence[int]):
+    """
+    ORM entity over the resolved grid, usable in place of Forecast.
+
+    Example:
+        F = resolved_forecasts([scenario_id])
+        db.query(func.sum(F.cost_dollars)).filter(F.scenario_id == scenario_id)
+    """
+    subquery = (
+        text(resolved_forecasts_sql())
+        .bindparams(scenario_ids=list(scenario_ids))
+        .columns(
+            Forecast.id,
+            Forecast.scenario_id,
+            Forecast.plant_id,
+            Forecast.category_id,
+            Forecast.period_id,
+            Forecast.generation_mwh,
+            Forecast.cost_dollars,
+            Forecast.notes,
+            Forecast.updated_at,
+            Forecast.updated_by,
+        )
+        .subquery("resolved_forecasts")
+    )
+    return aliased(Forecast, subquery)
+
+
+def forecast_source(scenario: Scenario):
+    """Forecast for full-mode scenarios, the resolved entity for overlays."""
+    if scenario is not None and scenario.storage_mode == StorageMode.OVERLAY.value:
+        return resolved_forecasts([scenario.id])
+    return Forecast
+
+
+def forecast_for_write(
+    db: Session,
+    scenario_id: int,
+    plant_id: Optional[int],
+    category_id: int,
+    period_id: int,
+) -> Tuple[Forecast, bool]:
+    """
+    The scenario's own row for a forecast cell, added if it has none.
+
+    Writes always go to the scenario's own row, so editing a cell an
+    overlay scenario inherits creates an override in it and leaves the
+    ancestor alone. A new override starts from the inherited cell's
+    values, so fields the caller does not set keep showing the same
+    numbers. The caller sets the values and commits.
+
+    Returns:
+        (Forecast, True if the row was added)
+    """
+    forecast = (
+        db.query(Forecast)
+        .filter(
+            Forecast.scenario_id == scenario_id,
+            Forecast.plant_id == plant_id,  # IS NULL for combined rows
+            Forecast.category_id == category_id,
+            Forecast.period_id == period_id,
+        )
+        .first()
+    )
+    if forecast is not None:
+        return forecast, False
+
+    forecast = Forecast(
+        scenario_id=scenario_id,
+        plant_id=plant_id,
+        category_id=category_id,
+        period_id=period_id,
+    )
+    scenario = db.get(Scenario, scenario_id)
+    if scenario is not None and scenario.is_overlay:
+        inherited = db.execute(text(f"""
+            SELECT r.generation_mwh, r.cost_dollars, r.notes
+            FROM ({resolved_forecasts_sql()}) r
+            WHERE r.plant_id IS NOT DISTINCT FROM :plant_id
+              AND r.category_id = :category_id
+              AND r.period_id = :period_id
+        """), {
+            "scenario_ids": [scenario_id],
+            "plant_id": plant_id,
+            "category_id": category_id,
+            "period_id": period_id,
+        }).first()
+        if inherited is not None:
+            forecast.generation_mwh = inherited.generation_mwh
+            forecast.cost_dollars = inherited.cost_dollars
+            forecast.notes = inherited.notes
+    db.add(forecast)
+    return forecast, True
+
+
+# =============================================================================
+# Cached flattening
+# =============================================================================
+
+@dataclass
+class ResolvedCell:
+    """One effective forecast cell of a scenario."""
+    plant_id: Optional[int]
+    category_id: int
+    period_id: int
+    generation_mwh: Optional[float]
+    cost_dollars: Optional[float]
+    notes: Optional[str]
+    source_scenario_id: int
+
+
+_cache: Dict[int, Tuple[tuple, List[ResolvedCell]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _chain_token(db: Session, scenario_id: int) -> tuple:
+    """Cheap fingerprint of every layer in the chain."""
+    row = db.execute(text(f"""
+        WITH RECURSIVE {_CHAIN_CTE}
+        SELECT
+            ARRAY_AGG(DISTINCT c.id),
+            (SELECT COUNT(*) FROM forecasts f WHERE f.scenario_id IN (SELECT id FROM chain)),
+            (SELECT MAX(f.updated_at) FROM forecasts f WHERE f.scenario_id IN (SELECT id FROM chain)),
+            (SELECT MAX(s.updated_at) FROM scenarios s WHERE s.id IN (SELECT id FROM chain))
+        FROM chain c
+    """), {"scenario_ids": [scenario_id]}).fetchone()
+    return (tuple(sorted(row[0] or [])), row[1], row[2], row[3])
+
+
+def resolve_scenario_forecasts(db: Session, scenario_id: int) -> List[ResolvedCell]:
+    """
+    Get the effective forecast grid for a scenario, using the cache.
+
+    The cached grid is reused while the chain's token (layer ids, row
+    count, latest row/scenario update) is unchanged.
+    """
+    token = _chain_token(db, scenario_id)
+
+    with _cache_lock:
+        cached = _cache.get(scenario_id)
+    if cached and cached[0] == token:
+        return cached[1]
+
+    rows = db.execute(text(resolved_forecasts_sql()), {"scenario_ids": [scenario_id]})
+    cells = [
+        ResolvedCell(
+            plant_id=row.plant_id,
+            category_id=row.category_id,
+            period_id=row.period_id,
+            generation_mwh=float(row.generation_mwh) if row.generation_mwh is not None else None,
+            cost_dollars=float(row.cost_dollars) if row.cost_dollars is not None else None,
+            notes=row.notes,
+            source_scenario_id=row.source_scenario_id,
+        )
+        for row in rows
+    ]
+
+    with _cache_lock:
+        _cache[scenario_id] = (token, cells)
+    return cells
+
+
+def clear_resolution_cache(scenario_id: Optional[int] = None):
+    """Drop cached grids (all, or one scenario)."""
+    with _cache_lock:
+        if scenario_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(scenario_id, None)
+
+
+# =============================================================================
+# Materialize
+# =============================================================================
+
+def materialize_scenario(
+    db: Session,
+    scenario_id: int,
+    updated_by: Optional[str] = None,
+) -> dict:
+    """
+    Convert an overlay scenario to full storage.
+
+    Inherited cells are copied into the scenario with one INSERT ... SELECT
+    and the storage mode is switched to full. The caller commits.
+
+    Returns:
+        Dict with the number of cells copied
+    """
+    scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+    if not scenario:
+        raise ValueError(f"Scenario {scenario_id} not found")
+
+    if scenario.storage_mode != StorageMode.OVERLAY.value:
+        return {"scenario_id": scenario_id, "cells_materialized": 0}
+
+    result = db.execute(text(f"""
+        INSERT INTO forecasts (
+            scenario_id, plant_id, category_id, period_id,
+            generation_mwh, cost_dollars, notes, updated_at, updated_by
+        )
+        SELECT
+            r.scenario_id, r.plant_id, r.category_id, r.period_id,
+            r.generation_mwh, r.cost_dollars, r.notes, NOW(), :updated_by
+        FROM ({resolved_forecasts_sql()}) r
+        WHERE r.source_scenario_id <> r.scenario_id
+    """), {"scenario_ids": [scenario_id], "updated_by": updated_by})
+
+    scenario.storage_mode = StorageMode.FULL.value
+    scenario.updated_at = datetime.utcnow()
+    db.flush()
+    clear_resolution_cache(scenario_id)
+
+    return {"scenario_id": scenario_id, "cells_materialized": result.rowcount}
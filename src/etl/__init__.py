@@ -1,6 +1,21 @@
 """ETL modules."""
 
-from .gl_actuals import load_gl_actuals
-from .gl_accounts import load_gl_accounts
+import importlib
+
+# Resolved on first access so importing an ETL helper (e.g. run_tracking
+# from the API) does not load pandas and the DB2 driver.
+_EXPORTS = {
+    "load_gl_actuals": "src.etl.gl_actuals",
+    "load_gl_accounts": "src.etl.gl_accounts",
+}
 
 __all__ = ['load_gl_actuals', 'load_gl_accounts']
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -19,6 +19,8 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List
 from enum import Enum
 
+from src.etl.outage_catalog import outage_group_info
+
 
 class PlantCode(str, Enum):
     """Plant codes from GL account."""
@@ -177,18 +179,6 @@ DEPARTMENT_CODES: Dict[str, Dict] = {
     "SUPPORT": {"name": "Support Services", "is_outage": False},
     "M&S": {"name": "Materials & Supplies", "is_outage": False},
     "MGT": {"name": "Management", "is_outage": False},
-    "OUTAGE": {"name": "Outage (General)", "is_outage": True},
-    "UNPLANNED": {"name": "Unplanned Outage", "is_outage": True},
-    "PLANNED-01": {"name": "Planned Outage - Unit 1", "is_outage": True, "unit": 1},
-    "PLANNED-02": {"name": "Planned Outage - Unit 2", "is_outage": True, "unit": 2},
-    "PLANNED-03": {"name": "Planned Outage - Unit 3", "is_outage": True, "unit": 3},
-    "PLANNED-04": {"name": "Planned Outage - Unit 4", "is_outage": True, "unit": 4},
-    "PLANNED-05": {"name": "Planned Outage - Unit 5", "is_outage": True, "unit": 5},
-    "PLANNED-06": {"name": "Planned Outage - Unit 6", "is_outage": True, "unit": 6},
-    "PLANNED-12": {"name": "Planned Outage - Unit 12", "is_outage": True, "unit": 12},
-    "PLANNED-13": {"name": "Planned Outage - Unit 13", "is_outage": True, "unit": 13},
-    "PLANNED-35": {"name": "Planned Outage - Unit 35", "is_outage": True, "unit": 35},
-    "PLANNED-46": {"name": "Planned Outage - Unit 46", "is_outage": True, "unit": 46},
 }
 
 
@@ -239,8 +229,12 @@ def get_ferc_description(ferc_code: str) -> str:
 
 
 def get_department_info(dept_code: str) -> Dict:
-    """Get department information from code."""
-    return DEPARTMENT_CODES.get(dept_code, {"name": dept_code, "is_outage": False})
+    """Get department information from code (outage groups are decoded)."""
+    return (
+        DEPARTMENT_CODES.get(dept_code)
+        or outage_group_info(dept_code)
+        or {"name": dept_code, "is_outage": False}
+    )
 
 
 def determine_cost_section(parsed: ParsedGLAccount) -> str:
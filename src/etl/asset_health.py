@@ -24,6 +24,7 @@ from src.database import SessionLocal
 from src.models import Plant, Period, CostCategory, Scenario, Forecast
 from src.models.period import Granularity
 from src.models.cost_category import CostSection
+from src.engine.scenario_layers import forecast_for_write, forecast_source
 
 
 class RiskLevel(str, Enum):
@@ -266,32 +267,17 @@ def import_asset_health_to_forecast(
             if not period:
                 continue
             
-            existing = (
-                db.query(Forecast)
-                .filter(
-                    Forecast.scenario_id == scenario_id,
-                    Forecast.plant_id == plant_id,
-                    Forecast.category_id == asset_health_category.id,
-                    Forecast.period_id == period.id,
-                )
-                .first()
+            # The scenario's own row (an override on copy-on-write scenarios)
+            forecast, created = forecast_for_write(
+                db, scenario_id, plant_id, asset_health_category.id, period.id
             )
-            
-            if existing:
-                existing.cost_dollars = total_cost
-                existing.notes = f"Auto-imported from Asset Health ({len(items)} items)"
-                stats["forecasts_updated"] += 1
-            else:
-                forecast = Forecast(
-                    scenario_id=scenario_id,
-                    plant_id=plant_id,
-                    category_id=asset_health_category.id,
-                    period_id=period.id,
-                    cost_dollars=total_cost,
-                    notes=f"Auto-imported from Asset Health",
-                )
-                db.add(forecast)
+            forecast.cost_dollars = total_cost
+            if created:
+                forecast.notes = f"Auto-imported from Asset Health"
                 stats["forecasts_created"] += 1
+            else:
+                forecast.notes = f"Auto-imported from Asset Health ({len(items)} items)"
+                stats["forecasts_updated"] += 1
         
         db.commit()
         return stats
@@ -330,12 +316,20 @@ def get_plant_budget_conflicts(
             .first()
         )
         
+        # Effective grid, so copy-on-write scenarios include inherited cells
+        scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+        F = forecast_source(scenario)
         existing_om = (
-            db.query(Forecast)
-            .join(CostCategory)
-            .join(Period)
+            db.query(
+                CostCategory.name.label("category_name"),
+                F.cost_dollars,
+                Plant.name.label("plant_name"),
+            )
+            .join(CostCategory, F.category_id == CostCategory.id)
+            .join(Period, F.period_id == Period.id)
+            .outerjoin(Plant, F.plant_id == Plant.id)
             .filter(
-                Forecast.scenario_id == scenario_id,
+                F.scenario_id == scenario_id,
                 CostCategory.section == CostSection.OPERATING,
                 Period.year == year,
             )
@@ -343,7 +337,7 @@ def get_plant_budget_conflicts(
         
         if asset_health_cat:
             existing_om = existing_om.filter(
-                Forecast.category_id != asset_health_cat.id
+                F.category_id != asset_health_cat.id
             )
         
         existing_om = existing_om.all()
@@ -359,7 +353,7 @@ def get_plant_budget_conflicts(
             for keyword in keywords_to_check:
                 if keyword in item_lower:
                     for forecast in existing_om:
-                        if keyword in forecast.category.name.lower():
+                        if keyword in forecast.category_name.lower():
                             conflicts.append({
                                 "asset_health_item": {
                                     "id": item.id,
@@ -368,9 +362,9 @@ def get_plant_budget_conflicts(
                                     "plant": item.plant_name,
                                 },
                                 "existing_forecast": {
-                                    "category": forecast.category.name,
+                                    "category": forecast.category_name,
                                     "cost": float(forecast.cost_dollars) if forecast.cost_dollars else 0,
-                                    "plant": forecast.plant.name if forecast.plant else "Combined",
+                                    "plant": forecast.plant_name or "Combined",
                                 },
                                 "potential_duplicate": True,
                             })
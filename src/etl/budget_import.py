@@ -21,6 +21,7 @@ from src.etl.account_mapping import (
     get_plant_id_from_code,
     BUDGET_RANKINGS,
 )
+from src.etl.run_tracking import track_etl_run
 
 logger = logging.getLogger(__name__)
 
@@ -204,47 +205,61 @@ def import_budget(
     
     logger.info(f"Importing budget from {file_path}")
     
-    if clear_existing:
-        if budget_year:
-            db.query(BudgetLine).filter(
-                BudgetLine.budget_year == budget_year
-            ).delete()
-        else:
-            db.query(BudgetLine).delete()
-        db.commit()
-        logger.info("Cleared existing budget lines")
-    
-    batch_size = 500
-    batch = []
-    
-    for row in read_budget_csv(file_path):
-        stats["total_rows"] += 1
+    with track_etl_run(
+        "budget_import", file=file_path.name, budget_year=budget_year, clear_existing=clear_existing
+    ) as run:
+        run.add_bytes(file_path.stat().st_size, phase="extract")
         
-        # Apply year filter if specified
-        row_year = row.get("BudgetYear", "")
-        if budget_year and row_year and int(row_year) != budget_year:
-            stats["skipped"] += 1
-            continue
+        if clear_existing:
+            with run.phase("clear"):
+                if budget_year:
+                    db.query(BudgetLine).filter(
+                        BudgetLine.budget_year == budget_year
+                    ).delete()
+                else:
+                    db.query(BudgetLine).delete()
+                db.commit()
+            logger.info("Cleared existing budget lines")
         
-        try:
-            budget_line = row_to_budget_line(row)
-            batch.append(budget_line)
-            stats["total_budget"] += budget_line.total
-            stats["imported"] += 1
+        batch_size = 500
+        batch = []
+        
+        for row in read_budget_csv(file_path):
+            stats["total_rows"] += 1
+            
+            # Apply year filter if specified
+            row_year = row.get("BudgetYear", "")
+            if budget_year and row_year and int(row_year) != budget_year:
+                stats["skipped"] += 1
+                continue
             
-            if len(batch) >= batch_size:
+            try:
+                with run.phase("transform"):
+                    budget_line = row_to_budget_line(row)
+                batch.append(budget_line)
+                stats["total_budget"] += budget_line.total
+                stats["imported"] += 1
+                
+                if len(batch) >= batch_size:
+                    with run.phase("load"):
+                        db.bulk_save_objects(batch)
+                        db.commit()
+                        run.add_rows(len(batch))
+                    batch = []
+                    logger.info(f"Imported {stats['imported']} rows...")
+                    
+            except Exception as e:
+                stats["errors"] += 1
+                logger.warning(f"Error importing row {stats['total_rows']}: {e}")
+        
+        if batch:
+            with run.phase("load"):
                 db.bulk_save_objects(batch)
                 db.commit()
-                batch = []
-                logger.info(f"Imported {stats['imported']} rows...")
-                
-        except Exception as e:
-            stats["errors"] += 1
-            logger.warning(f"Error importing row {stats['total_rows']}: {e}")
-    
-    if batch:
-        db.bulk_save_objects(batch)
-        db.commit()
+                run.add_rows(len(batch))
+        
+        run.add_rows(stats["total_rows"], phase="extract")
+        run.add_rows(stats["imported"], phase="transform")
     
     logger.info(f"Import complete: {stats['imported']} rows, total budget: ${stats['total_budget']:,.2f}")
     return stats
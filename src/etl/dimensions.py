@@ -0,0 +1,92 @@
+"""
+Maintain the ledger dimension tables (dim_account, dim_project, dim_outage).
+
+Before a month's facts are built, ensure_dimensions() adds the account
+strings, project numbers and shutdown aliases of its detail rows that
+have no key yet. Existing rows are left alone, so keys are stable across
+reloads.
+
+Concurrent loads adding the same new value block on each other's
+uncommitted row until that transaction ends. New values are therefore
+inserted in sorted order, so two loads always take those locks in the
+same order and cannot deadlock. The month loads also commit their new
+keys in a short transaction of their own before staging facts, so they
+do not hold those locks for the length of the load.
+"""
+
+from typing import Dict, Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from src.etl.account_mapping import parse_gl_account
+from src.etl.outage_catalog import parse_outage_alias
+from src.models.dimensions import DimAccount, DimOutage, DimProject
+
+SEGMENT_LENGTH = 10
+
+
+def account_row(gxacct: str) -> Dict:
+    """dim_account values for an account string."""
+    parsed = parse_gl_account(gxacct)
+    return {
+        "gxacct": gxacct,
+        "company_code": parsed.company_code[:SEGMENT_LENGTH],
+        "plant_code": parsed.plant_code[:SEGMENT_LENGTH],
+        "entity_code": parsed.entity_code[:SEGMENT_LENGTH],
+        "account_type": parsed.account_type[:SEGMENT_LENGTH],
+        "cost_type_code": parsed.cost_type_code[:SEGMENT_LENGTH],
+        "department_code": parsed.department_code[:SEGMENT_LENGTH],
+        "ferc_account": parsed.ferc_account[:SEGMENT_LENGTH],
+        "sub_account": parsed.sub_account[:SEGMENT_LENGTH],
+        "labor_indicator": parsed.labor_indicator[:SEGMENT_LENGTH],
+    }
+
+
+def outage_row(alias: str) -> Dict:
+    """dim_outage values for a shutdown alias."""
+    return vars(parse_outage_alias(alias))
+
+
+def _missing(db_conn, source: str, value_sql: str, dim_table: str, dim_column: str) -> List[str]:
+    rows = db_conn.execute(text(f"""
+        SELECT DISTINCT v.value
+        FROM (SELECT {value_sql} AS value FROM {source} t) v
+        WHERE v.value IS NOT NULL AND v.value <> ''
+          AND NOT EXISTS (SELECT 1 FROM {dim_table} d WHERE d.{dim_column} = v.value)
+        ORDER BY v.value
+    """))
+    return [row[0] for row in rows]
+
+
+def _insert(db_conn, model, rows: Iterable[Dict], key: str) -> int:
+    rows = list(rows)
+    if not rows:
+        return 0
+    db_conn.execute(insert(model).on_conflict_do_nothing(index_elements=[key]), rows)
+    return len(rows)
+
+
+def ensure_dimensions(db_conn, source: str) -> Dict[str, int]:
+    """
+    Add the dimension rows a detail table needs.
+
+    Args:
+        db_conn: SQLAlchemy connection (caller owns the transaction)
+        source: gl_transactions, one of its partitions or a staging table
+
+    Returns:
+        New rows per dimension table
+    """
+    accounts = _missing(db_conn, source, "t.gxacct", "dim_account", "gxacct")
+    projects = _missing(db_conn, source, "TRIM(t.gxpjno)", "dim_project", "project_number")
+    aliases = _missing(db_conn, source, "t.gxshut", "dim_outage", "alias")
+    return {
+        "dim_account": _insert(db_conn, DimAccount, (account_row(a) for a in accounts), "gxacct"),
+        "dim_project": _insert(
+            db_conn, DimProject, ({"project_number": p} for p in projects), "project_number"
+        ),
+        "dim_outage": _insert(
+            db_conn, DimOutage, (outage_row(a) for a in aliases if a.strip()), "alias"
+        ),
+    }
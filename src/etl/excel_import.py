@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from src.database import SessionLocal
 from src.models import Plant, Period, CostCategory, Scenario, Forecast
 from src.models.period import Granularity
+from src.engine.scenario_layers import forecast_for_write
 
 
 def import_forecast_excel(
@@ -99,31 +100,12 @@ def import_forecast_excel(
                 if pd.isna(value) or value == '' or value == 0:
                     continue
                 
-                # Check if forecast exists
-                existing = (
-                    db.query(Forecast)
-                    .filter(
-                        Forecast.scenario_id == scenario_id,
-                        Forecast.plant_id == plant_id,
-                        Forecast.category_id == category.id,
-                        Forecast.period_id == period.id,
-                    )
-                    .first()
+                # The scenario's own row (an override on copy-on-write scenarios)
+                forecast, created = forecast_for_write(
+                    db, scenario_id, plant_id, category.id, period.id
                 )
-                
-                if existing:
-                    existing.cost_dollars = Decimal(str(value))
-                    stats["forecasts_updated"] += 1
-                else:
-                    forecast = Forecast(
-                        scenario_id=scenario_id,
-                        plant_id=plant_id,
-                        category_id=category.id,
-                        period_id=period.id,
-                        cost_dollars=Decimal(str(value)),
-                    )
-                    db.add(forecast)
-                    stats["forecasts_created"] += 1
+                forecast.cost_dollars = Decimal(str(value))
+                stats["forecasts_created" if created else "forecasts_updated"] += 1
         
         db.commit()
         return stats
@@ -190,28 +172,11 @@ def import_generation_data(
                     continue
                 
                 # Update or create forecast with generation
-                existing = (
-                    db.query(Forecast)
-                    .filter(
-                        Forecast.scenario_id == scenario_id,
-                        Forecast.plant_id == plant.id,
-                        Forecast.category_id == gen_category.id,
-                        Forecast.period_id == period.id,
-                    )
-                    .first()
+                forecast, created = forecast_for_write(
+                    db, scenario_id, plant.id, gen_category.id, period.id
                 )
-                
-                if existing:
-                    existing.generation_mwh = Decimal(str(gen_value))
-                else:
-                    forecast = Forecast(
-                        scenario_id=scenario_id,
-                        plant_id=plant.id,
-                        category_id=gen_category.id,
-                        period_id=period.id,
-                        generation_mwh=Decimal(str(gen_value)),
-                    )
-                    db.add(forecast)
+                forecast.generation_mwh = Decimal(str(gen_value))
+                if created:
                     stats["records_created"] += 1
         
         db.commit()
@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session
 
 from src.models.actuals import ExpenseActual
 from src.etl.account_mapping import parse_gl_account, get_plant_id_from_code
+from src.etl.run_tracking import track_etl_run
 
 logger = logging.getLogger(__name__)
 
@@ -154,45 +155,59 @@ def import_expense_actuals(
     
     logger.info(f"Importing expense actuals from {file_path}")
     
-    if clear_existing:
-        if period_filter:
-            db.query(ExpenseActual).filter(
-                ExpenseActual.period_yyyymm == period_filter
-            ).delete()
-        else:
-            db.query(ExpenseActual).delete()
-        db.commit()
-        logger.info("Cleared existing expense actuals")
-    
-    batch_size = 1000
-    batch = []
-    
-    for row in read_expense_csv(file_path):
-        stats["total_rows"] += 1
+    with track_etl_run(
+        "expense_actuals", file=file_path.name, period=period_filter, clear_existing=clear_existing
+    ) as run:
+        run.add_bytes(file_path.stat().st_size, phase="extract")
         
-        if period_filter and row.get("YYYYMM", "").strip() != period_filter:
-            stats["skipped"] += 1
-            continue
+        if clear_existing:
+            with run.phase("clear"):
+                if period_filter:
+                    db.query(ExpenseActual).filter(
+                        ExpenseActual.period_yyyymm == period_filter
+                    ).delete()
+                else:
+                    db.query(ExpenseActual).delete()
+                db.commit()
+            logger.info("Cleared existing expense actuals")
         
-        try:
-            actual = row_to_expense_actual(row)
-            batch.append(actual)
-            stats["total_amount"] += actual.amount
-            stats["imported"] += 1
+        batch_size = 1000
+        batch = []
+        
+        for row in read_expense_csv(file_path):
+            stats["total_rows"] += 1
             
-            if len(batch) >= batch_size:
+            if period_filter and row.get("YYYYMM", "").strip() != period_filter:
+                stats["skipped"] += 1
+                continue
+            
+            try:
+                with run.phase("transform"):
+                    actual = row_to_expense_actual(row)
+                batch.append(actual)
+                stats["total_amount"] += actual.amount
+                stats["imported"] += 1
+                
+                if len(batch) >= batch_size:
+                    with run.phase("load"):
+                        db.bulk_save_objects(batch)
+                        db.commit()
+                        run.add_rows(len(batch))
+                    batch = []
+                    logger.info(f"Imported {stats['imported']} rows...")
+                    
+            except Exception as e:
+                stats["errors"] += 1
+                logger.warning(f"Error importing row {stats['total_rows']}: {e}")
+        
+        if batch:
+            with run.phase("load"):
                 db.bulk_save_objects(batch)
                 db.commit()
-                batch = []
-                logger.info(f"Imported {stats['imported']} rows...")
-                
-        except Exception as e:
-            stats["errors"] += 1
-            logger.warning(f"Error importing row {stats['total_rows']}: {e}")
-    
-    if batch:
-        db.bulk_save_objects(batch)
-        db.commit()
+                run.add_rows(len(batch))
+        
+        run.add_rows(stats["total_rows"], phase="extract")
+        run.add_rows(stats["imported"], phase="transform")
     
     logger.info(f"Import complete: {stats['imported']} rows, total amount: ${stats['total_amount']:,.2f}")
     return stats
@@ -0,0 +1,172 @@
+"""
+Local Parquet cache of Infinium extracts.
+
+Each extract is cached per slice, a (year, month) for GL actuals or the
+whole table for small extracts like the account master, as a
+zstd-compressed Parquet file in a Hive-style directory with a manifest
+next to it:
+
+    <EXTRACT_CACHE_DIR>/gl_actuals/year=2025/month=03/part.parquet
+    <EXTRACT_CACHE_DIR>/gl_actuals/year=2025/month=03/manifest.json
+    <EXTRACT_CACHE_DIR>/gl_actuals/year=2025/month=other/...   (adjustment periods)
+
+The manifest records the hash of the extract query, the row count and
+when it was pulled. A slice is served only if its query hash matches the
+current query and it is within the retention period
+(EXTRACT_CACHE_RETENTION_DAYS). Loads pull from DB2 and write the cache;
+only `--from-cache` on the ETL commands reads it, so a rerun (e.g. after
+a transform fix) can skip DB2. GL actuals serve closed months only.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.config import Config
+
+DATA_FILE = "part.parquet"
+MANIFEST_FILE = "manifest.json"
+COMPRESSION = "zstd"
+
+
+def query_hash(query: str) -> str:
+    """Hash of an extract query, ignoring whitespace differences."""
+    return hashlib.sha256(" ".join(query.split()).encode()).hexdigest()[:16]
+
+
+def _key_value(value) -> str:
+    if value is None:
+        return "other"
+    if isinstance(value, int):
+        return f"{value:02d}"
+    return str(value)
+
+
+class ExtractCache:
+    """Parquet slices of one extract query."""
+
+    def __init__(
+        self,
+        source: str,
+        query: str,
+        root: Optional[Path] = None,
+        retention_days: Optional[int] = None,
+    ):
+        self.source = source
+        self.query_hash = query_hash(query)
+        self.root = Path(root or Config.EXTRACT_CACHE_DIR) / source
+        self.retention = timedelta(
+            days=Config.EXTRACT_CACHE_RETENTION_DAYS if retention_days is None else retention_days
+        )
+
+    def slice_dir(self, keys: Dict) -> Path:
+        """Directory of a slice, e.g. {"year": 2025, "month": 3} -> year=2025/month=03."""
+        path = self.root
+        for name, value in keys.items():
+            path = path / f"{name}={_key_value(value)}"
+        return path
+
+    def _manifest(self, path: Path) -> Optional[Dict]:
+        try:
+            return json.loads((path / MANIFEST_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _expired(self, manifest: Dict, now: datetime) -> bool:
+        return now - datetime.fromisoformat(manifest["extracted_at"]) > self.retention
+
+    def read(self, keys: Dict) -> Optional[pd.DataFrame]:
+        """
+        A cached slice, or None if missing, from another query or expired.
+        """
+        path = self.slice_dir(keys)
+        manifest = self._manifest(path)
+        if (
+            manifest is None
+            or manifest.get("query_hash") != self.query_hash
+            or self._expired(manifest, datetime.now())
+        ):
+            return None
+        if manifest["rows"] == 0:
+            return pd.DataFrame(columns=manifest["columns"])
+        try:
+            df = pd.read_parquet(path / DATA_FILE)
+        except OSError:
+            return None
+        return df if len(df) == manifest["rows"] else None
+
+    def read_all(self, slices: List[Dict]) -> Optional[pd.DataFrame]:
+        """All slices concatenated, or None if any of them is not cached."""
+        frames = []
+        for keys in slices:
+            df = self.read(keys)
+            if df is None:
+                return None
+            frames.append(df)
+        non_empty = [df for df in frames if len(df)]
+        if not non_empty:
+            return frames[0] if frames else pd.DataFrame()
+        return pd.concat(non_empty, ignore_index=True)
+
+    def write(self, df: pd.DataFrame, keys: Dict) -> Dict:
+        """
+        Cache a slice, replacing any previous copy.
+
+        The manifest is removed first and written last, so a slice
+        interrupted mid-write is a cache miss rather than a wrong read.
+
+        Returns:
+            The slice manifest
+        """
+        path = self.slice_dir(keys)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / MANIFEST_FILE).unlink(missing_ok=True)
+        (path / DATA_FILE).unlink(missing_ok=True)
+
+        size = 0
+        if len(df):
+            tmp = path / f"{DATA_FILE}.tmp"
+            df.to_parquet(tmp, compression=COMPRESSION, index=False)
+            os.replace(tmp, path / DATA_FILE)
+            size = (path / DATA_FILE).stat().st_size
+
+        manifest = {
+            "source": self.source,
+            "keys": {name: value for name, value in keys.items()},
+            "query_hash": self.query_hash,
+            "rows": len(df),
+            "columns": [str(c) for c in df.columns],
+            "bytes": size,
+            "compression": COMPRESSION,
+            "extracted_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        tmp = path / f"{MANIFEST_FILE}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, path / MANIFEST_FILE)
+        return manifest
+
+    def prune(self) -> int:
+        """
+        Delete slices past the retention period or from another query.
+
+        Returns:
+            Slices deleted
+        """
+        now = datetime.now()
+        deleted = 0
+        for manifest_path in list(self.root.rglob(MANIFEST_FILE)):
+            manifest = self._manifest(manifest_path.parent)
+            if (
+                manifest is None
+                or manifest.get("query_hash") != self.query_hash
+                or self._expired(manifest, now)
+            ):
+                shutil.rmtree(manifest_path.parent, ignore_errors=True)
+                deleted += 1
+        return deleted
@@ -1,15 +1,27 @@
 """
 ETL for GL Account Master from Infinium DB2 to PostgreSQL.
 
-Full refresh approach: truncate and reload all active accounts.
+Hash-diff sync: the active accounts are staged, each row is hashed
+(md5 of its columns) and only accounts that are new, changed or no
+longer active are written to gl_accounts, which keeps the current
+version of each active account. Every version is kept in
+gl_account_history (type 2, valid_from/valid_to), so reports can map
+CTUF01 to a department as of a date (account_departments_as_of). The
+extract is pulled from DB2 and cached locally as Parquet (--from-cache
+reads the cached copy instead); --full clears gl_accounts first.
 """
 
 import pandas as pd
 from datetime import datetime
+from typing import Dict
 from sqlalchemy import text
 from src.db.infinium import get_infinium_connection
 from src.db.postgres import get_engine, init_db
 from src.models.gl_account import GLAccount
+from src.etl.run_tracking import track_etl_run, frame_bytes
+from src.etl.extract_cache import ExtractCache
+from src.etl.transforms import normalize_strings
+from src.etl.gl_facts import refresh_fact_keys
 
 
 # SQL query for account master
@@ -39,14 +51,50 @@ WHERE CTACTV = '1'
   AND CTCO = '003'
 """
 
+# Low-cardinality codes, stored as categoricals during the transform
+GL_ACCOUNTS_CATEGORIES = ['ctco', 'ctactv', 'ctmors', 'ctrc01']
 
-def extract_gl_accounts() -> pd.DataFrame:
+# Columns of an account version (everything the extract returns)
+ACCOUNT_COLUMNS = [
+    'ctacct', 'ctdesc', 'ctco', 'ctactv', 'ctmors',
+    'ctuf01', 'ctuf02', 'ctuf03', 'ctuf04',
+    'ctrc01', 'ctrc02', 'ctrc03', 'ctrc04', 'ctrc05', 'ctrc06', 'ctrc07', 'ctrc08', 'ctrc09',
+]
+
+# md5 of an account row; COALESCE keeps NULL distinct from a shifted column
+ROW_HASH_SQL = "md5(concat_ws('|', {}))".format(
+    ", ".join(f"COALESCE({col}, '')" for col in ACCOUNT_COLUMNS)
+)
+
+STAGING = "gl_accounts_load"
+
+# Department of each account as of a point in time (see account_departments_as_of)
+ACCOUNT_DEPARTMENTS_AS_OF_SQL = """
+SELECT h.ctacct, h.ctuf01, adm.dept_code
+FROM gl_account_history h
+LEFT JOIN account_dept_mappings adm ON TRIM(h.ctuf01) = adm.ctuf01
+WHERE h.valid_from <= :as_of
+  AND (h.valid_to IS NULL OR h.valid_to > :as_of)
+"""
+
+
+def extract_gl_accounts(from_cache: bool = False) -> pd.DataFrame:
     """
-    Extract GL accounts from Infinium DB2.
+    Extract GL accounts from Infinium DB2 (or the extract cache).
+    
+    Args:
+        from_cache: Read the cached extract, if any, instead of DB2
     
     Returns:
         DataFrame with GL accounts
     """
+    cache = ExtractCache("gl_accounts", GL_ACCOUNTS_QUERY)
+    if from_cache:
+        df = cache.read({})
+        if df is not None:
+            print(f"[EXTRACT] Read {len(df):,} accounts from the extract cache")
+            return df
+    
     print(f"[EXTRACT] Connecting to Infinium DB2...")
     conn = get_infinium_connection()
     
@@ -55,6 +103,7 @@ def extract_gl_accounts() -> pd.DataFrame:
     conn.close()
     
     print(f"[EXTRACT] Retrieved {len(df):,} accounts")
+    cache.write(df, {})
     return df
 
 
@@ -73,66 +122,165 @@ def transform_gl_accounts(df: pd.DataFrame) -> pd.DataFrame:
     # Lowercase column names
     df.columns = df.columns.str.lower()
     
-    # Strip whitespace from string columns
-    str_columns = df.select_dtypes(include=['object']).columns
-    for col in str_columns:
-        df[col] = df[col].str.strip() if df[col].dtype == 'object' else df[col]
+    # Strip whitespace; Arrow strings, low-cardinality codes as categoricals
+    normalize_strings(df, categories=GL_ACCOUNTS_CATEGORIES)
     
     print(f"[TRANSFORM] Complete")
     return df
 
 
-def load_gl_accounts():
+def sync_gl_accounts(engine, df: pd.DataFrame, full: bool = False) -> Dict[str, int]:
     """
-    Full refresh ETL for GL accounts.
+    Apply the active accounts in `df` to gl_accounts and its history.
+
+    One transaction: accounts whose hash differs are updated, new ones
+    inserted and ones no longer active deleted; their open history rows
+    are closed and new versions opened as of now.
+
+    Args:
+        engine: SQLAlchemy engine
+        df: Transformed extract (ACCOUNT_COLUMNS)
+        full: Clear gl_accounts first (every account is rewritten;
+            history still only changes for changed accounts)
+
+    Returns:
+        {"inserted", "updated", "deactivated", "versions_closed", "versions_opened"}
+    """
+    columns = ", ".join(ACCOUNT_COLUMNS)
+    assignments = ", ".join(f"{col} = s.{col}" for col in ACCOUNT_COLUMNS if col != 'ctacct')
+    now = datetime.now()
+    counts = {}
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {STAGING}"))
+        conn.execute(text(f"CREATE TABLE {STAGING} AS SELECT {columns}, row_hash FROM gl_accounts WITH NO DATA"))
+        df[ACCOUNT_COLUMNS].to_sql(STAGING, conn, if_exists='append', index=False, method='multi', chunksize=500)
+        conn.execute(text(f"UPDATE {STAGING} SET row_hash = {ROW_HASH_SQL}"))
+        
+        if full:
+            conn.execute(text("DELETE FROM gl_accounts"))
+        
+        counts["updated"] = conn.execute(text(f"""
+            UPDATE gl_accounts a SET {assignments}, row_hash = s.row_hash, updated_at = :now
+            FROM {STAGING} s
+            WHERE a.ctacct = s.ctacct AND a.row_hash IS DISTINCT FROM s.row_hash
+        """), {"now": now}).rowcount
+        counts["inserted"] = conn.execute(text(f"""
+            INSERT INTO gl_accounts ({columns}, row_hash, created_at, updated_at)
+            SELECT {", ".join(f"s.{col}" for col in ACCOUNT_COLUMNS)}, s.row_hash, :now, :now
+            FROM {STAGING} s
+            WHERE NOT EXISTS (SELECT 1 FROM gl_accounts a WHERE a.ctacct = s.ctacct)
+        """), {"now": now}).rowcount
+        counts["deactivated"] = conn.execute(text(f"""
+            DELETE FROM gl_accounts a
+            WHERE NOT EXISTS (SELECT 1 FROM {STAGING} s WHERE s.ctacct = a.ctacct)
+        """)).rowcount
+        
+        # History: close versions that changed or went inactive, then open
+        # a version for every active account without a current one
+        counts["versions_closed"] = conn.execute(text(f"""
+            UPDATE gl_account_history h SET valid_to = :now
+            WHERE h.valid_to IS NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM {STAGING} s WHERE s.ctacct = h.ctacct AND s.row_hash = h.row_hash
+              )
+        """), {"now": now}).rowcount
+        counts["versions_opened"] = conn.execute(text(f"""
+            INSERT INTO gl_account_history ({columns}, row_hash, valid_from)
+            SELECT {", ".join(f"s.{col}" for col in ACCOUNT_COLUMNS)}, s.row_hash, :now
+            FROM {STAGING} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM gl_account_history h WHERE h.ctacct = s.ctacct AND h.valid_to IS NULL
+            )
+        """), {"now": now}).rowcount
+        
+        conn.execute(text(f"DROP TABLE {STAGING}"))
+    
+    return counts
+
+
+def account_departments_as_of(db_conn, as_of: datetime) -> Dict[str, Dict]:
+    """
+    Each account's CTUF01 and mapped department as of a point in time.
+
+    Args:
+        db_conn: SQLAlchemy connection
+        as_of: Point in time (a date means the start of that day)
+
+    Returns:
+        {ctacct: {"ctuf01": ..., "dept_code": ... or None}}
+    """
+    rows = db_conn.execute(text(ACCOUNT_DEPARTMENTS_AS_OF_SQL), {"as_of": as_of})
+    return {row.ctacct: {"ctuf01": row.ctuf01, "dept_code": row.dept_code} for row in rows}
+
+
+def load_gl_accounts(from_cache: bool = False, full: bool = False):
+    """
+    Sync ETL for GL accounts.
+    
+    Args:
+        from_cache: Read the extract cache instead of DB2
+        full: Rewrite every account instead of only the changed ones
+    
+    The run is recorded in etl_runs with per-phase timings and row counts.
+    gl_facts department keys (which follow each account's CTUF01) are
+    re-derived when any account changed.
     """
     start_time = datetime.now()
     print("=" * 60)
-    print("GL Account Master ETL")
+    print("GL Account Master ETL" + (" (full)" if full else ""))
     print("=" * 60)
     
     # Initialize database tables if needed
     print("[INIT] Ensuring database tables exist...")
     init_db()
     
-    # Extract
-    df = extract_gl_accounts()
-    
-    if df.empty:
-        print("[LOAD] No data to load")
-        return
-    
-    # Transform
-    df = transform_gl_accounts(df)
-    
-    # Load
-    print(f"[LOAD] Loading to PostgreSQL...")
-    engine = get_engine()
-    
-    # Delete all existing accounts
-    with engine.connect() as conn:
-        result = conn.execute(text("DELETE FROM gl_accounts"))
-        deleted = result.rowcount
-        conn.commit()
-        print(f"[LOAD] Deleted {deleted:,} existing accounts")
-    
-    # Insert new data
-    df.to_sql(
-        'gl_accounts',
-        engine,
-        if_exists='append',
-        index=False,
-        method='multi',
-        chunksize=500
-    )
+    with track_etl_run("gl_accounts", full=full) as run:
+        # Extract
+        with run.phase("extract"):
+            df = extract_gl_accounts(from_cache=from_cache)
+            run.add_rows(len(df))
+            run.add_bytes(frame_bytes(df))
+        
+        if df.empty:
+            # An empty extract would deactivate every account
+            print("[LOAD] No data to load")
+            return
+        
+        # Transform
+        with run.phase("transform"):
+            df = transform_gl_accounts(df)
+            run.add_rows(len(df))
+        
+        # Load
+        print(f"[LOAD] Syncing to PostgreSQL...")
+        engine = get_engine()
+        
+        with run.phase("load"):
+            counts = sync_gl_accounts(engine, df, full=full)
+            changed = counts["inserted"] + counts["updated"] + counts["deactivated"]
+            print(
+                f"[LOAD] {counts['inserted']:,} new, {counts['updated']:,} changed, "
+                f"{counts['deactivated']:,} deactivated; {counts['versions_opened']:,} history version(s)"
+            )
+            run.add_rows(changed)
+        
+        if changed:
+            with run.phase("fact_keys"):
+                with engine.begin() as conn:
+                    updated = refresh_fact_keys(conn)
+                print(f"[LOAD] Re-derived keys of {updated:,} gl_facts rows")
+                run.add_rows(updated)
     
     elapsed = datetime.now() - start_time
-    print(f"[LOAD] Inserted {len(df):,} accounts")
+    print(f"[LOAD] Synced {len(df):,} accounts")
     print("=" * 60)
     print(f"Complete in {elapsed.total_seconds():.1f} seconds")
     print("=" * 60)
 
 
 if __name__ == "__main__":
-    load_gl_accounts()
+    import sys
+    
+    load_gl_accounts(from_cache="--from-cache" in sys.argv[1:], full="--full" in sys.argv[1:])
 
@@ -1,15 +1,34 @@
 """
 ETL for GL Actuals from Infinium DB2 to PostgreSQL.
 
-Full refresh approach: truncate and reload for specified year/month.
+Full refresh approach: each month of the year (or the one month) is
+loaded into a staging table and swapped in for its gl_transactions
+partition (see src/db/partitions.py), so a reload leaves no dead rows.
+The month's gl_facts rows are built from the same staging table and
+swapped in with it.
+
+Every load pulls from DB2 and caches the extract locally as Parquet per
+month; a rerun (e.g. after a transform fix) can read the cache instead
+(--from-cache), but only for closed months, since an open month keeps
+changing until it is closed.
 """
 
 import pandas as pd
 from datetime import datetime
+from typing import List, Optional
 from sqlalchemy import text
 from src.db.infinium import get_infinium_connection
+from src.db import partitions
 from src.db.postgres import get_engine, init_db
+from src.engine.close_calendar import current_month
 from src.models.gl_transaction import GLTransaction
+from src.etl.dimensions import ensure_dimensions
+from src.etl.gl_facts import insert_facts, stage_facts
+from src.etl.outage_catalog import refresh_outage_catalog
+from src.etl.preliminary import clear_preliminary
+from src.etl.run_tracking import track_etl_run, frame_bytes
+from src.etl.extract_cache import ExtractCache
+from src.etl.transforms import normalize_strings
 
 
 # SQL query for GL actuals
@@ -76,24 +95,80 @@ FROM GLCUFA.GLPTX1
 WHERE TXYEAR = {year}
 """
 
+# Low-cardinality codes, stored as categoricals during the transform
+GL_ACTUALS_CATEGORIES = ['gxco', 'thsrc', 'gxdrcr', 'gxeqfc']
+
+
+def _month_filter(month: int) -> str:
+    """Query filter for one month's partition (adjustment periods share one)."""
+    slot = partitions.month_slot(month)
+    if slot is None:
+        return f" AND TXMNTH NOT BETWEEN {partitions.MONTHS[0]} AND {partitions.MONTHS[-1]}"
+    return f" AND TXMNTH = {slot}"
+
 
-def extract_gl_actuals(year: int, month: int = None) -> pd.DataFrame:
+def _accounts_filter(accounts: List[str]) -> str:
+    quoted = ", ".join("'" + account.replace("'", "''") + "'" for account in accounts)
+    return f" AND TRIM(GXACCT) IN ({quoted})"
+
+
+def closed_slots(year: int) -> set:
+    """
+    Partition slots of `year` that are closed for every plant (the
+    adjustment periods once period 12 is closed).
+    """
+    closed = current_month(year)
+    slots = set(range(1, closed + 1))
+    if closed == 12:
+        slots.add(None)
+    return slots
+
+
+def extract_gl_actuals(
+    year: int,
+    month: int = None,
+    from_cache: bool = False,
+    accounts: Optional[List[str]] = None,
+) -> pd.DataFrame:
     """
     Extract GL actuals from Infinium DB2.
     
+    Each month pulled is cached as Parquet (see src/etl/extract_cache.py).
+    
     Args:
         year: Fiscal year (e.g., 2025)
-        month: Optional month (1-12). If None, extracts full year.
+        month: Optional month (1-12, or 13 for all adjustment periods).
+            If None, extracts full year.
+        from_cache: Read the cached extract instead of DB2 when every
+            month asked for is cached and closed (an open month is
+            always pulled)
+        accounts: Only these accounts of the month (always from DB2,
+            not cached)
         
     Returns:
         DataFrame with GL transactions
     """
+    cache = ExtractCache("gl_actuals", GL_ACTUALS_QUERY)
+    slots = [partitions.month_slot(month)] if month else list(partitions.MONTH_SLOTS)
+    
+    if from_cache and not accounts:
+        open_slots = [slot for slot in slots if slot not in closed_slots(year)]
+        if open_slots:
+            print(f"[EXTRACT] {len(open_slots)} month(s) not closed yet; not reading the extract cache")
+        else:
+            df = cache.read_all([{"year": year, "month": slot} for slot in slots])
+            if df is not None:
+                print(f"[EXTRACT] Read {len(df):,} rows from the extract cache")
+                return df
+    
     print(f"[EXTRACT] Connecting to Infinium DB2...")
     conn = get_infinium_connection()
     
     query = GL_ACTUALS_QUERY.format(year=year)
     if month:
-        query += f" AND TXMNTH = {month}"
+        query += _month_filter(month)
+    if accounts:
+        query += _accounts_filter(accounts)
     
     print(f"[EXTRACT] Running query for {year}" + (f"-{month:02d}" if month else " full year") + "...")
     
@@ -101,6 +176,17 @@ def extract_gl_actuals(year: int, month: int = None) -> pd.DataFrame:
     conn.close()
     
     print(f"[EXTRACT] Retrieved {len(df):,} rows")
+    
+    if accounts:
+        return df
+    
+    df_slots = df['TXMNTH'].map(partitions.month_slot)
+    for slot in slots:
+        rows = df[df_slots.isna()] if slot is None else df[df_slots == slot]
+        cache.write(rows, {"year": year, "month": slot})
+    pruned = cache.prune()
+    if pruned:
+        print(f"[EXTRACT] Pruned {pruned} cached month(s) past retention")
     return df
 
 
@@ -119,10 +205,8 @@ def transform_gl_actuals(df: pd.DataFrame) -> pd.DataFrame:
     # Lowercase column names to match PostgreSQL model
     df.columns = df.columns.str.lower()
     
-    # Strip whitespace from string columns
-    str_columns = df.select_dtypes(include=['object']).columns
-    for col in str_columns:
-        df[col] = df[col].str.strip() if df[col].dtype == 'object' else df[col]
+    # Strip whitespace; Arrow strings, low-cardinality codes as categoricals
+    normalize_strings(df, categories=GL_ACTUALS_CATEGORIES)
     
     # Convert date column
     if 'thedat' in df.columns:
@@ -132,58 +216,169 @@ def transform_gl_actuals(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def load_gl_actuals(year: int, month: int = None):
+def replace_partitions(engine, df: pd.DataFrame, year: int, month: int = None) -> int:
+    """
+    Replace the year's (or one month's) gl_transactions and gl_facts
+    partitions with `df`.
+
+    Each month is staged and indexed outside the swap; the swap itself
+    (and truncating months of a full-year reload that no longer have
+    rows) is one short transaction, so detail and facts change together;
+    preliminary rows of the months (src/etl/preliminary.py) go with it.
+
+    Returns:
+        Number of month partitions swapped in
+    """
+    with engine.begin() as conn:
+        partitions.ensure_year_partitions(conn, year)
+    
+    slots = [partitions.month_slot(month)] if month else list(partitions.MONTH_SLOTS)
+    df_slots = df['txmnth'].map(partitions.month_slot)
+    
+    staged = {}
+    for slot in slots:
+        rows = df[df_slots.isna()] if slot is None else df[df_slots == slot]
+        if rows.empty:
+            continue
+        with engine.begin() as conn:
+            staging = partitions.create_staging(conn, year, slot)
+        rows.to_sql(
+            staging,
+            engine,
+            if_exists='append',
+            index=False,
+            method='multi',
+            chunksize=1000
+        )
+        with engine.begin() as conn:
+            # New keys are committed on their own, before the facts
+            ensure_dimensions(conn, staging)
+        with engine.begin() as conn:
+            partitions.index_staging(conn, staging)
+            staged[slot] = (staging, stage_facts(conn, year, slot, staging))
+    
+    with engine.begin() as conn:
+        for slot in slots:
+            if slot in staged:
+                staging, fact_staging = staged[slot]
+                partitions.swap_in(conn, year, slot, staging)
+                partitions.swap_in(conn, year, slot, fact_staging, partitions.FACT_TABLE)
+            else:
+                for table in partitions.PARTITIONED_TABLES:
+                    partitions.truncate_partition(conn, year, slot, table)
+        # The detail has caught up with any preliminary months
+        clear_preliminary(conn, year, [slot for slot in slots if slot is not None])
+    
+    return len(staged)
+
+
+def replace_accounts(engine, df: pd.DataFrame, year: int, month: int, accounts: List[str]) -> int:
+    """
+    Replace one month's gl_transactions and gl_facts rows of some accounts
+    with `df`.
+
+    For the few accounts a reconciliation finds out of line; whole months
+    go through replace_partitions. Unlike a swap this deletes in place,
+    leaving dead rows to autovacuum, so it is only worth it for a small
+    share of the month. Detail and facts change in one transaction.
+
+    Returns:
+        Rows inserted
+    """
+    slot = partitions.month_slot(month)
+    detail = partitions.month_partition(year, slot)
+    facts = partitions.month_partition(year, slot, partitions.FACT_TABLE)
+    
+    with engine.begin() as conn:
+        partitions.ensure_year_partitions(conn, year)
+        staging = partitions.create_staging(conn, year, slot)
+        if not df.empty:
+            df.to_sql(staging, conn, if_exists='append', index=False, method='multi', chunksize=1000)
+        
+        params = {"accounts": list(accounts)}
+        conn.execute(text(f"""
+            DELETE FROM {facts} f USING {detail} t
+            WHERE f.id = t.id AND f.txmnth = t.txmnth AND t.gxacct = ANY(:accounts)
+        """), params)
+        conn.execute(text(f"DELETE FROM {detail} WHERE gxacct = ANY(:accounts)"), params)
+        conn.execute(text(f"INSERT INTO {detail} SELECT * FROM {staging}"))
+        insert_facts(conn, staging, facts)
+        conn.execute(text(f"DROP TABLE {staging}"))
+    
+    return len(df)
+
+
+def load_gl_actuals(
+    year: int,
+    month: int = None,
+    from_cache: bool = False,
+    refresh_outages: bool = True,
+    accounts: Optional[List[str]] = None,
+):
     """
     Full refresh ETL for GL actuals.
     
+    The run is recorded in etl_runs with per-phase timings and row counts.
+    
     Args:
         year: Fiscal year
-        month: Optional month. If None, loads full year.
+        month: Optional month (13 for the adjustment periods). If None,
+            loads full year. Months with no rows left in DB2 are emptied.
+        from_cache: Read closed months from the extract cache instead of
+            DB2 (see extract_gl_actuals)
+        refresh_outages: Refresh the outage catalog afterwards (the ETL
+            orchestrator does it once after all months instead)
+        accounts: Reload only these accounts of `month` from DB2 (see
+            replace_accounts); accounts with no rows left are deleted
     """
+    if accounts and not month:
+        raise ValueError("Reloading accounts needs a month")
+    
     start_time = datetime.now()
     print("=" * 60)
-    print(f"GL Actuals ETL - {year}" + (f"-{month:02d}" if month else " Full Year"))
+    print(f"GL Actuals ETL - {year}" + (f"-{month:02d}" if month else " Full Year")
+          + (f" ({len(accounts)} accounts)" if accounts else ""))
     print("=" * 60)
     
     # Initialize database tables if needed
     print("[INIT] Ensuring database tables exist...")
     init_db()
     
-    # Extract
-    df = extract_gl_actuals(year, month)
-    
-    if df.empty:
-        print("[LOAD] No data to load")
-        return
-    
-    # Transform
-    df = transform_gl_actuals(df)
-    
-    # Load
-    print(f"[LOAD] Loading to PostgreSQL...")
-    engine = get_engine()
-    
-    # Delete existing data for this period
-    with engine.connect() as conn:
-        if month:
-            delete_sql = text(f"DELETE FROM gl_transactions WHERE txyear = {year} AND txmnth = {month}")
-        else:
-            delete_sql = text(f"DELETE FROM gl_transactions WHERE txyear = {year}")
+    with track_etl_run("gl_actuals", year=year, month=month, accounts=len(accounts or [])) as run:
+        # Extract
+        with run.phase("extract"):
+            df = extract_gl_actuals(year, month, from_cache=from_cache, accounts=accounts)
+            run.add_rows(len(df))
+            run.add_bytes(frame_bytes(df))
         
-        result = conn.execute(delete_sql)
-        deleted = result.rowcount
-        conn.commit()
-        print(f"[LOAD] Deleted {deleted:,} existing rows")
-    
-    # Insert new data
-    df.to_sql(
-        'gl_transactions',
-        engine,
-        if_exists='append',
-        index=False,
-        method='multi',
-        chunksize=1000
-    )
+        # An empty extract still goes through the load: a month that no
+        # longer has rows in DB2 (or accounts with none left) is emptied
+        if df.empty:
+            print("[LOAD] No rows in DB2; emptying " + ("the accounts" if accounts else "the month(s)"))
+        
+        # Transform
+        with run.phase("transform"):
+            df = transform_gl_actuals(df)
+            run.add_rows(len(df))
+        
+        # Load
+        print(f"[LOAD] Loading to PostgreSQL...")
+        engine = get_engine()
+        
+        with run.phase("load"):
+            if accounts:
+                replace_accounts(engine, df, year, month, accounts)
+                print(f"[LOAD] Replaced {len(accounts)} account(s) in place")
+            else:
+                swapped = replace_partitions(engine, df, year, month)
+                print(f"[LOAD] Swapped in {swapped} month partition(s)")
+            run.add_rows(len(df))
+        
+        if refresh_outages:
+            with run.phase("outage_catalog"):
+                with engine.begin() as conn:
+                    outages = refresh_outage_catalog(conn, year)
+                print(f"[LOAD] Refreshed {outages:,} outage(s) in the catalog")
     
     elapsed = datetime.now() - start_time
     print(f"[LOAD] Inserted {len(df):,} rows")
@@ -193,11 +388,14 @@ def load_gl_actuals(year: int, month: int = None):
 
 
 if __name__ == "__main__":
-    # Default: load current year
-    import sys
+    import argparse
     
-    year = int(sys.argv[1]) if len(sys.argv) > 1 else 2025
-    month = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(description="Reload GL actuals from Infinium")
+    parser.add_argument("year", type=int, nargs="?", default=2025)
+    parser.add_argument("month", type=int, nargs="?")
+    parser.add_argument(
+        "--from-cache", action="store_true", help="read closed months from the extract cache, not DB2"
+    )
+    args = parser.parse_args()
     
-    load_gl_actuals(year, month)
-
+    load_gl_actuals(args.year, args.month, from_cache=args.from_cache)
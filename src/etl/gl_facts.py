@@ -0,0 +1,186 @@
+"""
+Populate gl_facts, the narrow GL actuals table summaries read.
+
+Each gl_facts row keeps the amount columns summaries, projections and
+variances use, integer keys into the ledger dimensions (dim_account,
+dim_project, dim_outage; see src/etl/dimensions.py) in place of the
+account string, project number and shutdown alias, and the keys they
+group by, derived once here instead of on every read:
+
+    plant_code    from the shutdown alias, else the account's first digit
+    dept_code     project mapping, else the account's CTUF01 mapping, else MAINT
+
+Outage group and flag are attributes of dim_outage.
+
+gl_actuals builds a month's facts from its detail staging table and
+swaps both in together. The mapping and account loads change what the
+department keys resolve to, so they call refresh_fact_keys() afterwards.
+
+    python -m src.etl.gl_facts 2025    # rebuild a year's facts from gl_transactions
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.db import partitions
+from src.etl.dimensions import ensure_dimensions
+
+FACT_COLUMNS = (
+    "id", "txyear", "txmnth", "account_key", "project_key", "outage_key",
+    "gxfamt", "gxdrcr", "plant_code", "dept_code",
+)
+
+# Department of a fact, given its dimension rows joined as da (account) and dp (project)
+DEPT_SQL = "COALESCE(pm.dept_code, adm.dept_code, 'MAINT')"
+
+DEPT_JOINS_SQL = """
+    LEFT JOIN gl_accounts a ON a.ctacct = da.gxacct
+    LEFT JOIN project_mappings pm ON pm.project_number = dp.project_number
+    LEFT JOIN account_dept_mappings adm ON TRIM(a.ctuf01) = adm.ctuf01
+"""
+
+
+# Plant of a detail row (alias t) given its outage dimension row (o)
+PLANT_SQL = """COALESCE(o.plant_code, CASE LEFT(t.gxacct, 1)
+                   WHEN '1' THEN 'KC'  -- Kyger accounts start with 1
+                   WHEN '2' THEN 'CC'  -- Clifty accounts start with 2
+                   ELSE 'KC'
+               END)"""
+
+# Dimension rows of a detail row (alias t)
+DIM_JOINS_SQL = """
+        LEFT JOIN dim_account da ON da.gxacct = t.gxacct
+        LEFT JOIN dim_project dp ON dp.project_number = TRIM(t.gxpjno)
+        LEFT JOIN dim_outage o ON o.alias = t.gxshut
+"""
+
+
+def fact_select_sql(source: str, where: str = "") -> str:
+    """SELECT of gl_facts rows (FACT_COLUMNS order) from a detail table."""
+    return f"""
+        SELECT t.id, t.txyear, t.txmnth, da.account_key, dp.project_key, o.outage_key,
+               t.gxfamt, t.gxdrcr,
+               {PLANT_SQL} AS plant_code,
+               {DEPT_SQL} AS dept_code
+        FROM {source} t
+        {DIM_JOINS_SQL}
+        {DEPT_JOINS_SQL}
+        {where}
+    """
+
+
+def insert_facts(db_conn, source: str, target: str, where: str = "") -> int:
+    """
+    Insert the facts of `source` detail rows into `target`.
+
+    Adds any dimension rows the source needs first.
+
+    Args:
+        db_conn: SQLAlchemy connection (caller owns the transaction)
+        source: gl_transactions or one of its partitions / staging tables
+        target: gl_facts or one of its staging tables
+        where: Optional WHERE clause on the source rows (alias t)
+
+    Returns:
+        Rows inserted
+    """
+    ensure_dimensions(db_conn, source)
+    result = db_conn.execute(text(
+        f"INSERT INTO {target} ({', '.join(FACT_COLUMNS)}) {fact_select_sql(source, where)}"
+    ))
+    return result.rowcount
+
+
+def stage_facts(db_conn, year: int, month: Optional[int], detail_staging: str) -> str:
+    """
+    Build the gl_facts staging table for a loaded detail staging table.
+
+    Returns:
+        Fact staging table name (indexed, ready for partitions.swap_in)
+    """
+    staging = partitions.create_staging(db_conn, year, month, partitions.FACT_TABLE)
+    insert_facts(db_conn, detail_staging, staging)
+    partitions.index_staging(db_conn, staging, partitions.FACT_TABLE)
+    return staging
+
+
+def refresh_fact_keys(db_conn, year: Optional[int] = None) -> int:
+    """
+    Re-derive fact departments after a mapping or account load.
+
+    The department only depends on the (account, project) pair, so it is
+    resolved once per distinct pair and only facts whose department
+    changes are rewritten.
+
+    Args:
+        db_conn: SQLAlchemy connection (caller owns the transaction)
+        year: Limit to one year (default: all years)
+
+    Returns:
+        Rows updated
+    """
+    year_filter = "AND f.txyear = :year" if year is not None else ""
+    result = db_conn.execute(text(f"""
+        WITH pairs AS (
+            SELECT DISTINCT f.account_key, f.project_key
+            FROM gl_facts f
+            WHERE TRUE {year_filter}
+        ),
+        resolved AS (
+            SELECT p.account_key, p.project_key, {DEPT_SQL} AS dept_code
+            FROM pairs p
+            LEFT JOIN dim_account da ON da.account_key = p.account_key
+            LEFT JOIN dim_project dp ON dp.project_key = p.project_key
+            {DEPT_JOINS_SQL}
+        )
+        UPDATE gl_facts f SET dept_code = r.dept_code
+        FROM resolved r
+        WHERE COALESCE(f.account_key, 0) = COALESCE(r.account_key, 0)
+          AND COALESCE(f.project_key, 0) = COALESCE(r.project_key, 0)
+          AND f.dept_code <> r.dept_code
+          {year_filter}
+    """), {"year": year} if year is not None else {})
+    return result.rowcount
+
+
+def rebuild_facts(engine, year: int) -> int:
+    """
+    Rebuild a year's gl_facts partitions from its gl_transactions rows.
+
+    For years loaded before gl_facts existed; each month is staged and
+    swapped in like a gl_actuals reload.
+
+    Returns:
+        Rows in the rebuilt facts
+    """
+    with engine.begin() as conn:
+        partitions.ensure_year_partitions(conn, year)
+
+    rows = 0
+    staged = {}
+    for slot in partitions.MONTH_SLOTS:
+        source = partitions.month_partition(year, slot)
+        with engine.begin() as conn:
+            # New keys are committed on their own, before the facts
+            ensure_dimensions(conn, source)
+        with engine.begin() as conn:
+            staging = partitions.create_staging(conn, year, slot, partitions.FACT_TABLE)
+            rows += insert_facts(conn, source, staging)
+            partitions.index_staging(conn, staging, partitions.FACT_TABLE)
+        staged[slot] = staging
+
+    with engine.begin() as conn:
+        for slot, staging in staged.items():
+            partitions.swap_in(conn, year, slot, staging, partitions.FACT_TABLE)
+    return rows
+
+
+if __name__ == "__main__":
+    import sys
+
+    from src.db.postgres import get_engine, init_db
+
+    init_db()
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else 2025
+    print(f"Rebuilt {rebuild_facts(get_engine(), year):,} gl_facts rows for {year}")
@@ -5,8 +5,11 @@ Load mapping CSV files into PostgreSQL.
 import pandas as pd
 from pathlib import Path
 from sqlalchemy.orm import sessionmaker
-from src.db.postgres import get_engine
+from src.db.postgres import get_engine, init_db
 from src.models.mapping_tables import Base, ProjectMapping, AccountDeptMapping
+from src.models.close_calendar import FiscalPeriod
+from src.etl.run_tracking import track_etl_run
+from src.etl.gl_facts import refresh_fact_keys
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -16,7 +19,7 @@ MASTER_DATA_DIR = Path(__file__).parent.parent.parent / 'data' / 'master'
 
 
 def load_project_mappings():
-    """Load project_mappings.csv into PostgreSQL."""
+    """Load project_mappings.csv into PostgreSQL. Returns rows inserted."""
     logging.info("Loading project_mappings.csv...")
     
     csv_path = MASTER_DATA_DIR / 'project_mappings.csv'
@@ -56,10 +59,12 @@ def load_project_mappings():
         raise
     finally:
         session.close()
+    
+    return len(df)
 
 
 def load_account_dept_mappings():
-    """Load account_dept_mappings.csv into PostgreSQL."""
+    """Load account_dept_mappings.csv into PostgreSQL. Returns rows inserted."""
     logging.info("Loading account_dept_mappings.csv...")
     
     csv_path = MASTER_DATA_DIR / 'account_dept_mappings.csv'
@@ -99,16 +104,73 @@ def load_account_dept_mappings():
         raise
     finally:
         session.close()
+    
+    return len(df)
+
+
+def load_fiscal_calendar():
+    """Load fiscal_calendar.csv into fiscal_periods (upsert). Returns rows loaded."""
+    logging.info("Loading fiscal_calendar.csv...")
+    
+    csv_path = MASTER_DATA_DIR / 'fiscal_calendar.csv'
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+    
+    df = pd.read_csv(csv_path, comment='#', parse_dates=['start_date', 'end_date'])
+    logging.info(f"Read {len(df)} fiscal periods from CSV")
+    
+    engine = get_engine()
+    FiscalPeriod.__table__.create(engine, checkfirst=True)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    
+    try:
+        # Periods are referenced by closes, so merge rather than full refresh
+        for _, row in df.iterrows():
+            session.merge(FiscalPeriod(
+                fiscal_year=int(row['fiscal_year']),
+                period=int(row['period']),
+                period_name=str(row['period_name']).strip(),
+                start_date=row['start_date'].date(),
+                end_date=row['end_date'].date(),
+            ))
+        
+        session.commit()
+        logging.info(f"Loaded {len(df)} fiscal periods")
+        
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Failed to load fiscal calendar: {e}")
+        raise
+    finally:
+        session.close()
+    
+    return len(df)
 
 
 def load_all_mappings():
-    """Load all mapping tables."""
+    """
+    Load all mapping tables (recorded in etl_runs as one run).
+
+    gl_facts department keys are re-derived from the new mappings.
+    """
     logging.info("=" * 60)
     logging.info("Loading Mapping Tables")
     logging.info("=" * 60)
     
-    load_project_mappings()
-    load_account_dept_mappings()
+    with track_etl_run("mappings") as run:
+        with run.phase("project_mappings"):
+            run.add_rows(load_project_mappings())
+        with run.phase("account_dept_mappings"):
+            run.add_rows(load_account_dept_mappings())
+        with run.phase("fiscal_calendar"):
+            run.add_rows(load_fiscal_calendar())
+        with run.phase("fact_keys"):
+            init_db()
+            with get_engine().begin() as conn:
+                updated = refresh_fact_keys(conn)
+            logging.info(f"Re-derived keys of {updated:,} gl_facts rows")
+            run.add_rows(updated)
     
     logging.info("=" * 60)
     logging.info("All mappings loaded successfully")
@@ -0,0 +1,411 @@
+"""
+Nightly ETL as a dependency graph.
+
+Each step names the steps it depends on; the orchestrator starts every
+step whose dependencies have finished, up to a worker cap, so
+independent work overlaps (the twelve GL months, the budget and expense
+CSVs, the views):
+
+    gl_accounts -> mappings --+
+    gl_partitions ------------+-> gl_actuals_2025_01 .. _12, _adj -> outage_catalog
+    budget ---------------------------------------------------------+
+    views ----------------------------------------------------------+-> ytd_aggregates
+    gl_actuals_* ---------------------------------------------------+
+    expense_actuals (only with --expense-file)
+
+The mappings wait for the account master because both re-derive
+gl_facts departments; the GL months wait for both because they derive
+departments from them.
+
+Completed steps are checkpointed to a JSON file after each one finishes.
+Every run starts from a fresh checkpoint; rerunning the same graph (same
+year, months and files) with --resume after a failure skips the steps
+the failed run completed and resumes at the failed step. When a step
+fails, steps depending on it are skipped and the others still run. A
+fully successful run removes its checkpoint.
+
+    python -m src.etl.orchestrator 2025 --workers 4
+    python -m src.etl.orchestrator 2025 --months 11 12 --from-cache
+    python -m src.etl.orchestrator 2025 --resume
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.db.partitions import ADJUSTMENT_MONTH
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_BUDGET_FILE = PROJECT_ROOT / 'docs' / 'source_documents' / 'PTProd_AcctGL_Budget.csv'
+CHECKPOINT_DIR = PROJECT_ROOT / 'data' / 'etl_checkpoints'
+
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class Step:
+    """A unit of ETL work and the steps that must finish before it."""
+    name: str
+    run: Callable[[], object]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class DagResult:
+    """Outcome of one orchestrator run."""
+    completed: List[str] = field(default_factory=list)
+    resumed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.skipped
+
+
+def validate(steps: Sequence[Step]):
+    """
+    Check step names are unique, dependencies exist and there is no cycle.
+
+    Raises:
+        ValueError: On the first problem found
+    """
+    names = [step.name for step in steps]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate steps: {', '.join(sorted(duplicates))}")
+
+    deps = {step.name: step.deps for step in steps}
+    for step in steps:
+        missing = [d for d in step.deps if d not in deps]
+        if missing:
+            raise ValueError(f"Step {step.name} depends on unknown {', '.join(missing)}")
+
+    visiting, visited = set(), set()
+
+    def visit(name, path):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dep in deps[name]:
+            visit(dep, path + [name])
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in deps:
+        visit(name, [])
+
+
+class Checkpoint:
+    """Completed steps of a graph, persisted as JSON after each step."""
+
+    def __init__(self, path: Path, signature: str):
+        self.path = Path(path)
+        self.signature = signature
+        self.completed: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "Checkpoint":
+        """Read completed steps; a checkpoint of another graph is ignored."""
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return self
+        if state.get("signature") == self.signature:
+            self.completed = dict(state.get("completed", {}))
+        return self
+
+    def mark_done(self, name: str):
+        with self._lock:
+            self.completed[name] = datetime.now().isoformat(timespec="seconds")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(
+                {"signature": self.signature, "completed": self.completed}, indent=2
+            ))
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+
+def run_dag(
+    steps: Sequence[Step],
+    workers: int = DEFAULT_WORKERS,
+    checkpoint: Optional[Checkpoint] = None,
+) -> DagResult:
+    """
+    Run steps as their dependencies complete, at most `workers` at a time.
+
+    Args:
+        steps: The graph (declaration order breaks ties between ready steps)
+        workers: Maximum steps running at once
+        checkpoint: Completed steps to skip; updated as steps finish
+
+    Returns:
+        DagResult
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    validate(steps)
+
+    start = time.perf_counter()
+    result = DagResult()
+    done = set()
+    if checkpoint is not None:
+        done = {step.name for step in steps if step.name in checkpoint.completed}
+        result.resumed = [step.name for step in steps if step.name in done]
+        if result.resumed:
+            logger.info(f"Resuming: {len(result.resumed)} step(s) already completed")
+
+    pending = [step for step in steps if step.name not in done]
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etl") as pool:
+        while pending or running:
+            blocked = set(result.failed) | set(result.skipped)
+            for step in [s for s in pending if any(d in blocked for d in s.deps)]:
+                pending.remove(step)
+                result.skipped.append(step.name)
+                logger.warning(f"Skipping {step.name}: a dependency did not complete")
+                blocked.add(step.name)
+
+            ready = [s for s in pending if all(d in done for d in s.deps)]
+            for step in ready[:workers - len(running)]:
+                pending.remove(step)
+                logger.info(f"Starting {step.name}")
+                running[pool.submit(_timed, step)] = step
+
+            if not running:
+                continue  # everything left was just skipped
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    result.failed[step.name] = f"{type(e).__name__}: {e}"
+                    logger.exception(f"Step {step.name} failed")
+                    continue
+                done.add(step.name)
+                result.completed.append(step.name)
+                if checkpoint is not None:
+                    checkpoint.mark_done(step.name)
+                logger.info(f"Finished {step.name} in {seconds:.1f}s")
+
+    result.seconds = time.perf_counter() - start
+    if checkpoint is not None and result.ok:
+        checkpoint.clear()
+    return result
+
+
+def _timed(step: Step) -> float:
+    start = time.perf_counter()
+    step.run()
+    return time.perf_counter() - start
+
+
+# =============================================================================
+# Nightly graph
+# =============================================================================
+
+def _month_step(year: int, month: int) -> str:
+    label = "adj" if month == ADJUSTMENT_MONTH else f"{month:02d}"
+    return f"gl_actuals_{year}_{label}"
+
+
+def _ensure_partitions(year: int):
+    from src.db import partitions
+    from src.db.postgres import get_engine, init_db
+
+    init_db()
+    with get_engine().begin() as conn:
+        partitions.ensure_year_partitions(conn, year)
+
+
+def _load_month(year: int, month: int, from_cache: bool):
+    from src.etl.gl_actuals import load_gl_actuals
+    load_gl_actuals(year, month, from_cache=from_cache, refresh_outages=False)
+
+
+def _load_accounts(from_cache: bool):
+    from src.etl.gl_accounts import load_gl_accounts
+    load_gl_accounts(from_cache=from_cache)
+
+
+def _load_mappings():
+    from src.etl.load_mappings import load_all_mappings
+    load_all_mappings()
+
+
+def _refresh_outages(year: int):
+    from src.db.postgres import get_engine
+    from src.etl.outage_catalog import refresh_outage_catalog
+
+    with get_engine().begin() as conn:
+        refresh_outage_catalog(conn, year)
+
+
+def _import_csv(importer: str, file_path: Path, **kwargs):
+    from src.db.postgres import get_session
+
+    if importer == "budget":
+        from src.etl.budget_import import import_budget as run_import
+    else:
+        from src.etl.expense_import import import_expense_actuals as run_import
+    db = get_session()
+    try:
+        run_import(db=db, file_path=file_path, clear_existing=True, **kwargs)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _create_views():
+    from src.db.views import create_budget_groups_view
+    create_budget_groups_view()
+
+
+def _refresh_ytd(year: int):
+    from src.engine.close_calendar import refresh_ytd_aggregates
+    refresh_ytd_aggregates(year)
+
+
+def nightly_steps(
+    year: int,
+    months: Optional[Iterable[int]] = None,
+    budget_file: Optional[Path] = DEFAULT_BUDGET_FILE,
+    expense_file: Optional[Path] = None,
+    from_cache: bool = False,
+) -> List[Step]:
+    """
+    The nightly ETL graph for a fiscal year.
+
+    Args:
+        year: Fiscal year
+        months: GL months to reload (default: 1-12 and the adjustment periods)
+        budget_file: Budget CSV to import for the year (None: no budget step)
+        expense_file: Expense actuals CSV (None: no expense step)
+        from_cache: Read the extract cache instead of DB2 (closed GL
+            months only); by default every extract is pulled from DB2
+    """
+    months = list(months) if months else [*range(1, 13), ADJUSTMENT_MONTH]
+    month_steps = [
+        Step(
+            _month_step(year, month),
+            lambda month=month: _load_month(year, month, from_cache),
+            ("mappings", "gl_partitions"),
+        )
+        for month in months
+    ]
+    month_names = tuple(step.name for step in month_steps)
+
+    steps = [
+        Step("gl_partitions", lambda: _ensure_partitions(year)),
+        Step("gl_accounts", lambda: _load_accounts(from_cache)),
+        Step("mappings", _load_mappings, ("gl_accounts",)),
+        *month_steps,
+        Step("outage_catalog", lambda: _refresh_outages(year), month_names),
+        Step("views", _create_views),
+    ]
+    ytd_deps = (*month_names, "views")
+    if budget_file is not None:
+        steps.append(Step("budget", lambda: _import_csv("budget", Path(budget_file), budget_year=year)))
+        ytd_deps = (*ytd_deps, "budget")
+    if expense_file is not None:
+        steps.append(Step("expense_actuals", lambda: _import_csv("expense", Path(expense_file))))
+    steps.append(Step("ytd_aggregates", lambda: _refresh_ytd(year), ytd_deps))
+    return steps
+
+
+def graph_signature(steps: Sequence[Step], **params) -> str:
+    """Identity of a graph for checkpoints: its steps, dependencies and params."""
+    shape = [[step.name, list(step.deps)] for step in steps]
+    payload = json.dumps({"steps": shape, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def run_nightly(
+    year: int,
+    months: Optional[Iterable[int]] = None,
+    workers: int = DEFAULT_WORKERS,
+    budget_file: Optional[Path] = DEFAULT_BUDGET_FILE,
+    expense_file: Optional[Path] = None,
+    from_cache: bool = False,
+    resume: bool = False,
+) -> DagResult:
+    """
+    Run (or resume) the nightly ETL for a year.
+
+    Args:
+        resume: Skip the steps completed by the previous failed run of
+            the same graph; otherwise its checkpoint is discarded, so a
+            scheduled run never skips work done on an earlier night
+        (others as for nightly_steps / run_dag)
+    """
+    steps = nightly_steps(year, months, budget_file, expense_file, from_cache)
+    signature = graph_signature(
+        steps, year=year, budget_file=budget_file, expense_file=expense_file, from_cache=from_cache
+    )
+    checkpoint = Checkpoint(CHECKPOINT_DIR / f"nightly-{year}.json", signature)
+    if resume:
+        checkpoint.load()
+    else:
+        checkpoint.clear()
+
+    result = run_dag(steps, workers=workers, checkpoint=checkpoint)
+    logger.info(
+        f"Nightly ETL {year}: {len(result.completed)} step(s) run, {len(result.resumed)} resumed, "
+        f"{len(result.failed)} failed, {len(result.skipped)} skipped in {result.seconds:.1f}s"
+    )
+    for name, error in result.failed.items():
+        logger.error(f"  {name}: {error}")
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the nightly ETL graph")
+    parser.add_argument("year", type=int, nargs="?", default=2025)
+    parser.add_argument("--months", type=int, nargs="+", help="GL months to reload (13: adjustment periods)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--budget-file", type=Path, default=DEFAULT_BUDGET_FILE)
+    parser.add_argument("--no-budget", action="store_true", help="skip the budget CSV import")
+    parser.add_argument("--expense-file", type=Path)
+    parser.add_argument(
+        "--from-cache", action="store_true", help="read the extract cache (closed months only), not DB2"
+    )
+    parser.add_argument("--resume", action="store_true", help="skip steps the previous failed run completed")
+    args = parser.parse_args(argv)
+
+    result = run_nightly(
+        args.year,
+        months=args.months,
+        workers=args.workers,
+        budget_file=None if args.no_budget else args.budget_file,
+        expense_file=args.expense_file,
+        from_cache=args.from_cache,
+        resume=args.resume,
+    )
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
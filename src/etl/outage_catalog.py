@@ -0,0 +1,171 @@
+"""
+Outage catalog decoded from shutdown aliases.
+
+A shutdown alias (gxshut) names one outage event:
+
+    K 01 25 P 01
+    | |  |  | +-- sequence
+    | |  |  +---- type: P=planned, F=forced, M=maintenance
+    | |  +------- outage year (2025)
+    | +---------- unit
+    +------------ plant letter (K=Kyger Creek, C=Clifty Creek)
+
+dim_outage holds one row per alias, decoded once when the ETL first sees
+it (see src/etl/dimensions.py); after a load, refresh_outage_catalog()
+re-decodes the loaded year's outages and recomputes their windows (first
+and last transaction date charged to them). Outage groups (PLANNED-<unit>,
+UNPLANNED) are also used as department codes by the project mappings.
+
+    python -m src.etl.outage_catalog    # re-decode the catalog and windows
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+OUTAGE_PLANTS = {"K": "KC", "C": "CC"}
+
+OUTAGE_TYPES = {"P": "planned", "F": "forced", "M": "maintenance"}
+PLANNED = "P"
+
+PLANNED_GROUP_PREFIX = "PLANNED-"
+UNPLANNED_GROUP = "UNPLANNED"
+GENERAL_GROUP = "OUTAGE"
+
+
+@dataclass
+class ParsedOutageAlias:
+    """Parts of a shutdown alias like 'K0125P01'."""
+
+    alias: str
+    plant_code: Optional[str]
+    unit: Optional[str]
+    unit_number: Optional[int]
+    outage_year: Optional[int]
+    outage_type: Optional[str]
+    outage_group: Optional[str]
+    is_outage: bool
+
+
+def _number(digits: str) -> Optional[int]:
+    return int(digits) if digits.isdigit() else None
+
+
+def outage_group(unit: str, outage_type: str) -> str:
+    """Group of an outage: PLANNED-<unit> or UNPLANNED."""
+    return f"{PLANNED_GROUP_PREFIX}{unit}" if outage_type == PLANNED else UNPLANNED_GROUP
+
+
+def parse_outage_alias(alias: str) -> ParsedOutageAlias:
+    """Decode a shutdown alias.
+
+    Args:
+        alias: gxshut value like 'K0125P01'
+
+    Returns:
+        ParsedOutageAlias; aliases under six characters or without a
+        P/F/M type letter are not outages but still carry their plant
+    """
+    plant_code = OUTAGE_PLANTS.get(alias[:1])
+    outage_type = alias[5:6]
+    if len(alias.strip()) < 6 or outage_type not in OUTAGE_TYPES:
+        return ParsedOutageAlias(alias, plant_code, None, None, None, None, None, False)
+
+    unit = alias[1:3]
+    year = _number(alias[3:5])
+    return ParsedOutageAlias(
+        alias=alias,
+        plant_code=plant_code,
+        unit=unit,
+        unit_number=_number(unit),
+        outage_year=2000 + year if year is not None else None,
+        outage_type=outage_type,
+        outage_group=outage_group(unit, outage_type),
+        is_outage=True,
+    )
+
+
+def outage_group_info(group: str) -> Optional[Dict]:
+    """Department info for an outage group code, or None if it is not one."""
+    if group == GENERAL_GROUP:
+        return {"name": "Outage (General)", "is_outage": True}
+    if group == UNPLANNED_GROUP:
+        return {"name": "Unplanned Outage", "is_outage": True}
+    if group.startswith(PLANNED_GROUP_PREFIX):
+        unit = _number(group[len(PLANNED_GROUP_PREFIX):])
+        if unit is not None:
+            return {"name": f"Planned Outage - Unit {unit}", "is_outage": True, "unit": unit}
+    return None
+
+
+def is_outage_group(code: str) -> bool:
+    """True for outage department/group codes (PLANNED-<unit>, UNPLANNED, OUTAGE)."""
+    return outage_group_info(code) is not None
+
+
+def refresh_outage_catalog(db_conn, year: Optional[int] = None) -> int:
+    """
+    Re-decode dim_outage rows and recompute their outage windows.
+
+    After a load only the outages of the loaded year are refreshed: those
+    it has facts for, and those whose window reaches into it (a reload may
+    have removed their rows there). Each window is still the first and
+    last date over all years, read through gl_facts' outage_key index and
+    the detail rows' dates.
+
+    Args:
+        db_conn: SQLAlchemy connection (caller owns the transaction)
+        year: Limit to the outages of one fiscal year (default: all)
+
+    Returns:
+        Catalog rows refreshed
+    """
+    if year is None:
+        keys_sql, params = "SELECT outage_key FROM dim_outage", {}
+    else:
+        # Posting dates can fall a little outside the fiscal year
+        keys_sql, params = """
+            SELECT f.outage_key FROM gl_facts f
+            WHERE f.txyear = :year AND f.outage_key IS NOT NULL
+            UNION
+            SELECT o.outage_key FROM dim_outage o
+            WHERE o.window_start <= make_date(:year + 1, 1, 31)
+              AND o.window_end >= make_date(:year - 1, 12, 1)
+        """, {"year": year}
+
+    rows = db_conn.execute(text(f"""
+        SELECT o.outage_key, o.alias FROM dim_outage o
+        WHERE o.outage_key IN ({keys_sql})
+    """), params).all()
+    if not rows:
+        return 0
+    db_conn.execute(text("""
+        UPDATE dim_outage SET
+            plant_code = :plant_code, unit = :unit, unit_number = :unit_number,
+            outage_year = :outage_year, outage_type = :outage_type,
+            outage_group = :outage_group, is_outage = :is_outage
+        WHERE alias = :alias
+    """), [vars(parse_outage_alias(alias)) for _, alias in rows])
+
+    db_conn.execute(text("""
+        UPDATE dim_outage o SET window_start = w.first_date, window_end = w.last_date
+        FROM (
+            SELECT k.outage_key, MIN(t.thedat) AS first_date, MAX(t.thedat) AS last_date
+            FROM unnest(CAST(:keys AS integer[])) AS k(outage_key)
+            LEFT JOIN gl_facts f ON f.outage_key = k.outage_key
+            LEFT JOIN gl_transactions t
+                ON t.id = f.id AND t.txyear = f.txyear AND t.txmnth = f.txmnth
+            GROUP BY k.outage_key
+        ) w
+        WHERE o.outage_key = w.outage_key
+          AND (o.window_start, o.window_end) IS DISTINCT FROM (w.first_date, w.last_date)
+    """), {"keys": [key for key, _ in rows]})
+    return len(rows)
+
+if __name__ == "__main__":
+    from src.db.postgres import get_engine, init_db
+
+    init_db()
+    with get_engine().begin() as conn:
+        print(f"Refreshed {refresh_outage_catalog(conn):,} outages")
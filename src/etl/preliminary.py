@@ -0,0 +1,224 @@
+"""
+Preliminary GL actuals for close.
+
+During close, finance wants department totals within minutes of
+postings; a detailed pull of the month from GLCUFA.GLPTX1 takes too long
+for that. The preliminary load pushes the aggregation down to DB2:
+
+    SUM(GXFAMT), COUNT(*) ... GROUP BY GXACCT, GXPJNO, GXSHUT, GXDRCR
+
+and loads only those rows (a few thousand instead of the month's
+detail) into gl_preliminary_actuals, with the same dimension keys, plant
+and department as gl_facts. The month is listed in preliminary_periods,
+and transaction_budget_groups reads the aggregate instead of the month's
+facts, so summaries, projections and variances pick it up; the summary
+and variance pages are marked preliminary. The next detailed load of the
+month (gl_actuals) clears both in its partition swap.
+
+    python -m src.etl.preliminary 2025 11
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+from src.db import partitions
+from src.db.infinium import get_infinium_connection
+from src.db.postgres import get_engine, init_db
+from src.etl.dimensions import ensure_dimensions
+from src.etl.gl_facts import DEPT_JOINS_SQL, DEPT_SQL, DIM_JOINS_SQL, PLANT_SQL
+from src.etl.run_tracking import track_etl_run, frame_bytes
+from src.etl.transforms import normalize_strings
+
+
+# Aggregate pushed down to DB2 (one row per account/project/alias/side)
+PRELIMINARY_QUERY = """
+SELECT
+    TXYEAR,
+    TXMNTH,
+    TRIM(GXACCT) AS GXACCT,
+    TRIM(GXPJNO) AS GXPJNO,
+    TRIM(GXSHUT) AS GXSHUT,
+    GXDRCR,
+    SUM(GXFAMT) AS GXFAMT,
+    COUNT(*) AS TXN_COUNT
+FROM GLCUFA.GLPTX1
+WHERE TXYEAR = {year} AND TXMNTH = {month}
+GROUP BY TXYEAR, TXMNTH, TRIM(GXACCT), TRIM(GXPJNO), TRIM(GXSHUT), GXDRCR
+"""
+
+STAGING = "gl_preliminary_actuals_load"
+
+CREATE_STAGING_SQL = f"""
+CREATE TABLE {STAGING} (
+    txyear INTEGER,
+    txmnth INTEGER,
+    gxacct VARCHAR(36),
+    gxpjno VARCHAR(10),
+    gxshut VARCHAR(12),
+    gxdrcr VARCHAR(1),
+    gxfamt NUMERIC(17, 2),
+    txn_count INTEGER
+)
+"""
+
+INSERT_PRELIMINARY_SQL = f"""
+INSERT INTO gl_preliminary_actuals (
+    txyear, txmnth, account_key, project_key, outage_key,
+    gxfamt, gxdrcr, txn_count, plant_code, dept_code
+)
+SELECT t.txyear, t.txmnth, da.account_key, dp.project_key, o.outage_key,
+       t.gxfamt, t.gxdrcr, t.txn_count,
+       {PLANT_SQL} AS plant_code,
+       {DEPT_SQL} AS dept_code
+FROM {STAGING} t
+{DIM_JOINS_SQL}
+{DEPT_JOINS_SQL}
+"""
+
+
+def _check_month(month: int):
+    if month not in partitions.MONTHS:
+        raise ValueError(f"Preliminary loads are for months 1-12, not {month}")
+
+
+def extract_preliminary(year: int, month: int) -> pd.DataFrame:
+    """
+    Month's actuals aggregated on DB2.
+
+    Returns:
+        DataFrame with one row per account, project, alias and side
+    """
+    _check_month(month)
+    print(f"[EXTRACT] Connecting to Infinium DB2...")
+    conn = get_infinium_connection()
+
+    print(f"[EXTRACT] Aggregating {year}-{month:02d} on DB2...")
+    df = pd.read_sql(PRELIMINARY_QUERY.format(year=int(year), month=int(month)), conn)
+    conn.close()
+
+    print(f"[EXTRACT] Retrieved {len(df):,} aggregate rows")
+    return df
+
+
+def transform_preliminary(df: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case columns and normalize text like the detailed load."""
+    df.columns = df.columns.str.lower()
+    normalize_strings(df, categories=['gxdrcr'])
+    return df
+
+
+def clear_preliminary(db_conn, year: int, months: Optional[Iterable[int]] = None) -> int:
+    """
+    Drop the preliminary rows of months whose detailed load has caught up.
+
+    Args:
+        db_conn: SQLAlchemy connection (caller owns the transaction)
+        year: Fiscal year
+        months: Months to clear (default: the whole year)
+
+    Returns:
+        Preliminary months cleared
+    """
+    params = {"year": year}
+    month_filter = ""
+    if months is not None:
+        params["months"] = [int(m) for m in months]
+        month_filter = "AND txmnth = ANY(:months)"
+    db_conn.execute(text(f"""
+        DELETE FROM gl_preliminary_actuals WHERE txyear = :year {month_filter}
+    """), params)
+    return db_conn.execute(text(f"""
+        DELETE FROM preliminary_periods WHERE txyear = :year {month_filter}
+    """), params).rowcount
+
+
+def replace_preliminary(engine, df: pd.DataFrame, year: int, month: int) -> int:
+    """
+    Replace a month's preliminary rows with `df` and mark it preliminary.
+
+    One transaction, so readers switch from the month's facts (or its
+    previous preliminary rows) to the new aggregate at once.
+
+    Returns:
+        Aggregate rows loaded
+    """
+    _check_month(month)
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {STAGING}"))
+        conn.execute(text(CREATE_STAGING_SQL))
+        df.to_sql(STAGING, conn, if_exists='append', index=False, method='multi', chunksize=1000)
+        ensure_dimensions(conn, STAGING)
+
+        clear_preliminary(conn, year, [month])
+        rows = conn.execute(text(INSERT_PRELIMINARY_SQL)).rowcount
+        conn.execute(text("""
+            INSERT INTO preliminary_periods (txyear, txmnth, loaded_at, txn_count)
+            VALUES (:year, :month, :loaded_at, :txn_count)
+        """), {
+            "year": year,
+            "month": month,
+            "loaded_at": datetime.now(),
+            "txn_count": int(df["txn_count"].sum()) if len(df) else 0,
+        })
+        conn.execute(text(f"DROP TABLE {STAGING}"))
+    return rows
+
+
+def load_preliminary_actuals(year: int, month: int):
+    """
+    Preliminary ETL for one month during close.
+
+    The run is recorded in etl_runs (job gl_preliminary), which also
+    expires cached projections and YTD aggregates.
+
+    Args:
+        year: Fiscal year
+        month: Month being closed (1-12)
+    """
+    _check_month(month)
+    start_time = datetime.now()
+    print("=" * 60)
+    print(f"GL Actuals Preliminary ETL - {year}-{month:02d}")
+    print("=" * 60)
+
+    # Initialize database tables if needed
+    print("[INIT] Ensuring database tables exist...")
+    init_db()
+
+    with track_etl_run("gl_preliminary", year=year, month=month) as run:
+        # Extract
+        with run.phase("extract"):
+            df = extract_preliminary(year, month)
+            run.add_rows(len(df))
+            run.add_bytes(frame_bytes(df))
+
+        # Transform
+        with run.phase("transform"):
+            df = transform_preliminary(df)
+            run.add_rows(len(df))
+
+        # Load
+        print(f"[LOAD] Loading to PostgreSQL...")
+        with run.phase("load"):
+            rows = replace_preliminary(get_engine(), df, year, month)
+            run.add_rows(rows)
+
+    elapsed = datetime.now() - start_time
+    print(f"[LOAD] Loaded {rows:,} aggregate rows ({int(df['txn_count'].sum()) if rows else 0:,} transactions)")
+    print("=" * 60)
+    print(f"Complete in {elapsed.total_seconds():.1f} seconds")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load preliminary GL actuals for a month in close")
+    parser.add_argument("year", type=int)
+    parser.add_argument("month", type=int)
+    args = parser.parse_args()
+
+    load_preliminary_actuals(args.year, args.month)
@@ -0,0 +1,361 @@
+"""
+Control-total reconciliation of GL actuals against Infinium.
+
+Instead of reloading whole years "just in case", compare per
+(month, account) control totals on both sides and reload only what
+differs:
+
+    row_count   COUNT(*)
+    amount      SUM(GXFAMT)
+    row_hash    SUM of a per-row checksum of journal, date and amount
+
+The row hash is a sum, so it does not depend on row order, and it is
+plain integer arithmetic (MOD, CAST), so the same SQL runs as an
+aggregate on DB2 and on gl_transactions; only the totals cross the wire.
+It catches changed, moved, added and dropped rows, not description-only
+edits.
+
+Differences are reloaded from DB2: a month with more than
+MAX_ACCOUNT_RELOAD differing accounts through a partition swap, fewer
+accounts in place (gl_actuals.replace_accounts). Reloaded months are
+checked again, and every check is written to reconciliation_results: a
+row per month compared, plus a row per differing account.
+
+    python -m src.etl.reconciliation 2025              # check and reload
+    python -m src.etl.reconciliation 2025 --dry-run    # check only
+    python -m src.etl.reconciliation 2025 --months 11 12
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, text
+
+from src.db import partitions
+from src.models.reconciliation import ReconciliationResult
+
+# More differing accounts than this in a month reloads the whole month
+MAX_ACCOUNT_RELOAD = 25
+
+# Order-independent checksum of a row; column names are unquoted so they
+# resolve on DB2 (GXJRNL) and Postgres (gxjrnl) alike
+ROW_HASH_SQL = (
+    "MOD(COALESCE(GXJRNL, 0) * 7919 + COALESCE(TH8DAT, 0) * 31"
+    " + CAST(COALESCE(GXFAMT, 0) * 100 AS BIGINT), 1000000007)"
+)
+
+CONTROL_TOTALS_SQL = """
+SELECT TXMNTH, TRIM(GXACCT) AS GXACCT, COUNT(*) AS ROW_COUNT,
+       SUM(GXFAMT) AS AMOUNT, SUM({row_hash}) AS ROW_HASH
+FROM {table}
+WHERE TXYEAR = {year}{months}
+GROUP BY TXMNTH, TRIM(GXACCT)
+"""
+
+SOURCE_TABLE = "GLCUFA.GLPTX1"
+
+Key = Tuple[int, Optional[str]]
+
+
+@dataclass(frozen=True)
+class ControlTotal:
+    """Totals of one (month, account) on one side."""
+    rows: int
+    amount: Decimal
+    row_hash: int
+
+
+@dataclass
+class Difference:
+    """A (month, account) whose totals differ between Infinium and Postgres."""
+    txmnth: int
+    gxacct: Optional[str]
+    source: Optional[ControlTotal]
+    target: Optional[ControlTotal]
+
+    @property
+    def status(self) -> str:
+        if self.target is None:
+            return "missing_target"
+        if self.source is None:
+            return "missing_source"
+        return "mismatch"
+
+
+def _months_filter(months: Optional[Iterable[int]]) -> str:
+    if not months:
+        return ""
+    conditions = []
+    for slot in sorted({partitions.month_slot(m) for m in months}, key=lambda s: s or 99):
+        if slot is None:
+            conditions.append(f"TXMNTH NOT BETWEEN {partitions.MONTHS[0]} AND {partitions.MONTHS[-1]}")
+        else:
+            conditions.append(f"TXMNTH = {slot}")
+    return " AND (" + " OR ".join(conditions) + ")"
+
+
+def control_totals_sql(table: str, year: int, months: Optional[Iterable[int]] = None) -> str:
+    """Control totals query for a table (DB2 or Postgres)."""
+    return CONTROL_TOTALS_SQL.format(
+        row_hash=ROW_HASH_SQL, table=table, year=int(year), months=_months_filter(months)
+    )
+
+
+def _totals(rows) -> Dict[Key, ControlTotal]:
+    return {
+        (int(txmnth), gxacct): ControlTotal(
+            rows=int(row_count),
+            amount=Decimal(str(amount or 0)),
+            row_hash=int(row_hash or 0),
+        )
+        for txmnth, gxacct, row_count, amount, row_hash in rows
+    }
+
+
+def source_totals(year: int, months: Optional[Iterable[int]] = None) -> Dict[Key, ControlTotal]:
+    """Control totals aggregated on DB2."""
+    from src.db.infinium import get_infinium_connection
+
+    conn = get_infinium_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(control_totals_sql(SOURCE_TABLE, year, months))
+        return _totals(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+def target_totals(db_conn, year: int, months: Optional[Iterable[int]] = None) -> Dict[Key, ControlTotal]:
+    """Control totals of gl_transactions."""
+    return _totals(db_conn.execute(text(control_totals_sql(partitions.TABLE, year, months))).fetchall())
+
+
+def compare_totals(
+    source: Dict[Key, ControlTotal],
+    target: Dict[Key, ControlTotal],
+) -> List[Difference]:
+    """
+    (month, account) keys whose totals differ, in month then account order.
+    """
+    differences = [
+        Difference(key[0], key[1], source.get(key), target.get(key))
+        for key in set(source) | set(target)
+        if source.get(key) != target.get(key)
+    ]
+    return sorted(differences, key=lambda d: (d.txmnth, d.gxacct or ""))
+
+
+def load_month(txmnth: int) -> int:
+    """load_gl_actuals month of a txmnth (adjustment periods load together)."""
+    slot = partitions.month_slot(txmnth)
+    return partitions.ADJUSTMENT_MONTH if slot is None else slot
+
+
+def plan_reloads(
+    differences: List[Difference],
+    max_accounts: int = MAX_ACCOUNT_RELOAD,
+) -> Dict[int, Optional[List[str]]]:
+    """
+    What to reload for a set of differences.
+
+    Returns:
+        {load month: accounts to reload in place, or None for the whole month}
+    """
+    accounts = defaultdict(set)
+    for difference in differences:
+        accounts[load_month(difference.txmnth)].add(difference.gxacct)
+
+    plan = {}
+    for month, month_accounts in sorted(accounts.items()):
+        # Rows without an account can't be targeted
+        if None in month_accounts or len(month_accounts) > max_accounts:
+            plan[month] = None
+        else:
+            plan[month] = sorted(month_accounts)
+    return plan
+
+
+def _sum_totals(totals: Iterable[ControlTotal]) -> ControlTotal:
+    totals = list(totals)
+    return ControlTotal(
+        rows=sum(t.rows for t in totals),
+        amount=sum((t.amount for t in totals), Decimal(0)),
+        row_hash=sum(t.row_hash for t in totals),
+    )
+
+
+def _result_row(txmnth, gxacct, status, source, target, action, resolved) -> dict:
+    return {
+        "txmnth": txmnth,
+        "gxacct": gxacct,
+        "status": status,
+        "source_rows": source.rows if source else None,
+        "target_rows": target.rows if target else None,
+        "source_amount": source.amount if source else None,
+        "target_amount": target.amount if target else None,
+        "source_hash": source.row_hash if source else None,
+        "target_hash": target.row_hash if target else None,
+        "action": action,
+        "resolved": resolved,
+    }
+
+
+def report_rows(
+    source: Dict[Key, ControlTotal],
+    target: Dict[Key, ControlTotal],
+    differences: List[Difference],
+    plan: Dict[int, Optional[List[str]]],
+    after: Optional[Dict[Key, ControlTotal]] = None,
+) -> List[dict]:
+    """
+    reconciliation_results rows of a check (without run/year columns).
+
+    Args:
+        source, target: Totals compared
+        differences: compare_totals(source, target)
+        plan: Reloads done (empty for a dry run)
+        after: Target totals of the reloaded months, re-read after the reload
+    """
+    def action(txmnth):
+        month = load_month(txmnth)
+        if month not in plan:
+            return "none"
+        return "month_reload" if plan[month] is None else "account_reload"
+
+    def resolved(keys):
+        if after is None:
+            return None
+        return all(source.get(key) == after.get(key) for key in keys)
+
+    keys_by_month = defaultdict(list)
+    for key in set(source) | set(target):
+        keys_by_month[key[0]].append(key)
+    differing = defaultdict(list)
+    for difference in differences:
+        differing[difference.txmnth].append(difference)
+
+    rows = []
+    for txmnth in sorted(keys_by_month):
+        keys = keys_by_month[txmnth]
+        month_diffs = differing[txmnth]
+        month_action = action(txmnth) if month_diffs else "none"
+        rows.append(_result_row(
+            txmnth, None, "mismatch" if month_diffs else "match",
+            _sum_totals(source[k] for k in keys if k in source),
+            _sum_totals(target[k] for k in keys if k in target),
+            month_action, resolved(keys) if month_action != "none" else None,
+        ))
+        for d in month_diffs:
+            key = (d.txmnth, d.gxacct)
+            rows.append(_result_row(
+                d.txmnth, d.gxacct, d.status, d.source, d.target,
+                month_action, resolved([key]) if month_action != "none" else None,
+            ))
+    return rows
+
+
+def reconcile_gl_actuals(
+    year: int,
+    months: Optional[Iterable[int]] = None,
+    reload: bool = True,
+    max_accounts: int = MAX_ACCOUNT_RELOAD,
+) -> List[dict]:
+    """
+    Compare a year's GL actuals with Infinium and reload what differs.
+
+    Args:
+        year: Fiscal year
+        months: Limit to these months (13: the adjustment periods)
+        reload: Reload differing months/accounts (False: report only)
+        max_accounts: Differing accounts above which a whole month is reloaded
+
+    Returns:
+        The reconciliation_results rows written
+    """
+    from src.db.postgres import get_engine, init_db
+    from src.etl.gl_actuals import load_gl_actuals
+    from src.etl.outage_catalog import refresh_outage_catalog
+    from src.etl.run_tracking import track_etl_run
+
+    init_db()
+    engine = get_engine()
+    checked_at = datetime.now()
+    months = list(months) if months else None
+
+    with track_etl_run("reconciliation", year=year, months=months, reload=reload) as run:
+        with run.phase("source"):
+            source = source_totals(year, months)
+            run.add_rows(len(source))
+        with run.phase("target"):
+            with engine.connect() as conn:
+                target = target_totals(conn, year, months)
+            run.add_rows(len(target))
+
+        differences = compare_totals(source, target)
+        plan = plan_reloads(differences, max_accounts) if reload else {}
+        print(f"[RECONCILE] {year}: {len(differences):,} differing month/account(s)")
+
+        after = None
+        if plan:
+            with run.phase("reload"):
+                for month, accounts in plan.items():
+                    load_gl_actuals(year, month, refresh_outages=False, accounts=accounts)
+                with engine.begin() as conn:
+                    refresh_outage_catalog(conn, year)
+            with run.phase("verify"):
+                with engine.connect() as conn:
+                    after = target_totals(conn, year, list(plan))
+
+        rows = report_rows(source, target, differences, plan, after)
+        for row in rows:
+            row.update(run_id=run.run_id, checked_at=checked_at, txyear=year)
+        if rows:
+            with engine.begin() as conn:
+                conn.execute(insert(ReconciliationResult), rows)
+        run.add_rows(len(rows), phase="report")
+
+    unresolved = [r for r in rows if r["gxacct"] is None and r["resolved"] is False]
+    for row in unresolved:
+        print(f"[RECONCILE] {year}-{row['txmnth']:02d} still differs after the reload")
+    return rows
+
+
+def get_reconciliation(db_conn, year: int) -> List[dict]:
+    """Rows of the latest check of a year (month rows first within each month)."""
+    rows = db_conn.execute(text("""
+        SELECT run_id, checked_at, txmnth, gxacct, status,
+               source_rows, target_rows, source_amount, target_amount,
+               action, resolved
+        FROM reconciliation_results
+        WHERE txyear = :year
+          AND checked_at = (SELECT MAX(checked_at) FROM reconciliation_results WHERE txyear = :year)
+        ORDER BY txmnth, gxacct NULLS FIRST
+    """), {"year": year}).mappings().all()
+    return [
+        {
+            **row,
+            "checked_at": row["checked_at"].isoformat(),
+            "source_amount": float(row["source_amount"]) if row["source_amount"] is not None else None,
+            "target_amount": float(row["target_amount"]) if row["target_amount"] is not None else None,
+        }
+        for row in rows
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reconcile GL actuals with Infinium")
+    parser.add_argument("year", type=int, nargs="?", default=2025)
+    parser.add_argument("--months", type=int, nargs="+", help="months to check (13: adjustment periods)")
+    parser.add_argument("--dry-run", action="store_true", help="report differences without reloading")
+    parser.add_argument("--max-accounts", type=int, default=MAX_ACCOUNT_RELOAD,
+                        help="differing accounts above which the whole month is reloaded")
+    args = parser.parse_args()
+
+    rows = reconcile_gl_actuals(args.year, args.months, reload=not args.dry_run, max_accounts=args.max_accounts)
+    mismatched = [r for r in rows if r["gxacct"] is None and r["status"] != "match"]
+    print(f"[RECONCILE] {len(mismatched)} of {sum(r['gxacct'] is None for r in rows)} month(s) differed")
@@ -0,0 +1,297 @@
+"""
+ETL run telemetry.
+
+Wrap a job in track_etl_run() and its stages in run.phase(); each run is
+written to etl_runs with per-phase timings, row and byte counts, overall
+rows/second, the process's peak RSS and the error on failure.
+
+Example:
+    with track_etl_run("gl_actuals", year=2025) as run:
+        with run.phase("extract"):
+            df = extract()
+            run.add_rows(len(df))
+            run.add_bytes(frame_bytes(df))
+        with run.phase("load"):
+            load(df)
+            run.add_rows(len(df))
+
+Runs are recorded on their own connection, so a failed job still leaves a
+'failed' row, and a telemetry problem never fails the job itself.
+"""
+
+import json
+import logging
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from src.db.events import notify
+from src.db.postgres import get_engine
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Rows/second below this fraction of the recent median flags a degrading job
+DEGRADATION_THRESHOLD = 0.7
+
+
+@dataclass
+class PhaseStats:
+    """Timings and volumes for one phase of a run."""
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+
+def process_peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process so far, in MB (None where
+    unsupported).
+
+    This is the process high-water mark, not a run's own: when the
+    orchestrator runs several jobs in one process (and in threads), a run
+    reports the highest RSS reached by any job before it finished.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB; macOS reports bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def frame_bytes(df) -> int:
+    """In-memory size of a pandas DataFrame."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class EtlRunTracker:
+    """Collects phase stats for a single run."""
+
+    def __init__(self, job_name: str, params: dict):
+        self.job_name = job_name
+        self.params = params
+        self.phases: Dict[str, PhaseStats] = {}
+        self.run_id: Optional[int] = None
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._current: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase; counts added inside it are attributed to it."""
+        stats = self.phases.setdefault(name, PhaseStats())
+        previous, self._current = self._current, name
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            self._current = previous
+
+    def _phase_stats(self, phase: Optional[str]) -> PhaseStats:
+        return self.phases.setdefault(phase or self._current or "run", PhaseStats())
+
+    def add_rows(self, count: int, phase: Optional[str] = None):
+        self._phase_stats(phase).rows += int(count)
+
+    def add_bytes(self, count: int, phase: Optional[str] = None):
+        self._phase_stats(phase).bytes += int(count)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    @property
+    def rows_processed(self) -> int:
+        """Rows written by the load phase, else the largest phase count."""
+        if "load" in self.phases:
+            return self.phases["load"].rows
+        return max((p.rows for p in self.phases.values()), default=0)
+
+    @property
+    def bytes_processed(self) -> int:
+        return max((p.bytes for p in self.phases.values()), default=0)
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed
+        rows = self.rows_processed
+        rss = process_peak_rss_mb()
+        return {
+            "duration_seconds": round(elapsed, 3),
+            "rows_processed": rows,
+            "bytes_processed": self.bytes_processed,
+            "rows_per_second": round(rows / elapsed, 2) if elapsed > 0 else None,
+            "process_peak_rss_mb": round(rss, 1) if rss is not None else None,
+            "phases": {
+                name: {"seconds": round(p.seconds, 3), "rows": p.rows, "bytes": p.bytes}
+                for name, p in self.phases.items()
+            },
+        }
+
+
+def _record_start(run: EtlRunTracker):
+    try:
+        with get_engine().begin() as conn:
+            run.run_id = conn.execute(text("""
+                INSERT INTO etl_runs (job_name, status, params, started_at)
+                VALUES (:job_name, 'running', :params, :started_at)
+                RETURNING id
+            """), {
+                "job_name": run.job_name,
+                "params": _json(run.params),
+                "started_at": run.started_at,
+            }).scalar()
+    except Exception as e:
+        logger.warning(f"Could not record start of ETL run {run.job_name}: {e}")
+
+
+def _record_finish(run: EtlRunTracker, status: str, error: Optional[str]):
+    summary = run.summary()
+    params = {
+        "status": status,
+        "error": error,
+        "finished_at": datetime.utcnow(),
+        **summary,
+        "phases": _json(summary["phases"]),
+    }
+    try:
+        with get_engine().begin() as conn:
+            if run.run_id is None:
+                conn.execute(text("""
+                    INSERT INTO etl_runs (
+                        job_name, status, params, started_at, finished_at, duration_seconds,
+                        rows_processed, bytes_processed, rows_per_second, process_peak_rss_mb, phases, error
+                    ) VALUES (
+                        :job_name, :status, :run_params, :started_at, :finished_at, :duration_seconds,
+                        :rows_processed, :bytes_processed, :rows_per_second, :process_peak_rss_mb, :phases, :error
+                    )
+                """), {
+                    **params,
+                    "job_name": run.job_name,
+                    "run_params": _json(run.params),
+                    "started_at": run.started_at,
+                })
+            else:
+                conn.execute(text("""
+                    UPDATE etl_runs SET
+                        status = :status, finished_at = :finished_at,
+                        duration_seconds = :duration_seconds, rows_processed = :rows_processed,
+                        bytes_processed = :bytes_processed, rows_per_second = :rows_per_second,
+                        process_peak_rss_mb = :process_peak_rss_mb, phases = :phases, error = :error
+                    WHERE id = :run_id
+                """), {**params, "run_id": run.run_id})
+            if status == "success":
+                # Pages showing actuals for this year pick up the reload
+                notify(
+                    conn, "etl_finished", run.params.get("plant_code"), run.params.get("year"),
+                    job_name=run.job_name, rows_processed=summary["rows_processed"],
+                )
+    except Exception as e:
+        logger.warning(f"Could not record ETL run {run.job_name}: {e}")
+
+    logger.info(
+        f"ETL run {run.job_name} {status}: {summary['rows_processed']:,} rows "
+        f"in {summary['duration_seconds']:.1f}s ({summary['rows_per_second'] or 0:,.0f} rows/s)"
+    )
+
+
+def _json(value) -> str:
+    return json.dumps(value, default=str)
+
+
+@contextmanager
+def track_etl_run(job_name: str, **params):
+    """
+    Record an ETL run in etl_runs.
+
+    Args:
+        job_name: Job identifier (e.g. 'gl_actuals')
+        **params: Job parameters stored with the run (year, file, ...)
+
+    Yields:
+        EtlRunTracker
+    """
+    run = EtlRunTracker(job_name, params)
+    _record_start(run)
+    try:
+        yield run
+    except BaseException as e:
+        _record_finish(run, "failed", f"{type(e).__name__}: {e}")
+        raise
+    _record_finish(run, "success", None)
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def get_etl_runs(db_conn, job_name: Optional[str] = None, limit: int = 50) -> List[dict]:
+    """Most recent runs, newest first."""
+    params = {"limit": limit}
+    where = ""
+    if job_name:
+        where = "WHERE job_name = :job_name"
+        params["job_name"] = job_name
+
+    result = db_conn.execute(text(f"""
+        SELECT id, job_name, status, params, started_at, finished_at, duration_seconds,
+               rows_processed, bytes_processed, rows_per_second, process_peak_rss_mb, phases, error
+        FROM etl_runs
+        {where}
+        ORDER BY started_at DESC
+        LIMIT :limit
+    """), params)
+    return [dict(row._mapping) for row in result]
+
+
+def throughput_trends(db_conn, window: int = 10) -> List[dict]:
+    """
+    Rows/second of each job's latest successful run against the median of
+    the previous `window` successful runs.
+    """
+    result = db_conn.execute(text("""
+        SELECT job_name, started_at, rows_per_second, duration_seconds, rows_processed
+        FROM (
+            SELECT job_name, started_at, rows_per_second, duration_seconds, rows_processed,
+                   ROW_NUMBER() OVER (PARTITION BY job_name ORDER BY started_at DESC) AS rn
+            FROM etl_runs
+            WHERE status = 'success' AND rows_per_second IS NOT NULL
+        ) r
+        WHERE rn <= :depth
+        ORDER BY job_name, started_at DESC
+    """), {"depth": window + 1})
+
+    by_job: Dict[str, list] = {}
+    for row in result:
+        by_job.setdefault(row.job_name, []).append(row)
+
+    trends = []
+    for job_name, rows in by_job.items():
+        latest, history = rows[0], rows[1:]
+        latest_rps = float(latest.rows_per_second)
+        baseline = (
+            statistics.median(float(r.rows_per_second) for r in history)
+            if history else None
+        )
+        ratio = latest_rps / baseline if baseline else None
+        trends.append({
+            "job_name": job_name,
+            "latest_started_at": latest.started_at,
+            "latest_rows_per_second": latest_rps,
+            "latest_duration_seconds": float(latest.duration_seconds or 0),
+            "baseline_rows_per_second": baseline,
+            "baseline_runs": len(history),
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "degrading": ratio is not None and ratio < DEGRADATION_THRESHOLD,
+        })
+    return trends
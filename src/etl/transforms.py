@@ -0,0 +1,44 @@
+"""
+Column normalization shared by the Infinium transforms.
+
+DB2 returns CHAR columns as space-padded Python-object strings. The
+transforms convert them to pyarrow-backed strings, so stripping runs as
+one Arrow kernel per column instead of a Python call per value, and
+store low-cardinality code columns (company, source, debit/credit flag)
+as categoricals. On a full-year GL extract both use a fraction of the
+memory of object strings; benchmarks/test_bench_transforms.py compares
+the two.
+"""
+
+from typing import Iterable
+
+import pandas as pd
+
+STRING_DTYPE = "string[pyarrow]"
+
+
+def normalize_strings(
+    df: pd.DataFrame,
+    categories: Iterable[str] = (),
+    string_dtype=STRING_DTYPE,
+) -> pd.DataFrame:
+    """
+    Strip the text columns of an extract and convert their dtype.
+
+    Args:
+        df: Extract with lower-case column names (modified in place)
+        categories: Text columns to store as categoricals (missing ones are ignored)
+        string_dtype: Dtype for the other text columns (object keeps the
+            old representation, for comparisons)
+
+    Returns:
+        The same DataFrame
+    """
+    categories = set(categories)
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        # Object columns can also hold dates or Decimals from the driver
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            continue
+        values = df[col].astype(string_dtype).str.strip()
+        df[col] = values.astype("category") if col in categories else values
+    return df
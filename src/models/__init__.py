@@ -1,31 +1,51 @@
 """SQLAlchemy models."""
 
-from .gl_transaction import GLTransaction
-from .gl_account import GLAccount
+from .gl_transaction import GLFact, GLPreliminaryActual, GLTransaction, PreliminaryPeriod
+from .dimensions import DimAccount, DimOutage, DimProject
+from .gl_account import GLAccount, GLAccountHistory
 from .period import Period
 from .plant import Plant
 from .cost_category import CostCategory
-from .scenario import Scenario
+from .scenario import Scenario, ScenarioRiskBand
 from .forecast import Forecast
-from .actuals import BudgetLine, ExpenseActual
-from .funding import Funding
+from .actuals import BudgetLine, EnergyActual, ExpenseActual
+from .funding import DepartmentForecast, BudgetSubmission, BudgetEntry
 from .capital_asset import CapitalAsset, CapitalProject, AssetStatus
-from .mapping_tables import ProjectMapping, AccountMapping
+from .mapping_tables import ProjectMapping, AccountDeptMapping
+from .etl_run import EtlRun
+from .reconciliation import ReconciliationResult
+from .close_calendar import FiscalPeriod, PeriodClose, YtdAggregate
 
 __all__ = [
     'GLTransaction',
+    'GLFact',
+    'GLPreliminaryActual',
+    'PreliminaryPeriod',
+    'DimAccount',
+    'DimProject',
+    'DimOutage',
     'GLAccount',
+    'GLAccountHistory',
     'Period',
     'Plant',
     'CostCategory',
     'Scenario',
+    'ScenarioRiskBand',
     'Forecast',
     'BudgetLine',
+    'EnergyActual',
     'ExpenseActual',
-    'Funding',
+    'DepartmentForecast',
+    'BudgetSubmission',
+    'BudgetEntry',
     'CapitalAsset',
     'CapitalProject',
     'AssetStatus',
     'ProjectMapping',
-    'AccountMapping',
+    'AccountDeptMapping',
+    'EtlRun',
+    'ReconciliationResult',
+    'FiscalPeriod',
+    'PeriodClose',
+    'YtdAggregate',
 ]
@@ -6,6 +6,61 @@ from sqlalchemy.orm import relationship
 from src.database import Base
 
 
+class EnergyActual(Base):
+    """Actual fuel/energy cost transactions from GLDetailsEnergy."""
+
+    __tablename__ = "energy_actuals"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Source identifiers
+    gl_detail_id = Column(String(20), nullable=True)
+    journal = Column(String(20), nullable=True)
+
+    # Period
+    period_yyyymm = Column(String(6), nullable=False, index=True)
+    period_id = Column(Integer, ForeignKey("periods.id"), nullable=True)
+
+    # Account information
+    gl_account = Column(String(50), nullable=False, index=True)
+    account_description = Column(String(100))
+
+    # Plant
+    plant_id = Column(Integer, ForeignKey("plants.id"), nullable=True)
+    budget_entity = Column(String(20))
+
+    # Amount
+    amount = Column(Numeric(18, 2), nullable=False)
+    debit_credit = Column(String(1))
+
+    # Classification
+    cost_group = Column(String(20), index=True)  # GROUP field (COAL, LIME, etc.)
+    cost_type = Column(String(20))
+    labor_nonlabor = Column(String(20))
+
+    # Transaction details
+    description = Column(String(100))
+    description2 = Column(String(200))
+    trans_date = Column(Date, nullable=True)
+
+    # Work order/project reference
+    work_order = Column(String(30))
+    po_number = Column(String(30))
+    project_id = Column(String(30))
+    project_desc = Column(String(100))
+
+    # Vendor
+    vendor_id = Column(String(20))
+    vendor_name = Column(String(100))
+
+    # Relationships
+    period = relationship("Period")
+    plant = relationship("Plant")
+
+    def __repr__(self):
+        return f"<EnergyActual(period={self.period_yyyymm}, group={self.cost_group}, amount={self.amount})>"
+
+
 class ExpenseActual(Base):
     """Actual O&M expense transactions from GLDetailsExpense."""
 
@@ -0,0 +1,60 @@
+"""
+Fiscal close calendar.
+"""
+
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from src.db.postgres import Base
+
+
+class FiscalPeriod(Base):
+    """A fiscal period (seeded from data/master/fiscal_calendar.csv)."""
+
+    __tablename__ = 'fiscal_periods'
+
+    fiscal_year = Column(Integer, primary_key=True)
+    period = Column(Integer, primary_key=True)  # 1-12
+    period_name = Column(String(20), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+
+    def __repr__(self):
+        return f"<FiscalPeriod {self.fiscal_year}-{self.period:02d}>"
+
+
+class PeriodClose(Base):
+    """A period closed for a plant; the latest one is the plant's current month."""
+
+    __tablename__ = 'period_closes'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    plant_code = Column(String(10), nullable=False)
+    fiscal_year = Column(Integer, nullable=False)
+    period = Column(Integer, nullable=False)
+    closed_at = Column(DateTime, server_default=func.now(), nullable=False)
+    closed_by = Column(String(100))
+
+    __table_args__ = (
+        UniqueConstraint('plant_code', 'fiscal_year', 'period', name='uq_period_closes_plant_period'),
+    )
+
+    def __repr__(self):
+        return f"<PeriodClose {self.plant_code} {self.fiscal_year}-{self.period:02d}>"
+
+
+class YtdAggregate(Base):
+    """YTD actual and budget per department through a closed period."""
+
+    __tablename__ = 'ytd_aggregates'
+
+    plant_code = Column(String(10), primary_key=True)
+    fiscal_year = Column(Integer, primary_key=True)
+    through_period = Column(Integer, primary_key=True)
+    dept_code = Column(String(30), primary_key=True)
+    ytd_actual = Column(Numeric(18, 2), nullable=False, default=0)
+    ytd_budget = Column(Numeric(18, 2), nullable=False, default=0)
+    annual_budget = Column(Numeric(18, 2), nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<YtdAggregate {self.plant_code} {self.fiscal_year}-{self.through_period:02d} {self.dept_code}>"
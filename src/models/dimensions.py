@@ -0,0 +1,69 @@
+"""
+Dimension tables for the GL ledger.
+
+gl_facts stores integer surrogate keys into these instead of the account
+string, project number and shutdown alias, so summary joins and GROUP
+BYs run on integers. Rows are added by the ETL (src/etl/dimensions.py)
+as new values appear and are never renumbered.
+"""
+
+from sqlalchemy import Boolean, Column, Date, Integer, SmallInteger, String
+from src.db.postgres import Base
+
+
+class DimAccount(Base):
+    """A GL account string and its nine segments (see parse_gl_account)."""
+
+    __tablename__ = 'dim_account'
+
+    account_key = Column(Integer, primary_key=True, autoincrement=True)
+    gxacct = Column(String(36), nullable=False, unique=True)
+
+    company_code = Column(String(10))
+    plant_code = Column(String(10))
+    entity_code = Column(String(10))
+    account_type = Column(String(10))
+    cost_type_code = Column(String(10))
+    department_code = Column(String(10))
+    ferc_account = Column(String(10))
+    sub_account = Column(String(10))
+    labor_indicator = Column(String(10))
+
+    def __repr__(self):
+        return f"<DimAccount {self.account_key} {self.gxacct}>"
+
+
+class DimProject(Base):
+    """A project number (trimmed)."""
+
+    __tablename__ = 'dim_project'
+
+    project_key = Column(Integer, primary_key=True, autoincrement=True)
+    project_number = Column(String(10), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<DimProject {self.project_key} {self.project_number}>"
+
+
+class DimOutage(Base):
+    """A shutdown alias (e.g. K0125P01) decoded into its parts; the outage catalog."""
+
+    __tablename__ = 'dim_outage'
+
+    outage_key = Column(SmallInteger, primary_key=True, autoincrement=True)
+    alias = Column(String(12), nullable=False, unique=True)
+
+    plant_code = Column(String(2))  # KC / CC from the first letter
+    unit = Column(String(2))
+    unit_number = Column(SmallInteger)
+    outage_year = Column(SmallInteger)
+    outage_type = Column(String(1))  # P=planned, F=forced, M=maintenance
+    outage_group = Column(String(20))  # PLANNED-<unit> / UNPLANNED
+    is_outage = Column(Boolean, nullable=False, default=False)
+
+    # First and last transaction date charged (src/etl/outage_catalog.py)
+    window_start = Column(Date)
+    window_end = Column(Date)
+
+    def __repr__(self):
+        return f"<DimOutage {self.outage_key} {self.alias}>"
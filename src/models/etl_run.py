@@ -0,0 +1,38 @@
+"""
+ETL run history.
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Text, JSON, Index
+from src.db.postgres import Base
+
+
+class EtlRun(Base):
+    """One execution of an ETL job with per-phase timings and volumes."""
+
+    __tablename__ = 'etl_runs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_name = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default='running')  # running, success, failed
+    params = Column(JSON)
+
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Numeric(12, 3))
+
+    # Totals across phases
+    rows_processed = Column(BigInteger)
+    bytes_processed = Column(BigInteger)
+    rows_per_second = Column(Numeric(14, 2))
+    process_peak_rss_mb = Column(Numeric(10, 1))  # Whole process (ru_maxrss), not this run
+
+    # {"extract": {"seconds": 1.2, "rows": 1000, "bytes": 52000}, ...}
+    phases = Column(JSON)
+    error = Column(Text)
+
+    __table_args__ = (
+        Index('ix_etl_runs_job_started', 'job_name', 'started_at'),
+    )
+
+    def __repr__(self):
+        return f"<EtlRun {self.id} {self.job_name} {self.status}>"
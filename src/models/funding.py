@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, Enum, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -53,6 +53,14 @@ class DepartmentForecast(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     updated_by = Column(String(100), nullable=True)
     
+    # Incremented on every write; saves carrying a stale version get a 409
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    
+    # Target of the grid save's ON CONFLICT (created in migration 006)
+    __table_args__ = (
+        UniqueConstraint('plant_code', 'dept_code', 'budget_year', name='uq_dept_forecast'),
+    )
+    
     def __repr__(self):
         return f"<DepartmentForecast({self.plant_code}/{self.dept_code}/{self.budget_year})>"
     
@@ -269,6 +277,9 @@ class BudgetEntry(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
+    # Incremented on every write; saves carrying a stale version get a 409
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    
     # Relationships
     submission = relationship("BudgetSubmission", back_populates="entries")
     
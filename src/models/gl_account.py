@@ -2,7 +2,7 @@
 GL Account model for account master from Infinium.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
 from sqlalchemy.sql import func
 from src.db.postgres import Base
 
@@ -40,9 +40,55 @@ class GLAccount(Base):
     ctrc08 = Column(String(8))   # Sub-detail segment
     ctrc09 = Column(String(8))   # Labor type segment
     
+    # md5 of the columns above; the sync only rewrites accounts whose hash changed
+    row_hash = Column(String(32))
+    
     # Metadata
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return f"<GLAccount {self.ctacct} {self.ctdesc}>"
+
+
+class GLAccountHistory(Base):
+    """
+    Type-2 history of the account master: one row per version of an
+    account, valid from valid_from until valid_to (NULL: current).
+    """
+    
+    __tablename__ = 'gl_account_history'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ctacct = Column(String(36), nullable=False)
+    ctdesc = Column(String(30))
+    ctco = Column(String(3))
+    ctactv = Column(String(1))
+    ctmors = Column(String(1))
+    ctuf01 = Column(String(10))
+    ctuf02 = Column(String(10))
+    ctuf03 = Column(String(10))
+    ctuf04 = Column(String(10))
+    ctrc01 = Column(String(3))
+    ctrc02 = Column(String(8))
+    ctrc03 = Column(String(8))
+    ctrc04 = Column(String(8))
+    ctrc05 = Column(String(8))
+    ctrc06 = Column(String(8))
+    ctrc07 = Column(String(8))
+    ctrc08 = Column(String(8))
+    ctrc09 = Column(String(8))
+    row_hash = Column(String(32), nullable=False)
+    
+    valid_from = Column(DateTime, nullable=False)
+    valid_to = Column(DateTime)
+    
+    __table_args__ = (
+        Index('ix_gl_account_history_acct_valid', 'ctacct', 'valid_from'),
+        # At most one current version per account
+        Index('uq_gl_account_history_current', 'ctacct', unique=True,
+              postgresql_where=text('valid_to IS NULL')),
+    )
+    
+    def __repr__(self):
+        return f"<GLAccountHistory {self.ctacct} {self.valid_from:%Y-%m-%d}-{self.valid_to or ''}>"
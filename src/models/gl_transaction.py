@@ -1,8 +1,21 @@
 """
-GL Transaction model for actuals from Infinium.
+GL Transaction models for actuals from Infinium.
+
+gl_transactions keeps every Infinium column and is only read by the
+transaction detail / drill-down endpoints. gl_facts holds the same rows
+(1:1 by id) narrowed to what summaries, projections and variances read:
+integer dimension keys instead of the account, project and shutdown
+strings, and the plant and department derived once at load time.
+
+Both are partitioned by LIST (txyear), each year by LIST (txmnth); see
+src/db/partitions.py for the layout and how reloads swap partitions in.
+
+gl_preliminary_actuals holds a month's actuals aggregated on DB2 during
+close, read in place of its facts until the detailed load catches up
+(preliminary_periods lists those months; see src/etl/preliminary.py).
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, Index
+from sqlalchemy import Column, Integer, SmallInteger, String, Numeric, Date, DateTime, Index
 from sqlalchemy.sql import func
 from src.db.postgres import Base
 
@@ -12,6 +25,7 @@ class GLTransaction(Base):
     
     __tablename__ = 'gl_transactions'
     
+    # The partition keys have to be part of the primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Key identifiers
@@ -19,9 +33,9 @@ class GLTransaction(Base):
     gxacct = Column(String(36), index=True)
     gxco = Column(String(3))
     
-    # Time dimensions
-    txyear = Column(Integer, index=True)
-    txmnth = Column(Integer, index=True)
+    # Time dimensions (partition keys; pruning replaces their own indexes)
+    txyear = Column(Integer, primary_key=True, autoincrement=False)
+    txmnth = Column(Integer, primary_key=True, autoincrement=False)
     thedat = Column(Date)
     th8dat = Column(Numeric(8, 0))
     
@@ -98,11 +112,88 @@ class GLTransaction(Base):
     # Metadata
     created_at = Column(DateTime, server_default=func.now())
     
-    # Composite index for common queries
+    # Composite index for common queries (created on every partition)
     __table_args__ = (
         Index('ix_gl_year_month_acct', 'txyear', 'txmnth', 'gxacct'),
+        {'postgresql_partition_by': 'LIST (txyear)'},
     )
     
     def __repr__(self):
         return f"<GLTransaction {self.gxjrnl} {self.gxacct} {self.gxfamt}>"
 
+
+
+class GLFact(Base):
+    """Narrow GL actual row; same id as its gl_transactions detail row."""
+    
+    __tablename__ = 'gl_facts'
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    txyear = Column(Integer, primary_key=True, autoincrement=False)
+    txmnth = Column(Integer, primary_key=True, autoincrement=False)
+    
+    # Dimension keys (src/models/dimensions.py) for gxacct, gxpjno and gxshut
+    account_key = Column(Integer, index=True)
+    project_key = Column(Integer)
+    outage_key = Column(SmallInteger, index=True)  # per-outage reports
+    
+    gxfamt = Column(Numeric(17, 2))
+    gxdrcr = Column(String(1))
+    
+    # Derived keys (see src/etl/gl_facts.py)
+    plant_code = Column(String(2), nullable=False)
+    dept_code = Column(String(20), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_gl_facts_plant_dept', 'plant_code', 'dept_code'),
+        {'postgresql_partition_by': 'LIST (txyear)'},
+    )
+    
+    def __repr__(self):
+        return f"<GLFact {self.id} {self.plant_code}/{self.dept_code} {self.gxfamt}>"
+
+
+
+class GLPreliminaryActual(Base):
+    """
+    Actuals of a preliminary month summed on DB2 by account, project,
+    shutdown alias and debit/credit; shaped like gl_facts.
+    """
+    
+    __tablename__ = 'gl_preliminary_actuals'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    txyear = Column(Integer, nullable=False)
+    txmnth = Column(Integer, nullable=False)
+    
+    account_key = Column(Integer)
+    project_key = Column(Integer)
+    outage_key = Column(SmallInteger)
+    
+    gxfamt = Column(Numeric(17, 2))
+    gxdrcr = Column(String(1))
+    txn_count = Column(Integer, nullable=False)  # Infinium rows summed
+    
+    plant_code = Column(String(2), nullable=False)
+    dept_code = Column(String(20), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_gl_preliminary_actuals_year_month', 'txyear', 'txmnth'),
+    )
+    
+    def __repr__(self):
+        return f"<GLPreliminaryActual {self.txyear}-{self.txmnth:02d} {self.plant_code}/{self.dept_code} {self.gxfamt}>"
+
+
+class PreliminaryPeriod(Base):
+    """A month read from gl_preliminary_actuals until its detailed load."""
+    
+    __tablename__ = 'preliminary_periods'
+    
+    txyear = Column(Integer, primary_key=True, autoincrement=False)
+    txmnth = Column(Integer, primary_key=True, autoincrement=False)
+    loaded_at = Column(DateTime, nullable=False)
+    txn_count = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<PreliminaryPeriod {self.txyear}-{self.txmnth:02d}>"
@@ -0,0 +1,44 @@
+"""
+GL actuals reconciliation report.
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Index
+from src.db.postgres import Base
+
+
+class ReconciliationResult(Base):
+    """
+    Control totals of Infinium and gl_transactions for one month of a check.
+
+    Each check writes a month row (gxacct NULL) for every month compared,
+    and a row per account whose totals differ.
+    """
+
+    __tablename__ = 'reconciliation_results'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer)  # etl_runs.id of the check
+    checked_at = Column(DateTime, nullable=False)
+    txyear = Column(Integer, nullable=False)
+    txmnth = Column(Integer, nullable=False)
+    gxacct = Column(String(36))
+
+    # match, mismatch, missing_source (only in Postgres), missing_target (only in Infinium)
+    status = Column(String(20), nullable=False)
+    source_rows = Column(BigInteger)
+    target_rows = Column(BigInteger)
+    source_amount = Column(Numeric(18, 2))
+    target_amount = Column(Numeric(18, 2))
+    source_hash = Column(BigInteger)
+    target_hash = Column(BigInteger)
+
+    # none, month_reload, account_reload
+    action = Column(String(20), nullable=False, default='none')
+    resolved = Column(Boolean)  # Totals match after the reload (NULL: not reloaded)
+
+    __table_args__ = (
+        Index('ix_reconciliation_results_year_checked', 'txyear', 'checked_at'),
+    )
+
+    def __repr__(self):
+        return f"<ReconciliationResult {self.txyear}-{self.txmnth:02d} {self.gxacct or '*'} {self.status}>"
@@ -2,7 +2,10 @@
 
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum as SQLEnum, Text, ForeignKey
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Boolean, Enum as SQLEnum, Text, ForeignKey,
+    Numeric, UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from src.database import Base
@@ -23,6 +26,12 @@ class ScenarioStatus(str, Enum):
     ARCHIVED = "archived"
 
 
+class StorageMode(str, Enum):
+    """How a scenario stores its forecast grid."""
+    FULL = "full"        # Every cell stored on the scenario
+    OVERLAY = "overlay"  # Only overridden cells; the rest inherited from parent
+
+
 class Scenario(Base):
     """Forecast scenario/version entity."""
     
@@ -37,6 +46,7 @@ class Scenario(Base):
     # Versioning
     version = Column(Integer, default=1)
     parent_scenario_id = Column(Integer, ForeignKey("scenarios.id"), nullable=True)
+    storage_mode = Column(String(20), nullable=False, default=StorageMode.FULL.value)
     
     # Audit fields
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -50,6 +60,7 @@ class Scenario(Base):
     # Relationships
     forecasts = relationship("Forecast", back_populates="scenario")
     parent = relationship("Scenario", remote_side=[id])
+    risk_bands = relationship("ScenarioRiskBand", back_populates="scenario")
     
     def __repr__(self):
         return f"<Scenario(name='{self.name}', type={self.scenario_type.value})>"
@@ -58,4 +69,51 @@ class Scenario(Base):
     def display_name(self) -> str:
         """Display name with version."""
         return f"{self.name} (v{self.version})"
+    
+    @property
+    def is_overlay(self) -> bool:
+        """True if forecast cells are inherited from the parent chain."""
+        return self.storage_mode == StorageMode.OVERLAY.value
+
 
+
+class ScenarioRiskBand(Base):
+    """
+    Monte Carlo cost distribution for one plant and year.
+    
+    Stored against a derived scenario whose parent is the simulated
+    base scenario (see src.engine.risk_simulation).
+    """
+    
+    __tablename__ = "scenario_risk_bands"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    scenario_id = Column(Integer, ForeignKey("scenarios.id"), nullable=False, index=True)
+    plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    trials = Column(Integer, nullable=False)
+    
+    # Total cost distribution
+    cost_mean = Column(Numeric(18, 2), nullable=True)
+    cost_p10 = Column(Numeric(18, 2), nullable=True)
+    cost_p50 = Column(Numeric(18, 2), nullable=True)
+    cost_p90 = Column(Numeric(18, 2), nullable=True)
+    
+    # $/MWhr distribution
+    cost_per_mwh_p10 = Column(Numeric(18, 4), nullable=True)
+    cost_per_mwh_p50 = Column(Numeric(18, 4), nullable=True)
+    cost_per_mwh_p90 = Column(Numeric(18, 4), nullable=True)
+    
+    generation_mwh_p50 = Column(Numeric(18, 4), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    scenario = relationship("Scenario", back_populates="risk_bands")
+    plant = relationship("Plant")
+    
+    __table_args__ = (
+        UniqueConstraint("scenario_id", "plant_id", "year", name="uq_scenario_risk_band"),
+    )
+    
+    def __repr__(self):
+        return f"<ScenarioRiskBand(scenario={self.scenario_id}, plant={self.plant_id}, year={self.year})>"
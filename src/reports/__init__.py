@@ -1,18 +1,24 @@
 # Report generation module
 
-from src.reports.variance_report import (
-    VarianceType,
-    VarianceLine,
-    MonthlyValues,
-    generate_variance_report,
-    variance_report_to_dict,
-    get_ytd_variance_summary,
-)
+import importlib
 
-from src.reports.sponsor_report import (
-    generate_sponsor_report,
-    generate_all_sponsor_reports,
-)
+# Exports are resolved on first access so the API can import one report
+# module without loading openpyxl for the Excel writers.
+_EXPORTS = {
+    "VarianceType": "src.reports.variance_report",
+    "VarianceLine": "src.reports.variance_report",
+    "MonthlyValues": "src.reports.variance_report",
+    "generate_variance_report": "src.reports.variance_report",
+    "variance_report_to_dict": "src.reports.variance_report",
+    "get_ytd_variance_summary": "src.reports.variance_report",
+    "generate_sponsor_report": "src.reports.sponsor_report",
+    "generate_all_sponsor_reports": "src.reports.sponsor_report",
+    "ComparisonResult": "src.reports.scenario_comparison",
+    "compare_scenarios": "src.reports.scenario_comparison",
+    "comparison_to_dict": "src.reports.scenario_comparison",
+    "comparison_to_excel": "src.reports.scenario_comparison",
+    "iter_comparison_json": "src.reports.scenario_comparison",
+}
 
 __all__ = [
     # Variance reporting
@@ -25,4 +31,19 @@ __all__ = [
     # Sponsor reports
     "generate_sponsor_report",
     "generate_all_sponsor_reports",
+    # Scenario comparison
+    "ComparisonResult",
+    "compare_scenarios",
+    "comparison_to_dict",
+    "comparison_to_excel",
+    "iter_comparison_json",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
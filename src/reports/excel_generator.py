@@ -11,9 +11,10 @@ from openpyxl.utils import get_column_letter
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from src.models import Forecast, Scenario, Plant, CostCategory, Period
+from src.models import Forecast, Scenario, ScenarioRiskBand, Plant, CostCategory, Period
 from src.models.cost_category import CostSection
 from src.models.period import Granularity
+from src.engine.scenario_layers import forecast_source
 
 
 def create_styles():
@@ -75,6 +76,9 @@ def generate_sponsor_report(
     # Get scenario info
     scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
     
+    # Overlay scenarios read their grid through the parent chain
+    forecast = forecast_source(scenario)
+    
     # Get all plants
     plants = db.query(Plant).filter(Plant.is_active == True).all()
     
@@ -93,17 +97,28 @@ def generate_sponsor_report(
     # Create Summary sheet
     ws_summary = wb.active
     ws_summary.title = "Summary"
-    _create_summary_sheet(ws_summary, db, scenario, plants, categories, year_range, styles)
+    _create_summary_sheet(ws_summary, db, scenario, plants, categories, year_range, styles, forecast)
+    
+    # Create Risk Bands sheet for Monte Carlo scenarios
+    risk_bands = (
+        db.query(ScenarioRiskBand)
+        .filter(ScenarioRiskBand.scenario_id == scenario_id)
+        .order_by(ScenarioRiskBand.plant_id, ScenarioRiskBand.year)
+        .all()
+    )
+    if risk_bands:
+        ws_risk = wb.create_sheet("Risk Bands")
+        _create_risk_sheet(ws_risk, scenario, plants, risk_bands, styles)
     
     # Create Monthly Detail sheet if requested
     if include_monthly and years >= 1:
         ws_monthly = wb.create_sheet("Monthly Detail")
-        _create_monthly_sheet(ws_monthly, db, scenario, plants, categories, current_year, min(years, 2), styles)
+        _create_monthly_sheet(ws_monthly, db, scenario, plants, categories, current_year, min(years, 2), styles, forecast)
     
     # Create sheets by plant
     for plant in plants:
         ws_plant = wb.create_sheet(plant.short_name)
-        _create_plant_sheet(ws_plant, db, scenario, plant, categories, year_range, styles)
+        _create_plant_sheet(ws_plant, db, scenario, plant, categories, year_range, styles, forecast)
     
     # Save to buffer
     buffer = BytesIO()
@@ -113,7 +128,7 @@ def generate_sponsor_report(
     return buffer
 
 
-def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styles):
+def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styles, forecast=Forecast):
     """Create the summary sheet with annual totals."""
     # Title
     ws['A1'] = f"OVEC Financial Forecast - {scenario.name}"
@@ -137,7 +152,7 @@ def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styl
     ws.cell(row=row, column=1).font = Font(bold=True)
     total_gen = Decimal(0)
     for col, year in enumerate(year_range, 2):
-        gen = _get_generation_for_year(db, scenario.id, year)
+        gen = _get_generation_for_year(db, scenario.id, year, forecast=forecast)
         ws.cell(row=row, column=col, value=float(gen) if gen else 0)
         ws.cell(row=row, column=col).number_format = '#,##0'
         total_gen += gen or Decimal(0)
@@ -169,7 +184,7 @@ def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styl
         for cat in section_cats:
             ws.cell(row=row, column=1, value=f"  {cat.name}")
             for col, year in enumerate(year_range, 2):
-                cost = _get_cost_for_category_year(db, scenario.id, cat.id, year)
+                cost = _get_cost_for_category_year(db, scenario.id, cat.id, year, forecast=forecast)
                 ws.cell(row=row, column=col, value=float(cost) if cost else 0)
                 ws.cell(row=row, column=col).number_format = '#,##0'
                 section_total[year] += cost or Decimal(0)
@@ -193,7 +208,7 @@ def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styl
         row += 1
         ws.cell(row=row, column=1, value=f"  $/MWhr")
         for col, year in enumerate(year_range, 2):
-            gen = _get_generation_for_year(db, scenario.id, year)
+            gen = _get_generation_for_year(db, scenario.id, year, forecast=forecast)
             if gen and gen > 0:
                 cpm = section_total[year] / gen
                 ws.cell(row=row, column=col, value=float(cpm))
@@ -221,7 +236,7 @@ def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styl
     ws.cell(row=row, column=1, value="ALL-IN $/MWhr")
     ws.cell(row=row, column=1).font = Font(bold=True)
     for col, year in enumerate(year_range, 2):
-        gen = _get_generation_for_year(db, scenario.id, year)
+        gen = _get_generation_for_year(db, scenario.id, year, forecast=forecast)
         if gen and gen > 0:
             cpm = grand_total[year] / gen
             ws.cell(row=row, column=col, value=float(cpm))
@@ -234,7 +249,7 @@ def _create_summary_sheet(ws, db, scenario, plants, categories, year_range, styl
         ws.column_dimensions[get_column_letter(col)].width = 15
 
 
-def _create_monthly_sheet(ws, db, scenario, plants, categories, start_year, num_years, styles):
+def _create_monthly_sheet(ws, db, scenario, plants, categories, start_year, num_years, styles, forecast=Forecast):
     """Create monthly detail sheet."""
     ws['A1'] = f"Monthly Detail - {scenario.name}"
     ws['A1'].font = Font(bold=True, size=14)
@@ -270,7 +285,7 @@ def _create_monthly_sheet(ws, db, scenario, plants, categories, start_year, num_
         for cat in section_cats:
             ws.cell(row=row, column=1, value=f"  {cat.name}")
             for col, (year, month) in enumerate(months, 2):
-                cost = _get_cost_for_category_month(db, scenario.id, cat.id, year, month)
+                cost = _get_cost_for_category_month(db, scenario.id, cat.id, year, month, forecast=forecast)
                 ws.cell(row=row, column=col, value=float(cost) if cost else 0)
                 ws.cell(row=row, column=col).number_format = '#,##0'
             row += 1
@@ -283,7 +298,7 @@ def _create_monthly_sheet(ws, db, scenario, plants, categories, start_year, num_
         ws.column_dimensions[get_column_letter(col)].width = 10
 
 
-def _create_plant_sheet(ws, db, scenario, plant, categories, year_range, styles):
+def _create_plant_sheet(ws, db, scenario, plant, categories, year_range, styles, forecast=Forecast):
     """Create a sheet for a specific plant."""
     ws['A1'] = f"{plant.name} - {scenario.name}"
     ws['A1'].font = Font(bold=True, size=14)
@@ -303,7 +318,7 @@ def _create_plant_sheet(ws, db, scenario, plant, categories, year_range, styles)
     ws.cell(row=row, column=1, value="GENERATION (MWh)")
     ws.cell(row=row, column=1).font = Font(bold=True)
     for col, year in enumerate(year_range, 2):
-        gen = _get_generation_for_year(db, scenario.id, year, plant.id)
+        gen = _get_generation_for_year(db, scenario.id, year, plant.id, forecast=forecast)
         ws.cell(row=row, column=col, value=float(gen) if gen else 0)
         ws.cell(row=row, column=col).number_format = '#,##0'
     
@@ -321,7 +336,7 @@ def _create_plant_sheet(ws, db, scenario, plant, categories, year_range, styles)
         for cat in section_cats:
             ws.cell(row=row, column=1, value=f"  {cat.name}")
             for col, year in enumerate(year_range, 2):
-                cost = _get_cost_for_category_year(db, scenario.id, cat.id, year, plant.id)
+                cost = _get_cost_for_category_year(db, scenario.id, cat.id, year, plant.id, forecast=forecast)
                 ws.cell(row=row, column=col, value=float(cost) if cost else 0)
                 ws.cell(row=row, column=col).number_format = '#,##0'
             row += 1
@@ -333,44 +348,87 @@ def _create_plant_sheet(ws, db, scenario, plant, categories, year_range, styles)
         ws.column_dimensions[get_column_letter(col)].width = 15
 
 
-def _get_generation_for_year(db, scenario_id: int, year: int, plant_id: int = None) -> Optional[Decimal]:
+def _create_risk_sheet(ws, scenario, plants, risk_bands, styles):
+    """Create the P10/P50/P90 sheet for a Monte Carlo risk scenario."""
+    ws['A1'] = f"Cost Risk Bands - {scenario.name}"
+    ws['A1'].font = Font(bold=True, size=14)
+    ws['A2'] = f"{risk_bands[0].trials:,} trials per plant/year"
+    
+    row = 4
+    headers = [
+        'Plant', 'Year',
+        'Cost P10', 'Cost P50', 'Cost P90', 'Cost Mean',
+        '$/MWhr P10', '$/MWhr P50', '$/MWhr P90',
+        'Generation P50 (MWh)',
+    ]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=row, column=col, value=header)
+        cell.font = Font(bold=True, color='FFFFFF')
+        cell.fill = PatternFill(start_color='1F4E79', end_color='1F4E79', fill_type='solid')
+    
+    plant_names = {p.id: p.short_name for p in plants}
+    
+    for band in risk_bands:
+        row += 1
+        ws.cell(row=row, column=1, value=plant_names.get(band.plant_id, str(band.plant_id)))
+        ws.cell(row=row, column=2, value=band.year)
+        values = [
+            (band.cost_p10, '#,##0'),
+            (band.cost_p50, '#,##0'),
+            (band.cost_p90, '#,##0'),
+            (band.cost_mean, '#,##0'),
+            (band.cost_per_mwh_p10, '$#,##0.00'),
+            (band.cost_per_mwh_p50, '$#,##0.00'),
+            (band.cost_per_mwh_p90, '$#,##0.00'),
+            (band.generation_mwh_p50, '#,##0'),
+        ]
+        for col, (value, number_format) in enumerate(values, 3):
+            ws.cell(row=row, column=col, value=float(value) if value else 0)
+            ws.cell(row=row, column=col).number_format = number_format
+    
+    ws.column_dimensions['A'].width = 15
+    for col in range(2, len(headers) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 16
+
+
+def _get_generation_for_year(db, scenario_id: int, year: int, plant_id: int = None, forecast=Forecast) -> Optional[Decimal]:
     """Get total generation for a year."""
     query = (
-        db.query(func.sum(Forecast.generation_mwh))
-        .join(Period)
-        .filter(Forecast.scenario_id == scenario_id)
+        db.query(func.sum(forecast.generation_mwh))
+        .join(Period, forecast.period_id == Period.id)
+        .filter(forecast.scenario_id == scenario_id)
         .filter(Period.year == year)
     )
     if plant_id:
-        query = query.filter(Forecast.plant_id == plant_id)
+        query = query.filter(forecast.plant_id == plant_id)
     
     result = query.scalar()
     return Decimal(str(result)) if result else Decimal(0)
 
 
-def _get_cost_for_category_year(db, scenario_id: int, category_id: int, year: int, plant_id: int = None) -> Optional[Decimal]:
+def _get_cost_for_category_year(db, scenario_id: int, category_id: int, year: int, plant_id: int = None, forecast=Forecast) -> Optional[Decimal]:
     """Get total cost for a category in a year."""
     query = (
-        db.query(func.sum(Forecast.cost_dollars))
-        .join(Period)
-        .filter(Forecast.scenario_id == scenario_id)
-        .filter(Forecast.category_id == category_id)
+        db.query(func.sum(forecast.cost_dollars))
+        .join(Period, forecast.period_id == Period.id)
+        .filter(forecast.scenario_id == scenario_id)
+        .filter(forecast.category_id == category_id)
         .filter(Period.year == year)
     )
     if plant_id:
-        query = query.filter(Forecast.plant_id == plant_id)
+        query = query.filter(forecast.plant_id == plant_id)
     
     result = query.scalar()
     return Decimal(str(result)) if result else Decimal(0)
 
 
-def _get_cost_for_category_month(db, scenario_id: int, category_id: int, year: int, month: int) -> Optional[Decimal]:
+def _get_cost_for_category_month(db, scenario_id: int, category_id: int, year: int, month: int, forecast=Forecast) -> Optional[Decimal]:
     """Get cost for a category in a specific month."""
     query = (
-        db.query(func.sum(Forecast.cost_dollars))
-        .join(Period)
-        .filter(Forecast.scenario_id == scenario_id)
-        .filter(Forecast.category_id == category_id)
+        db.query(func.sum(forecast.cost_dollars))
+        .join(Period, forecast.period_id == Period.id)
+        .filter(forecast.scenario_id == scenario_id)
+        .filter(forecast.category_id == category_id)
         .filter(Period.year == year)
         .filter(Period.month == month)
     )
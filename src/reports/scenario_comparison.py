@@ -0,0 +1,426 @@
+"""
+Scenario comparison (diff) engine.
+
+Pivots forecasts for N scenarios in a single query into an aligned
+(plant, category, period) x scenario matrix, then computes deltas against
+the first (baseline) scenario, $/MWhr deltas per plant and year, and the
+largest movers. Each cell is marked added, removed, changed or unchanged
+against the baseline. Results are returned as a dict, streamed as JSON
+(roll-ups first, then the cells in chunks) or written to Excel. Overlay
+scenarios are compared on their resolved (inherited)
+grid.
+"""
+
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models import Scenario
+from src.engine.scenario_layers import resolved_forecasts_sql
+from src.utils.json_encoder import orjson_dumps
+
+# Cell status against the baseline
+ADDED = "added"          # Not in the baseline
+REMOVED = "removed"      # Only in the baseline
+CHANGED = "changed"      # Cost or generation differs
+UNCHANGED = "unchanged"
+
+# Cells serialized per chunk of the streamed JSON
+JSON_CHUNK_CELLS = 1000
+
+
+@dataclass
+class ComparisonResult:
+    """Aligned comparison matrix for a set of scenarios."""
+    scenarios: List[dict]
+    # One entry per (plant, category, period) cell
+    plant_ids: List[Optional[int]]
+    plant_names: List[str]
+    category_ids: List[int]
+    category_names: List[str]
+    sections: List[str]
+    years: List[int]
+    months: List[Optional[int]]
+    # Matrices shaped (cells, scenarios)
+    cost: np.ndarray
+    generation: np.ndarray
+    delta: np.ndarray
+    present: np.ndarray  # True where the scenario has the cell
+    # Roll-ups
+    totals: List[dict] = field(default_factory=list)
+    cost_per_mwh: List[dict] = field(default_factory=list)
+    top_movers: List[dict] = field(default_factory=list)
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.years)
+
+    def status(self, r: int) -> List[Optional[str]]:
+        """Status of cell r in each scenario (None for the baseline, or absent from both)."""
+        statuses = [None]
+        in_baseline = self.present[r, 0]
+        for i in range(1, len(self.scenarios)):
+            if not self.present[r, i]:
+                statuses.append(REMOVED if in_baseline else None)
+            elif not in_baseline:
+                statuses.append(ADDED)
+            elif self.delta[r, i] != 0 or self.generation[r, i] != self.generation[r, 0]:
+                statuses.append(CHANGED)
+            else:
+                statuses.append(UNCHANGED)
+        return statuses
+
+
+def _build_pivot_sql(count: int, extra_filters: str) -> str:
+    """One SUM ... FILTER column pair per scenario."""
+    columns = []
+    for i in range(count):
+        columns.append(
+            f"SUM(f.cost_dollars) FILTER (WHERE f.scenario_id = :s{i}) AS cost_{i}"
+        )
+        columns.append(
+            f"SUM(f.generation_mwh) FILTER (WHERE f.scenario_id = :s{i}) AS gen_{i}"
+        )
+    pivot_columns = ",\n            ".join(columns)
+
+    return f"""
+        SELECT
+            f.plant_id,
+            COALESCE(pl.short_name, 'Combined') AS plant_name,
+            f.category_id,
+            c.name AS category_name,
+            c.section,
+            p.year,
+            p.month,
+            {pivot_columns}
+        FROM ({resolved_forecasts_sql()}) f
+        JOIN periods p ON p.id = f.period_id
+        JOIN cost_categories c ON c.id = f.category_id
+        LEFT JOIN plants pl ON pl.id = f.plant_id
+        WHERE f.scenario_id = ANY(:scenario_ids){extra_filters}
+        GROUP BY f.plant_id, pl.short_name, f.category_id, c.name, c.section,
+                 c.sort_order, p.year, p.month
+        ORDER BY f.plant_id NULLS LAST, c.section, c.sort_order, p.year, p.month NULLS FIRST
+    """
+
+
+def compare_scenarios(
+    db: Session,
+    scenario_ids: Sequence[int],
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    plant_ids: Optional[Sequence[int]] = None,
+    top_n: int = 20,
+    min_delta: float = 0.0,
+) -> ComparisonResult:
+    """
+    Compare two or more scenarios cell by cell.
+
+    Args:
+        db: Database session
+        scenario_ids: Scenarios to compare; the first is the baseline
+        year_from: Optional first year
+        year_to: Optional last year
+        plant_ids: Optional plant filter
+        top_n: Number of top movers to return per scenario
+        min_delta: Top movers must move by more than this many dollars
+
+    Returns:
+        ComparisonResult
+
+    Raises:
+        ValueError: If fewer than two scenarios are given
+        LookupError: If any scenario does not exist
+    """
+    ids = list(dict.fromkeys(scenario_ids))
+    if len(ids) < 2:
+        raise ValueError("At least two scenarios are required for a comparison")
+
+    found = {s.id: s for s in db.query(Scenario).filter(Scenario.id.in_(ids)).all()}
+    missing = [i for i in ids if i not in found]
+    if missing:
+        raise LookupError(f"Scenarios not found: {missing}")
+
+    params = {"scenario_ids": ids}
+    for i, scenario_id in enumerate(ids):
+        params[f"s{i}"] = scenario_id
+
+    filters = ""
+    if year_from is not None:
+        filters += " AND p.year >= :year_from"
+        params["year_from"] = year_from
+    if year_to is not None:
+        filters += " AND p.year <= :year_to"
+        params["year_to"] = year_to
+    if plant_ids:
+        filters += " AND f.plant_id = ANY(:plant_ids)"
+        params["plant_ids"] = list(plant_ids)
+
+    rows = db.execute(text(_build_pivot_sql(len(ids), filters)), params).fetchall()
+
+    return build_comparison(
+        [{"id": s.id, "name": s.name, "version": s.version} for s in (found[i] for i in ids)],
+        rows,
+        top_n=top_n,
+        min_delta=min_delta,
+    )
+
+
+def build_comparison(
+    scenarios: List[dict],
+    rows: Sequence[tuple],
+    top_n: int = 20,
+    min_delta: float = 0.0,
+) -> ComparisonResult:
+    """
+    Build the comparison from pivot rows.
+
+    Args:
+        scenarios: {"id", "name", "version"} per scenario, baseline first
+        rows: (plant_id, plant_name, category_id, category_name, section,
+            year, month, cost_0, gen_0, cost_1, gen_1, ...) per cell; a
+            scenario without the cell has NULL cost and generation
+        top_n: Number of top movers to return per scenario
+        min_delta: Top movers must move by more than this many dollars
+
+    Returns:
+        ComparisonResult
+    """
+    n = len(scenarios)
+    cost = np.zeros((len(rows), n))
+    generation = np.zeros((len(rows), n))
+    present = np.zeros((len(rows), n), dtype=bool)
+    for r, row in enumerate(rows):
+        values = row[7:]
+        costs, gens = values[0::2], values[1::2]
+        cost[r] = [float(v) if v is not None else 0.0 for v in costs]
+        generation[r] = [float(v) if v is not None else 0.0 for v in gens]
+        present[r] = [c is not None or g is not None for c, g in zip(costs, gens)]
+
+    result = ComparisonResult(
+        scenarios=scenarios,
+        plant_ids=[row[0] for row in rows],
+        plant_names=[row[1] for row in rows],
+        category_ids=[row[2] for row in rows],
+        category_names=[row[3] for row in rows],
+        sections=[str(row[4]).lower() for row in rows],
+        years=[row[5] for row in rows],
+        months=[row[6] for row in rows],
+        cost=cost,
+        generation=generation,
+        delta=cost - cost[:, :1],
+        present=present,
+    )
+
+    result.totals = _scenario_totals(result)
+    result.cost_per_mwh = _cost_per_mwh_deltas(result)
+    result.top_movers = _top_movers(result, top_n, min_delta)
+    return result
+
+
+def _scenario_totals(result: ComparisonResult) -> List[dict]:
+    """Total cost per scenario, delta vs baseline and cells by status."""
+    totals = result.cost.sum(axis=0)
+    counts = [dict.fromkeys((ADDED, REMOVED, CHANGED, UNCHANGED), 0) for _ in result.scenarios]
+    for r in range(result.cell_count):
+        for i, status in enumerate(result.status(r)):
+            if status is not None:
+                counts[i][status] += 1
+    return [
+        {
+            "scenario_id": s["id"],
+            "total_cost": float(totals[i]),
+            "delta": float(totals[i] - totals[0]),
+            "delta_pct": float((totals[i] - totals[0]) / totals[0] * 100) if totals[0] else None,
+            "cells": counts[i] if i else None,
+        }
+        for i, s in enumerate(result.scenarios)
+    ]
+
+
+def _group_sum(keys: List[tuple], matrix: np.ndarray):
+    """Sum matrix rows by key; returns (unique keys, summed matrix)."""
+    index: Dict[tuple, int] = {}
+    inverse = np.array([index.setdefault(k, len(index)) for k in keys], dtype=int)
+    sums = np.zeros((len(index), matrix.shape[1]))
+    if len(inverse):
+        np.add.at(sums, inverse, matrix)
+    return list(index), sums
+
+
+def _cost_per_mwh_deltas(result: ComparisonResult) -> List[dict]:
+    """$/MWhr per plant and year for each scenario, with deltas vs baseline."""
+    keys = [
+        (plant_id, plant_name, year)
+        for plant_id, plant_name, year in zip(result.plant_ids, result.plant_names, result.years)
+    ]
+    labels, cost = _group_sum(keys, result.cost)
+    _, generation = _group_sum(keys, result.generation)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_mwh = np.where(generation > 0, cost / generation, np.nan)
+    delta = per_mwh - per_mwh[:, :1]
+
+    output = []
+    for r, (plant_id, plant_name, year) in sorted(
+        enumerate(labels), key=lambda x: (x[1][0] is None, x[1][0] or 0, x[1][2])
+    ):
+        output.append({
+            "plant_id": plant_id,
+            "plant": plant_name,
+            "year": year,
+            "cost_per_mwh": [None if np.isnan(v) else float(v) for v in per_mwh[r]],
+            "delta": [None if np.isnan(v) else float(v) for v in delta[r]],
+        })
+    return output
+
+
+def _top_movers(result: ComparisonResult, top_n: int, min_delta: float = 0.0) -> List[dict]:
+    """Largest absolute changes vs baseline by plant and category."""
+    keys = [
+        (plant_id, plant_name, category_id, category_name)
+        for plant_id, plant_name, category_id, category_name in zip(
+            result.plant_ids, result.plant_names, result.category_ids, result.category_names
+        )
+    ]
+    labels, delta = _group_sum(keys, result.delta)
+    _, cost = _group_sum(keys, result.cost)
+
+    movers = []
+    for i, scenario in enumerate(result.scenarios[1:], 1):
+        order = np.argsort(-np.abs(delta[:, i]))[:top_n]
+        for r in order:
+            if abs(delta[r, i]) <= min_delta:
+                break
+            plant_id, plant_name, category_id, category_name = labels[r]
+            movers.append({
+                "scenario_id": scenario["id"],
+                "plant_id": plant_id,
+                "plant": plant_name,
+                "category_id": category_id,
+                "category": category_name,
+                "baseline": float(cost[r, 0]),
+                "value": float(cost[r, i]),
+                "delta": float(delta[r, i]),
+            })
+    return movers
+
+
+def _cell_dict(result: ComparisonResult, r: int) -> dict:
+    return {
+        "plant_id": result.plant_ids[r],
+        "plant": result.plant_names[r],
+        "category_id": result.category_ids[r],
+        "category": result.category_names[r],
+        "section": result.sections[r],
+        "year": result.years[r],
+        "month": result.months[r],
+        "cost": result.cost[r].tolist(),
+        "generation": result.generation[r].tolist(),
+        "delta": result.delta[r].tolist(),
+        "status": result.status(r),
+    }
+
+
+def _summary_dict(result: ComparisonResult) -> dict:
+    return {
+        "scenarios": result.scenarios,
+        "baseline_scenario_id": result.scenarios[0]["id"],
+        "cell_count": result.cell_count,
+        "totals": result.totals,
+        "cost_per_mwh": result.cost_per_mwh,
+        "top_movers": result.top_movers,
+    }
+
+
+def comparison_to_dict(result: ComparisonResult) -> dict:
+    """The comparison as a JSON-ready dict: roll-ups, then every cell."""
+    return {
+        **_summary_dict(result),
+        "cells": [_cell_dict(result, r) for r in range(result.cell_count)],
+    }
+
+
+def iter_comparison_json(result: ComparisonResult, chunk_cells: int = JSON_CHUNK_CELLS) -> Iterator[bytes]:
+    """
+    The comparison_to_dict document as JSON bytes, in pieces: the roll-ups,
+    then `chunk_cells` cells at a time, so the cell list is never held
+    as one dict or one buffer.
+    """
+    yield orjson_dumps(_summary_dict(result))[:-1] + b',"cells":['
+    for start in range(0, result.cell_count, chunk_cells):
+        cells = b",".join(
+            orjson_dumps(_cell_dict(result, r))
+            for r in range(start, min(start + chunk_cells, result.cell_count))
+        )
+        yield cells if start == 0 else b"," + cells
+    yield b"]}"
+
+
+def comparison_to_excel(result: ComparisonResult) -> BytesIO:
+    """Write the comparison to an Excel workbook (write-only mode)."""
+    wb = Workbook(write_only=True)
+    header_font = Font(bold=True, color='FFFFFF')
+    header_fill = PatternFill(start_color='1F4E79', end_color='1F4E79', fill_type='solid')
+    names = [s["name"] for s in result.scenarios]
+
+    def header_row(ws, headers):
+        cells = []
+        for value in headers:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = header_font
+            cell.fill = header_fill
+            cells.append(cell)
+        ws.append(cells)
+
+    # Summary
+    ws = wb.create_sheet("Summary")
+    header_row(ws, ["Scenario", "Total Cost", "Delta vs Baseline", "Delta %"])
+    for s, total in zip(result.scenarios, result.totals):
+        ws.append([s["name"], total["total_cost"], total["delta"], total["delta_pct"]])
+
+    # $/MWhr by plant and year
+    ws = wb.create_sheet("$ per MWhr")
+    header_row(ws, ["Plant", "Year"] + names + [f"Delta {n}" for n in names[1:]])
+    for row in result.cost_per_mwh:
+        ws.append([row["plant"], row["year"]] + row["cost_per_mwh"] + row["delta"][1:])
+
+    # Top movers
+    ws = wb.create_sheet("Top Movers")
+    header_row(ws, ["Scenario", "Plant", "Category", "Baseline", "Value", "Delta"])
+    scenario_names = {s["id"]: s["name"] for s in result.scenarios}
+    for m in result.top_movers:
+        ws.append([
+            scenario_names[m["scenario_id"]], m["plant"], m["category"],
+            m["baseline"], m["value"], m["delta"],
+        ])
+
+    # Full matrix
+    ws = wb.create_sheet("Detail")
+    header_row(
+        ws,
+        ["Plant", "Category", "Section", "Year", "Month"]
+        + names + [f"Delta {n}" for n in names[1:]] + [f"Status {n}" for n in names[1:]],
+    )
+    for r in range(result.cell_count):
+        ws.append(
+            [
+                result.plant_names[r], result.category_names[r], result.sections[r],
+                result.years[r], result.months[r],
+            ]
+            + result.cost[r].tolist()
+            + result.delta[r, 1:].tolist()
+            + result.status(r)[1:]
+        )
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
@@ -5,6 +5,16 @@ from .json_encoder import (
     serialize_for_json,
     json_dumps,
     json_loads,
+    orjson_default,
+    orjson_dumps,
+    ORJSONResponse,
+    rows_to_dicts,
+)
+from .instrumentation import (
+    RequestStats,
+    current_stats,
+    redact_parameters,
+    render_metrics,
 )
 
 __all__ = [
@@ -12,4 +22,12 @@ __all__ = [
     'serialize_for_json',
     'json_dumps',
     'json_loads',
+    'orjson_default',
+    'orjson_dumps',
+    'ORJSONResponse',
+    'rows_to_dicts',
+    'RequestStats',
+    'current_stats',
+    'redact_parameters',
+    'render_metrics',
 ]
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""Request and SQL instrumentation.
+
+SQLAlchemy cursor events (registered on every Engine) count statements,
+database time and rows for the request in progress; the request is
+tracked with a ContextVar so the counts follow it into the threadpool
+used by sync endpoints. ORJSONResponse reports its render time here too.
+
+Aggregates are kept in-process per route template and rendered in the
+Prometheus text format by render_metrics(). Statements slower than
+Config.SLOW_QUERY_MS are logged with their bound parameters redacted.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import Config
+
+
+slow_query_logger = logging.getLogger("src.slow_query")
+
+# Prometheus histogram buckets for request latency (seconds)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_MAX_LOGGED_SQL = 2000
+
+
+@dataclass
+class RequestStats:
+    """Counters for a single request."""
+    sql_statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    serialize_seconds: float = 0.0
+    # Optional per-statement capture: (statement, seconds, rows)
+    statements: Optional[List[Tuple[str, float, int]]] = None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request(capture_statements: bool = False) -> Tuple[RequestStats, object]:
+    """Begin collecting stats for the current context.
+
+    Returns:
+        (stats, token); pass the token to end_request()
+    """
+    stats = RequestStats(statements=[] if capture_statements else None)
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def record_serialization(seconds: float) -> None:
+    """Add response render time to the current request (no-op outside one)."""
+    stats = _current.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
+
+
+# =============================================================================
+# SQL hooks
+# =============================================================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+def redact_parameters(parameters) -> object:
+    """Replace bound parameter values with their type names."""
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: keep the shape of the first row and the row count
+            return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__ if parameters is not None else None
+
+
+def _compact_sql(statement: str) -> str:
+    """Single-line SQL with inline string literals masked."""
+    sql = _STRING_LITERAL.sub("'?'", " ".join(statement.split()))
+    return sql if len(sql) <= _MAX_LOGGED_SQL else sql[:_MAX_LOGGED_SQL] + " ..."
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    rowcount = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_statements += 1
+        stats.db_seconds += elapsed
+        stats.rows += rowcount
+        if stats.statements is not None:
+            stats.statements.append((_compact_sql(statement), elapsed, rowcount))
+
+    if elapsed * 1000 >= Config.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "slow query %.1f ms rows=%d params=%s sql=%s",
+            elapsed * 1000, rowcount, redact_parameters(parameters), _compact_sql(statement),
+        )
+
+
+# =============================================================================
+# Metrics registry
+# =============================================================================
+
+@dataclass
+class _RouteMetrics:
+    requests: Dict[str, int] = field(default_factory=dict)  # status class -> count
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    latency_sum: float = 0.0
+    count: int = 0
+    sql_statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    serialize_seconds: float = 0.0
+
+
+_metrics: Dict[Tuple[str, str], _RouteMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+    """Fold a finished request into the per-route aggregates."""
+    status_class = f"{status // 100}xx"
+    with _metrics_lock:
+        m = _metrics.setdefault((method, route), _RouteMetrics())
+        m.requests[status_class] = m.requests.get(status_class, 0) + 1
+        m.count += 1
+        m.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                m.latency_buckets[i] += 1
+        m.sql_statements += stats.sql_statements
+        m.db_seconds += stats.db_seconds
+        m.rows += stats.rows
+        m.serialize_seconds += stats.serialize_seconds
+
+
+def reset_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_metrics() -> str:
+    """All aggregates in the Prometheus text exposition format."""
+    with _metrics_lock:
+        snapshot = {
+            key: _RouteMetrics(
+                requests=dict(m.requests),
+                latency_buckets=list(m.latency_buckets),
+                latency_sum=m.latency_sum,
+                count=m.count,
+                sql_statements=m.sql_statements,
+                db_seconds=m.db_seconds,
+                rows=m.rows,
+                serialize_seconds=m.serialize_seconds,
+            )
+            for key, m in _metrics.items()
+        }
+
+    lines = [
+        "# HELP http_requests_total Requests by route template and status class.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route), m in sorted(snapshot.items()):
+        for status_class, count in sorted(m.requests.items()):
+            lines.append(
+                f'http_requests_total{{method="{method}",route="{_label(route)}",status="{status_class}"}} {count}'
+            )
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), m in sorted(snapshot.items()):
+        labels = f'method="{method}",route="{_label(route)}"'
+        for bound, count in zip(LATENCY_BUCKETS, m.latency_buckets):
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.count}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.latency_sum:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.count}")
+
+    for name, attr, help_text in (
+        ("http_request_sql_statements_total", "sql_statements", "SQL statements executed."),
+        ("http_request_db_seconds_total", "db_seconds", "Time spent in the database."),
+        ("http_request_db_rows_total", "rows", "Rows fetched or affected."),
+        ("http_request_serialize_seconds_total", "serialize_seconds", "Time spent rendering responses."),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (method, route), m in sorted(snapshot.items()):
+            value = getattr(m, attr)
+            value = f"{value:.6f}" if isinstance(value, float) else str(value)
+            lines.append(f'{name}{{method="{method}",route="{_label(route)}"}} {value}')
+
+    return "\n".join(lines) + "\n"
+
+
+def server_timing_header(total_seconds: float, stats: RequestStats) -> str:
+    """Server-Timing header value (durations in ms)."""
+    return ", ".join([
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.sql_statements} queries, {stats.rows} rows"',
+        f"serialize;dur={stats.serialize_seconds * 1000:.1f}",
+        f"total;dur={total_seconds * 1000:.1f}",
+    ])
@@ -1,9 +1,18 @@
 """Custom JSON encoder for handling Decimal and other special types."""
 
 import json
+import time
 from decimal import Decimal
 from datetime import datetime, date
-from typing import Any
+from typing import Any, Iterable, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from .instrumentation import record_serialization
+
+# Dict keys may be ints (e.g. month numbers); NumPy arrays/scalars are native
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -48,4 +57,54 @@ def json_dumps(obj: Any, **kwargs) -> str:
 
 def json_loads(s: str, **kwargs) -> Any:
     """Deserialize JSON string (wrapper for consistency)."""
-    return json.loads(s, **kwargs)
\ No newline at end of file
+    return json.loads(s, **kwargs)
+
+
+def orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not handle natively.
+
+    orjson already handles datetime/date, dataclasses, UUIDs and NumPy
+    (with OPT_SERIALIZE_NUMPY); this covers Decimal and Pydantic models.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
+def orjson_dumps(obj: Any) -> bytes:
+    """Serialize object to JSON bytes with orjson (Decimal as float)."""
+    return orjson.dumps(obj, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Used as the app's default response class. Returning one directly from a
+    handler (e.g. ORJSONResponse(payload)) also skips FastAPI's
+    response_model validation, which is the fast path for large read-only
+    payloads built with rows_to_dicts.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = orjson_dumps(content)
+        record_serialization(time.perf_counter() - start)
+        return body
+
+
+def rows_to_dicts(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[dict]:
+    """Convert DB rows to plain dicts without per-field conversion.
+
+    Decimal/date values are left as-is for orjson to encode, so large
+    result sets avoid building a Pydantic model per row.
+
+    Example:
+        result = conn.execute(query, params)
+        rows_to_dicts(result.keys(), result.fetchall())
+    """
+    keys = tuple(keys)
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,153 @@
+"""On-demand request profiling.
+
+StackSampler is a small wall-clock sampling profiler: a background thread
+reads sys._current_frames() every few milliseconds and counts the stacks
+that pass through project code, so both async handlers (event loop
+thread) and sync handlers (threadpool) are captured. Stacks are kept in
+the collapsed "a;b;c count" format read by flamegraph.pl and speedscope.
+
+Profiles are written as JSON (stacks plus the captured SQL statements and
+their timings) to Config.PROFILE_DIR. Nothing here runs unless profiling
+is enabled; see ProfilingMiddleware.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import Config
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+_SRC_PREFIX = str(PROJECT_ROOT / "src")
+_PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+DEFAULT_INTERVAL = 0.005
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(str(PROJECT_ROOT)):
+        filename = filename[len(str(PROJECT_ROOT)) + 1:]
+    else:
+        filename = Path(filename).name
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Sample stacks of all threads running project code.
+
+    Every concurrent request running project code is sampled too, so
+    profile on a quiet worker for clean results.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, int]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                labels = []
+                in_project = False
+                depth = 0
+                while frame is not None and depth < MAX_STACK_DEPTH:
+                    if frame.f_code.co_filename.startswith(_SRC_PREFIX):
+                        in_project = True
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                    depth += 1
+                if in_project:
+                    key = ";".join(reversed(labels))
+                    self.stacks[key] = self.stacks.get(key, 0) + 1
+
+
+def collapsed_stacks(stacks: Dict[str, int]) -> str:
+    """Stacks in flamegraph.pl / speedscope collapsed format."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def save_profile(
+    method: str,
+    path: str,
+    route: Optional[str],
+    status: int,
+    seconds: float,
+    sampler: StackSampler,
+    statements: List[tuple],
+) -> str:
+    """Write a profile to PROFILE_DIR; returns its id."""
+    profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    profile_dir = Path(Config.PROFILE_DIR)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+
+    data = {
+        "id": profile_id,
+        "method": method,
+        "path": path,
+        "route": route,
+        "status": status,
+        "duration_ms": round(seconds * 1000, 2),
+        "sample_interval_ms": sampler.interval * 1000,
+        "samples": sampler.samples,
+        "stacks": sampler.stacks,
+        "sql": [
+            {"statement": statement, "duration_ms": round(elapsed * 1000, 3), "rows": rows}
+            for statement, elapsed, rows in statements
+        ],
+        "sql_total_ms": round(sum(s[1] for s in statements) * 1000, 3),
+        "created_at": time.time(),
+    }
+    (profile_dir / f"{profile_id}.json").write_text(json.dumps(data))
+    return profile_id
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    """Read a stored profile (None if the id is unknown or malformed)."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    file = Path(Config.PROFILE_DIR) / f"{profile_id}.json"
+    if not file.exists():
+        return None
+    return json.loads(file.read_text())
+
+
+def list_profiles(limit: int = 50) -> List[dict]:
+    """Most recent stored profiles, newest first (without stacks)."""
+    profile_dir = Path(Config.PROFILE_DIR)
+    if not profile_dir.exists():
+        return []
+    files = sorted(profile_dir.glob("*.json"), reverse=True)[:limit]
+    summaries = []
+    for file in files:
+        data = json.loads(file.read_text())
+        summaries.append({
+            k: data[k] for k in ("id", "method", "path", "route", "status", "duration_ms", "sql_total_ms")
+        } | {"sql_statements": len(data["sql"])})
+    return summaries
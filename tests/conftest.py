@@ -0,0 +1,74 @@
+"""
+Shared test fixtures.
+
+Most tests need no database. Tests of set-based SQL that only PostgreSQL
+runs (ANY, DISTINCT ON, UPDATE ... FROM VALUES, partitions) use the
+`pg_engine` fixture, which points at TEST_POSTGRES_DATABASE: a dedicated
+database, empty or left by an earlier run. The fixture creates the
+tables from the models (partitioned like the app's) and the driver
+tables, which only migration 008 defines, by running that migration;
+tests truncate the tables they use and create the views they read.
+Without it those tests are skipped, so a plain `pytest` run is
+unaffected.
+
+Environment:
+    TEST_POSTGRES_DATABASE  Database for the PostgreSQL tests (host, port
+                            and credentials as for the app)
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+
+TEST_DB = os.getenv("TEST_POSTGRES_DATABASE")
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / "migrations" / "versions"
+
+
+def _run_migration(engine, filename: str):
+    """Run one migration's upgrade() on the engine."""
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    spec = importlib.util.spec_from_file_location(Path(filename).stem, MIGRATIONS_DIR / filename)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """Engine on the test database, with every model's table and the driver tables created."""
+    if not TEST_DB:
+        pytest.skip("TEST_POSTGRES_DATABASE is not set")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import make_url
+
+    import src.models  # noqa: F401  (registers every model)
+    from src import database
+    from src.config import Config
+    from src.db import postgres
+    from src.models import mapping_tables
+
+    engine = create_engine(make_url(Config.get_postgres_url()).set(database=TEST_DB))
+    for base in (database.Base, postgres.Base, mapping_tables.Base):
+        base.metadata.create_all(engine)
+    if not inspect(engine).has_table("driver_definitions"):
+        _run_migration(engine, "008_driver_framework.py")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_truncate(pg_engine):
+    """Function emptying tables of the test database (and rows referencing them)."""
+    def truncate(*tables: str):
+        with pg_engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+    return truncate
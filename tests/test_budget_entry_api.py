@@ -0,0 +1,39 @@
+"""Tests for budget entry saves."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import budget_entry_api
+from src.api.routes.budget_entry_api import BudgetLineData, _line_values
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(budget_entry_api.router)
+    return TestClient(app)
+
+
+class TestSaveBudgetEntriesValidation:
+    """Validation happens before any database work."""
+
+    def test_existing_line_needs_version(self, client):
+        body = {
+            "plant_code": "KC",
+            "dept_code": "MAINT",
+            "year": 2025,
+            "entries": [{"id": 7, "months": [1.0] * 12}],
+        }
+
+        response = client.post("/api/budget-entry/KC/2025", json=body)
+
+        assert response.status_code == 400
+        assert "Version required" in response.json()["detail"]
+
+    def test_update_writes_only_sent_fields(self):
+        values = _line_values(BudgetLineData(months=[1.0] * 12, line_description="Pumps"))
+
+        assert values["total"] == 12
+        assert values["line_description"] == "Pumps"
+        assert "notes" not in values and "account_code" not in values
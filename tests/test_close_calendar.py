@@ -0,0 +1,154 @@
+"""Tests for the fiscal close calendar."""
+
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+
+from src.engine import close_calendar
+from src.engine.close_calendar import CloseState, _Snapshot, close_period, current_month
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    """Install a close-state snapshot: KC closed through 2025-10, CC never closed."""
+    periods = {
+        (2025, m): (date(2025, m, 1), date(2025, m, 28)) for m in range(1, 13)
+    }
+    snap = _Snapshot(
+        loaded_at=time.monotonic(),
+        closes={"KC": CloseState("KC", 2025, 10)},
+        periods=periods,
+    )
+    monkeypatch.setattr(close_calendar, "_snapshot", snap)
+    return snap
+
+
+class TestCurrentMonth:
+    """Tests for current_month()."""
+
+    def test_last_closed_period(self, snapshot):
+        assert current_month(2025, "KC") == 10
+
+    def test_earlier_and_later_years(self, snapshot):
+        assert current_month(2024, "KC") == 12
+        assert current_month(2026, "KC") == 0
+
+    def test_calendar_fallback_for_unclosed_plant(self, snapshot):
+        assert current_month(2025, "CC", today=date(2025, 7, 15)) == 6
+        assert current_month(2025, "CC", today=date(2025, 1, 10)) == 0
+
+    def test_year_outside_calendar(self, snapshot):
+        assert current_month(2019, "CC", today=date(2025, 7, 15)) == 12
+
+    def test_corporate_uses_earliest_plant(self, snapshot):
+        assert current_month(2025, today=date(2025, 9, 15)) == 8
+        assert current_month(2025, today=date(2026, 2, 1)) == 10
+
+    def test_invalidate_forces_reload(self, snapshot, monkeypatch):
+        reloaded = _Snapshot(time.monotonic(), {"KC": CloseState("KC", 2025, 11)}, snapshot.periods)
+        monkeypatch.setattr(close_calendar, "_load_snapshot", lambda: reloaded)
+
+        assert current_month(2025, "KC") == 10
+        close_calendar.invalidate_close_state()
+        assert current_month(2025, "KC") == 11
+
+
+class TestClosePeriod:
+    """Tests for close_period() validation."""
+
+    def test_unknown_plant(self):
+        with pytest.raises(ValueError, match="Unknown plant"):
+            close_period("XX", 2025, 1)
+
+
+class _Result:
+    def __init__(self, value=None, rowcount=0):
+        self.value = value
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self.value
+
+    def __iter__(self):
+        return iter([])
+
+
+class _RecordingConnection:
+    """Records statements; freshness checks answer from `fresh` in order."""
+
+    def __init__(self, fresh):
+        self.fresh = list(fresh)
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append((sql, params or {}))
+        if "MIN(computed_at)" in sql:
+            return _Result(self.fresh.pop(0))
+        return _Result()
+
+    def kinds(self):
+        kinds = []
+        for sql, _ in self.statements:
+            for kind in ("pg_advisory_xact_lock", "MIN(computed_at)", "DELETE", "INSERT"):
+                if kind in sql:
+                    kinds.append(kind)
+                    break
+        return kinds
+
+
+@pytest.fixture
+def recording(monkeypatch):
+    """Route get_engine() to a recording connection; returns a factory."""
+    def install(*fresh):
+        conn = _RecordingConnection(fresh)
+
+        class _Engine:
+            @contextmanager
+            def begin(self):
+                yield conn
+
+        monkeypatch.setattr(close_calendar, "get_engine", lambda: _Engine())
+        return conn
+    return install
+
+
+class TestYtdAggregates:
+    """Tests for the ytd_aggregates rebuild on read."""
+
+    def test_fresh_month_is_read_without_locking(self, recording):
+        conn = recording(True)
+
+        close_calendar.get_ytd_aggregates("KC", 2025, 3)
+
+        assert conn.kinds() == ["MIN(computed_at)"]
+
+    def test_stale_month_is_rebuilt_under_the_lock(self, recording):
+        conn = recording(False, False)
+
+        close_calendar.get_ytd_aggregates("KC", 2025, 3)
+
+        assert conn.kinds() == [
+            "MIN(computed_at)", "pg_advisory_xact_lock", "MIN(computed_at)",
+            "pg_advisory_xact_lock", "DELETE", "INSERT",
+        ]
+        lock_params = conn.statements[1][1]
+        assert lock_params == {"lock_key": "ytd_aggregates:KC:2025:3"}
+
+    def test_rebuild_by_another_reader_is_not_repeated(self, recording):
+        conn = recording(False, True)
+
+        close_calendar.get_ytd_aggregates("KC", 2025, 3)
+
+        assert conn.kinds() == ["MIN(computed_at)", "pg_advisory_xact_lock", "MIN(computed_at)"]
+
+    def test_computed_at_is_utc_like_etl_runs(self, recording):
+        conn = recording()
+
+        close_calendar.precompute_ytd(conn, "KC", 2025, 3)
+
+        insert_sql, params = conn.statements[-1]
+        assert "NOW()" not in insert_sql
+        assert abs((params["computed_at"] - datetime.utcnow()).total_seconds()) < 60
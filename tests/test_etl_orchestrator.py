@@ -0,0 +1,141 @@
+"""Tests for the nightly ETL orchestrator."""
+
+import threading
+import time
+
+import pytest
+
+from src.etl import orchestrator
+from src.etl.orchestrator import Checkpoint, Step, graph_signature, nightly_steps, run_dag, run_nightly, validate
+
+
+def _recorder():
+    order, lock = [], threading.Lock()
+
+    def step(name, deps=(), fail=False, sleep=0.0):
+        def run():
+            time.sleep(sleep)
+            if fail:
+                raise RuntimeError(f"{name} broke")
+            with lock:
+                order.append(name)
+        return Step(name, run, tuple(deps))
+
+    return order, step
+
+
+class TestGraph:
+    """Tests for graph validation and the nightly graph."""
+
+    def test_unknown_dependency_and_cycle(self):
+        noop = lambda: None
+
+        with pytest.raises(ValueError, match="unknown"):
+            validate([Step("a", noop, ("b",))])
+        with pytest.raises(ValueError, match="cycle"):
+            validate([Step("a", noop, ("b",)), Step("b", noop, ("a",))])
+
+    def test_nightly_months_wait_for_mappings(self):
+        steps = {s.name: s for s in nightly_steps(2025, months=[1, 13], budget_file=None)}
+
+        assert set(steps["gl_actuals_2025_01"].deps) == {"mappings", "gl_partitions"}
+        assert steps["outage_catalog"].deps == ("gl_actuals_2025_01", "gl_actuals_2025_adj")
+        assert "budget" not in steps and "expense_actuals" not in steps
+
+    def test_nightly_pulls_from_db2_by_default(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(orchestrator, "_load_month", lambda *args: calls.append(args))
+        monkeypatch.setattr(orchestrator, "_load_accounts", lambda *args: calls.append(args))
+        steps = {s.name: s for s in nightly_steps(2025, months=[1], budget_file=None)}
+
+        steps["gl_actuals_2025_01"].run()
+        steps["gl_accounts"].run()
+
+        assert calls == [(2025, 1, False), (False,)]
+
+
+class TestRunDag:
+    """Tests for scheduling, failures and resume."""
+
+    def test_dependencies_run_first_within_the_worker_cap(self):
+        order, step = _recorder()
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def tracked(name, deps=()):
+            inner = step(name, deps, sleep=0.02)
+
+            def run():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                inner.run()
+                with lock:
+                    active[0] -= 1
+            return Step(name, run, inner.deps)
+
+        steps = [tracked("root"), *[tracked(f"m{i}", ["root"]) for i in range(5)],
+                 tracked("last", [f"m{i}" for i in range(5)])]
+        result = run_dag(steps, workers=2)
+
+        assert result.ok
+        assert order[0] == "root" and order[-1] == "last"
+        assert peak[0] == 2
+
+    def test_failure_skips_only_dependents(self):
+        order, step = _recorder()
+        steps = [step("a", fail=True), step("b", ["a"]), step("c", ["b"]), step("d")]
+
+        result = run_dag(steps, workers=2)
+
+        assert list(result.failed) == ["a"]
+        assert result.skipped == ["b", "c"]
+        assert order == ["d"]
+
+    def test_resume_skips_completed_steps(self, tmp_path):
+        path = tmp_path / "nightly.json"
+        order, step = _recorder()
+        failing = [step("a"), step("b", ["a"], fail=True), step("c", ["b"])]
+
+        first = run_dag(failing, workers=1, checkpoint=Checkpoint(path, "sig").load())
+        assert first.completed == ["a"] and path.exists()
+
+        order.clear()
+        fixed = [step("a"), step("b", ["a"]), step("c", ["b"])]
+        second = run_dag(fixed, workers=1, checkpoint=Checkpoint(path, "sig").load())
+
+        assert second.resumed == ["a"]
+        assert order == ["b", "c"]
+        assert not path.exists()
+
+    def test_checkpoint_of_another_graph_is_ignored(self, tmp_path):
+        path = tmp_path / "nightly.json"
+        Checkpoint(path, "old").mark_done("a")
+
+        assert Checkpoint(path, "new").load().completed == {}
+
+
+class TestRunNightly:
+    """A scheduled run starts fresh; only --resume reads the checkpoint."""
+
+    @pytest.fixture
+    def last_night(self, tmp_path, monkeypatch):
+        """A checkpoint of last night's run of the same graph, plus a recorder of steps run."""
+        monkeypatch.setattr(orchestrator, "CHECKPOINT_DIR", tmp_path)
+        order, step = _recorder()
+        steps = [step("a"), step("b", ["a"])]
+        monkeypatch.setattr(orchestrator, "nightly_steps", lambda *args: steps)
+        signature = graph_signature(steps, year=2025, budget_file=None, expense_file=None, from_cache=False)
+        Checkpoint(tmp_path / "nightly-2025.json", signature).mark_done("a")
+        return order
+
+    def test_default_runs_every_step(self, last_night):
+        result = run_nightly(2025, budget_file=None)
+
+        assert result.resumed == []
+        assert last_night == ["a", "b"]
+
+    def test_resume_skips_completed_steps(self, last_night):
+        result = run_nightly(2025, budget_file=None, resume=True)
+
+        assert result.resumed == ["a"]
+        assert last_night == ["b"]
@@ -0,0 +1,83 @@
+"""
+Tests for ETL run telemetry.
+"""
+
+import pytest
+
+from src.etl import run_tracking
+from src.etl.run_tracking import EtlRunTracker, track_etl_run
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Capture finished runs instead of writing them to etl_runs."""
+    finished = []
+    monkeypatch.setattr(run_tracking, "_record_start", lambda run: None)
+    monkeypatch.setattr(
+        run_tracking, "_record_finish",
+        lambda run, status, error: finished.append((run, status, error)),
+    )
+    return finished
+
+
+class TestEtlRunTracker:
+    """Tests for EtlRunTracker."""
+
+    def test_counts_attributed_to_current_phase(self):
+        run = EtlRunTracker("job", {})
+        with run.phase("extract"):
+            run.add_rows(100)
+            run.add_bytes(2048)
+        with run.phase("load"):
+            run.add_rows(90)
+        with run.phase("load"):
+            run.add_rows(10)
+
+        assert run.phases["extract"].rows == 100
+        assert run.phases["load"].rows == 100
+        assert run.rows_processed == 100
+        assert run.bytes_processed == 2048
+
+    def test_summary(self):
+        run = EtlRunTracker("job", {"year": 2025})
+        with run.phase("load"):
+            run.add_rows(500)
+
+        summary = run.summary()
+        assert summary["rows_processed"] == 500
+        assert summary["rows_per_second"] > 0
+        assert set(summary["phases"]) == {"load"}
+        assert summary["phases"]["load"]["seconds"] >= 0
+
+    def test_peak_rss_is_the_process_high_water_mark(self, monkeypatch):
+        monkeypatch.setattr(run_tracking, "process_peak_rss_mb", lambda: 812.34)
+
+        summary = EtlRunTracker("job", {}).summary()
+
+        assert summary["process_peak_rss_mb"] == 812.3
+        assert "peak_rss_mb" not in summary
+
+
+class TestTrackEtlRun:
+    """Tests for track_etl_run."""
+
+    def test_success(self, recorded):
+        with track_etl_run("gl_actuals", year=2025) as run:
+            with run.phase("load"):
+                run.add_rows(3)
+
+        (run, status, error), = recorded
+        assert status == "success"
+        assert error is None
+        assert run.params == {"year": 2025}
+
+    def test_failure_recorded_and_reraised(self, recorded):
+        with pytest.raises(ValueError):
+            with track_etl_run("gl_actuals") as run:
+                with run.phase("extract"):
+                    raise ValueError("DB2 unavailable")
+
+        (run, status, error), = recorded
+        assert status == "failed"
+        assert error == "ValueError: DB2 unavailable"
+        assert "extract" in run.phases
@@ -0,0 +1,46 @@
+"""Tests for the shared ETL column normalization."""
+
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from src.etl.transforms import normalize_strings
+
+
+def _extract():
+    return pd.DataFrame({
+        "gxacct": ["  K1-100-5000 ", "K1-200-5100", None],
+        "gxdrcr": ["D ", "C", "D"],
+        "thedat": [date(2025, 3, 1), date(2025, 3, 2), None],
+        "gxfamt": [Decimal("1.50"), Decimal("2"), Decimal("3")],
+        "txmnth": [3, 3, 3],
+    })
+
+
+class TestNormalizeStrings:
+    """Text columns are stripped and re-typed; other columns are left alone."""
+
+    def test_strip_and_categories(self):
+        df = normalize_strings(_extract(), categories=["gxdrcr", "gxco"], string_dtype="string")
+
+        assert df["gxacct"].dtype == "string"
+        assert df["gxacct"].tolist()[:2] == ["K1-100-5000", "K1-200-5100"]
+        assert df["gxacct"].isna().iloc[2]
+        assert isinstance(df["gxdrcr"].dtype, pd.CategoricalDtype)
+        assert sorted(df["gxdrcr"].cat.categories) == ["C", "D"]
+
+    def test_non_text_object_columns_untouched(self):
+        df = normalize_strings(_extract(), string_dtype="string")
+
+        assert df["thedat"].dtype == object and df["thedat"].iloc[0] == date(2025, 3, 1)
+        assert df["gxfamt"].iloc[0] == Decimal("1.50")
+        assert df["txmnth"].dtype == "int64"
+
+    def test_arrow_strings(self):
+        pytest.importorskip("pyarrow")
+        df = normalize_strings(_extract(), categories=["gxdrcr"])
+
+        assert df["gxacct"].dtype == "string[pyarrow]"
+        assert df["gxacct"].iloc[0] == "K1-100-5000"
@@ -0,0 +1,61 @@
+"""Tests for change events."""
+
+import asyncio
+import json
+
+from src.api.routes.events import format_sse
+from src.db import events
+from src.db.events import EventHub, encode_event
+
+
+class TestEncodeEvent:
+    """Tests for NOTIFY payloads."""
+
+    def test_small_event_keeps_detail(self):
+        payload = json.loads(encode_event("forecast_deleted", "KC", 2025, {"dept_code": "MAINT"}))
+
+        assert payload == {"type": "forecast_deleted", "plant_code": "KC", "year": 2025, "dept_code": "MAINT"}
+
+    def test_oversized_event_is_truncated(self):
+        rows = [{"dept_code": f"D{i}", "months": [123456.78] * 12} for i in range(200)]
+
+        payload = encode_event("forecast_saved", "KC", 2025, {"rows": rows})
+
+        assert len(payload) <= events.MAX_PAYLOAD_BYTES
+        assert json.loads(payload)["truncated"] is True
+
+    def test_sse_format(self):
+        assert format_sse({"type": "resync"}) == 'event: resync\ndata: {"type":"resync"}\n\n'
+
+
+class TestEventHub:
+    """Tests for fan-out to subscribers."""
+
+    def test_dispatch_by_plant_and_year(self):
+        async def run():
+            hub = EventHub()
+            loop = asyncio.get_running_loop()
+            kc, cc = asyncio.Queue(), asyncio.Queue()
+            # Registered directly: no listener thread (or database) needed
+            hub._subscribers[kc] = ("KC", 2025, loop)
+            hub._subscribers[cc] = ("CC", 2025, loop)
+
+            hub.dispatch({"type": "forecast_saved", "plant_code": "KC", "year": 2025})
+            hub.dispatch({"type": "forecast_saved", "plant_code": "KC", "year": 2024})
+            hub.dispatch({"type": "etl_finished", "plant_code": None, "year": 2025})
+            await asyncio.sleep(0)
+
+            return [kc.get_nowait()["type"] for _ in range(kc.qsize())], cc.qsize()
+
+        kc_events, cc_count = asyncio.run(run())
+
+        assert kc_events == ["forecast_saved", "etl_finished"]
+        assert cc_count == 1
+
+    def test_full_queue_resyncs(self):
+        queue = asyncio.Queue(maxsize=2)
+        for i in range(3):
+            events._offer(queue, {"type": "forecast_saved", "n": i})
+
+        assert queue.qsize() == 1
+        assert queue.get_nowait() == {"type": "resync"}
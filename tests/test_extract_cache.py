@@ -0,0 +1,113 @@
+"""Tests for the Infinium extract cache."""
+
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.config import Config
+from src.etl import gl_actuals
+from src.etl.extract_cache import MANIFEST_FILE, ExtractCache, query_hash
+
+QUERY = "SELECT GXACCT, TXMNTH FROM GLCUFA.GLPTX1 WHERE TXYEAR = {year}"
+
+
+def _cache(tmp_path, query=QUERY, retention_days=30):
+    return ExtractCache("gl_actuals", query, root=tmp_path, retention_days=retention_days)
+
+
+def _empty_slice():
+    return pd.DataFrame(columns=["GXACCT", "TXMNTH"])
+
+
+class TestLayout:
+    """Tests for slice paths and query hashes."""
+
+    def test_slice_dirs(self, tmp_path):
+        cache = _cache(tmp_path)
+
+        assert cache.slice_dir({"year": 2025, "month": 3}) == tmp_path / "gl_actuals" / "year=2025" / "month=03"
+        assert cache.slice_dir({"year": 2025, "month": None}).name == "month=other"
+
+    def test_query_hash_ignores_whitespace(self):
+        assert query_hash("SELECT a\n  FROM t") == query_hash("SELECT a FROM t")
+        assert query_hash("SELECT a FROM t") != query_hash("SELECT b FROM t")
+
+
+class TestReadWrite:
+    """Slices are served only for the same query and within retention."""
+
+    def test_round_trip_of_an_empty_month(self, tmp_path):
+        cache = _cache(tmp_path)
+        manifest = cache.write(_empty_slice(), {"year": 2025, "month": 13})
+
+        assert manifest["rows"] == 0
+        assert list(cache.read({"year": 2025, "month": 13}).columns) == ["GXACCT", "TXMNTH"]
+
+    def test_missing_slice_misses_the_whole_read(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.write(_empty_slice(), {"year": 2025, "month": 1})
+
+        assert cache.read_all([{"year": 2025, "month": 1}, {"year": 2025, "month": 2}]) is None
+
+    def test_changed_query_is_a_miss(self, tmp_path):
+        _cache(tmp_path).write(_empty_slice(), {"year": 2025, "month": 1})
+
+        assert _cache(tmp_path, query=QUERY + " AND GXCO = '003'").read({"year": 2025, "month": 1}) is None
+
+    def test_expired_slices_are_missed_and_pruned(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.write(_empty_slice(), {"year": 2024, "month": 1})
+        cache.write(_empty_slice(), {"year": 2025, "month": 1})
+
+        old = cache.slice_dir({"year": 2024, "month": 1}) / MANIFEST_FILE
+        manifest = json.loads(old.read_text())
+        manifest["extracted_at"] = (datetime.now() - timedelta(days=31)).isoformat()
+        old.write_text(json.dumps(manifest))
+
+        assert cache.read({"year": 2024, "month": 1}) is None
+        assert cache.prune() == 1
+        assert not old.parent.exists()
+        assert cache.read({"year": 2025, "month": 1}) is not None
+
+
+class _PulledFromDb2(Exception):
+    pass
+
+
+@pytest.fixture
+def cached_year(tmp_path, monkeypatch):
+    """Every 2025 GL month cached (empty); KC and CC closed through March."""
+    monkeypatch.setattr(Config, "EXTRACT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(gl_actuals, "current_month", lambda year: 3)
+
+    def pull():
+        raise _PulledFromDb2()
+    monkeypatch.setattr(gl_actuals, "get_infinium_connection", pull)
+
+    cache = ExtractCache("gl_actuals", gl_actuals.GL_ACTUALS_QUERY)
+    for slot in (*range(1, 13), None):
+        cache.write(_empty_slice(), {"year": 2025, "month": slot})
+
+
+class TestGlActualsCache:
+    """GL actuals read the cache only when asked to, and only for closed months."""
+
+    def test_db2_by_default(self, cached_year):
+        with pytest.raises(_PulledFromDb2):
+            gl_actuals.extract_gl_actuals(2025, 2)
+
+    def test_closed_month_from_cache(self, cached_year):
+        assert gl_actuals.extract_gl_actuals(2025, 2, from_cache=True).empty
+
+    def test_open_month_is_never_served_from_cache(self, cached_year):
+        with pytest.raises(_PulledFromDb2):
+            gl_actuals.extract_gl_actuals(2025, 4, from_cache=True)
+        with pytest.raises(_PulledFromDb2):
+            gl_actuals.extract_gl_actuals(2025, from_cache=True)
+
+    def test_adjustment_periods_closed_with_the_year(self, monkeypatch):
+        monkeypatch.setattr(gl_actuals, "current_month", lambda year: 12)
+
+        assert gl_actuals.closed_slots(2025) == {*range(1, 13), None}
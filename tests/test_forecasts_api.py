@@ -0,0 +1,81 @@
+"""Tests for the forecast grid save."""
+
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import forecasts_api
+from src.api.routes.forecasts_api import changed_cells, grid_etag
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(forecasts_api.router)
+    return TestClient(app)
+
+
+def _grid(*dept_codes):
+    return {
+        "plant_code": "KC",
+        "year": 2025,
+        "forecasts": [{"dept_code": d, "months": [100.0] * 12} for d in dept_codes],
+    }
+
+
+class TestChangedCells:
+    """Tests for the per-cell diff."""
+
+    def test_only_differing_months(self):
+        old = [Decimal("100.00")] * 12
+        new = list(old)
+        new[2] = Decimal("150.00")
+
+        assert changed_cells("MAINT", old, new) == [
+            {"dept_code": "MAINT", "month": 3, "old": 100.0, "new": 150.0}
+        ]
+
+    def test_new_row_reports_every_month(self):
+        cells = changed_cells("MAINT", [None] * 12, [Decimal("1.00")] * 12)
+
+        assert len(cells) == 12
+        assert all(c["old"] is None for c in cells)
+
+    def test_amounts_rounded_like_storage(self):
+        assert forecasts_api._to_cents(0.1 + 0.2) == Decimal("0.30")
+
+
+class TestSaveForecastsValidation:
+    """Validation happens before any database work."""
+
+    def test_duplicate_department(self, client):
+        response = client.post("/api/forecasts/KC/2025", json=_grid("MAINT", "MAINT"))
+
+        assert response.status_code == 400
+        assert "Duplicate" in response.json()["detail"]
+
+    def test_wrong_month_count(self, client):
+        body = _grid("MAINT")
+        body["forecasts"][0]["months"] = [1.0] * 11
+
+        assert client.post("/api/forecasts/KC/2025", json=body).status_code == 400
+
+    def test_empty_grid_is_a_no_op(self, client):
+        response = client.post("/api/forecasts/KC/2025", json=_grid())
+
+        assert response.json()["count"] == 0
+        assert response.json()["changed_cells"] == []
+
+
+class TestGridEtag:
+    """Tests for the grid ETag."""
+
+    def test_changes_with_any_version(self):
+        etag = grid_etag([("MAINT", 1), ("OPER", 3)])
+
+        assert etag.startswith('W/"')
+        assert etag == grid_etag([("MAINT", 1), ("OPER", 3)])
+        assert etag != grid_etag([("MAINT", 2), ("OPER", 3)])
+        assert etag != grid_etag([("MAINT", 1)])
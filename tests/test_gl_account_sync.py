@@ -0,0 +1,147 @@
+"""Tests for the account master hash-diff sync."""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from src.etl import gl_accounts
+from src.models.gl_account import GLAccount, GLAccountHistory
+
+
+class TestAccountColumns:
+    """The hash and the history cover every column of the extract."""
+
+    def test_columns_match_the_extract(self):
+        extract = [line.strip().rstrip(",").lower() for line in gl_accounts.GL_ACCOUNTS_QUERY.splitlines()
+                   if line.strip().startswith("CT")]
+
+        assert gl_accounts.ACCOUNT_COLUMNS == extract
+
+    def test_history_keeps_every_version_column(self):
+        history = set(GLAccountHistory.__table__.columns.keys())
+        current = set(GLAccount.__table__.columns.keys())
+
+        assert set(gl_accounts.ACCOUNT_COLUMNS) | {"row_hash"} <= history & current
+        assert history - current == {"valid_from", "valid_to"}
+
+
+class TestHistory:
+    """Tests for the type-2 history table."""
+
+    def test_one_current_version_per_account(self):
+        index = next(i for i in GLAccountHistory.__table__.indexes if i.name == "uq_gl_account_history_current")
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+        assert "CREATE UNIQUE INDEX" in ddl
+        assert "WHERE valid_to IS NULL" in ddl
+
+
+T1 = datetime(2025, 1, 10, 2, 0)
+T2 = datetime(2025, 6, 10, 2, 0)
+
+
+def _accounts(*rows) -> pd.DataFrame:
+    """Transformed extract of (ctacct, ctdesc, ctuf01) accounts."""
+    df = pd.DataFrame(None, index=range(len(rows)), columns=gl_accounts.ACCOUNT_COLUMNS, dtype=object)
+    df[["ctacct", "ctdesc", "ctuf01"]] = list(rows)
+    return df.assign(ctco="003", ctactv="1", ctmors="M")
+
+
+@pytest.fixture
+def sync(pg_engine, pg_truncate, monkeypatch):
+    """Function syncing accounts as of a point in time; CTUF01 FPC100 -> OPER, FPC250 -> ENGR."""
+    pg_truncate("gl_accounts", "gl_account_history", "account_dept_mappings")
+    with pg_engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO account_dept_mappings (ctuf01, dept_code) VALUES ('FPC100', 'OPER'), ('FPC250', 'ENGR')
+        """))
+
+    def run(at: datetime, df: pd.DataFrame, full: bool = False) -> dict:
+        class _Clock(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return at
+        monkeypatch.setattr(gl_accounts, "datetime", _Clock)
+        return gl_accounts.sync_gl_accounts(pg_engine, df, full=full)
+    return run
+
+
+def _current(engine) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.execute(text("SELECT ctacct, ctdesc FROM gl_accounts")).all())
+
+
+def _history(engine, ctacct: str) -> list:
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT ctuf01, valid_from, valid_to FROM gl_account_history
+            WHERE ctacct = :ctacct ORDER BY valid_from
+        """), {"ctacct": ctacct})
+        return [tuple(row) for row in rows]
+
+
+class TestSyncGlAccounts:
+    """Tests for sync_gl_accounts against PostgreSQL."""
+
+    def test_first_sync_inserts_and_opens_versions(self, sync, pg_engine):
+        counts = sync(T1, _accounts(("1001", "Coal handling", "FPC100"), ("2002", "Lime", "FPC250")))
+
+        assert counts == {
+            "updated": 0, "inserted": 2, "deactivated": 0, "versions_closed": 0, "versions_opened": 2,
+        }
+        assert _current(pg_engine) == {"1001": "Coal handling", "2002": "Lime"}
+        assert _history(pg_engine, "1001") == [("FPC100", T1, None)]
+
+    def test_unchanged_accounts_are_not_written(self, sync):
+        accounts = _accounts(("1001", "Coal handling", "FPC100"), ("2002", "Lime", "FPC250"))
+        sync(T1, accounts)
+
+        assert set(sync(T2, accounts).values()) == {0}
+
+    def test_update_insert_and_deactivate(self, sync, pg_engine):
+        sync(T1, _accounts(("1001", "Coal handling", "FPC100"), ("2002", "Lime", "FPC250")))
+
+        counts = sync(T2, _accounts(("1001", "Coal yard", "FPC100"), ("3003", "Ash", "FPC250")))
+
+        assert counts == {
+            "updated": 1, "inserted": 1, "deactivated": 1, "versions_closed": 2, "versions_opened": 2,
+        }
+        assert _current(pg_engine) == {"1001": "Coal yard", "3003": "Ash"}
+        assert _history(pg_engine, "1001") == [("FPC100", T1, T2), ("FPC100", T2, None)]
+        assert _history(pg_engine, "2002") == [("FPC250", T1, T2)]
+        assert _history(pg_engine, "3003") == [("FPC250", T2, None)]
+
+    def test_change_in_any_column_is_a_new_version(self, sync, pg_engine):
+        accounts = _accounts(("1001", "Coal handling", "FPC100"))
+        sync(T1, accounts)
+
+        counts = sync(T2, accounts.assign(ctrc09="LAB"))
+
+        assert (counts["updated"], counts["versions_opened"]) == (1, 1)
+        assert len(_history(pg_engine, "1001")) == 2
+
+    def test_full_rewrites_accounts_but_not_history(self, sync, pg_engine):
+        accounts = _accounts(("1001", "Coal handling", "FPC100"), ("2002", "Lime", "FPC250"))
+        sync(T1, accounts)
+
+        counts = sync(T2, accounts, full=True)
+
+        assert (counts["inserted"], counts["versions_closed"], counts["versions_opened"]) == (2, 0, 0)
+        assert _history(pg_engine, "1001") == [("FPC100", T1, None)]
+
+    def test_departments_as_of_follow_ctuf01_changes(self, sync, pg_engine):
+        sync(T1, _accounts(("1001", "Coal handling", "FPC100")))
+        sync(T2, _accounts(("1001", "Coal handling", "FPC250")))
+
+        with pg_engine.connect() as conn:
+            before = gl_accounts.account_departments_as_of(conn, datetime(2025, 1, 1))
+            first = gl_accounts.account_departments_as_of(conn, datetime(2025, 3, 1))
+            at_change = gl_accounts.account_departments_as_of(conn, T2)
+
+        assert before == {}
+        assert first == {"1001": {"ctuf01": "FPC100", "dept_code": "OPER"}}
+        assert at_change == {"1001": {"ctuf01": "FPC250", "dept_code": "ENGR"}}
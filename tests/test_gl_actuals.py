@@ -0,0 +1,81 @@
+"""Tests for the GL actuals load."""
+
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from src.db import partitions
+from src.etl import gl_actuals, run_tracking
+
+
+class _Engine:
+    @contextmanager
+    def begin(self):
+        yield None
+
+
+def _empty_extract():
+    """What DB2 returns for a month with no rows (numeric columns only)."""
+    return pd.DataFrame({
+        "TXYEAR": pd.Series(dtype="int64"),
+        "TXMNTH": pd.Series(dtype="int64"),
+        "GXFAMT": pd.Series(dtype="float64"),
+    })
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Run load_gl_actuals on an empty extract; returns the replace_* calls."""
+    calls = []
+    monkeypatch.setattr(run_tracking, "_record_start", lambda run: None)
+    monkeypatch.setattr(run_tracking, "_record_finish", lambda run, status, error: None)
+    monkeypatch.setattr(gl_actuals, "init_db", lambda: None)
+    monkeypatch.setattr(gl_actuals, "get_engine", _Engine)
+    monkeypatch.setattr(gl_actuals, "extract_gl_actuals", lambda *args, **kwargs: _empty_extract())
+    monkeypatch.setattr(
+        gl_actuals, "replace_partitions",
+        lambda engine, df, year, month=None: calls.append(("partitions", df, year, month)) or 0,
+    )
+    monkeypatch.setattr(
+        gl_actuals, "replace_accounts",
+        lambda engine, df, year, month, accounts: calls.append(("accounts", df, year, month)) or 0,
+    )
+    return calls
+
+
+class TestEmptyExtract:
+    """A month DB2 no longer has rows for is emptied, not left as it was."""
+
+    def test_month_reload_goes_through_the_swap(self, loads):
+        gl_actuals.load_gl_actuals(2025, 3, refresh_outages=False)
+
+        [(kind, df, year, month)] = loads
+        assert (kind, year, month) == ("partitions", 2025, 3)
+        assert df.empty and "txmnth" in df.columns
+
+    def test_full_year_reload_goes_through_the_swap(self, loads):
+        gl_actuals.load_gl_actuals(2025, refresh_outages=False)
+
+        assert [(kind, year, month) for kind, _, year, month in loads] == [("partitions", 2025, None)]
+
+    def test_account_reload_deletes_the_accounts(self, loads):
+        gl_actuals.load_gl_actuals(2025, 3, refresh_outages=False, accounts=["501100"])
+
+        assert [(kind, month) for kind, _, _, month in loads] == [("accounts", 3)]
+
+    def test_empty_month_partitions_are_truncated(self, monkeypatch):
+        truncated, cleared = [], []
+        monkeypatch.setattr(partitions, "ensure_year_partitions", lambda conn, year: None)
+        monkeypatch.setattr(
+            partitions, "truncate_partition",
+            lambda conn, year, month, table: truncated.append((year, month, table)),
+        )
+        monkeypatch.setattr(gl_actuals, "clear_preliminary", lambda conn, year, months: cleared.append(months))
+        df = gl_actuals.transform_gl_actuals(_empty_extract())
+
+        swapped = gl_actuals.replace_partitions(_Engine(), df, 2025, 3)
+
+        assert swapped == 0
+        assert truncated == [(2025, 3, table) for table in partitions.PARTITIONED_TABLES]
+        assert cleared == [[3]]
@@ -0,0 +1,72 @@
+"""Tests for the narrow GL fact table."""
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from src.db import partitions, views
+from src.etl import gl_facts
+from src.etl.dimensions import account_row, ensure_dimensions
+from src.models.gl_transaction import GLFact, GLTransaction
+
+
+class TestFactTable:
+    """Tests for the gl_facts layout."""
+
+    def test_partitioned_like_the_detail_table(self):
+        ddl = str(CreateTable(GLFact.__table__).compile(dialect=postgresql.dialect()))
+
+        assert "PARTITION BY LIST (txyear)" in ddl
+        assert "PRIMARY KEY (id, txyear, txmnth)" in ddl
+        assert partitions.month_partition(2025, 3, partitions.FACT_TABLE) == "gl_facts_y2025m03"
+        assert [name for name, _ in partitions._parent_indexes(partitions.FACT_TABLE)] == [
+            "ix_gl_facts_account_key", "ix_gl_facts_outage_key", "ix_gl_facts_plant_dept",
+        ]
+
+    def test_strings_are_replaced_by_dimension_keys(self):
+        detail = set(GLTransaction.__table__.columns.keys())
+        facts = GLFact.__table__.columns.keys()
+
+        assert list(gl_facts.FACT_COLUMNS) == facts
+        assert set(facts) - detail == {
+            "account_key", "project_key", "outage_key", "plant_code", "dept_code",
+        }
+
+
+class TestDimensions:
+    """Tests for decoding dimension values."""
+
+    def test_account_segments(self):
+        row = account_row("003-1-20-401-10-350-501-110-4")
+
+        assert row["gxacct"] == "003-1-20-401-10-350-501-110-4"
+        assert (row["plant_code"], row["department_code"], row["ferc_account"]) == ("1", "350", "501")
+        assert row["labor_indicator"] == "4"
+
+    def test_new_keys_are_assigned_in_sorted_order(self, pg_engine, pg_truncate):
+        pg_truncate("dim_account", "dim_project", "dim_outage")
+        accounts = ["003-1-20-401-10-350-501-110-4", "001-1-20-401-10-350-501-110-4",
+                    "002-1-20-401-10-350-501-110-4", "001-1-20-401-10-350-501-110-4"]
+        with pg_engine.begin() as conn:
+            conn.execute(text("CREATE TEMP TABLE dim_source (gxacct text, gxpjno text, gxshut text)"))
+            conn.execute(
+                text("INSERT INTO dim_source (gxacct) VALUES (:gxacct)"),
+                [{"gxacct": gxacct} for gxacct in accounts],
+            )
+            ensure_dimensions(conn, "dim_source")
+            keyed = conn.execute(text("SELECT gxacct FROM dim_account ORDER BY account_key")).scalars().all()
+
+        assert keyed == sorted(set(accounts))
+
+
+class TestViews:
+    """Summaries read only the facts; details join the wide table."""
+
+    def test_budget_groups_view_is_narrow(self):
+        assert "gl_facts" in views.CREATE_BUDGET_GROUPS_VIEW
+        assert "gl_transactions" not in views.CREATE_BUDGET_GROUPS_VIEW
+
+    def test_details_view_joins_one_to_one(self):
+        sql = views.CREATE_TRANSACTION_DETAILS_VIEW
+
+        assert "t.id = f.id AND t.txyear = f.txyear AND t.txmnth = f.txmnth" in sql
@@ -0,0 +1,152 @@
+"""
+Tests for request/SQL instrumentation and on-demand profiling.
+"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.config import Config
+from src.api.middleware import InstrumentationMiddleware, ProfilingMiddleware
+from src.utils.instrumentation import redact_parameters, render_metrics, reset_metrics
+from src.utils.json_encoder import ORJSONResponse
+from src.utils.profiling import load_profile
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://")
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(InstrumentationMiddleware, server_timing=True)
+
+    @app.get("/items/{plant_code}")
+    def items(plant_code: str):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            rows = conn.execute(text("SELECT :code AS code"), {"code": plant_code}).fetchall()
+        return {"plant_code": rows[0][0]}
+
+    reset_metrics()
+    yield TestClient(app)
+    reset_metrics()
+
+
+class TestInstrumentationMiddleware:
+    """Tests for InstrumentationMiddleware."""
+
+    def test_metrics_tagged_by_route_template(self, client):
+        client.get("/items/KC")
+        client.get("/items/CC")
+
+        output = render_metrics()
+        assert 'http_requests_total{method="GET",route="/items/{plant_code}",status="2xx"} 2' in output
+        assert 'http_request_sql_statements_total{method="GET",route="/items/{plant_code}"} 4' in output
+        assert "/items/KC" not in output
+
+    def test_unmatched_paths_share_a_label(self, client):
+        client.get("/nope/1")
+        client.get("/nope/2")
+
+        assert 'route="unmatched",status="4xx"} 2' in render_metrics()
+
+    def test_server_timing_header(self, client):
+        response = client.get("/items/KC")
+
+        timing = response.headers["server-timing"]
+        assert 'desc="2 queries' in timing
+        assert "serialize;dur=" in timing
+        assert "total;dur=" in timing
+
+
+class TestSlowQueryLog:
+    """Tests for the slow-query log."""
+
+    def test_parameters_are_redacted(self, client, monkeypatch, caplog):
+        monkeypatch.setattr(Config, "SLOW_QUERY_MS", 0)
+        with caplog.at_level(logging.WARNING, logger="src.slow_query"):
+            client.get("/items/SECRET-PLANT")
+
+        assert "slow query" in caplog.text
+        assert "SECRET-PLANT" not in caplog.text
+        assert "'str'" in caplog.text
+
+    def test_redact_executemany(self):
+        redacted = redact_parameters([{"a": 1}, {"a": 2}])
+        assert redacted == {"rows": 2, "first": {"a": "int"}}
+
+
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    @pytest.fixture
+    def profiled_client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "PROFILE_DIR", str(tmp_path))
+        engine = create_engine("sqlite://")
+        app = FastAPI(default_response_class=ORJSONResponse)
+        app.add_middleware(ProfilingMiddleware, token="s3cret")
+
+        @app.get("/items/{plant_code}")
+        def items(plant_code: str):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return {"plant_code": plant_code}
+
+        return TestClient(app)
+
+    def test_not_profiled_without_flag(self, profiled_client, tmp_path):
+        response = profiled_client.get("/items/KC")
+
+        assert "x-profile-id" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_token_required(self, profiled_client):
+        response = profiled_client.get("/items/KC?_profile=1", headers={"X-Profile-Token": "wrong"})
+
+        assert "x-profile-id" not in response.headers
+
+    def test_profile_stored_with_sql(self, profiled_client):
+        response = profiled_client.get(
+            "/items/KC", headers={"X-Profile": "1", "X-Profile-Token": "s3cret"}
+        )
+
+        assert response.json() == {"plant_code": "KC"}
+        profile = load_profile(response.headers["x-profile-id"])
+        assert profile["route"] == "/items/{plant_code}"
+        assert profile["status"] == 200
+        assert [s["statement"] for s in profile["sql"]] == ["SELECT 1"]
+        assert "stacks" in profile
+
+
+class TestProfileRoutes:
+    """Stored profiles need the profiling token when one is configured."""
+
+    @pytest.fixture
+    def profiles_client(self, tmp_path, monkeypatch):
+        from src.api.routes import profiles
+
+        monkeypatch.setattr(Config, "PROFILE_DIR", str(tmp_path))
+        monkeypatch.setattr(Config, "PROFILING_TOKEN", "s3cret")
+        app = FastAPI()
+        app.include_router(profiles.router)
+        return TestClient(app)
+
+    @pytest.mark.parametrize("path", [
+        "/api/profiles", "/api/profiles/abc", "/api/profiles/abc/flamegraph.txt",
+    ])
+    def test_token_required(self, profiles_client, path):
+        assert profiles_client.get(path).status_code == 403
+        assert profiles_client.get(path, headers={"X-Profile-Token": "wrong"}).status_code == 403
+
+    def test_readable_with_token(self, profiles_client):
+        headers = {"X-Profile-Token": "s3cret"}
+
+        assert profiles_client.get("/api/profiles", headers=headers).json() == {"profiles": []}
+        assert profiles_client.get("/api/profiles/abc", headers=headers).status_code == 404
+
+    def test_open_without_a_configured_token(self, profiles_client, monkeypatch):
+        monkeypatch.setattr(Config, "PROFILING_TOKEN", None)
+
+        assert profiles_client.get("/api/profiles").status_code == 200
@@ -0,0 +1,111 @@
+"""Tests for the outage catalog and cost rollup."""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from src.api.routes.outages import rollup_outages
+from src.db import partitions
+from src.etl.account_mapping import get_department_info
+from src.etl.outage_catalog import is_outage_group, parse_outage_alias, refresh_outage_catalog
+
+
+class TestParseOutageAlias:
+    """Tests for decoding shutdown aliases."""
+
+    def test_planned_outage(self):
+        parsed = parse_outage_alias("K0125P01")
+
+        assert (parsed.plant_code, parsed.unit, parsed.unit_number) == ("KC", "01", 1)
+        assert (parsed.outage_year, parsed.outage_type) == (2025, "P")
+        assert parsed.outage_group == "PLANNED-01"
+        assert parsed.is_outage
+
+    def test_forced_and_maintenance_are_unplanned(self):
+        assert parse_outage_alias("C0324F02").outage_group == "UNPLANNED"
+        assert parse_outage_alias("C0324M02").outage_type == "M"
+        assert parse_outage_alias("C0324F02").plant_code == "CC"
+
+    def test_non_outage_alias_keeps_its_plant(self):
+        parsed = parse_outage_alias("K01")
+
+        assert parsed.plant_code == "KC"
+        assert not parsed.is_outage and parsed.outage_group is None
+
+
+class TestOutageGroups:
+    """Outage department codes are decoded, not listed."""
+
+    def test_groups(self):
+        assert is_outage_group("PLANNED-35")
+        assert is_outage_group("UNPLANNED") and is_outage_group("OUTAGE")
+        assert not is_outage_group("MAINT")
+        assert not is_outage_group("PLANNED-XX")
+
+    def test_department_info(self):
+        assert get_department_info("PLANNED-03") == {
+            "name": "Planned Outage - Unit 3", "is_outage": True, "unit": 3,
+        }
+        assert get_department_info("MAINT")["is_outage"] is False
+
+
+class TestRollup:
+    """Tests for the per-unit rollup."""
+
+    def test_events_grouped_by_plant_and_unit(self):
+        rows = [
+            ("K0125P01", "KC", 1, 2025, "P", "PLANNED-01", date(2025, 3, 1), date(2025, 4, 15), Decimal("100.50"), 3),
+            ("K0125F02", "KC", 1, 2025, "F", "UNPLANNED", None, None, Decimal("20"), 1),
+            ("K0225P01", "KC", 2, 2025, "P", "PLANNED-02", None, None, None, 1),
+        ]
+
+        units = rollup_outages(rows)
+
+        assert [(u["plant_code"], u["unit"]) for u in units] == [("KC", 1), ("KC", 2)]
+        assert units[0]["total"] == 120.5
+        assert units[0]["by_type"] == {"planned": 100.5, "forced": 20.0, "maintenance": 0.0}
+        assert [o["alias"] for o in units[0]["outages"]] == ["K0125P01", "K0125F02"]
+        assert units[1]["total"] == 0.0
+
+
+class TestRefreshWindows:
+    """A load refreshes only its year's outages, over all their years."""
+
+    def _load(self, conn, rows):
+        for row_id, (year, key, day) in enumerate(rows, start=1):
+            params = {"id": row_id, "year": year, "key": key, "day": day}
+            conn.execute(text(
+                "INSERT INTO gl_transactions (id, txyear, txmnth, thedat) VALUES (:id, :year, 1, :day)"
+            ), params)
+            conn.execute(text("""
+                INSERT INTO gl_facts (id, txyear, txmnth, outage_key, plant_code, dept_code)
+                VALUES (:id, :year, 1, :key, 'KC', 'PLANNED-01')
+            """), params)
+
+    def test_window_spans_all_years_of_the_loaded_outages(self, pg_engine, pg_truncate):
+        pg_truncate("gl_facts", "gl_transactions", "dim_outage")
+        with pg_engine.begin() as conn:
+            for year in (2023, 2024, 2025):
+                partitions.ensure_year_partitions(conn, year)
+            conn.execute(text("""
+                INSERT INTO dim_outage (outage_key, alias, is_outage, window_start, window_end)
+                VALUES (1, 'K0125P01', true, NULL, NULL),
+                       (2, 'K0123P01', true, '2020-01-01', '2020-01-01')
+            """))
+            self._load(conn, [
+                (2024, 1, date(2024, 12, 20)),
+                (2025, 1, date(2025, 1, 10)),
+                (2023, 2, date(2023, 5, 1)),
+            ])
+
+            refreshed = refresh_outage_catalog(conn, 2025)
+            windows = conn.execute(text(
+                "SELECT outage_key, window_start, window_end, unit FROM dim_outage ORDER BY outage_key"
+            )).all()
+
+        assert refreshed == 1
+        assert windows == [
+            (1, date(2024, 12, 20), date(2025, 1, 10), "01"),
+            (2, date(2020, 1, 1), date(2020, 1, 1), None),
+        ]
@@ -0,0 +1,35 @@
+"""Tests for the gl_transactions partition layout."""
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from src.db import partitions
+from src.models.gl_transaction import GLTransaction
+
+
+class TestPartitionLayout:
+    """Tests for partition naming and bounds."""
+
+    def test_names(self):
+        assert partitions.year_partition(2025) == "gl_transactions_y2025"
+        assert partitions.month_partition(2025, 3) == "gl_transactions_y2025m03"
+        assert partitions.month_partition(2025, None) == "gl_transactions_y2025_other"
+
+    def test_adjustment_periods_go_to_default(self):
+        assert partitions.month_slot(12) == 12
+        assert partitions.month_slot(3.0) == 3
+        assert partitions.month_slot(0) is None
+        assert partitions.month_slot(13) is None
+
+    def test_staging_check_implies_partition_bounds(self):
+        assert partitions._check(2025, 3) == "txyear = 2025 AND txmnth = 3"
+        assert "txmnth NOT IN (1, 2" in partitions._check(2025, None)
+
+    def test_table_is_partitioned_by_year(self):
+        ddl = str(CreateTable(GLTransaction.__table__).compile(dialect=postgresql.dialect()))
+
+        assert "PARTITION BY LIST (txyear)" in ddl
+        assert "PRIMARY KEY (id, txyear, txmnth)" in ddl
+        assert [name for name, _ in partitions._parent_indexes()] == [
+            "ix_gl_transactions_gxacct", "ix_gl_transactions_gxshut", "ix_gl_year_month_acct",
+        ]
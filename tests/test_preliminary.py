@@ -0,0 +1,175 @@
+"""Tests for preliminary close actuals."""
+
+import asyncio
+
+import orjson
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from src.api.routes import outages
+from src.db import partitions, views
+from src.engine import close_calendar
+from src.etl import gl_facts, preliminary
+from src.models.gl_transaction import GLFact, GLPreliminaryActual
+
+TABLES = (
+    "gl_preliminary_actuals", "preliminary_periods", "gl_facts", "dim_account", "dim_project",
+    "dim_outage", "gl_accounts", "project_mappings", "account_dept_mappings",
+)
+
+# (id, gxacct, gxpjno, gxshut, gxfamt) of a month's detail, all debits
+DETAIL = [
+    (1, "1001", "", "", 100),
+    (2, "1001", "", "", 50),
+    (3, "2002", "P123", "", 30),
+    (4, "2002", "", "K0125P01", 20),
+]
+
+KEYS_SQL = """
+    SELECT DISTINCT da.gxacct, dp.project_number, o.alias, r.plant_code, r.dept_code
+    FROM {table} r
+    LEFT JOIN dim_account da ON da.account_key = r.account_key
+    LEFT JOIN dim_project dp ON dp.project_key = r.project_key
+    LEFT JOIN dim_outage o ON o.outage_key = r.outage_key
+"""
+
+
+class TestPreliminaryRows:
+    """Preliminary rows are shaped and derived like facts."""
+
+    def test_same_keys_as_facts(self):
+        fact_columns = set(GLFact.__table__.columns.keys()) - {"id"}
+        preliminary_columns = set(GLPreliminaryActual.__table__.columns.keys()) - {"id"}
+
+        assert preliminary_columns - fact_columns == {"txn_count"}
+        assert fact_columns - preliminary_columns == set()
+
+    def test_only_regular_months(self):
+        with pytest.raises(ValueError):
+            preliminary.load_preliminary_actuals(2025, 13)
+
+    def test_transform(self):
+        pytest.importorskip("pyarrow")
+        df = pd.DataFrame({"GXACCT": ["K1-100"], "GXDRCR": ["D "], "TXN_COUNT": [4]})
+
+        df = preliminary.transform_preliminary(df)
+
+        assert list(df.columns) == ["gxacct", "gxdrcr", "txn_count"]
+        assert df["gxdrcr"].tolist() == ["D"]
+
+
+def _aggregate(month: int = 11) -> pd.DataFrame:
+    """DETAIL as the DB2 aggregate (after transform_preliminary)."""
+    df = pd.DataFrame(DETAIL, columns=["id", "gxacct", "gxpjno", "gxshut", "gxfamt"])
+    df = df.groupby(["gxacct", "gxpjno", "gxshut"], as_index=False).agg(
+        gxfamt=("gxfamt", "sum"), txn_count=("id", "count")
+    )
+    return df.assign(txyear=2025, txmnth=month, gxdrcr="D")
+
+
+@pytest.fixture
+def ledger(pg_engine, pg_truncate):
+    """Accounts and mappings: 1001 -> OPER by CTUF01, project P123 -> ENGR, 2002 unmapped."""
+    pg_truncate(*TABLES)
+    with pg_engine.begin() as conn:
+        partitions.ensure_year_partitions(conn, 2025)
+        conn.execute(text("""
+            INSERT INTO gl_accounts (ctacct, ctuf01, ctactv, row_hash)
+            VALUES ('1001', 'FPC100', 'A', 'h1'), ('2002', 'FPC250', 'A', 'h2')
+        """))
+        conn.execute(text("INSERT INTO account_dept_mappings (ctuf01, dept_code) VALUES ('FPC100', 'OPER')"))
+        conn.execute(text("INSERT INTO project_mappings (project_number, dept_code) VALUES ('P123', 'ENGR')"))
+        conn.execute(text("DROP VIEW IF EXISTS transaction_budget_groups"))
+        conn.execute(text(views.CREATE_BUDGET_GROUPS_VIEW))
+    return pg_engine
+
+
+def _load_facts(conn, month: int):
+    """DETAIL of a month into gl_facts, through the fact derivation gl_actuals uses."""
+    conn.execute(text("""
+        CREATE TEMP TABLE detail_load (
+            id INTEGER, txyear INTEGER, txmnth INTEGER, gxacct VARCHAR(36), gxpjno VARCHAR(10),
+            gxshut VARCHAR(12), gxfamt NUMERIC(17, 2), gxdrcr VARCHAR(1)
+        ) ON COMMIT DROP
+    """))
+    conn.execute(text("""
+        INSERT INTO detail_load VALUES (:id, 2025, :month, :gxacct, :gxpjno, :gxshut, :gxfamt, 'D')
+    """), [
+        {"id": i, "month": month, "gxacct": a, "gxpjno": p, "gxshut": s, "gxfamt": amt}
+        for i, a, p, s, amt in DETAIL
+    ])
+    gl_facts.insert_facts(conn, "detail_load", "gl_facts")
+
+
+class TestReplacePreliminary:
+    """Tests for loading and clearing a preliminary month."""
+
+    def test_plant_and_department_derived_like_facts(self, ledger):
+        with ledger.begin() as conn:
+            _load_facts(conn, 10)
+        preliminary.replace_preliminary(ledger, _aggregate(), 2025, 11)
+
+        with ledger.connect() as conn:
+            facts = {tuple(row) for row in conn.execute(text(KEYS_SQL.format(table="gl_facts")))}
+            aggregates = {
+                tuple(row) for row in conn.execute(text(KEYS_SQL.format(table="gl_preliminary_actuals")))
+            }
+
+        assert aggregates == facts == {
+            ("1001", None, None, "KC", "OPER"),
+            ("2002", "P123", None, "CC", "ENGR"),
+            ("2002", None, "K0125P01", "KC", "MAINT"),
+        }
+
+    def test_reload_replaces_the_month_and_clear_drops_it(self, ledger):
+        preliminary.replace_preliminary(ledger, _aggregate(), 2025, 11)
+        rows = preliminary.replace_preliminary(ledger, _aggregate(), 2025, 11)
+
+        assert rows == 3
+        with ledger.connect() as conn:
+            totals = conn.execute(text("SELECT COUNT(*), SUM(gxfamt) FROM gl_preliminary_actuals")).one()
+            periods = conn.execute(text("SELECT txmnth, txn_count FROM preliminary_periods")).all()
+        assert tuple(totals) == (3, 200)
+        assert [tuple(row) for row in periods] == [(11, 4)]
+
+        with ledger.begin() as conn:
+            assert preliminary.clear_preliminary(conn, 2025, [11]) == 1
+        with ledger.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM gl_preliminary_actuals")).scalar() == 0
+
+
+@pytest.fixture
+def in_close(ledger, monkeypatch):
+    """October and November detail loaded; November then reloaded preliminary."""
+    with ledger.begin() as conn:
+        _load_facts(conn, 10)
+    with ledger.begin() as conn:
+        _load_facts(conn, 11)
+    preliminary.replace_preliminary(ledger, _aggregate().assign(gxfamt=lambda df: df.gxfamt * 2), 2025, 11)
+    monkeypatch.setattr(outages, "get_engine", lambda: ledger)
+    monkeypatch.setattr(close_calendar, "get_engine", lambda: ledger)
+    return ledger
+
+
+class TestReads:
+    """Preliminary months read their aggregate instead of their facts."""
+
+    def test_budget_groups_view(self, in_close):
+        with in_close.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT txmnth, BOOL_AND(is_preliminary), SUM(gxfamt), SUM(txn_count), COUNT(*)
+                FROM transaction_budget_groups
+                GROUP BY txmnth ORDER BY txmnth
+            """)).all()
+
+        assert [tuple(row) for row in rows] == [(10, False, 200, 4, 4), (11, True, 400, 4, 3)]
+
+    def test_outage_costs_count_preliminary_months(self, in_close):
+        response = asyncio.run(outages.get_outage_costs(2025))
+        document = orjson.loads(response.body)
+
+        assert document["preliminary_months"] == [11]
+        [unit] = document["units"]
+        assert unit["total"] == 60.0
+        assert unit["outages"][0]["txn_count"] == 2
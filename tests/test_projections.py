@@ -0,0 +1,149 @@
+"""Tests for year-end department projections."""
+
+from contextlib import nullcontext
+
+import numpy as np
+import pytest
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from src.engine.projections import (
+    ProjectionInputs,
+    ProjectionMethod,
+    build_projection_set,
+    invalidate_projections,
+    project,
+)
+from src.engine import projections
+
+
+def _inputs():
+    """Three departments: saved forecast, budget only, actuals only."""
+    keys = [("KC", "MAINT"), ("KC", "OPER"), ("CC", "ENGR")]
+    actuals = np.array([
+        [100.0] * 12,
+        [50.0] * 12,
+        [10.0, 20.0, 30.0] + [0.0] * 9,
+    ])
+    prior = np.array([
+        [0.0] * 12,
+        [25.0] * 6 + [50.0] * 6,
+        [0.0] * 12,
+    ])
+    budget = np.array([
+        [90.0] * 12,
+        [40.0] * 12,
+        [0.0] * 12,
+    ])
+    saved = np.array([
+        [120.0] * 12,
+        [0.0] * 12,
+        [0.0] * 12,
+    ])
+    return ProjectionInputs(
+        year=2025,
+        keys=keys,
+        actuals=actuals,
+        prior_actuals=prior,
+        budget=budget,
+        saved=saved,
+        has_budget=np.array([True, True, False]),
+        has_saved=np.array([True, False, False]),
+    )
+
+
+class TestProject:
+    """Tests for the vectorized projection."""
+
+    def test_forecast_method_prefers_saved_then_budget_then_run_rate(self):
+        grid, _, source = project(_inputs(), 3, ProjectionMethod.FORECAST)
+
+        assert list(source) == ["saved", "budget", "run_rate"]
+        assert grid[0].sum() == 3 * 100 + 9 * 120
+        assert grid[1].sum() == 3 * 50 + 9 * 40
+        assert grid[2].sum() == 60 + 9 * 20
+
+    def test_seasonal_scales_prior_year_shape(self):
+        grid, _, source = project(_inputs(), 6, ProjectionMethod.SEASONAL)
+
+        # Prior-year YTD 150 vs 300 this year: the prior H2 (50/month) doubles
+        assert source[1] == "seasonal"
+        assert grid[1, 6:].tolist() == [100.0] * 6
+        # No prior-year actuals: run-rate
+        assert source[0] == "run_rate"
+        assert grid[0, 6:].tolist() == [100.0] * 6
+
+    def test_closed_year_is_all_actuals(self):
+        grid, _, _ = project(_inputs(), 12, ProjectionMethod.FORECAST)
+
+        assert np.array_equal(grid, _inputs().actuals)
+
+    def test_nothing_closed_uses_estimates(self):
+        grid, estimate, _ = project(_inputs(), 0, ProjectionMethod.FORECAST)
+
+        assert np.array_equal(grid, estimate)
+        assert grid[2].sum() == 0
+
+
+class TestProjectionSet:
+    """Tests for packaging and caching projections."""
+
+    def test_rows_by_plant(self):
+        result = build_projection_set(_inputs(), 3)
+
+        maint = result.get("KC", "MAINT")
+        assert maint.ytd_actual == 300
+        assert maint.ytd_budget == 270
+        assert maint.year_end_projection == 300 + 9 * 120
+        assert maint.has_saved_forecast
+        assert [p.dept_code for p in result.for_plant("KC")] == ["MAINT", "OPER"]
+
+    def test_invalidate_by_year(self):
+        result = build_projection_set(_inputs(), 3)
+        projections._cache[(2025, 3, "forecast")] = ((1,), result)
+        projections._cache[(2024, 12, "forecast")] = ((1,), result)
+
+        invalidate_projections(2025)
+
+        assert list(projections._cache) == [(2024, 12, "forecast")]
+        invalidate_projections()
+        assert projections._cache == {}
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class _FailingConnection:
+    """Connection whose every query raises the given error."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, *args):
+        raise self.error
+
+
+class TestFetch:
+    """Only a missing table reads as empty input."""
+
+    def test_missing_table_is_empty(self):
+        conn = _FailingConnection(ProgrammingError("SELECT", {}, _PgError("42P01")))
+
+        assert projections._fetch(conn, "SELECT 1", {}) == []
+
+    def test_other_sql_errors_propagate(self):
+        conn = _FailingConnection(ProgrammingError("SELECT", {}, _PgError("42703")))
+
+        with pytest.raises(ProgrammingError):
+            projections._fetch(conn, "SELECT 1", {})
+
+    def test_connection_errors_propagate(self):
+        conn = _FailingConnection(OperationalError("SELECT", {}, Exception("server closed")))
+
+        with pytest.raises(OperationalError):
+            projections._fetch(conn, "SELECT 1", {})
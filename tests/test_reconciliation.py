@@ -0,0 +1,96 @@
+"""Tests for GL actuals control-total reconciliation."""
+
+from decimal import Decimal
+
+from src.etl.reconciliation import (
+    ControlTotal,
+    compare_totals,
+    control_totals_sql,
+    plan_reloads,
+    report_rows,
+)
+
+
+def _total(rows, amount, row_hash):
+    return ControlTotal(rows, Decimal(amount), row_hash)
+
+
+SOURCE = {
+    (3, "K1-100"): _total(10, "100.00", 1111),
+    (3, "K1-200"): _total(5, "50.00", 2222),
+    (4, "K1-100"): _total(2, "20.00", 3333),
+    (14, "K1-100"): _total(1, "-5.00", 4444),
+}
+
+
+class TestCompare:
+    """Tests for comparing control totals."""
+
+    def test_differences_and_status(self):
+        target = dict(SOURCE)
+        target[(3, "K1-200")] = _total(5, "50.00", 9999)  # same count and sum, different rows
+        del target[(4, "K1-100")]
+        target[(4, "C2-300")] = _total(1, "1.00", 1)
+
+        differences = compare_totals(SOURCE, target)
+
+        assert [(d.txmnth, d.gxacct, d.status) for d in differences] == [
+            (3, "K1-200", "mismatch"),
+            (4, "C2-300", "missing_source"),
+            (4, "K1-100", "missing_target"),
+        ]
+
+    def test_matching_totals(self):
+        assert compare_totals(SOURCE, dict(SOURCE)) == []
+
+    def test_query_runs_on_either_side(self):
+        sql = control_totals_sql("gl_transactions", 2025, [3, 13])
+
+        assert "FROM gl_transactions" in sql
+        assert "AND (TXMNTH = 3 OR TXMNTH NOT BETWEEN 1 AND 12)" in sql
+        assert "GROUP BY TXMNTH, TRIM(GXACCT)" in sql
+
+
+class TestPlan:
+    """Few differing accounts are reloaded in place, many reload the month."""
+
+    def test_accounts_or_whole_month(self):
+        target = {key: _total(0, "0", 0) for key in SOURCE}
+
+        plan = plan_reloads(compare_totals(SOURCE, target), max_accounts=1)
+
+        assert plan == {3: None, 4: ["K1-100"], 13: ["K1-100"]}
+
+    def test_rows_without_account_reload_the_month(self):
+        differences = compare_totals({(5, None): _total(1, "1", 1)}, {})
+
+        assert plan_reloads(differences) == {5: None}
+
+
+class TestReport:
+    """Tests for the report rows."""
+
+    def test_month_and_account_rows(self):
+        target = dict(SOURCE)
+        target[(3, "K1-200")] = _total(4, "40.00", 2000)
+        differences = compare_totals(SOURCE, target)
+        plan = plan_reloads(differences)
+
+        rows = report_rows(SOURCE, target, differences, plan, after=dict(SOURCE))
+
+        assert [(r["txmnth"], r["gxacct"], r["status"], r["action"]) for r in rows] == [
+            (3, None, "mismatch", "account_reload"),
+            (3, "K1-200", "mismatch", "account_reload"),
+            (4, None, "match", "none"),
+            (14, None, "match", "none"),
+        ]
+        assert rows[0]["source_rows"] == 15 and rows[0]["target_rows"] == 14
+        assert rows[0]["resolved"] is True and rows[2]["resolved"] is None
+
+    def test_dry_run_does_not_resolve(self):
+        differences = compare_totals(SOURCE, {})
+
+        rows = report_rows(SOURCE, {}, differences, plan={})
+
+        assert {r["action"] for r in rows} == {"none"}
+        assert {r["resolved"] for r in rows} == {None}
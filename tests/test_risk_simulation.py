@@ -0,0 +1,86 @@
+"""Tests for the Monte Carlo cost risk simulation."""
+
+import numpy as np
+
+from src.engine.risk_simulation import (
+    RiskAssumptions,
+    PlantYearInputs,
+    simulate_plant_year,
+    run_simulation,
+)
+
+
+def _inputs(**overrides):
+    values = dict(
+        plant_id=1,
+        year=2026,
+        generation_mwh=5_000_000,
+        fuel_cost=150_000_000,
+        other_cost=50_000_000,
+    )
+    values.update(overrides)
+    return PlantYearInputs(**values)
+
+
+class TestSimulatePlantYear:
+    """Tests for single plant/year simulation."""
+
+    def test_bands_are_ordered(self):
+        """Test P10 <= P50 <= P90 for cost and $/MWhr."""
+        result = simulate_plant_year(
+            _inputs(), RiskAssumptions(), 10_000, np.random.SeedSequence(1)
+        )
+
+        assert result.cost_p10 <= result.cost_p50 <= result.cost_p90
+        assert result.cost_per_mwh_p10 <= result.cost_per_mwh_p50 <= result.cost_per_mwh_p90
+
+    def test_zero_volatility_matches_point_estimate(self):
+        """Test that no volatility reproduces the base scenario."""
+        assumptions = RiskAssumptions(
+            coal_price_volatility=0,
+            heat_rate_volatility=0,
+            generation_volatility=0,
+        )
+        result = simulate_plant_year(
+            _inputs(), assumptions, 1_000, np.random.SeedSequence(1)
+        )
+
+        assert result.cost_p10 == result.cost_p90 == 200_000_000
+        assert result.cost_per_mwh_p50 == 40.0
+
+    def test_certain_repairs_add_full_cost(self):
+        """Test repairs with probability 1.0 always occur."""
+        assumptions = RiskAssumptions(
+            coal_price_volatility=0,
+            heat_rate_volatility=0,
+            generation_volatility=0,
+        )
+        inputs = _inputs(
+            repair_costs=np.array([1_000_000.0, 2_000_000.0]),
+            repair_probabilities=np.array([1.0, 1.0]),
+        )
+        result = simulate_plant_year(inputs, assumptions, 1_000, np.random.SeedSequence(1))
+
+        assert result.cost_p50 == 203_000_000
+
+
+class TestRunSimulation:
+    """Tests for multi plant/year runs."""
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed gives the same bands."""
+        inputs = [_inputs(year=2026), _inputs(year=2027)]
+
+        first = run_simulation(inputs, trials=5_000, seed=42)
+        second = run_simulation(inputs, trials=5_000, seed=42)
+
+        assert [r.cost_p50 for r in first] == [r.cost_p50 for r in second]
+
+    def test_process_pool_matches_serial(self):
+        """Test worker count does not change results."""
+        inputs = [_inputs(year=2026), _inputs(year=2027)]
+
+        serial = run_simulation(inputs, trials=2_000, seed=7)
+        pooled = run_simulation(inputs, trials=2_000, seed=7, workers=2)
+
+        assert [r.cost_p90 for r in serial] == [r.cost_p90 for r in pooled]
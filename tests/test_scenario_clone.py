@@ -0,0 +1,165 @@
+"""Tests for set-based scenario cloning."""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.engine.scenario_clone import DriverOverride, _subset_filters, clone_scenario
+from src.models import CostCategory, Forecast, Period, Plant, Scenario
+from src.models.cost_category import CostSection
+from src.models.period import Granularity
+from src.models.scenario import ScenarioType
+
+TABLES = (
+    "driver_values", "driver_definitions", "forecasts", "scenarios",
+    "periods", "cost_categories", "plants",
+)
+
+
+class TestSubsetFilters:
+    """Tests for the shared WHERE clauses."""
+
+    def test_no_subset(self):
+        params = {}
+
+        assert _subset_filters("f", None, None, None, None, params, "p.year", False) == ""
+        assert params == {}
+
+    def test_year_plant_and_category(self):
+        params = {}
+        sql = _subset_filters("f", 2025, 2026, [1], [7, 8], params, "p.year", False)
+
+        assert sql == (
+            " AND p.year >= :year_from AND p.year <= :year_to"
+            " AND f.plant_id = ANY(:plant_ids) AND f.category_id = ANY(:category_ids)"
+        )
+        assert params == {"year_from": 2025, "year_to": 2026, "plant_ids": [1], "category_ids": [7, 8]}
+
+    def test_plant_agnostic_rows_can_be_kept(self):
+        sql = _subset_filters("dv", None, None, [1], None, {}, "dv.year", True)
+
+        assert sql == " AND (dv.plant_id = ANY(:plant_ids) OR dv.plant_id IS NULL)"
+
+
+class TestCloneValidation:
+    """Argument checks happen before any database work."""
+
+    def test_category_subset_rejected_with_copy_on_write(self):
+        with pytest.raises(ValueError, match="copy-on-write"):
+            clone_scenario(None, 1, category_ids=[1], copy_on_write=True)
+
+
+@pytest.fixture
+def seeded(pg_engine, pg_truncate):
+    """
+    A full scenario with forecasts for two plants (plus combined rows),
+    two categories and 2024-2026, and coal_price driver values.
+    """
+    pg_truncate(*TABLES)
+    db = Session(bind=pg_engine)
+    plants = [
+        Plant(name=name, short_name=short, capacity_mw=1000, unit_count=5, unit_capacity_mw=200)
+        for name, short in (("Kyger Creek", "KC"), ("Clifty Creek", "CC"))
+    ]
+    categories = [
+        CostCategory(name=name, short_name=name, section=CostSection.FUEL)
+        for name in ("Coal", "Lime")
+    ]
+    periods = [Period(year=year, month=1, granularity=Granularity.MONTHLY) for year in (2024, 2025, 2026)]
+    source = Scenario(name="Budget", scenario_type=ScenarioType.BUDGET)
+    db.add_all([*plants, *categories, *periods, source])
+    db.flush()
+
+    for plant_id in (plants[0].id, plants[1].id, None):
+        for category in categories:
+            for period in periods:
+                db.add(Forecast(
+                    scenario_id=source.id, plant_id=plant_id, category_id=category.id,
+                    period_id=period.id, cost_dollars=Decimal("100.00"),
+                ))
+
+    driver_id = db.execute(text(
+        "INSERT INTO driver_definitions (name) VALUES ('coal_price') RETURNING id"
+    )).scalar()
+    for plant_id, period in (
+        (None, "202501"), (plants[0].id, "202501"), (plants[1].id, "202501"), (plants[0].id, "202601"),
+    ):
+        db.execute(text("""
+            INSERT INTO driver_values (scenario_id, driver_id, plant_id, period_yyyymm, value)
+            VALUES (:scenario_id, :driver_id, :plant_id, :period, 50)
+        """), {"scenario_id": source.id, "driver_id": driver_id, "plant_id": plant_id, "period": period})
+    db.commit()
+
+    yield db, source, plants, categories
+    db.close()
+
+
+def _driver_values(db, scenario_id):
+    return db.execute(text("""
+        SELECT plant_id, period_yyyymm, value FROM driver_values
+        WHERE scenario_id = :scenario_id ORDER BY plant_id NULLS FIRST, period_yyyymm
+    """), {"scenario_id": scenario_id}).fetchall()
+
+
+class TestCloneScenario:
+    """Tests for clone_scenario against PostgreSQL."""
+
+    def test_full_copy(self, seeded):
+        db, source, _, _ = seeded
+
+        result = clone_scenario(db, source.id, created_by="tester")
+
+        assert result["forecasts_copied"] == 18
+        assert result["driver_values_copied"] == 4
+        clone = result["scenario"]
+        assert clone.parent_scenario_id == source.id
+        assert clone.version == 2
+
+    def test_year_plant_category_subset(self, seeded):
+        db, source, plants, categories = seeded
+        kc = plants[0].id
+
+        result = clone_scenario(
+            db, source.id, year_from=2025, year_to=2025, plant_ids=[kc], category_ids=[categories[0].id],
+        )
+        clone_id = result["scenario"].id
+
+        forecasts = db.query(Forecast).filter(Forecast.scenario_id == clone_id).all()
+        assert [(f.plant_id, f.category_id, f.period.year) for f in forecasts] == [
+            (kc, categories[0].id, 2025)
+        ]
+        # The plant-agnostic driver value is kept, the other plant and 2026 are not
+        assert [(r.plant_id, r.period_yyyymm) for r in _driver_values(db, clone_id)] == [
+            (None, "202501"), (kc, "202501"),
+        ]
+
+    def test_overrides_update_existing_and_insert_new_periods(self, seeded):
+        db, source, plants, _ = seeded
+        kc = plants[0].id
+
+        result = clone_scenario(db, source.id, driver_overrides=[
+            DriverOverride("coal_price", 60, plant_id=kc),
+            DriverOverride("coal_price", 70, plant_id=kc, period_yyyymm="202502"),
+        ])
+
+        assert result["driver_values_updated"] == 2
+        assert result["driver_values_inserted"] == 1
+        values = {(r.plant_id, r.period_yyyymm): r.value for r in _driver_values(db, result["scenario"].id)}
+        assert values[(kc, "202501")] == values[(kc, "202601")] == Decimal("60")
+        assert values[(kc, "202502")] == Decimal("70")
+        assert values[(None, "202501")] == values[(plants[1].id, "202501")] == Decimal("50")
+
+    def test_error_rolls_back_the_clone(self, seeded):
+        db, source, plants, _ = seeded
+
+        with pytest.raises(Exception):
+            # Overflows NUMERIC(18, 6) after the rows were copied
+            clone_scenario(db, source.id, name="Broken", driver_overrides=[
+                DriverOverride("coal_price", 1e15, plant_id=plants[0].id),
+            ])
+
+        assert db.query(Scenario).filter(Scenario.name == "Broken").count() == 0
+        assert db.query(Forecast).count() == 18
+        assert len(_driver_values(db, source.id)) == 4
@@ -0,0 +1,159 @@
+"""Tests for the scenario comparison (diff) engine."""
+
+import orjson
+import pytest
+
+from src.reports.scenario_comparison import (
+    ADDED,
+    CHANGED,
+    REMOVED,
+    UNCHANGED,
+    build_comparison,
+    compare_scenarios,
+    comparison_to_dict,
+    comparison_to_excel,
+    iter_comparison_json,
+)
+
+SCENARIOS = [
+    {"id": 1, "name": "Budget", "version": 1},
+    {"id": 2, "name": "Forecast", "version": 2},
+]
+
+# (plant_id, plant, category_id, category, section, year, month, cost_0, gen_0, cost_1, gen_1)
+ROWS = [
+    (1, "KC", 10, "Coal", "fuel", 2025, 1, 100, 10, 150, 10),
+    (1, "KC", 10, "Coal", "fuel", 2025, 2, 100, 10, 110, 10),
+    (1, "KC", 11, "Lime", "fuel", 2025, 1, None, None, 40, None),
+    (2, "CC", 10, "Coal", "fuel", 2025, 1, 80, 20, None, None),
+    (2, "CC", 11, "Lime", "fuel", 2025, 1, 5, 0, 5, 0),
+]
+
+
+@pytest.fixture
+def result():
+    return build_comparison(SCENARIOS, ROWS)
+
+
+class TestCellStatus:
+    """Cells are classified against the baseline."""
+
+    def test_added_removed_changed_unchanged(self, result):
+        assert [result.status(r)[1] for r in range(result.cell_count)] == [
+            CHANGED, CHANGED, ADDED, REMOVED, UNCHANGED,
+        ]
+        assert all(result.status(r)[0] is None for r in range(result.cell_count))
+
+    def test_missing_cells_count_as_zero_in_deltas(self, result):
+        assert result.delta[:, 1].tolist() == [50, 10, 40, -80, 0]
+
+    def test_generation_change_alone_is_a_change(self):
+        rows = [(1, "KC", 10, "Coal", "fuel", 2025, 1, 100, 10, 100, 12)]
+
+        assert build_comparison(SCENARIOS, rows).status(0) == [None, CHANGED]
+
+
+class TestRollups:
+    """Totals, $/MWhr and top movers."""
+
+    def test_totals_with_cell_counts(self, result):
+        baseline, forecast = result.totals
+
+        assert baseline["total_cost"] == 285
+        assert baseline["cells"] is None
+        assert forecast["delta"] == 20
+        assert forecast["cells"] == {ADDED: 1, REMOVED: 1, CHANGED: 2, UNCHANGED: 1}
+
+    def test_cost_per_mwh_grouped_by_plant_and_year(self, result):
+        kc, cc = result.cost_per_mwh
+
+        assert (kc["plant"], kc["year"]) == ("KC", 2025)
+        assert kc["cost_per_mwh"] == [10.0, 15.0]
+        assert kc["delta"] == [0.0, 5.0]
+        # No generation left in the forecast
+        assert cc["cost_per_mwh"] == [4.25, None]
+
+    def test_top_movers_grouped_by_plant_and_category(self, result):
+        movers = [(m["plant"], m["category"], m["delta"]) for m in result.top_movers]
+
+        assert movers == [("CC", "Coal", -80), ("KC", "Coal", 60), ("KC", "Lime", 40)]
+
+    def test_top_movers_threshold_and_limit(self):
+        movers = build_comparison(SCENARIOS, ROWS, min_delta=45).top_movers
+
+        assert [(m["plant"], m["category"]) for m in movers] == [("CC", "Coal"), ("KC", "Coal")]
+        assert len(build_comparison(SCENARIOS, ROWS, top_n=1).top_movers) == 1
+
+
+class TestOutput:
+    """JSON and Excel output."""
+
+    def test_dict_is_json_ready(self, result):
+        document = orjson.loads(orjson.dumps(comparison_to_dict(result)))
+
+        assert document["baseline_scenario_id"] == 1
+        assert document["cell_count"] == len(document["cells"]) == 5
+        assert document["cells"][2]["status"] == [None, ADDED]
+
+    def test_streamed_json_matches_the_dict(self, result):
+        chunks = list(iter_comparison_json(result, chunk_cells=2))
+
+        # Roll-ups, three chunks of cells, closing bracket
+        assert len(chunks) == 5
+        assert orjson.loads(b"".join(chunks)) == orjson.loads(orjson.dumps(comparison_to_dict(result)))
+
+    def test_streamed_json_without_cells(self):
+        document = orjson.loads(b"".join(iter_comparison_json(build_comparison(SCENARIOS, []))))
+
+        assert (document["cell_count"], document["cells"]) == (0, [])
+
+    def test_excel_has_every_sheet(self, result):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(comparison_to_excel(result))
+
+        assert workbook.sheetnames == ["Summary", "$ per MWhr", "Top Movers", "Detail"]
+        assert workbook["Detail"].max_row == 6
+
+
+class _Query:
+    """db.query(Scenario).filter(...).all() over no scenarios."""
+
+    def filter(self, *args):
+        return self
+
+    def all(self):
+        return []
+
+
+class _Session:
+    def query(self, *args):
+        return _Query()
+
+
+class TestCompareScenariosErrors:
+    """Unknown scenarios and bad arguments raise different errors."""
+
+    def test_unknown_scenario_is_a_lookup_error(self):
+        with pytest.raises(LookupError, match="not found"):
+            compare_scenarios(_Session(), [1, 2])
+
+    def test_single_scenario_is_a_value_error(self):
+        with pytest.raises(ValueError):
+            compare_scenarios(_Session(), [1, 1])
+
+    def test_report_route_maps_errors_to_status(self):
+        from fastapi import HTTPException
+
+        from src.api.routes.reports import generate_comparison_report
+
+        def status(scenario_ids):
+            with pytest.raises(HTTPException) as excinfo:
+                generate_comparison_report(
+                    scenario_ids=scenario_ids, year=None, year_from=None, year_to=None, plant_ids=None,
+                    top_n=20, min_delta=0.0, format="json", db=_Session(),
+                )
+            return excinfo.value.status_code
+
+        assert status("1,2") == 404
+        assert status("1") == 400
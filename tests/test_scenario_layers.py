@@ -0,0 +1,167 @@
+"""Tests for copy-on-write (overlay) scenario storage."""
+
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.api.routes.forecasts import ForecastUpdate, get_scenario_forecasts, update_forecast
+from src.engine.scenario_layers import (
+    clear_resolution_cache,
+    forecast_for_write,
+    materialize_scenario,
+    resolve_scenario_forecasts,
+)
+from src.models import CostCategory, Forecast, Period, Plant, Scenario
+from src.models.cost_category import CostSection
+from src.models.period import Granularity
+from src.models.scenario import ScenarioType, StorageMode
+
+TABLES = ("forecasts", "scenarios", "periods", "cost_categories", "plants")
+
+
+@pytest.fixture
+def chain(pg_engine, pg_truncate):
+    """
+    base (full, four cells of 100) <- child (overlay, overrides one cell
+    with 150) <- grandchild (overlay, no rows of its own).
+    """
+    pg_truncate(*TABLES)
+    clear_resolution_cache()
+    db = Session(bind=pg_engine)
+    plant = Plant(name="Kyger Creek", short_name="KC", capacity_mw=1000, unit_count=5, unit_capacity_mw=200)
+    categories = [CostCategory(name=n, short_name=n, section=CostSection.FUEL) for n in ("Coal", "Lime")]
+    periods = [Period(year=2025, month=m, granularity=Granularity.MONTHLY) for m in (1, 2)]
+    db.add_all([plant, *categories, *periods])
+    db.flush()
+
+    base = Scenario(name="Budget", scenario_type=ScenarioType.BUDGET)
+    db.add(base)
+    db.flush()
+    child = Scenario(
+        name="What-if", scenario_type=ScenarioType.BUDGET,
+        parent_scenario_id=base.id, storage_mode=StorageMode.OVERLAY.value,
+    )
+    db.add(child)
+    db.flush()
+    grandchild = Scenario(
+        name="What-if 2", scenario_type=ScenarioType.BUDGET,
+        parent_scenario_id=child.id, storage_mode=StorageMode.OVERLAY.value,
+    )
+    db.add(grandchild)
+
+    for category in categories:
+        for period in periods:
+            db.add(Forecast(
+                scenario_id=base.id, plant_id=plant.id, category_id=category.id, period_id=period.id,
+                generation_mwh=Decimal("10.0000"), cost_dollars=Decimal("100.00"),
+            ))
+    db.add(Forecast(
+        scenario_id=child.id, plant_id=plant.id, category_id=categories[0].id,
+        period_id=periods[0].id, generation_mwh=Decimal("10.0000"), cost_dollars=Decimal("150.00"),
+    ))
+    db.commit()
+
+    yield db, base, child, grandchild, categories, periods
+    db.close()
+
+
+def _plant_id(db) -> int:
+    return db.query(Plant.id).scalar()
+
+
+def _base_row(db, base, category, period):
+    return db.query(Forecast).filter(
+        Forecast.scenario_id == base.id,
+        Forecast.category_id == category.id,
+        Forecast.period_id == period.id,
+    ).one()
+
+
+class TestResolution:
+    """Overlay scenarios read their own cells first, then the parent chain."""
+
+    def test_override_wins_and_the_rest_is_inherited(self, chain):
+        db, base, child, _, categories, periods = chain
+
+        cells = {(c.category_id, c.period_id): c for c in resolve_scenario_forecasts(db, child.id)}
+
+        assert len(cells) == 4
+        overridden = cells[(categories[0].id, periods[0].id)]
+        assert (overridden.cost_dollars, overridden.source_scenario_id) == (150.0, child.id)
+        inherited = cells[(categories[1].id, periods[1].id)]
+        assert (inherited.cost_dollars, inherited.source_scenario_id) == (100.0, base.id)
+
+    def test_grandchild_inherits_through_the_chain(self, chain):
+        db, _, child, grandchild, categories, periods = chain
+
+        cells = {(c.category_id, c.period_id): c for c in resolve_scenario_forecasts(db, grandchild.id)}
+
+        assert cells[(categories[0].id, periods[0].id)].source_scenario_id == child.id
+        assert sum(c.cost_dollars for c in cells.values()) == 450.0
+
+    def test_forecast_grid_endpoint_returns_the_resolved_grid(self, chain):
+        db, _, child, _, _, _ = chain
+
+        rows = get_scenario_forecasts(child.id, db=db)
+
+        assert len(rows) == 4
+        assert {r.scenario_id for r in rows} == {child.id}
+        assert sorted(r.cost_dollars for r in rows) == [100.0, 100.0, 100.0, 150.0]
+
+
+class TestOverrides:
+    """Writes to an overlay scenario go to its own rows."""
+
+    def test_new_override_starts_from_the_inherited_cell(self, chain):
+        db, base, child, _, categories, periods = chain
+
+        forecast, created = forecast_for_write(db, child.id, _plant_id(db), categories[1].id, periods[0].id)
+
+        assert created
+        assert forecast.scenario_id == child.id
+        assert (forecast.cost_dollars, forecast.generation_mwh) == (Decimal("100.00"), Decimal("10.0000"))
+
+    def test_existing_override_is_reused(self, chain):
+        db, _, child, _, categories, periods = chain
+
+        forecast, created = forecast_for_write(db, child.id, _plant_id(db), categories[0].id, periods[0].id)
+
+        assert not created
+        assert forecast.cost_dollars == Decimal("150.00")
+
+    def test_editing_an_inherited_cell_leaves_the_ancestor_alone(self, chain):
+        db, base, child, _, categories, periods = chain
+        ancestor = _base_row(db, base, categories[1], periods[1])
+
+        response = update_forecast(
+            ancestor.id, ForecastUpdate(cost_dollars=175.0, scenario_id=child.id), db=db
+        )
+
+        assert response.scenario_id == child.id
+        assert response.id != ancestor.id
+        assert (response.cost_dollars, response.generation_mwh) == (175.0, 10.0)
+        db.expire_all()
+        assert _base_row(db, base, categories[1], periods[1]).cost_dollars == Decimal("100.00")
+        assert db.query(Forecast).filter(Forecast.scenario_id == child.id).count() == 2
+
+    def test_editing_a_row_outside_the_chain_is_rejected(self, chain):
+        db, base, child, _, categories, periods = chain
+        # The child overrides this cell, so the base row is not part of it
+        shadowed = _base_row(db, base, categories[0], periods[0])
+
+        with pytest.raises(HTTPException) as excinfo:
+            update_forecast(shadowed.id, ForecastUpdate(cost_dollars=1.0, scenario_id=child.id), db=db)
+
+        assert excinfo.value.status_code == 400
+
+    def test_materialize_copies_inherited_cells(self, chain):
+        db, _, child, _, _, _ = chain
+
+        result = materialize_scenario(db, child.id)
+        db.commit()
+
+        assert result["cells_materialized"] == 3
+        assert db.get(Scenario, child.id).storage_mode == StorageMode.FULL.value
+        assert db.query(Forecast).filter(Forecast.scenario_id == child.id).count() == 4
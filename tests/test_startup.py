@@ -0,0 +1,57 @@
+"""
+Tests that API startup stays lazy.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "pyodbc")
+
+
+def _loaded_after_import(module: str):
+    """Heavy modules present after importing `module` in a fresh interpreter."""
+    probe = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+class TestLazyStartup:
+    """Importing the app must not load heavy optional dependencies."""
+
+    @pytest.mark.parametrize("module", ["src.api.main", "src.db", "src.database"])
+    def test_no_heavy_imports(self, module):
+        assert _loaded_after_import(module) == []
+
+    def test_engine_created_on_first_use(self):
+        probe = (
+            "import src.api.main, src.database as d; "
+            "print(d._engine is None); d.SessionLocal().close(); print(d._engine is d.get_engine())"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ["True", "True"]
+
+    def test_package_exports_resolve_lazily(self):
+        import src.reports
+
+        assert "comparison_to_excel" in src.reports.__all__
+        assert callable(src.reports.comparison_to_excel)
+        with pytest.raises(AttributeError):
+            src.reports.not_a_report